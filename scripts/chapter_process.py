@@ -0,0 +1,94 @@
+"""Run one chapter job in its own spawned process so ``--chapter-timeout`` can kill it."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any
+
+POLL_INTERVAL_SECONDS = 0.2
+TERMINATE_GRACE_SECONDS = 5.0
+
+
+class ChapterProcessError(RuntimeError):
+    """The chapter process raised, or exited without returning a result."""
+
+
+def _child_main(
+    sender: Connection,
+    initializer: Callable[..., object] | None,
+    initargs: tuple,
+    func: Callable[..., object],
+    args: tuple,
+) -> None:
+    # 自成一個 process group，逾時時連 marker / torch 開的子程序一起收掉
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+        sender.send((True, func(*args)))
+    except BaseException as exc:  # noqa: BLE001
+        sender.send((False, f"{type(exc).__name__}: {exc}"))
+    finally:
+        sender.close()
+
+
+def _kill(process: multiprocessing.process.BaseProcess) -> None:
+    def signal_group(sig: signal.Signals) -> None:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)
+            else:
+                process.terminate()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    signal_group(signal.SIGTERM)
+    process.join(TERMINATE_GRACE_SECONDS)
+    if process.is_alive():
+        signal_group(getattr(signal, "SIGKILL", signal.SIGTERM))
+        process.join()
+
+
+async def run_in_chapter_process(
+    func: Callable[..., object],
+    args: tuple,
+    *,
+    timeout: float | None,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple = (),
+) -> Any:
+    """Return ``func(*args)`` from a fresh spawn process; on timeout or cancellation the process is killed."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child_main, args=(sender, initializer, initargs, func, args))
+    process.start()
+    sender.close()
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    finished = False
+    try:
+        while not receiver.poll():
+            if not process.is_alive():
+                if receiver.poll():
+                    break
+                raise ChapterProcessError(f"chapter process exited with code {process.exitcode}")
+            if deadline is not None and loop.time() >= deadline:
+                raise TimeoutError
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        ok, payload = receiver.recv()
+        finished = True
+    finally:
+        if finished:
+            await asyncio.to_thread(process.join, TERMINATE_GRACE_SECONDS)
+        if process.is_alive():
+            await asyncio.to_thread(_kill, process)
+        receiver.close()
+    if not ok:
+        raise ChapterProcessError(payload)
+    return payload
@@ -4,12 +4,14 @@ Usage examples:
     uv run python scripts/ingest_miller_chapters.py --limit 1 --match "76 - "
     uv run python scripts/ingest_miller_chapters.py --use-marker --chunk-size 64
     uv run python scripts/ingest_miller_chapters.py --high-fidelity-marker --limit 1 --match "76 - "
+    uv run python scripts/ingest_miller_chapters.py --use-marker --workers 4 --chapter-timeout 3600 --resume
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import importlib.util
 import json
 import os
 import re
@@ -17,7 +19,11 @@ import shutil
 import sys
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
+
+from chapter_process import run_in_chapter_process
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -28,6 +34,13 @@ DEFAULT_REPORT_DIR = PROJECT_ROOT / "data" / "reports"
 DEFAULT_MILLER_PROFILE_JSON = (
     PROJECT_ROOT / "configs" / "asset-aware" / "miller_marker_hq.json"
 )
+SOURCE_SIDECAR_MODULE_PATH = (
+    PROJECT_ROOT / "src" / "application" / "services" / "textbook_source_sidecar.py"
+)
+PROGRESS_MANIFEST_NAME = "miller_ingest_progress.json"
+INGEST_LEDGER_STAGE = "ingest"
+FALLBACK_BLOCKS_LEDGER_STAGE = "fallback_blocks"
+FALLBACK_BLOCKS_BUILDER_VERSION = 1
 CHAPTER_PDF_NAME_RE = re.compile(r"^\d+\s+-\s+.+\.pdf$", re.IGNORECASE)
 
 
@@ -147,6 +160,30 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help="Recommended Miller textbook mode: strict Marker + figures + custom profile.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Chapter ingests to run concurrently in separate processes. 1 keeps the in-process sequential path.",
+    )
+    parser.add_argument(
+        "--chapter-timeout",
+        type=float,
+        default=0,
+        help="Seconds before a single chapter ingest is killed and reported as failed. 0 means no timeout.",
+    )
+    parser.add_argument(
+        "--progress-file",
+        type=Path,
+        default=None,
+        help=f"Resumable progress manifest. Defaults to <report-dir>/{PROGRESS_MANIFEST_NAME}.",
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Reuse chapters the progress manifest already recorded as finished with the same options.",
+    )
     return parser.parse_args()
 
 
@@ -258,6 +295,87 @@ class IngestEntry:
     error: str
 
 
+def failed_entry(pdf_path: Path, *, use_marker: bool, error: str) -> IngestEntry:
+    return IngestEntry(
+        filename=pdf_path.name,
+        pdf_path=str(pdf_path),
+        doc_id=build_doc_id_for_pdf(pdf_path),
+        skipped=False,
+        success=False,
+        backend="marker" if use_marker else "pymupdf",
+        has_blocks_json=False,
+        blocks_count=0,
+        error=error,
+    )
+
+
+class IngestProgress:
+    """Per-chapter progress manifest, rewritten atomically after every state change.
+
+    Entries are keyed by chapter filename. A later run with ``--resume`` reuses
+    finished entries only when they were produced with the same ingest options.
+    """
+
+    def __init__(self, path: Path, options: dict[str, object]) -> None:
+        self.path = path
+        self.options = options
+        self.chapters: dict[str, dict[str, object]] = {}
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if isinstance(payload, dict) and payload.get("options") == options:
+            chapters = payload.get("chapters")
+            if isinstance(chapters, dict):
+                self.chapters = chapters
+
+    def finished_entry(self, pdf_path: Path) -> IngestEntry | None:
+        record = self.chapters.get(pdf_path.name)
+        if not isinstance(record, dict) or record.get("status") not in {"ok", "skipped"}:
+            return None
+        try:
+            entry = IngestEntry(**record["entry"])
+        except (KeyError, TypeError):
+            return None
+        if entry.pdf_path != str(pdf_path):
+            return None
+        return entry
+
+    def mark_running(self, pdf_path: Path) -> None:
+        self.chapters[pdf_path.name] = {
+            "status": "running",
+            "started_at_utc": datetime.now(UTC).isoformat(),
+        }
+        self._flush()
+
+    def record(self, entry: IngestEntry, status: str) -> None:
+        previous = self.chapters.get(entry.filename) or {}
+        self.chapters[entry.filename] = {
+            "status": status,
+            "started_at_utc": previous.get("started_at_utc"),
+            "finished_at_utc": datetime.now(UTC).isoformat(),
+            "entry": asdict(entry),
+        }
+        self._flush()
+
+    def _flush(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "updated_at_utc": datetime.now(UTC).isoformat(),
+            "options": self.options,
+            "chapters": self.chapters,
+        }
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def entry_status(entry: IngestEntry) -> str:
+    if entry.skipped:
+        return "skipped"
+    return "ok" if entry.success else "failed"
+
+
 def check_blocks_json(data_dir: Path, doc_id: str) -> tuple[bool, int]:
     blocks_path = data_dir / doc_id / "blocks.json"
     if not blocks_path.exists():
@@ -273,6 +391,44 @@ def check_blocks_json(data_dir: Path, doc_id: str) -> tuple[bool, int]:
     return True, 0
 
 
+@lru_cache(maxsize=1)
+def load_source_sidecar_module() -> ModuleType:
+    """Load the repo's stdlib-only sidecar/ledger module by file path."""
+    # asset-aware-mcp 的 src 已排在 sys.path 前面，因此以檔案路徑載入本 repo 的 sidecar 模組
+    spec = importlib.util.spec_from_file_location(
+        "exam_textbook_source_sidecar",
+        SOURCE_SIDECAR_MODULE_PATH,
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {SOURCE_SIDECAR_MODULE_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def refresh_source_sidecars(data_dir: Path, doc_id: str) -> None:
+    """Write source_readiness.json and blocks.sqlite next to the fresh blocks.json."""
+    doc_dir = data_dir / doc_id
+    try:
+        sidecars = load_source_sidecar_module()
+        if sidecars.load_readiness_sidecar(doc_dir) is None:
+            sidecars.write_readiness_sidecar(doc_dir)
+        store = sidecars.BlockStore.open(doc_dir)
+        if store is None:
+            sidecars.build_block_store(doc_dir)
+        else:
+            store.close()
+    except Exception as exc:
+        print(f"  !! source sidecars skipped for {doc_id}: {exc}", flush=True)
+
+
+def build_profile_fingerprint(etl_profile: str, etl_profile_json: Path | None) -> str:
+    """Identify the ETL profile for the ingest ledger; JSON profiles are keyed by content."""
+    if etl_profile_json is not None:
+        return "json:" + load_source_sidecar_module().file_sha256(etl_profile_json.resolve())
+    return etl_profile
+
+
 def load_existing_readiness(data_dir: Path, doc_id: str) -> tuple[bool, int]:
     doc_dir = data_dir / doc_id
     manifest_path = doc_dir / f"{doc_id}_manifest.json"
@@ -459,6 +615,15 @@ def materialize_fallback_blocks(data_dir: Path, doc_id: str) -> tuple[bool, int]
     if not markdown_path.exists():
         return False, 0
 
+    sidecars = load_source_sidecar_module()
+    ledger_key = {
+        "markdown_sha256": sidecars.file_sha256(markdown_path),
+        "builder_version": FALLBACK_BLOCKS_BUILDER_VERSION,
+    }
+    record = sidecars.ingest_stage_record(doc_dir, FALLBACK_BLOCKS_LEDGER_STAGE, ledger_key)
+    if record is not None:
+        return True, int(record["details"].get("blocks_count") or 0)
+
     markdown = markdown_path.read_text(encoding="utf-8")
     blocks = build_fallback_blocks(markdown)
     if not blocks:
@@ -469,6 +634,13 @@ def materialize_fallback_blocks(data_dir: Path, doc_id: str) -> tuple[bool, int]
         json.dumps(blocks, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
+    sidecars.record_ingest_stage(
+        doc_dir,
+        FALLBACK_BLOCKS_LEDGER_STAGE,
+        ledger_key,
+        ["blocks.json"],
+        details={"blocks_count": len(blocks)},
+    )
     return True, len(blocks)
 
 
@@ -525,29 +697,104 @@ async def ingest_one(
     fallback_blocks: bool,
     text_only: bool,
     clean_existing: bool,
+    profile_fingerprint: str = "",
 ) -> IngestEntry:
+    """
+    Ingest one chapter unless the ingest ledger shows its artifacts were already
+    produced from the same PDF content and options.
+
+    Docs ingested before the ledger existed keep the old blocks.json readiness
+    skip; a doc whose ledger no longer matches is deleted and re-ingested.
+    """
     from src.infrastructure.file_storage import FileStorage
-    from src.presentation.dependencies import document_service, get_marker_extractor
 
     doc_id = build_doc_id_for_pdf(pdf_path)
+    doc_dir = data_dir / doc_id
     repository = FileStorage(data_dir)
+    sidecars = load_source_sidecar_module()
+    pdf_sha256 = sidecars.ledger_content_hash(doc_dir, pdf_path)
+    ledger_key = {
+        "pdf_sha256": pdf_sha256,
+        "backend": "text-only" if text_only else ("marker" if use_marker else "pymupdf"),
+        "profile": profile_fingerprint,
+        "chunk_size": chunk_size if use_marker and not text_only else 0,
+        "extract_figures": extract_figures,
+        "fallback_blocks": fallback_blocks,
+        "require_marker": require_marker,
+    }
 
     if clean_existing and repository.document_exists(doc_id):
         repository.delete_document(doc_id)
 
-    has_blocks, block_count = load_existing_readiness(data_dir, doc_id)
-    if skip_ready and has_blocks and block_count > 0:
-        return IngestEntry(
-            filename=pdf_path.name,
-            pdf_path=str(pdf_path),
-            doc_id=doc_id,
-            skipped=True,
-            success=True,
-            backend="marker" if use_marker else "pymupdf",
-            has_blocks_json=True,
-            blocks_count=block_count,
-            error="",
+    if skip_ready:
+        record = sidecars.ingest_stage_record(doc_dir, INGEST_LEDGER_STAGE, ledger_key)
+        if record is not None:
+            return IngestEntry(
+                filename=pdf_path.name,
+                pdf_path=str(pdf_path),
+                doc_id=doc_id,
+                skipped=True,
+                success=True,
+                backend=str(record["details"].get("backend") or ledger_key["backend"]),
+                has_blocks_json=True,
+                blocks_count=int(record["details"].get("blocks_count") or 0),
+                error="",
+            )
+        if not sidecars.has_ingest_stage(doc_dir, INGEST_LEDGER_STAGE):
+            has_blocks, block_count = load_existing_readiness(data_dir, doc_id)
+            if has_blocks and block_count > 0:
+                return IngestEntry(
+                    filename=pdf_path.name,
+                    pdf_path=str(pdf_path),
+                    doc_id=doc_id,
+                    skipped=True,
+                    success=True,
+                    backend="marker" if use_marker else "pymupdf",
+                    has_blocks_json=True,
+                    blocks_count=block_count,
+                    error="",
+                )
+        elif repository.document_exists(doc_id):
+            print(f"  .. {pdf_path.name}: PDF or ingest options changed, re-ingesting", flush=True)
+            repository.delete_document(doc_id)
+
+    entry = await ingest_pdf(
+        pdf_path,
+        doc_id=doc_id,
+        data_dir=data_dir,
+        use_marker=use_marker,
+        require_marker=require_marker,
+        extract_figures=extract_figures,
+        chunk_size=chunk_size,
+        fallback_blocks=fallback_blocks,
+        text_only=text_only,
+    )
+    if entry.success and entry.has_blocks_json:
+        sidecars.record_ingest_stage(
+            data_dir / entry.doc_id,
+            INGEST_LEDGER_STAGE,
+            ledger_key,
+            [f"{entry.doc_id}_full.md", "blocks.json"],
+            source_path=pdf_path,
+            source_sha256=pdf_sha256,
+            details={"backend": entry.backend, "blocks_count": entry.blocks_count},
         )
+    return entry
+
+
+async def ingest_pdf(
+    pdf_path: Path,
+    *,
+    doc_id: str,
+    data_dir: Path,
+    use_marker: bool,
+    require_marker: bool,
+    extract_figures: bool,
+    chunk_size: int,
+    fallback_blocks: bool,
+    text_only: bool,
+) -> IngestEntry:
+    from src.presentation.dependencies import document_service, get_marker_extractor
 
     if text_only:
         text_doc_id, backend_name = ingest_text_only_document(
@@ -637,6 +884,27 @@ async def ingest_one(
     )
 
 
+def init_ingest_worker(
+    data_dir: Path,
+    disable_lightrag: bool,
+    etl_profile: str,
+    etl_profile_json: Path | None,
+) -> None:
+    """Process-pool initializer: each worker needs its own asset-aware-mcp env and profile."""
+    configure_asset_mcp_env(
+        data_dir,
+        disable_lightrag,
+        etl_profile=etl_profile,
+        etl_profile_json=etl_profile_json,
+    )
+    activate_asset_mcp_profile(etl_profile=etl_profile, etl_profile_json=etl_profile_json)
+
+
+def ingest_in_worker(pdf_path: str, ingest_kwargs: dict[str, object]) -> dict[str, object]:
+    entry = asyncio.run(ingest_one(Path(pdf_path), **ingest_kwargs))
+    return asdict(entry)
+
+
 async def main_async(args: argparse.Namespace) -> int:
     if args.high_fidelity_marker:
         args.use_marker = True
@@ -682,43 +950,91 @@ async def main_async(args: argparse.Namespace) -> int:
 
     report_dir.mkdir(parents=True, exist_ok=True)
 
-    entries: list[IngestEntry] = []
-    for index, pdf_path in enumerate(chapter_pdfs, start=1):
-        print(f"[{index}/{len(chapter_pdfs)}] ingesting {pdf_path.name}", flush=True)
-        try:
-            entry = await ingest_one(
-                pdf_path,
-                data_dir=data_dir,
-                use_marker=args.use_marker,
-                require_marker=args.require_marker,
-                extract_figures=args.extract_figures,
-                chunk_size=args.chunk_size,
-                skip_ready=args.skip_ready,
-                fallback_blocks=args.fallback_blocks,
-                text_only=args.text_only,
-                clean_existing=args.clean_existing,
-            )
-        except Exception as exc:  # pragma: no cover - operational path
-            entry = IngestEntry(
-                filename=pdf_path.name,
-                pdf_path=str(pdf_path),
-                doc_id=build_doc_id_for_pdf(pdf_path),
-                skipped=False,
-                success=False,
-                backend="marker" if args.use_marker else "pymupdf",
-                has_blocks_json=False,
-                blocks_count=0,
-                error=str(exc),
+    ingest_kwargs: dict[str, object] = {
+        "data_dir": data_dir,
+        "use_marker": args.use_marker,
+        "require_marker": args.require_marker,
+        "extract_figures": args.extract_figures,
+        "chunk_size": args.chunk_size,
+        "skip_ready": args.skip_ready,
+        "fallback_blocks": args.fallback_blocks,
+        "text_only": args.text_only,
+        "clean_existing": args.clean_existing,
+        "profile_fingerprint": build_profile_fingerprint(args.etl_profile, args.etl_profile_json),
+    }
+    progress_path = (args.progress_file or report_dir / PROGRESS_MANIFEST_NAME).resolve()
+    progress = IngestProgress(
+        progress_path,
+        {
+            **{
+                key: value
+                for key, value in ingest_kwargs.items()
+                if key not in {"data_dir", "skip_ready", "profile_fingerprint"}
+            },
+            "data_dir": str(data_dir),
+            "etl_profile": args.etl_profile,
+            "etl_profile_json": str(args.etl_profile_json.resolve()) if args.etl_profile_json else "",
+        },
+    )
+    workers = max(args.workers, 1)
+    chapter_timeout = args.chapter_timeout if args.chapter_timeout > 0 else None
+    total = len(chapter_pdfs)
+
+    # marker 是 CPU-bound；每章跑在自己的 spawn process（自行設定 asset-aware-mcp 環境），
+    # 逾時就能直接終止，不會卡住 worker 名額
+    use_processes = workers > 1 or chapter_timeout is not None
+    worker_initargs = (data_dir, args.disable_lightrag, args.etl_profile, args.etl_profile_json)
+    semaphore = asyncio.Semaphore(workers)
+    entries_by_index: dict[int, IngestEntry] = {}
+
+    async def run_chapter(index: int, pdf_path: Path) -> None:
+        resumed = progress.finished_entry(pdf_path) if args.resume else None
+        if resumed is not None:
+            entry = IngestEntry(**{**asdict(resumed), "skipped": True})
+            print(f"[{index}/{total}] resumed {pdf_path.name} from progress manifest", flush=True)
+            entries_by_index[index] = entry
+            return
+
+        async with semaphore:
+            print(f"[{index}/{total}] ingesting {pdf_path.name}", flush=True)
+            progress.mark_running(pdf_path)
+            try:
+                if use_processes:
+                    payload = await run_in_chapter_process(
+                        ingest_in_worker,
+                        (str(pdf_path), ingest_kwargs),
+                        timeout=chapter_timeout,
+                        initializer=init_ingest_worker,
+                        initargs=worker_initargs,
+                    )
+                    entry = IngestEntry(**payload)
+                else:
+                    entry = await ingest_one(pdf_path, **ingest_kwargs)
+            except TimeoutError:
+                # chapter process 已被終止
+                entry = failed_entry(
+                    pdf_path,
+                    use_marker=args.use_marker,
+                    error=f"timed out after {chapter_timeout:g}s",
+                )
+            except Exception as exc:  # pragma: no cover - operational path
+                entry = failed_entry(pdf_path, use_marker=args.use_marker, error=str(exc))
+
+            if entry.has_blocks_json and not entry.skipped:
+                refresh_source_sidecars(data_dir, entry.doc_id)
+
+            status = entry_status(entry)
+            progress.record(entry, status)
+            print(
+                f"  -> [{index}/{total}] {status}: doc_id={entry.doc_id} "
+                f"blocks={entry.blocks_count} error={entry.error}",
+                flush=True,
             )
+            entries_by_index[index] = entry
 
-        status = "ok" if entry.success else "failed"
-        if entry.skipped:
-            status = "skipped"
-        print(
-            f"  -> {status}: doc_id={entry.doc_id} blocks={entry.blocks_count} error={entry.error}",
-            flush=True,
-        )
-        entries.append(entry)
+    await asyncio.gather(*(run_chapter(index, pdf_path) for index, pdf_path in enumerate(chapter_pdfs, start=1)))
+
+    entries = [entries_by_index[index] for index in sorted(entries_by_index)]
 
     report = {
         "generated_at_utc": datetime.now(UTC).isoformat(),
@@ -737,6 +1053,10 @@ async def main_async(args: argparse.Namespace) -> int:
         "fallback_blocks": args.fallback_blocks,
         "text_only": args.text_only,
         "clean_existing": args.clean_existing,
+        "workers": workers,
+        "chapter_timeout": args.chapter_timeout,
+        "progress_file": str(progress_path),
+        "resume": args.resume,
         "requested_match": args.match,
         "requested_limit": args.limit,
         "requested_start_chapter": args.start_chapter,
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import importlib.util
 import json
 import os
 import re
 import sys
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
+from types import ModuleType
+
+from chapter_process import ChapterProcessError, run_in_chapter_process
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -21,6 +26,10 @@ DEFAULT_REPORT_DIR = PROJECT_ROOT / "data" / "reports"
 DEFAULT_PROFILE_JSON = (
     PROJECT_ROOT / "configs" / "asset-aware" / "miller_marker_hq.json"
 )
+SOURCE_SIDECAR_MODULE_PATH = (
+    PROJECT_ROOT / "src" / "application" / "services" / "textbook_source_sidecar.py"
+)
+FIGURES_LEDGER_STAGE = "figures"
 CHAPTER_PDF_NAME_RE = re.compile(r"^\d+\s+-\s+.+\.pdf$", re.IGNORECASE)
 
 
@@ -31,6 +40,7 @@ class RefreshEntry:
     success: bool
     figure_count: int
     error: str
+    skipped: bool = False
 
 
 def parse_args() -> argparse.Namespace:
@@ -50,6 +60,24 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_PROFILE_JSON,
         help="Custom ETL profile JSON file for figure extraction thresholds.",
     )
+    parser.add_argument(
+        "--skip-unchanged",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip chapters whose PDF, profile and manifest match the ingest ledger's last figure refresh.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Chapters to refresh concurrently in separate processes. 1 keeps the sequential path.",
+    )
+    parser.add_argument(
+        "--chapter-timeout",
+        type=float,
+        default=0,
+        help="Seconds before a single chapter refresh is reported as failed. 0 means no timeout.",
+    )
     return parser.parse_args()
 
 
@@ -109,6 +137,21 @@ def find_chapter_pdfs(
     return pdfs
 
 
+@lru_cache(maxsize=1)
+def load_source_sidecar_module() -> ModuleType:
+    """Load the repo's stdlib-only sidecar/ledger module by file path."""
+    # asset-aware-mcp 的 src 已排在 sys.path 前面，因此以檔案路徑載入本 repo 的 sidecar 模組
+    spec = importlib.util.spec_from_file_location(
+        "exam_textbook_source_sidecar",
+        SOURCE_SIDECAR_MODULE_PATH,
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {SOURCE_SIDECAR_MODULE_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def build_doc_id_for_pdf(pdf_path: Path) -> str:
     from src.application.document_service import build_doc_id_unique_suffix
     from src.domain.value_objects import DocId
@@ -124,6 +167,7 @@ async def refresh_one(
     *,
     data_dir: Path,
     etl_profile_json: Path | None,
+    skip_unchanged: bool = True,
 ) -> RefreshEntry:
     from src.application.document_service import DocumentService
     from src.domain.etl_profile import ETLProfile
@@ -159,6 +203,23 @@ async def refresh_one(
     original_pdf = doc_dir / "original.pdf"
     source_pdf = original_pdf if original_pdf.exists() else pdf_path
 
+    sidecars = load_source_sidecar_module()
+    pdf_sha256 = sidecars.ledger_content_hash(doc_dir, source_pdf)
+    ledger_key = {
+        "pdf_sha256": pdf_sha256,
+        "profile": ("json:" + sidecars.file_sha256(etl_profile_json.resolve())) if etl_profile_json else "default",
+    }
+    record = sidecars.ingest_stage_record(doc_dir, FIGURES_LEDGER_STAGE, ledger_key)
+    if skip_unchanged and record is not None:
+        return RefreshEntry(
+            filename=pdf_path.name,
+            doc_id=doc_id,
+            success=True,
+            figure_count=int(record["details"].get("figure_count") or 0),
+            error="",
+            skipped=True,
+        )
+
     manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
     assets = manifest.get("assets")
     if not isinstance(assets, dict):
@@ -191,6 +252,15 @@ async def refresh_one(
         json.dumps(manifest, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
+    sidecars.record_ingest_stage(
+        doc_dir,
+        FIGURES_LEDGER_STAGE,
+        ledger_key,
+        [manifest_path.name],
+        source_path=source_pdf,
+        source_sha256=pdf_sha256,
+        details={"figure_count": len(figures)},
+    )
 
     return RefreshEntry(
         filename=pdf_path.name,
@@ -201,6 +271,27 @@ async def refresh_one(
     )
 
 
+def init_refresh_worker(data_dir: Path, etl_profile_json: Path | None) -> None:
+    configure_asset_mcp_env(data_dir, etl_profile_json)
+
+
+def refresh_in_worker(
+    pdf_path: str,
+    data_dir: Path,
+    etl_profile_json: Path | None,
+    skip_unchanged: bool,
+) -> dict[str, object]:
+    entry = asyncio.run(
+        refresh_one(
+            Path(pdf_path),
+            data_dir=data_dir,
+            etl_profile_json=etl_profile_json,
+            skip_unchanged=skip_unchanged,
+        )
+    )
+    return asdict(entry)
+
+
 async def main_async(args: argparse.Namespace) -> int:
     configure_asset_mcp_env(args.data_dir.resolve(), args.etl_profile_json)
     chapter_dir = args.chapter_dir.resolve()
@@ -223,21 +314,62 @@ async def main_async(args: argparse.Namespace) -> int:
         raise SystemExit("No chapter PDFs matched the requested filters.")
 
     report_dir.mkdir(parents=True, exist_ok=True)
-    entries: list[RefreshEntry] = []
-
-    for index, pdf_path in enumerate(chapter_pdfs, start=1):
-        print(f"[{index}/{len(chapter_pdfs)}] refresh figures {pdf_path.name}", flush=True)
-        entry = await refresh_one(
-            pdf_path,
-            data_dir=data_dir,
-            etl_profile_json=args.etl_profile_json,
-        )
-        status = "ok" if entry.success else "failed"
-        print(
-            f"  -> {status}: doc_id={entry.doc_id} figures={entry.figure_count} error={entry.error}",
-            flush=True,
-        )
-        entries.append(entry)
+    workers = max(args.workers, 1)
+    chapter_timeout = args.chapter_timeout if args.chapter_timeout > 0 else None
+    total = len(chapter_pdfs)
+
+    # 每章跑在自己的 spawn process，逾時就終止
+    use_processes = workers > 1 or chapter_timeout is not None
+    semaphore = asyncio.Semaphore(workers)
+    entries_by_index: dict[int, RefreshEntry] = {}
+
+    async def run_chapter(index: int, pdf_path: Path) -> None:
+        async with semaphore:
+            print(f"[{index}/{total}] refresh figures {pdf_path.name}", flush=True)
+            try:
+                if use_processes:
+                    payload = await run_in_chapter_process(
+                        refresh_in_worker,
+                        (str(pdf_path), data_dir, args.etl_profile_json, args.skip_unchanged),
+                        timeout=chapter_timeout,
+                        initializer=init_refresh_worker,
+                        initargs=(data_dir, args.etl_profile_json),
+                    )
+                    entry = RefreshEntry(**payload)
+                else:
+                    entry = await refresh_one(
+                        pdf_path,
+                        data_dir=data_dir,
+                        etl_profile_json=args.etl_profile_json,
+                        skip_unchanged=args.skip_unchanged,
+                    )
+            except TimeoutError:
+                entry = RefreshEntry(
+                    filename=pdf_path.name,
+                    doc_id=build_doc_id_for_pdf(pdf_path),
+                    success=False,
+                    figure_count=0,
+                    error=f"timed out after {chapter_timeout:g}s",
+                )
+            except ChapterProcessError as exc:
+                entry = RefreshEntry(
+                    filename=pdf_path.name,
+                    doc_id=build_doc_id_for_pdf(pdf_path),
+                    success=False,
+                    figure_count=0,
+                    error=str(exc),
+                )
+            status = "skipped" if entry.skipped else ("ok" if entry.success else "failed")
+            print(
+                f"  -> [{index}/{total}] {status}: doc_id={entry.doc_id} "
+                f"figures={entry.figure_count} error={entry.error}",
+                flush=True,
+            )
+            entries_by_index[index] = entry
+
+    await asyncio.gather(*(run_chapter(index, pdf_path) for index, pdf_path in enumerate(chapter_pdfs, start=1)))
+
+    entries = [entries_by_index[index] for index in sorted(entries_by_index)]
 
     report = {
         "report_schema_version": 1,
@@ -248,6 +380,9 @@ async def main_async(args: argparse.Namespace) -> int:
         "chapter_dir": str(chapter_dir),
         "data_dir": str(data_dir),
         "etl_profile_json": str(args.etl_profile_json.resolve()) if args.etl_profile_json else "",
+        "skip_unchanged": args.skip_unchanged,
+        "workers": workers,
+        "chapter_timeout": args.chapter_timeout,
         "requested_match": args.match,
         "requested_limit": args.limit,
         "requested_start_chapter": args.start_chapter,
@@ -256,6 +391,7 @@ async def main_async(args: argparse.Namespace) -> int:
             "total": len(entries),
             "success": sum(1 for entry in entries if entry.success),
             "failed": sum(1 for entry in entries if not entry.success),
+            "skipped": sum(1 for entry in entries if entry.skipped),
             "figures": sum(entry.figure_count for entry in entries),
         },
         "entries": [asdict(entry) for entry in entries],
@@ -14,6 +14,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from src.application.services.telegram_admin_service import TelegramAdminBot
 from src.infrastructure.logging import bootstrap_logging
+from src.infrastructure.metrics import maybe_start_metrics_server
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,6 +26,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     bootstrap_logging("telegram-admin-bot")
+    maybe_start_metrics_server("bot")
     args = parse_args()
     bot = TelegramAdminBot.from_env()
     if not bot.config.is_configured:
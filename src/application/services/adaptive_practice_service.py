@@ -0,0 +1,205 @@
+"""Adaptive practice question selection from cached per-user statistics."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import TypeVar
+
+from src.domain.entities.practice import PracticeQuestionStat
+from src.domain.repositories.practice_attempt_repository import IPracticeAttemptRepository
+from src.infrastructure.logging import get_logger
+from src.infrastructure.persistence.read_model_versions import TableVersionTracker
+from src.infrastructure.persistence.sqlite_practice_attempt_repo import get_practice_attempt_repository
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+ADAPTIVE_SOURCE_TABLES = ("practice_attempts",)
+DEFAULT_SNAPSHOT_USERS = 16
+# 沒作答過的題目略高於中性值，讓新題與錯題一起出現
+UNSEEN_ITEM_NEED = 0.6
+UNSEEN_TOPIC_WEAKNESS = 0.5
+# 已答對且還沒到複習時間的題目大幅降權，但不排除（題庫太小時仍可補滿）
+NOT_DUE_FACTOR = 0.15
+OVERDUE_BOOST_CAP_DAYS = 14.0
+
+
+@dataclass(frozen=True, slots=True)
+class PracticeItemSnapshot:
+    """One user's item statistics, keyed for O(1) lookups during selection."""
+
+    user_id: str
+    items: dict[str, PracticeQuestionStat]
+    topic_weakness: dict[str, float]
+    built_at: datetime
+    version: int = 0
+
+    def item_weight(
+        self,
+        question_id: str,
+        topics: Iterable[str] = (),
+        now: datetime | None = None,
+        global_stat: PracticeQuestionStat | None = None,
+    ) -> float:
+        """Sampling weight: personal need × topic weakness × item difficulty × review timing.
+
+        ``global_stat`` carries fresher all-user counts than the snapshot when given.
+        """
+        stat = self.items.get(question_id)
+        topic_values = [self.topic_weakness.get(topic, UNSEEN_TOPIC_WEAKNESS) for topic in topics if topic]
+        topic_weakness = max(topic_values) if topic_values else UNSEEN_TOPIC_WEAKNESS
+        difficulty_source = global_stat or stat
+        difficulty = difficulty_source.item_difficulty if difficulty_source is not None else 0.5
+
+        if stat is None or stat.attempts == 0:
+            need = UNSEEN_ITEM_NEED
+            timing = 1.0
+        else:
+            need = 1.0 - (stat.correct + 1) / (stat.attempts + 2)
+            timing = _review_timing_factor(stat.next_review_at, now or self.built_at)
+
+        return (0.25 + need) * (0.5 + topic_weakness) * (0.75 + 0.5 * difficulty) * timing
+
+
+def _review_timing_factor(next_review_at: datetime | None, now: datetime) -> float:
+    if next_review_at is None:
+        return 1.0
+    overdue_days = (now - next_review_at).total_seconds() / 86400
+    if overdue_days < 0:
+        return NOT_DUE_FACTOR
+    return 1.0 + min(overdue_days, OVERDUE_BOOST_CAP_DAYS) / 7
+
+
+class AdaptivePracticeSelector:
+    """Pick the next K practice questions, favouring weak, overdue and unseen items."""
+
+    def __init__(
+        self,
+        repository: IPracticeAttemptRepository | None = None,
+        *,
+        rng: random.Random | None = None,
+        max_users: int = DEFAULT_SNAPSHOT_USERS,
+    ) -> None:
+        self.repository = repository or get_practice_attempt_repository()
+        self.rng = rng or random.Random()
+        self.max_users = max(int(max_users), 1)
+        self._snapshots: OrderedDict[str, PracticeItemSnapshot] = OrderedDict()
+        self._lock = Lock()
+        self._source_versions = TableVersionTracker(
+            tables=ADAPTIVE_SOURCE_TABLES,
+            db_path=getattr(self.repository, "db_path", None),
+        )
+
+    def snapshot(self, user_id: str) -> PracticeItemSnapshot:
+        # 任何程序寫入作答紀錄都會推進 table_versions；那時才比對使用者版本，只丟掉有變動的人
+        if self._source_versions.poll():
+            self._invalidate_changed_users()
+        with self._lock:
+            snapshot = self._snapshots.get(user_id)
+            if snapshot is not None:
+                self._snapshots.move_to_end(user_id)
+                return snapshot
+
+        snapshot = self._build_snapshot(user_id)
+        with self._lock:
+            self._snapshots[user_id] = snapshot
+            while len(self._snapshots) > self.max_users:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(user_id, None)
+
+    def _invalidate_changed_users(self) -> None:
+        with self._lock:
+            cached = {user_id: snapshot.version for user_id, snapshot in self._snapshots.items()}
+        if not cached:
+            return
+        current = self.repository.get_user_versions(list(cached))
+        changed = [user_id for user_id, version in cached.items() if current.get(user_id, 0) != version]
+        with self._lock:
+            for user_id in changed:
+                # 比對期間可能已被重建；只丟掉仍是舊版本的快照
+                snapshot = self._snapshots.get(user_id)
+                if snapshot is not None and snapshot.version == cached[user_id]:
+                    del self._snapshots[user_id]
+        if changed:
+            logger.debug("adaptive_practice_snapshots_invalidated", user_ids=changed)
+
+    def select(
+        self,
+        user_id: str,
+        candidates: Iterable[T],
+        k: int,
+        *,
+        key: Callable[[T], str],
+        topics: Callable[[T], Iterable[str]] = lambda _candidate: (),
+        now: datetime | None = None,
+    ) -> list[T]:
+        """Weighted sample of ``k`` candidates without replacement, highest priority first."""
+        if k <= 0:
+            return []
+        snapshot = self.snapshot(user_id)
+        now = now or datetime.now()
+        candidates = list(candidates)
+        candidate_ids = [key(candidate) for candidate in candidates]
+        global_stats = self.repository.load_item_difficulty(list(dict.fromkeys(candidate_ids)))
+        keyed: list[tuple[float, int, T]] = []
+        for position, (candidate, question_id) in enumerate(zip(candidates, candidate_ids, strict=True)):
+            weight = snapshot.item_weight(question_id, topics(candidate), now, global_stats.get(question_id))
+            # 1 - random() 落在 (0, 1]，log 版本的 u ** (1 / w) 不會下溢
+            keyed.append((math.log(1.0 - self.rng.random()) / weight, position, candidate))
+        picked = heapq.nlargest(k, keyed, key=lambda item: (item[0], -item[1]))
+        logger.debug(
+            "adaptive_practice_selected",
+            user_id=user_id,
+            candidate_count=len(keyed),
+            selected_count=len(picked),
+            known_items=len(snapshot.items),
+        )
+        return [candidate for _key, _position, candidate in picked]
+
+    def _build_snapshot(self, user_id: str) -> PracticeItemSnapshot:
+        # 先讀版本再讀統計：中間有新作答時，下次比對一定會發現版本不同
+        version = self.repository.get_user_versions([user_id]).get(user_id, 0)
+        items = self.repository.load_item_statistics(user_id)
+        topic_weakness = {
+            mastery.label: 1.0 - (mastery.correct + 1) / (mastery.attempts + 2)
+            for mastery in self.repository.list_mastery(user_id, dimension="topic")
+        }
+        logger.info(
+            "adaptive_practice_snapshot_built",
+            user_id=user_id,
+            item_count=len(items),
+            topic_count=len(topic_weakness),
+        )
+        return PracticeItemSnapshot(
+            user_id=user_id,
+            items=items,
+            topic_weakness=topic_weakness,
+            built_at=datetime.now(),
+            version=version,
+        )
+
+
+_selector: AdaptivePracticeSelector | None = None
+
+
+def get_adaptive_practice_selector() -> AdaptivePracticeSelector:
+    """Return the process-wide selector so snapshots are shared across requests."""
+    global _selector
+    if _selector is None:
+        _selector = AdaptivePracticeSelector()
+    return _selector
@@ -0,0 +1,193 @@
+"""Process-wide LRU cache for parsed asset-aware documents."""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+from src.infrastructure.logging import get_logger
+
+if TYPE_CHECKING:
+    from src.application.services.past_exam_extraction_service import AssetAwareDocument
+
+logger = get_logger(__name__)
+
+ASSET_DOCUMENT_CACHE_MAX_BYTES_ENV_VAR = "EXAM_ASSET_DOCUMENT_CACHE_MAX_BYTES"
+DEFAULT_ASSET_DOCUMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+PAGE_MARKER_COMMENT_RE = re.compile(r"<!--\s*Page\s+\d+\s*-->")
+
+FileSignature = tuple[int, int, int, int]
+
+
+def clean_markdown_excerpt(markdown: str) -> str:
+    """Drop page markers and blank lines from a markdown excerpt."""
+    without_page_markers = PAGE_MARKER_COMMENT_RE.sub(" ", markdown)
+    lines = [line.strip() for line in without_page_markers.splitlines() if line.strip()]
+    return "\n".join(lines)
+
+
+def parse_markdown_sections(markdown: str) -> list[dict[str, Any]]:
+    """
+    Split markdown into heading sections in one linear pass.
+
+    Each section body runs until the next heading of the same or a higher
+    level, so parent sections include their children. Open headings are kept
+    on a stack and closed when a heading at that level or above appears.
+    """
+    lines = markdown.splitlines()
+    headings: list[tuple[int, int, str]] = []
+    end_by_heading: list[int] = []
+    open_stack: list[int] = []
+
+    for index, line in enumerate(lines):
+        match = HEADING_RE.match(line.strip())
+        if not match:
+            continue
+        level = len(match.group(1))
+        while open_stack and headings[open_stack[-1]][1] >= level:
+            end_by_heading[open_stack.pop()] = index
+        headings.append((index, level, re.sub(r"\*+", "", match.group(2)).strip()))
+        end_by_heading.append(len(lines))
+        open_stack.append(len(headings) - 1)
+
+    return [
+        {
+            "title": title,
+            "level": level,
+            "body": clean_markdown_excerpt("\n".join(lines[start + 1 : end_by_heading[position]]).strip()),
+        }
+        for position, (start, level, title) in enumerate(headings)
+    ]
+
+
+@dataclass(slots=True)
+class MarkdownSectionIndex:
+    """Parsed sections plus a normalized-title dictionary for O(1) exact lookups."""
+
+    sections: list[dict[str, Any]]
+    normalize: Callable[[str], str]
+    by_title: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for section in self.sections:
+            self.by_title.setdefault(self.normalize(section.get("title", "")), section)
+
+    def find(self, title: str) -> dict[str, Any] | None:
+        """Exact normalized title first, then the first substring match in document order."""
+        normalized_title = self.normalize(title)
+        exact = self.by_title.get(normalized_title)
+        if exact is not None:
+            return exact
+        for candidate, section in self.by_title.items():
+            if normalized_title in candidate or candidate in normalized_title:
+                return section
+        return None
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    signature: FileSignature
+    document: AssetAwareDocument
+    size_bytes: int
+    section_index: MarkdownSectionIndex | None = None
+
+
+class AssetDocumentCache:
+    """Byte-bounded LRU of decoded asset-aware documents keyed by file signatures."""
+
+    def __init__(self, max_bytes: int = DEFAULT_ASSET_DOCUMENT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max(int(max_bytes), 0)
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, signature: FileSignature) -> AssetAwareDocument | None:
+        """Return the cached document when its files have not changed since it was stored."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.signature != signature:
+                self._drop_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.document
+
+    def put(self, key: str, signature: FileSignature, document: AssetAwareDocument, size_bytes: int) -> None:
+        """Store a freshly loaded document; documents larger than the whole budget are not cached."""
+        if size_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = _CacheEntry(signature=signature, document=document, size_bytes=size_bytes)
+            self._total_bytes += size_bytes
+            while self._total_bytes > self.max_bytes and self._entries:
+                evicted_key = next(iter(self._entries))
+                self._drop_locked(evicted_key)
+                logger.debug("asset_document_cache_evicted", key=evicted_key, total_bytes=self._total_bytes)
+
+    def section_index(
+        self,
+        document: AssetAwareDocument,
+        normalize: Callable[[str], str],
+    ) -> MarkdownSectionIndex:
+        """Return the memoized section index for ``document``, building it on first use."""
+        with self._lock:
+            entry = next(
+                (candidate for candidate in self._entries.values() if candidate.document is document),
+                None,
+            )
+            if entry is not None and entry.section_index is not None:
+                return entry.section_index
+
+        index = MarkdownSectionIndex(sections=parse_markdown_sections(document.markdown), normalize=normalize)
+        if entry is not None:
+            with self._lock:
+                entry.section_index = index
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size_bytes
+
+
+def _resolve_max_bytes() -> int:
+    value = os.getenv(ASSET_DOCUMENT_CACHE_MAX_BYTES_ENV_VAR)
+    if value is None:
+        return DEFAULT_ASSET_DOCUMENT_CACHE_MAX_BYTES
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return DEFAULT_ASSET_DOCUMENT_CACHE_MAX_BYTES
+
+
+_cache: AssetDocumentCache | None = None
+
+
+def get_asset_document_cache() -> AssetDocumentCache:
+    """Return the process-wide asset document cache shared by all loaders."""
+    global _cache
+    if _cache is None:
+        _cache = AssetDocumentCache(max_bytes=_resolve_max_bytes())
+    return _cache
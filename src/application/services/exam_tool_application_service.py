@@ -5,23 +5,39 @@ from __future__ import annotations
 import json
 import random
 import uuid
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from src.domain.entities.question import Difficulty, Question, QuestionType, Source, SourceLocation
-from src.domain.value_objects.audit import ActorType
+from src.domain.entities.exam import BlueprintQuota, ExamCatalogEntry
+from src.domain.entities.question import Difficulty, ExamTrack, Question, QuestionType, Source, SourceLocation
 from src.domain.value_objects.answer import coerce_question_type, normalize_answer_letters, question_allows_multiple
+from src.domain.value_objects.audit import ActorType
+
+# 依作答紀錄選題時，每格先抽的候選倍數（抽樣成本與題數成正比，不掃整個題庫）
+ADAPTIVE_CANDIDATE_FACTOR = 4
 
 
 class ExamToolApplicationService:
     """Handle question-bank oriented MCP tool operations outside the server bootstrap."""
 
-    def __init__(self, *, repo, project_root: Path, exams_dir: Path, questions_dir: Path):
+    def __init__(
+        self,
+        *,
+        repo,
+        project_root: Path,
+        exams_dir: Path,
+        questions_dir: Path,
+        exam_catalog=None,
+        practice_selector=None,
+    ):
         self.repo = repo
         self.project_root = project_root
         self.exams_dir = exams_dir
         self.questions_dir = questions_dir
+        self.exam_catalog = exam_catalog
+        self.practice_selector = practice_selector
 
     @staticmethod
     def _coerce_int(value: Any, *, default: int, min_value: int | None = None, max_value: int | None = None) -> int:
@@ -266,49 +282,111 @@ class ExamToolApplicationService:
     def create_exam(self, args: dict) -> dict:
         args = args or {}
         exam_name = self._coerce_str(args.get("name"), default="新考卷")
-        question_count = self._coerce_int(args.get("question_count"), default=10, min_value=1)
-        topic_filter = args.get("topics", [])
-        if not isinstance(topic_filter, list):
-            topic_filter = []
+        topic_filter = self._coerce_topic_list(args.get("topics"))
+        validated_only = bool(args.get("validated_only", False))
 
-        if not self.questions_dir.exists():
-            return {"success": False, "error": f"題庫目錄不存在：{self.questions_dir}"}
-
-        all_questions = []
-        for filepath in self.questions_dir.glob("*.json"):
-            try:
-                with open(filepath, "r", encoding="utf-8") as file_handle:
-                    question = json.load(file_handle)
-            except (json.JSONDecodeError, OSError):
-                continue
-
-            if topic_filter and not any(topic in question.get("topics", []) for topic in topic_filter):
-                continue
-            all_questions.append(question)
+        exam_track_value = self._coerce_str(args.get("exam_track"))
+        try:
+            exam_track = ExamTrack(exam_track_value.lower()) if exam_track_value else None
+        except ValueError:
+            return {"success": False, "error": f"未知的 exam_track：{exam_track_value}"}
 
-        if not all_questions:
+        if args.get("blueprint"):
+            quotas, error = self._coerce_blueprint(args.get("blueprint"))
+            if error:
+                return {"success": False, "error": error}
+            question_count = sum(quota.count for quota in quotas)
+        else:
+            question_count = self._coerce_int(args.get("question_count"), default=10, min_value=1)
+            difficulty_value = self._coerce_str(args.get("difficulty"))
+            difficulty = None
+            if difficulty_value:
+                try:
+                    difficulty = Difficulty(difficulty_value.lower())
+                except ValueError:
+                    return {"success": False, "error": f"難度無效：{difficulty_value}"}
+            quotas = self._split_quota_by_topics(question_count, topic_filter, difficulty)
+
+        adaptive_user_id = self._coerce_str(args.get("adaptive_user_id"))
+        if adaptive_user_id and self.practice_selector is None:
+            return {"success": False, "error": "此伺服器未啟用依作答紀錄選題（adaptive_user_id）"}
+
+        rng = random.Random()
+        if adaptive_user_id:
+            cells = self._sample_adaptive_cells(
+                quotas,
+                adaptive_user_id,
+                exam_track=exam_track,
+                validated_only=validated_only,
+                rng=rng,
+            )
+        else:
+            cells = self.repo.sample_by_blueprint(
+                quotas,
+                exam_track=exam_track,
+                validated_only=validated_only,
+                rng=rng,
+            )
+        selected = [question for cell in cells for question in cell]
+        if not args.get("blueprint") and topic_filter and len(selected) < question_count:
+            # 各知識點平均分配後仍不足時，從其他指定知識點補題
+            top_up = self.repo.sample_by_blueprint(
+                [
+                    BlueprintQuota(count=question_count - len(selected), topic=quota.topic, difficulty=quota.difficulty)
+                    for quota in quotas
+                ],
+                exam_track=exam_track,
+                validated_only=validated_only,
+                exclude_ids={question.id for question in selected},
+                rng=rng,
+            )
+            for question in (question for cell in top_up for question in cell):
+                if len(selected) >= question_count:
+                    break
+                selected.append(question)
+        # 各格內已打散，再跨格打散，避免考卷依藍圖順序成段出現同一知識點
+        rng.shuffle(selected)
+
+        if not selected:
             return {
                 "success": False,
                 "error": "題庫中無可用題目，請先寫入題目後再建立考卷。",
             }
 
-        selected = random.sample(all_questions, min(len(all_questions), question_count))
         exam_id = str(uuid.uuid4())[:8]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        exam_data = {
+        blueprint_report = [
+            {
+                "topic": quota.topic,
+                "difficulty": quota.difficulty.value if quota.difficulty else None,
+                "requested": quota.count,
+                "selected": len(cell),
+            }
+            for quota, cell in zip(quotas, cells, strict=True)
+        ]
+        exam_header = {
             "id": exam_id,
             "name": exam_name,
-            "questions": selected,
             "question_count": len(selected),
             "requested_question_count": question_count,
-            "available_question_count": len(all_questions),
+            "blueprint": blueprint_report if args.get("blueprint") else [],
             "created_at": datetime.now().isoformat(),
         }
 
         filepath = self.exams_dir / f"exam_{timestamp}_{exam_id}.json"
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as file_handle:
-            json.dump(exam_data, file_handle, ensure_ascii=False, indent=2)
+        self._write_exam_file(filepath, exam_header, (question.to_dict() for question in selected))
+        if self.exam_catalog is not None:
+            self.exam_catalog.save(
+                ExamCatalogEntry(
+                    id=exam_id,
+                    name=exam_name,
+                    question_count=len(selected),
+                    file_path=str(filepath.resolve()),
+                    created_at=datetime.fromisoformat(exam_header["created_at"]),
+                    requested_question_count=question_count,
+                    question_ids=[question.id for question in selected],
+                )
+            )
 
         return {
             "success": True,
@@ -316,14 +394,114 @@ class ExamToolApplicationService:
             "name": exam_name,
             "question_count": len(selected),
             "requested_question_count": question_count,
+            "shortfalls": [cell for cell in blueprint_report if cell["selected"] < cell["requested"]]
+            if args.get("blueprint")
+            else [],
             "saved_to": str(filepath.relative_to(self.project_root)),
+            "adaptive_user_id": adaptive_user_id or None,
         }
 
+    def _sample_adaptive_cells(
+        self,
+        quotas: list[BlueprintQuota],
+        user_id: str,
+        *,
+        exam_track: ExamTrack | None,
+        validated_only: bool,
+        rng: random.Random,
+    ) -> list[list[Question]]:
+        """每格先隨機取 ADAPTIVE_CANDIDATE_FACTOR 倍候選，再依作答紀錄加權挑出該格題數。"""
+        candidate_cells = self.repo.sample_by_blueprint(
+            [
+                BlueprintQuota(
+                    count=quota.count * ADAPTIVE_CANDIDATE_FACTOR,
+                    topic=quota.topic,
+                    difficulty=quota.difficulty,
+                )
+                for quota in quotas
+            ],
+            exam_track=exam_track,
+            validated_only=validated_only,
+            rng=rng,
+        )
+        return [
+            self.practice_selector.select(
+                user_id,
+                candidates,
+                quota.count,
+                key=lambda question: question.id,
+                topics=lambda question: question.topics,
+            )
+            for quota, candidates in zip(quotas, candidate_cells, strict=True)
+        ]
+
+    def _coerce_blueprint(self, value: Any) -> tuple[list[BlueprintQuota], str]:
+        if not isinstance(value, list):
+            return [], "blueprint 必須是陣列"
+        quotas: list[BlueprintQuota] = []
+        for position, cell in enumerate(value, start=1):
+            if not isinstance(cell, dict):
+                return [], f"blueprint 第 {position} 格格式錯誤"
+            count = self._coerce_int(cell.get("count"), default=0, min_value=1)
+            if count <= 0:
+                return [], f"blueprint 第 {position} 格的 count 必須為正整數"
+            difficulty_value = self._coerce_str(cell.get("difficulty"))
+            difficulty = None
+            if difficulty_value:
+                try:
+                    difficulty = Difficulty(difficulty_value.lower())
+                except ValueError:
+                    return [], f"blueprint 第 {position} 格的難度無效：{difficulty_value}"
+            topic = self._coerce_str(cell.get("topic")) or None
+            quotas.append(BlueprintQuota(count=count, topic=topic, difficulty=difficulty))
+        if not quotas:
+            return [], "blueprint 不可為空"
+        return quotas, ""
+
+    @staticmethod
+    def _split_quota_by_topics(
+        question_count: int,
+        topics: list[str],
+        difficulty: Difficulty | None,
+    ) -> list[BlueprintQuota]:
+        """沒有藍圖時，把題數平均分給指定的知識點（未指定則整個題庫一格）"""
+        if not topics:
+            return [BlueprintQuota(count=question_count, difficulty=difficulty)]
+        base, remainder = divmod(question_count, len(topics))
+        return [
+            BlueprintQuota(count=base + (1 if position < remainder else 0), topic=topic, difficulty=difficulty)
+            for position, topic in enumerate(topics)
+        ]
+
+    @staticmethod
+    def _write_exam_file(filepath: Path, header: dict, questions: Iterator[dict]) -> None:
+        """逐題寫入考卷 JSON（先寫暫存檔再 rename），不需先組出整份文件"""
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_name(f".{filepath.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file_handle:
+            file_handle.write("{\n")
+            for key, value in header.items():
+                file_handle.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            file_handle.write('  "questions": [')
+            for position, question in enumerate(questions):
+                file_handle.write(",\n    " if position else "\n    ")
+                file_handle.write(json.dumps(question, ensure_ascii=False))
+            file_handle.write("\n  ]\n}\n")
+        tmp_path.replace(filepath)
+
     def get_stats(self, _args: dict | None = None) -> dict:
-        stats = self.repo.get_statistics()
+        content_stats_reader = getattr(self.repo, "get_content_statistics", None)
+        if self.exam_catalog is not None and content_stats_reader is not None:
+            self.exam_catalog.ensure_backfilled(self.exams_dir)
+            content_stats = content_stats_reader()
+            stats = content_stats["questions"]
+            exam_count = content_stats["generated_exam_count"]
+        else:
+            stats = self.repo.get_statistics()
+            exam_count = self._exam_count()
         return {
             "question_count": stats.get("total", 0),
-            "exam_count": len(list(self.exams_dir.glob("*.json"))) if self.exams_dir.exists() else 0,
+            "exam_count": exam_count,
             "difficulty_distribution": stats.get("by_difficulty", {}),
             "topic_distribution": stats.get("by_topic", {}),
             "validated_count": stats.get("validated", 0),
@@ -331,6 +509,12 @@ class ExamToolApplicationService:
             "recent_7_days": stats.get("recent_7_days", 0),
         }
 
+    def _exam_count(self) -> int:
+        if self.exam_catalog is None:
+            return len(list(self.exams_dir.glob("*.json"))) if self.exams_dir.exists() else 0
+        self.exam_catalog.ensure_backfilled(self.exams_dir)
+        return self.exam_catalog.count()
+
     def get_question(self, args: dict) -> dict:
         question_id = args.get("question_id", "")
         question = self.repo.get_by_id(question_id)
@@ -15,6 +15,7 @@ from src.application.services.textbook_generation_service import TextbookGenerat
 from src.infrastructure.agent import collect_opencode_available_models
 from src.infrastructure.agent.provider import extract_chat_completion_text, extract_responses_api_text
 from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics import LLM_CALL_SECONDS
 from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
 from src.infrastructure.persistence.sqlite_question_repo import get_question_repository
 
@@ -273,11 +274,10 @@ class PastExamExplanationService:
         catalog: list[dict[str, Any]] = []
         for doc_id in candidate_doc_ids:
             try:
+                # title / filename 來自 readiness sidecar，不必為了目錄讀整份 markdown
                 readiness = self.textbook_generation_service.assess_document_source_readiness(doc_id)
                 if not readiness.get("source_ready"):
                     continue
-
-                document = self.textbook_generation_service.asset_loader.load_asset_document(doc_id)
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
                     "past_exam_textbook_catalog_doc_skipped",
@@ -286,14 +286,15 @@ class PastExamExplanationService:
                 )
                 continue
 
-            filename = str(document.manifest.get("filename") or "")
-            if not self._looks_like_textbook_document(document.title, filename):
+            title = str(readiness.get("title") or doc_id)
+            filename = str(readiness.get("filename") or "")
+            if not self._looks_like_textbook_document(title, filename):
                 continue
 
             catalog.append(
                 {
                     "doc_id": doc_id,
-                    "title": document.title,
+                    "title": title,
                     "filename": filename,
                     "readiness": readiness,
                 }
@@ -638,12 +639,14 @@ class PastExamExplanationService:
     def _invoke_llm(self, prompt: str, *, provider=None) -> str:
         if provider is not None:
             try:
-                return provider.run(prompt)
+                with LLM_CALL_SECONDS.time(caller="past_exam_explanation", backend="agent", outcome="ok"):
+                    return provider.run(prompt)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("past_exam_explanation_provider_fallback", error=str(exc))
 
         llm_config = self.resolve_direct_llm_config()
-        return self._call_openai_compatible_completion(prompt, llm_config)
+        with LLM_CALL_SECONDS.time(caller="past_exam_explanation", backend="direct", outcome="ok"):
+            return self._call_openai_compatible_completion(prompt, llm_config)
 
     def _call_openai_compatible_completion(self, prompt: str, llm_config: dict[str, Any]) -> str:
         headers = {
@@ -19,6 +19,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from src.application.services.asset_document_cache import AssetDocumentCache, get_asset_document_cache
 from src.domain.entities.past_exam import Concept, PastExam, PastExamQuestion, QuestionPattern
 from src.domain.repositories.past_exam_repository import IPastExamRepository
 from src.infrastructure.logging import get_logger
@@ -257,8 +258,9 @@ def _clean_inline_text(value: str) -> str:
 class PastExamExtractionService:
     """Parse asset-aware markdown into past-exam artifacts."""
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, document_cache: AssetDocumentCache | None = None):
         self.data_dir = data_dir
+        self.document_cache = document_cache if document_cache is not None else get_asset_document_cache()
 
     def run_end_to_end(
         self,
@@ -325,6 +327,20 @@ class PastExamExtractionService:
             log.error("asset_markdown_missing", markdown_path=str(markdown_path))
             raise FileNotFoundError(f"找不到 markdown: {markdown_path}")
 
+        manifest_stat = manifest_path.stat()
+        markdown_stat = markdown_path.stat()
+        cache_key = str(doc_dir.resolve())
+        signature = (
+            manifest_stat.st_mtime_ns,
+            manifest_stat.st_size,
+            markdown_stat.st_mtime_ns,
+            markdown_stat.st_size,
+        )
+        cached = self.document_cache.get(cache_key, signature)
+        if cached is not None:
+            log.debug("asset_document_cache_hit", markdown_path=str(markdown_path))
+            return cached
+
         manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
         markdown = markdown_path.read_text(encoding="utf-8")
         document = AssetAwareDocument(
@@ -340,6 +356,7 @@ class PastExamExtractionService:
             markdown_chars=len(markdown),
             markdown_path=str(markdown_path),
         )
+        self.document_cache.put(cache_key, signature, document, manifest_stat.st_size + markdown_stat.st_size)
         return document
 
     def extract_questions(
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import re
 import subprocess
+from collections.abc import Iterable
 from pathlib import Path
 
 from src.infrastructure.logging import get_logger
@@ -22,6 +23,7 @@ class PastExamFigureService:
     def __init__(self, data_dir: Path | None = None):
         self.data_dir = data_dir or DEFAULT_DATA_DIR
         self._manifest_cache: dict[str, dict | None] = {}
+        self._page_figure_cache: dict[str, dict[int, list[dict]]] = {}
 
     def enrich_question(self, question: dict) -> dict:
         """Return a question dict annotated with figure assets when available."""
@@ -31,6 +33,28 @@ class PastExamFigureService:
             enriched.update(asset_payload)
         return enriched
 
+    def enrich_questions(self, questions: Iterable[dict]) -> list[dict]:
+        """
+        Enrich a whole practice pool.
+
+        Text-only rows are passed through untouched; only image-based rows
+        resolve assets, and each document's manifest is indexed by page once.
+        """
+        enriched_questions: list[dict] = []
+        image_question_count = 0
+        for question in questions:
+            if not self._should_resolve_assets(question):
+                enriched_questions.append(question)
+                continue
+            image_question_count += 1
+            enriched_questions.append(self.enrich_question(question))
+        logger.debug(
+            "past_exam_figures_batch_enriched",
+            question_count=len(enriched_questions),
+            image_question_count=image_question_count,
+        )
+        return enriched_questions
+
     def resolve_question_assets(self, question: dict) -> dict:
         """Resolve option figures / page figures / page preview for a past-exam question."""
         if not self._should_resolve_assets(question):
@@ -80,34 +104,40 @@ class PastExamFigureService:
         return bool(self._placeholder_option_labels(options))
 
     def _load_page_figures(self, doc_id: str, source_page: int) -> list[dict]:
-        manifest = self._load_manifest(doc_id)
-        if manifest is None:
-            return []
-
-        doc_dir = self.data_dir / doc_id
-        raw_figures = (((manifest.get("assets") or {}).get("figures")) or [])
-        figures: list[dict] = []
-        for raw_figure in raw_figures:
-            if int(raw_figure.get("page") or 0) != source_page:
-                continue
-
-            resolved_path = self._resolve_figure_path(doc_dir, raw_figure)
-            if resolved_path is None:
-                continue
+        return [dict(figure) for figure in self._page_figure_index(doc_id).get(source_page, [])]
 
-            figure_id = str(raw_figure.get("id") or resolved_path.stem)
-            figures.append(
-                {
-                    "id": figure_id,
-                    "page": source_page,
-                    "path": str(resolved_path),
-                    "caption": str(raw_figure.get("caption") or "").strip(),
-                    "path_name": resolved_path.name,
-                    "local_index": self._figure_local_index(figure_id, resolved_path.stem),
-                }
-            )
+    def _page_figure_index(self, doc_id: str) -> dict[int, list[dict]]:
+        """Group a document's manifest figures by page once, instead of rescanning per question."""
+        if doc_id in self._page_figure_cache:
+            return self._page_figure_cache[doc_id]
 
-        return sorted(figures, key=lambda item: (item["local_index"], item["path_name"]))
+        manifest = self._load_manifest(doc_id)
+        by_page: dict[int, list[dict]] = {}
+        if manifest is not None:
+            doc_dir = self.data_dir / doc_id
+            raw_figures = (((manifest.get("assets") or {}).get("figures")) or [])
+            for raw_figure in raw_figures:
+                page = int(raw_figure.get("page") or 0)
+                resolved_path = self._resolve_figure_path(doc_dir, raw_figure)
+                if resolved_path is None:
+                    continue
+
+                figure_id = str(raw_figure.get("id") or resolved_path.stem)
+                by_page.setdefault(page, []).append(
+                    {
+                        "id": figure_id,
+                        "page": page,
+                        "path": str(resolved_path),
+                        "caption": str(raw_figure.get("caption") or "").strip(),
+                        "path_name": resolved_path.name,
+                        "local_index": self._figure_local_index(figure_id, resolved_path.stem),
+                    }
+                )
+            for figures in by_page.values():
+                figures.sort(key=lambda item: (item["local_index"], item["path_name"]))
+
+        self._page_figure_cache[doc_id] = by_page
+        return by_page
 
     def _load_manifest(self, doc_id: str) -> dict | None:
         if doc_id in self._manifest_cache:
@@ -0,0 +1,230 @@
+"""Array-backed scoring and breakdowns for submitted practice sessions."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+UNLABELED_GROUP = "未標記"
+UNLABELED_TOPIC = "未標記主題"
+DEFAULT_SCORECARD_CACHE_ENTRIES = 32
+WEAK_TOPIC_LIMIT = 8
+
+# (代碼陣列, 各組顯示值——沿用第一個原始值，空值為 UNLABELED_GROUP)
+GroupEncoding = tuple[np.ndarray, tuple[Any, ...]]
+
+
+def _encode_groups(values: Sequence[Any]) -> GroupEncoding:
+    """Map raw group values to dense codes in first-seen order, grouping by their string form."""
+    code_by_key: dict[str, int] = {}
+    labels: list[Any] = []
+    codes = np.empty(len(values), dtype=np.int32)
+    for index, raw_value in enumerate(values):
+        label = raw_value if raw_value not in (None, "", []) else UNLABELED_GROUP
+        key = str(label)
+        code = code_by_key.get(key)
+        if code is None:
+            code = code_by_key[key] = len(labels)
+            labels.append(label)
+        codes[index] = code
+    return codes, tuple(labels)
+
+
+def _clean_topics(raw_topics: Any) -> list[str]:
+    topics = [str(topic).strip() for topic in (raw_topics or []) if str(topic).strip()]
+    return topics or [UNLABELED_TOPIC]
+
+
+@dataclass(slots=True)
+class PracticeScorecard:
+    """Graded practice session stored as parallel NumPy arrays."""
+
+    answered: np.ndarray
+    correct: np.ndarray
+    user_answers: tuple[str, ...]
+    correct_answers: tuple[str, ...]
+    topic_rows: np.ndarray
+    topic_codes: np.ndarray
+    topic_labels: tuple[str, ...]
+    group_values: dict[str, Sequence[Any]] = field(default_factory=dict)
+    column_source: Callable[[str], Sequence[Any]] | None = None
+    _group_encodings: dict[str, GroupEncoding] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        answered: Sequence[bool],
+        correct: Sequence[bool],
+        topics: Sequence[Any],
+        groups: Mapping[str, Sequence[Any]],
+        user_answers: Sequence[str] = (),
+        correct_answers: Sequence[str] = (),
+    ) -> PracticeScorecard:
+        size = len(answered)
+        topic_rows: list[int] = []
+        topic_values: list[str] = []
+        for index, raw_topics in enumerate(topics):
+            for topic in _clean_topics(raw_topics):
+                topic_rows.append(index)
+                topic_values.append(topic)
+        topic_codes, topic_labels = _encode_groups(topic_values)
+
+        scorecard = cls(
+            answered=np.fromiter(answered, dtype=bool, count=size),
+            correct=np.fromiter(correct, dtype=bool, count=size),
+            user_answers=tuple(user_answers) or ("",) * size,
+            correct_answers=tuple(correct_answers) or ("",) * size,
+            topic_rows=np.asarray(topic_rows, dtype=np.int32),
+            topic_codes=topic_codes,
+            topic_labels=topic_labels,
+            group_values=dict(groups),
+        )
+        for group_key in groups:
+            scorecard._encoding(group_key)
+        return scorecard
+
+    @classmethod
+    def from_result_rows(cls, result_rows: Sequence[Mapping[str, Any]]) -> PracticeScorecard:
+        """Build a scorecard from already formatted result rows (group fields are encoded lazily)."""
+        rows = list(result_rows)
+        scorecard = cls.build(
+            answered=[bool(row.get("is_answered")) for row in rows],
+            correct=[bool(row.get("is_correct")) for row in rows],
+            topics=[row.get("topics", []) for row in rows],
+            groups={},
+        )
+        scorecard.column_source = lambda group_key: [row.get(group_key) for row in rows]
+        return scorecard
+
+    def __len__(self) -> int:
+        return int(self.answered.size)
+
+    def summary(self) -> dict[str, Any]:
+        total_questions = len(self)
+        correct_count = int(np.count_nonzero(self.correct))
+        answered_count = int(np.count_nonzero(self.answered))
+        return {
+            "correct_count": correct_count,
+            "answered_count": answered_count,
+            "incorrect_count": answered_count - correct_count,
+            "unanswered_count": total_questions - answered_count,
+            "total_questions": total_questions,
+            "score": (correct_count / total_questions * 100) if total_questions else 0.0,
+            "answered_accuracy": (correct_count / answered_count * 100) if answered_count else 0.0,
+        }
+
+    def breakdown_rows(self, group_key: str, label: str, numeric_sort_desc: bool = False) -> list[dict]:
+        """Dataframe-friendly correct / wrong / unanswered counts per group."""
+        codes, labels = self._encoding(group_key)
+        group_count = len(labels)
+        totals = np.bincount(codes, minlength=group_count)
+        correct = np.bincount(codes[self.correct], minlength=group_count)
+        wrong = np.bincount(codes[self.answered & ~self.correct], minlength=group_count)
+        unanswered = totals - correct - wrong
+
+        table_rows = [
+            {
+                label: group_label,
+                "題數": int(totals[code]),
+                "答對": int(correct[code]),
+                "答錯": int(wrong[code]),
+                "未作答": int(unanswered[code]),
+                "正確率": f"{(correct[code] / totals[code] * 100) if totals[code] else 0.0:.1f}%",
+            }
+            for code, group_label in enumerate(labels)
+        ]
+        if numeric_sort_desc:
+            order = sorted(
+                range(group_count),
+                key=lambda code: labels[code] if isinstance(labels[code], (int, float)) else -1,
+                reverse=True,
+            )
+        else:
+            order = sorted(range(group_count), key=lambda code: str(labels[code]))
+        return [table_rows[code] for code in order]
+
+    def weak_topic_rows(self, limit: int = WEAK_TOPIC_LIMIT) -> list[dict]:
+        """Topics of wrong or unanswered questions, most frequent first (ties keep first-seen order)."""
+        missed_codes = self.topic_codes[~self.correct[self.topic_rows]]
+        if missed_codes.size == 0:
+            return []
+        counts = np.bincount(missed_codes, minlength=len(self.topic_labels))
+        present, first_seen = np.unique(missed_codes, return_index=True)
+        ranked = sorted(zip(present.tolist(), first_seen.tolist()), key=lambda item: (-counts[item[0]], item[1]))
+        return [
+            {"主題": self.topic_labels[code], "錯題/未作答": int(counts[code])}
+            for code, _first_seen in ranked[:limit]
+        ]
+
+    def _encoding(self, group_key: str) -> GroupEncoding:
+        encoding = self._group_encodings.get(group_key)
+        if encoding is None:
+            values = self.group_values.get(group_key)
+            if values is None:
+                if self.column_source is None:
+                    raise KeyError(group_key)
+                values = self.column_source(group_key)
+            encoding = self._group_encodings[group_key] = _encode_groups(values)
+        return encoding
+
+
+def practice_session_fingerprint(entries: Iterable[Sequence[Any]]) -> str:
+    """Hash the per-question grading inputs (key, answers, grouping fields) of a practice session."""
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        digest.update(repr(tuple(entry)).encode("utf-8", "surrogatepass"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class PracticeScorecardCache:
+    """Small LRU of scorecards keyed by ``practice_session_fingerprint``."""
+
+    def __init__(self, max_entries: int = DEFAULT_SCORECARD_CACHE_ENTRIES) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self._entries: OrderedDict[str, PracticeScorecard] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> PracticeScorecard | None:
+        with self._lock:
+            scorecard = self._entries.get(fingerprint)
+            if scorecard is not None:
+                self._entries.move_to_end(fingerprint)
+            return scorecard
+
+    def put(self, fingerprint: str, scorecard: PracticeScorecard) -> None:
+        with self._lock:
+            self._entries[fingerprint] = scorecard
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug("practice_scorecard_cached", question_count=len(scorecard), cached_sessions=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: PracticeScorecardCache | None = None
+
+
+def get_practice_scorecard_cache() -> PracticeScorecardCache:
+    """Return the process-wide scorecard cache shared by Streamlit sessions."""
+    global _cache
+    if _cache is None:
+        _cache = PracticeScorecardCache()
+    return _cache
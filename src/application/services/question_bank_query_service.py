@@ -7,6 +7,8 @@ from pathlib import Path
 
 from src.domain.entities.question import ExamTrack
 from src.infrastructure.logging import get_logger
+from src.infrastructure.persistence.read_model_versions import get_read_model_cache
+from src.infrastructure.persistence.sqlite_exam_catalog_repo import get_exam_catalog_repository
 from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
 from src.infrastructure.persistence.sqlite_question_repo import get_question_repository
 
@@ -21,21 +23,23 @@ class QuestionBankQueryService:
     def __init__(self, exams_dir: Path | None = None):
         self.question_repo = get_question_repository()
         self.past_exam_repo = get_past_exam_repository()
+        self.exam_catalog = get_exam_catalog_repository()
         self.exams_dir = exams_dir or EXAMS_DIR
 
     def get_content_stats(self) -> dict:
-        """Return combined stats for general bank, past exams, and generated exam files."""
-        self.exams_dir.mkdir(parents=True, exist_ok=True)
+        """Return combined stats for general bank, past exams, and the generated exam catalog."""
+        self.exam_catalog.ensure_backfilled(self.exams_dir)
 
-        question_stats = self.question_repo.get_statistics()
-        past_exam_stats = self.past_exam_repo.get_statistics()
-        generated_exams = list(self.exams_dir.glob("*.json"))
+        content_stats = self.question_repo.get_content_statistics()
+        question_stats = content_stats["questions"]
+        past_exam_stats = content_stats["past_exams"]
+        generated_exam_count = content_stats["generated_exam_count"]
 
         stats = {
             "question_count": question_stats["total"],
             "regular_question_count": question_stats["total"],
-            "exam_count": len(generated_exams),
-            "generated_exam_count": len(generated_exams),
+            "exam_count": generated_exam_count,
+            "generated_exam_count": generated_exam_count,
             "past_exam_count": past_exam_stats["exam_count"],
             "past_exam_question_count": past_exam_stats["question_count"],
             "past_exam_answered_count": past_exam_stats["answered_question_count"],
@@ -52,13 +56,27 @@ class QuestionBankQueryService:
         )
         return stats
 
+    def list_generated_exams(self, limit: int = 50, offset: int = 0) -> list[dict]:
+        """List generated exams from the catalog, newest first, without opening exam files."""
+        self.exam_catalog.ensure_backfilled(self.exams_dir)
+        return [entry.to_dict() for entry in self.exam_catalog.list_recent(limit=limit, offset=offset)]
+
     def list_questions(
         self,
         validated_only: bool = False,
         exam_track: str | None = None,
         limit: int = 500,
     ) -> list[dict]:
-        """List general-bank questions while tolerating repository signature drift."""
+        """List general-bank questions, reused across processes until ``questions`` changes."""
+        return get_read_model_cache().get_or_load(
+            ("question_bank_list", validated_only, exam_track, limit),
+            ("questions",),
+            lambda: self._load_questions(validated_only, exam_track, limit),
+            db_path=getattr(self.question_repo, "db_path", None),
+        )
+
+    def _load_questions(self, validated_only: bool, exam_track: str | None, limit: int) -> list[dict]:
+        """Load general-bank questions while tolerating repository signature drift."""
         supported_params = signature(self.question_repo.list_all).parameters
 
         exam_track_enum = None
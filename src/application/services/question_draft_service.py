@@ -16,7 +16,7 @@ from src.domain.entities.question_draft import (
     QuestionDraftStatus,
     classify_source_confidence,
 )
-from src.infrastructure.persistence.database import get_connection
+from src.infrastructure.persistence.database import get_write_connection
 from src.infrastructure.persistence.sqlite_question_draft_repo import get_question_draft_repository
 from src.infrastructure.persistence.sqlite_question_repo import get_question_repository
 
@@ -225,7 +225,7 @@ class QuestionDraftService:
         if question_db_path != draft_db_path:
             raise RuntimeError("Question and draft repositories must share the same database for atomic promote")
 
-        with get_connection(question_db_path) as conn:
+        with get_write_connection(question_db_path) as conn:
             try:
                 conn.execute("BEGIN IMMEDIATE")
                 question_id = self.question_repo.save_with_connection(
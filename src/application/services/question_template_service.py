@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import defaultdict
+from typing import Any
 
 from src.domain.entities.past_exam import PastExamQuestion, QuestionPattern
 from src.domain.entities.question import Difficulty, Question, QuestionType
@@ -12,8 +13,13 @@ from src.domain.entities.question_draft import (
     DraftTemplateReference,
     QuestionDraft,
 )
+from src.infrastructure.persistence.read_model_versions import TableVersionTracker
 from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
 
+TEMPLATE_CATALOG_SIZE = 12
+TEMPLATE_SOURCE_EXAM_LIMIT = 20
+TEMPLATE_SOURCE_TABLES = ("past_exams", "past_exam_questions")
+
 PATTERN_LABELS = {
     QuestionPattern.DIRECT_RECALL.value: "直接記憶",
     QuestionPattern.CLINICAL_SCENARIO.value: "臨床情境",
@@ -33,8 +39,15 @@ class QuestionTemplateService:
     def __init__(self):
         self.repo = get_past_exam_repository()
         self._template_cache: list[dict] | None = None
+        self._source_versions = TableVersionTracker(
+            tables=TEMPLATE_SOURCE_TABLES,
+            db_path=getattr(self.repo, "db_path", None),
+        )
 
     def list_templates(self, limit: int = 8) -> list[dict]:
+        # 任何程序匯入或修改考古題都會推進 table_versions，下次列出時重建模板
+        if self._source_versions.poll():
+            self._template_cache = None
         if self._template_cache is None:
             self._template_cache = self._build_template_catalog()
         return self._template_cache[:limit]
@@ -75,36 +88,37 @@ class QuestionTemplateService:
         )
 
     def _build_template_catalog(self) -> list[dict]:
-        questions = self._load_historical_questions(limit=20)
-        if not questions:
+        exemplars = self.repo.list_template_exemplars(
+            exam_limit=TEMPLATE_SOURCE_EXAM_LIMIT,
+            exemplars_per_pattern=TEMPLATE_CATALOG_SIZE,
+        )
+        if not exemplars:
             return []
 
-        by_pattern: dict[str, list[PastExamQuestion]] = defaultdict(list)
-        pattern_counts = Counter()
-        for question in questions:
+        # 查詢已依題數多寡排序各 pattern，pattern 內依年份新到舊
+        by_pattern: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        pattern_counts: dict[str, int] = {}
+        for exemplar in exemplars:
+            question = exemplar["question"]
             pattern = question.pattern.value if hasattr(question.pattern, "value") else str(question.pattern)
-            by_pattern[pattern].append(question)
-            pattern_counts[pattern] += 1
-
-        for group in by_pattern.values():
-            group.sort(key=lambda item: (-int(item.exam_year or 0), int(item.question_number or 0), item.id))
+            by_pattern[pattern].append(exemplar)
+            pattern_counts[pattern] = exemplar["pattern_count"]
 
-        ordered_patterns = [pattern for pattern, _count in pattern_counts.most_common()]
+        ordered_patterns = list(by_pattern)
         positions = {pattern: 0 for pattern in ordered_patterns}
         templates: list[dict] = []
 
-        while len(templates) < 12:
+        while len(templates) < TEMPLATE_CATALOG_SIZE:
             added = False
             for pattern in ordered_patterns:
-                group = by_pattern.get(pattern, [])
-                cursor = positions.get(pattern, 0)
+                group = by_pattern[pattern]
+                cursor = positions[pattern]
                 if cursor >= len(group):
                     continue
-                exemplar = group[cursor]
                 positions[pattern] = cursor + 1
-                templates.append(self._build_template(exemplar, group, pattern_counts))
+                templates.append(self._build_template(group[cursor], group, pattern_counts))
                 added = True
-                if len(templates) >= 12:
+                if len(templates) >= TEMPLATE_CATALOG_SIZE:
                     break
             if not added:
                 break
@@ -113,16 +127,15 @@ class QuestionTemplateService:
 
     def _build_template(
         self,
-        exemplar: PastExamQuestion,
-        sibling_questions: list[PastExamQuestion],
-        pattern_counts: Counter,
+        exemplar_row: dict[str, Any],
+        pattern_group: list[dict[str, Any]],
+        pattern_counts: dict[str, int],
     ) -> dict:
+        exemplar: PastExamQuestion = exemplar_row["question"]
         pattern = exemplar.pattern.value if hasattr(exemplar.pattern, "value") else str(exemplar.pattern)
-        topics = self._top_values(topic for question in sibling_questions for topic in question.topics if topic)
-        concepts = self._top_values(
-            concept for question in sibling_questions for concept in question.concept_names if concept
-        )
-        source_refs = [self._format_source_ref(question) for question in sibling_questions[:3]]
+        topics = list(exemplar_row["top_topics"])
+        concepts = list(exemplar_row["top_concepts"])
+        source_refs = [self._format_source_ref(sibling["question"]) for sibling in pattern_group[:3]]
         blueprint = {
             "pattern": pattern,
             "pattern_label": PATTERN_LABELS.get(pattern, pattern),
@@ -133,10 +146,7 @@ class QuestionTemplateService:
             "recommended_rules": self._recommended_rules(pattern, exemplar, topics),
             "sample_source_refs": source_refs,
             "historical_pattern_distribution": dict(pattern_counts),
-            "source_exam_years": sorted(
-                {int(question.exam_year) for question in sibling_questions if question.exam_year},
-                reverse=True,
-            )[:6],
+            "source_exam_years": [int(year) for year in exemplar_row["exam_years"][:6]],
         }
 
         return {
@@ -158,13 +168,6 @@ class QuestionTemplateService:
             "blueprint": blueprint,
         }
 
-    def _load_historical_questions(self, limit: int = 20) -> list[PastExamQuestion]:
-        exam_catalog = self.repo.list_exam_catalog(limit=limit)
-        questions: list[PastExamQuestion] = []
-        for exam in exam_catalog:
-            questions.extend(self.repo.list_questions(exam["id"]))
-        return questions
-
     def _build_stem_scaffold(
         self,
         exemplar: PastExamQuestion,
@@ -209,10 +212,6 @@ class QuestionTemplateService:
     def _format_source_ref(self, question: PastExamQuestion) -> str:
         return f"{int(question.exam_year or 0)} {question.exam_name} 第 {int(question.question_number or 0)} 題"
 
-    def _top_values(self, values) -> list[str]:
-        counter = Counter(value for value in values if value)
-        return [name for name, _count in counter.most_common(5)]
-
 
 _service: QuestionTemplateService | None = None
 
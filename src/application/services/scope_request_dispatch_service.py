@@ -15,7 +15,7 @@ from src.domain.entities.scope_request import ScopeRequestStatus
 from src.domain.value_objects.answer import coerce_question_type
 from src.infrastructure.agent.provider import extract_last_json_object
 from src.infrastructure.logging import get_logger
-from src.infrastructure.persistence import get_question_repository
+from src.infrastructure.persistence import get_exam_catalog_repository, get_question_repository
 from src.infrastructure.persistence.sqlite_scope_request_repo import get_scope_request_repository
 
 logger = get_logger(__name__)
@@ -46,6 +46,7 @@ def _build_question_tool_service() -> ExamToolApplicationService:
         project_root=PROJECT_ROOT,
         exams_dir=EXAMS_DIR,
         questions_dir=QUESTIONS_DIR,
+        exam_catalog=get_exam_catalog_repository(),
     )
 
 
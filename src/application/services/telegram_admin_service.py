@@ -17,12 +17,15 @@ from typing import Any, Callable, Mapping
 from src.application.services.openclaw_session_keys import build_openclaw_session_key
 from src.infrastructure.agent.provider import AgentProviderConfig, create_agent_provider
 from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics import format_metrics_summary, get_metrics_registry
 
 PROJECT_DIR = Path(__file__).resolve().parents[3]
 logger = get_logger(__name__)
 
 RunCommand = Callable[[list[str], int], tuple[int, str, str]]
 QuestionStatsReader = Callable[[], dict[str, Any]]
+MetricsFetcher = Callable[[str], str]
+METRICS_URLS_ENV_VAR = "TELEGRAM_METRICS_URLS"
 
 
 @dataclass(frozen=True)
@@ -140,11 +143,18 @@ class TelegramAdminStatusService:
         project_dir: Path | None = None,
         run_command: RunCommand | None = None,
         question_stats_reader: QuestionStatsReader | None = None,
+        metrics_urls: list[str] | None = None,
+        metrics_fetcher: MetricsFetcher | None = None,
     ) -> None:
         self.project_dir = project_dir or PROJECT_DIR
         self.jobs_dir = self.project_dir / "data" / "jobs"
         self.run_command = run_command or _default_run_command
         self.question_stats_reader = question_stats_reader or self._read_question_stats
+        # 其他程序（web / MCP）以 ANESTHESIA_EXAM_METRICS_PORT_WEB / _MCP 開的 /metrics 端點
+        self.metrics_urls = (
+            metrics_urls if metrics_urls is not None else _parse_csv(os.environ.get(METRICS_URLS_ENV_VAR, ""))
+        )
+        self.metrics_fetcher = metrics_fetcher or _fetch_metrics_text
 
     def collect_snapshot(self) -> SiteStatusSnapshot:
         question_count = _question_count(self.question_stats_reader())
@@ -210,6 +220,17 @@ class TelegramAdminStatusService:
         http = self._web_http_status()
         return "\n".join(["Web", f"service: {service}", f"http: {http}", "url: http://127.0.0.1:8501"])
 
+    def build_metrics_text(self) -> str:
+        local_summary = format_metrics_summary(get_metrics_registry().render_prometheus(), limit=8)
+        sections = ["Latency p50/p99", "[bot]", local_summary]
+        for url in self.metrics_urls:
+            sections.append(f"[{url}]")
+            try:
+                sections.append(format_metrics_summary(self.metrics_fetcher(url)))
+            except Exception as exc:  # noqa: BLE001
+                sections.append(f"error: {exc}")
+        return "\n".join(sections)
+
     def build_help_text(self) -> str:
         return "\n".join(
             [
@@ -219,6 +240,7 @@ class TelegramAdminStatusService:
                 "/errors - recent worker/job errors",
                 "/openclaw - OpenClaw version, model, MCP",
                 "/web - web service and HTTP status",
+                "/metrics - p50/p99 latency of DB, repository, MCP and LLM calls",
                 "/help - command list",
                 "",
                 "Read-only: Telegram cannot modify questions or run shell commands.",
@@ -395,6 +417,7 @@ class TelegramAdminBot:
             "/errors": self.status_service.build_errors_text,
             "/openclaw": self.status_service.build_openclaw_text,
             "/web": self.status_service.build_web_text,
+            "/metrics": self.status_service.build_metrics_text,
             "/help": self.status_service.build_help_text,
             "/start": self.status_service.build_help_text,
         }
@@ -485,6 +508,15 @@ def _question_count(stats: Mapping[str, Any]) -> int:
     return 0
 
 
+def _parse_csv(raw: str) -> list[str]:
+    return [item.strip() for item in raw.replace(";", ",").split(",") if item.strip()]
+
+
+def _fetch_metrics_text(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8", errors="replace")
+
+
 def _parse_mcp_servers(raw: str) -> list[str]:
     servers: list[str] = []
     for line in raw.splitlines():
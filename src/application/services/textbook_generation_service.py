@@ -7,7 +7,19 @@ import re
 from pathlib import Path
 from typing import Any
 
+from src.application.services.asset_document_cache import clean_markdown_excerpt
 from src.application.services.past_exam_extraction_service import PastExamExtractionService
+from src.application.services.textbook_source_sidecar import (
+    BlockStore,
+    block_has_precise_source,
+    block_has_searchable_text,
+    build_block_store,
+    build_readiness_sidecar,
+    load_readiness_sidecar,
+    normalize_source_text,
+    source_signature,
+    write_readiness_sidecar,
+)
 from src.infrastructure.logging import get_logger
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
@@ -40,12 +52,7 @@ MATCH_STOPWORDS = {
 }
 
 
-def _normalize_text(value: str) -> str:
-    cleaned = re.sub(r"<!--.*?-->", " ", value)
-    cleaned = cleaned.replace("`", " ")
-    cleaned = re.sub(r"[_*#>\-]+", " ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned.strip().lower()
+_normalize_text = normalize_source_text
 
 
 def _truncate_text(value: str, limit: int) -> str:
@@ -93,56 +100,60 @@ class TextbookGenerationService:
             log.info("textbook_source_readiness_checked", **result)
             return result
 
-        try:
-            stat = blocks_path.stat()
-            cache_key = (stat.st_mtime_ns, stat.st_size)
-        except OSError:
-            cache_key = (0, 0)
+        signature = source_signature(doc_dir)
+        cache_key = tuple(signature.values()) if signature else (0, 0, 0, 0)
 
         cached = self._source_readiness_cache.get(doc_id)
         if cached and cached[0] == cache_key:
             return dict(cached[1])
 
-        try:
-            blocks = json.loads(blocks_path.read_text(encoding="utf-8"))
-        except Exception as exc:  # noqa: BLE001
-            result = {
-                "doc_id": doc_id,
-                "source_ready": False,
-                "has_blocks": True,
-                "searchable_block_count": 0,
-                "precise_block_count": 0,
-                "gate_reasons": [f"blocks.json 無法讀取: {exc}"],
-            }
-            self._source_readiness_cache[doc_id] = (cache_key, result)
-            log.info("textbook_source_readiness_checked", **result)
-            return dict(result)
-
-        searchable_blocks = [block for block in blocks if self._block_has_searchable_text(block)]
-        precise_blocks = [
-            block
-            for block in searchable_blocks
-            if isinstance((block.get("metadata") or {}).get("line_start"), int)
-            and isinstance((block.get("metadata") or {}).get("line_end"), int)
-            and int(block.get("page") or 0) > 0
-        ]
+        sidecar = load_readiness_sidecar(doc_dir)
+        if sidecar is None:
+            try:
+                sidecar = build_readiness_sidecar(doc_dir)
+            except Exception as exc:  # noqa: BLE001
+                result = {
+                    "doc_id": doc_id,
+                    "source_ready": False,
+                    "has_blocks": True,
+                    "searchable_block_count": 0,
+                    "precise_block_count": 0,
+                    "gate_reasons": [f"blocks.json 無法讀取: {exc}"],
+                }
+                self._source_readiness_cache[doc_id] = (cache_key, result)
+                log.info("textbook_source_readiness_checked", **result)
+                return dict(result)
+            try:
+                write_readiness_sidecar(doc_dir, sidecar)
+            except OSError as exc:
+                log.warning("textbook_readiness_sidecar_write_failed", error=str(exc))
 
         gate_reasons: list[str] = []
-        if not searchable_blocks:
+        if not sidecar["searchable_block_count"]:
             gate_reasons.append("blocks.json 缺少可搜尋文字")
-        if not precise_blocks:
+        if not sidecar["precise_block_count"]:
             gate_reasons.append("blocks.json 缺少 line metadata")
 
         result = {
             "doc_id": doc_id,
             "source_ready": not gate_reasons,
             "has_blocks": True,
-            "searchable_block_count": len(searchable_blocks),
-            "precise_block_count": len(precise_blocks),
+            "searchable_block_count": sidecar["searchable_block_count"],
+            "precise_block_count": sidecar["precise_block_count"],
             "gate_reasons": gate_reasons,
+            "title": sidecar.get("title") or doc_id,
+            "filename": sidecar.get("filename") or "",
+            "page_range": list(sidecar.get("page_range") or []),
+            "section_count": len(sidecar.get("sections") or []),
         }
         self._source_readiness_cache[doc_id] = (cache_key, result)
-        log.info("textbook_source_readiness_checked", **result)
+        log.info(
+            "textbook_source_readiness_checked",
+            source_ready=result["source_ready"],
+            searchable_block_count=result["searchable_block_count"],
+            precise_block_count=result["precise_block_count"],
+            gate_reasons=gate_reasons,
+        )
         return dict(result)
 
     def build_prompt_context(
@@ -175,13 +186,14 @@ class TextbookGenerationService:
 
         for doc_id in doc_ids:
             document = self.asset_loader.load_asset_document(doc_id)
-            parsed_sections = self._parse_markdown_sections(document.markdown)
+            section_index = self.asset_loader.document_cache.section_index(document, _normalize_text)
+            parsed_sections = section_index.sections
             chapter_title = parsed_sections[0]["title"] if parsed_sections else document.title
 
             excerpts: list[str] = []
             for requested in selected_by_doc.get(doc_id, []):
                 selected_title = str(requested.get("title") or "").strip()
-                matched = self._find_section(parsed_sections, selected_title)
+                matched = section_index.find(selected_title)
                 excerpt = matched["body"] if matched else requested.get("preview", "")
                 excerpt = _truncate_text(excerpt, 1800)
                 if excerpt:
@@ -190,7 +202,7 @@ class TextbookGenerationService:
 
             if not excerpts:
                 headings = ", ".join(section["title"] for section in parsed_sections[:8])
-                cleaned_markdown = self._clean_markdown_excerpt(document.markdown)
+                cleaned_markdown = clean_markdown_excerpt(document.markdown)
                 excerpt = _truncate_text(cleaned_markdown, 2400)
                 summary_lines = [f"### {document.title}"]
                 if headings:
@@ -420,15 +432,17 @@ class TextbookGenerationService:
                 continue
 
             document = self.asset_loader.load_asset_document(doc_id)
-            blocks = self._load_blocks(doc_id)
-            candidate_blocks = [block for block in blocks if self._block_has_precise_source(block)]
-            if not candidate_blocks:
-                gate_reasons.append(f"{doc_id} 缺少可精確引用的 block")
-                continue
-
             stem_queries = self._stem_queries(question)
             answer_queries = self._answer_queries(question)
             explanation_queries = self._explanation_queries(question)
+            candidate_blocks = self._load_candidate_blocks(
+                doc_id,
+                [*stem_queries, *answer_queries, *explanation_queries],
+                preferred_sections,
+            )
+            if candidate_blocks is None:
+                gate_reasons.append(f"{doc_id} 缺少可精確引用的 block")
+                continue
 
             stem_match = self._find_best_match(candidate_blocks, stem_queries, preferred_sections)
             answer_match = self._find_best_match(candidate_blocks, answer_queries, preferred_sections)
@@ -635,6 +649,44 @@ class TextbookGenerationService:
                 return block
         return None
 
+    def _load_candidate_blocks(
+        self,
+        doc_id: str,
+        queries: list[str],
+        preferred_sections: list[str],
+    ) -> list[dict[str, Any]] | None:
+        """
+        Return the precise blocks that can possibly score for ``queries``, in document order.
+
+        A block only reaches the 0.34 match threshold through a query token or a
+        preferred section, so the per-doc ``blocks.sqlite`` store narrows the scan
+        to those blocks instead of decoding the whole ``blocks.json``. Returns
+        ``None`` when the document has no precise block at all.
+        """
+        doc_dir = self.data_dir / doc_id
+        store = BlockStore.open(doc_dir)
+        if store is None and (doc_dir / "blocks.json").exists():
+            try:
+                build_block_store(doc_dir)
+                store = BlockStore.open(doc_dir)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("textbook_block_store_build_failed", doc_id=doc_id, error=str(exc))
+        if store is None:
+            blocks = [block for block in self._load_blocks(doc_id) if self._block_has_precise_source(block)]
+            return blocks or None
+
+        with store:
+            if not store.count(precise_only=True):
+                return None
+            tokens = {token for query in queries for token in self._match_tokens(_normalize_text(query))}
+            section_hints = [_normalize_text(title) for title in preferred_sections if title]
+            sections = [
+                section
+                for section in store.section_titles()
+                if any(hint in section or section in hint for hint in section_hints if hint)
+            ]
+            return store.candidate_blocks(tokens, sections=sections)
+
     def _load_blocks(self, doc_id: str) -> list[dict[str, Any]]:
         blocks_path = self.data_dir / doc_id / "blocks.json"
         if not blocks_path.exists():
@@ -646,13 +698,10 @@ class TextbookGenerationService:
 
     @staticmethod
     def _block_has_searchable_text(block: dict[str, Any]) -> bool:
-        return bool(_normalize_text(str(block.get("text") or ""))) and int(block.get("page") or 0) > 0
+        return block_has_searchable_text(block)
 
     def _block_has_precise_source(self, block: dict[str, Any]) -> bool:
-        if not self._block_has_searchable_text(block):
-            return False
-        metadata = block.get("metadata") or {}
-        return isinstance(metadata.get("line_start"), int) and isinstance(metadata.get("line_end"), int)
+        return block_has_precise_source(block)
 
     def _stem_queries(self, question: dict) -> list[str]:
         topics = " ".join(question.get("topics", []))
@@ -697,49 +746,6 @@ class TextbookGenerationService:
         tokens = re.findall(r"[a-z0-9]{3,}", normalized_query)
         return [token for token in tokens if token not in MATCH_STOPWORDS]
 
-    def _parse_markdown_sections(self, markdown: str) -> list[dict[str, Any]]:
-        lines = markdown.splitlines()
-        sections: list[dict[str, Any]] = []
-
-        for index, line in enumerate(lines):
-            match = re.match(r"^(#{1,6})\s+(.+)$", line.strip())
-            if not match:
-                continue
-
-            level = len(match.group(1))
-            title = re.sub(r"\*+", "", match.group(2)).strip()
-            end_index = len(lines)
-            for next_index in range(index + 1, len(lines)):
-                next_match = re.match(r"^(#{1,6})\s+(.+)$", lines[next_index].strip())
-                if next_match and len(next_match.group(1)) <= level:
-                    end_index = next_index
-                    break
-
-            body = "\n".join(lines[index + 1 : end_index]).strip()
-            sections.append(
-                {
-                    "title": title,
-                    "level": level,
-                    "body": self._clean_markdown_excerpt(body),
-                }
-            )
-
-        return sections
-
-    def _find_section(self, parsed_sections: list[dict[str, Any]], title: str) -> dict[str, Any] | None:
-        normalized_title = _normalize_text(title)
-        for section in parsed_sections:
-            candidate = _normalize_text(section.get("title", ""))
-            if candidate == normalized_title or normalized_title in candidate or candidate in normalized_title:
-                return section
-        return None
-
-    @staticmethod
-    def _clean_markdown_excerpt(markdown: str) -> str:
-        without_page_markers = re.sub(r"<!--\s*Page\s+\d+\s*-->", " ", markdown)
-        lines = [line.strip() for line in without_page_markers.splitlines() if line.strip()]
-        return "\n".join(lines)
-
 
 _service: TextbookGenerationService | None = None
 
@@ -0,0 +1,444 @@
+"""Readiness summary, block index and ingest ledger sidecars derived from a textbook's ``blocks.json``."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# 只用標準庫：ingest 腳本把 asset-aware-mcp 的 src 放在 sys.path 前面，會以檔案路徑載入本模組
+SIDECAR_FILENAME = "source_readiness.json"
+SIDECAR_SCHEMA_VERSION = 1
+BLOCK_STORE_FILENAME = "blocks.sqlite"
+BLOCK_STORE_SCHEMA_VERSION = 1
+_TRIGRAM_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34, 0)
+INGEST_LEDGER_FILENAME = "ingest_ledger.json"
+INGEST_LEDGER_SCHEMA_VERSION = 1
+
+
+def normalize_source_text(value: str) -> str:
+    """Lower-case text with markdown punctuation and HTML comments collapsed to spaces."""
+    cleaned = re.sub(r"<!--.*?-->", " ", value)
+    cleaned = cleaned.replace("`", " ")
+    cleaned = re.sub(r"[_*#>\-]+", " ", cleaned)
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    return cleaned.strip().lower()
+
+
+def block_has_searchable_text(block: dict[str, Any]) -> bool:
+    return bool(normalize_source_text(str(block.get("text") or ""))) and int(block.get("page") or 0) > 0
+
+
+def block_has_precise_source(block: dict[str, Any]) -> bool:
+    if not block_has_searchable_text(block):
+        return False
+    metadata = block.get("metadata") or {}
+    return isinstance(metadata.get("line_start"), int) and isinstance(metadata.get("line_end"), int)
+
+
+def resolve_manifest_path(doc_dir: Path) -> Path:
+    manifest_path = doc_dir / f"{doc_dir.name}_manifest.json"
+    if not manifest_path.exists() and (doc_dir / "manifest.json").exists():
+        return doc_dir / "manifest.json"
+    return manifest_path
+
+
+def source_signature(doc_dir: Path) -> dict[str, int] | None:
+    """Return the file signature the sidecar is valid for, or ``None`` without ``blocks.json``."""
+    try:
+        blocks_stat = (doc_dir / "blocks.json").stat()
+    except OSError:
+        return None
+    try:
+        manifest_stat = resolve_manifest_path(doc_dir).stat()
+        manifest_mtime_ns, manifest_size = manifest_stat.st_mtime_ns, manifest_stat.st_size
+    except OSError:
+        manifest_mtime_ns, manifest_size = 0, 0
+    return {
+        "blocks_mtime_ns": blocks_stat.st_mtime_ns,
+        "blocks_size": blocks_stat.st_size,
+        "manifest_mtime_ns": manifest_mtime_ns,
+        "manifest_size": manifest_size,
+    }
+
+
+def build_readiness_sidecar(doc_dir: Path) -> dict[str, Any]:
+    """Decode ``blocks.json`` once and summarize it; raises when the file is missing or invalid."""
+    signature = source_signature(doc_dir)
+    if signature is None:
+        raise FileNotFoundError(f"找不到 blocks.json: {doc_dir / 'blocks.json'}")
+
+    raw = (doc_dir / "blocks.json").read_text(encoding="utf-8")
+    blocks = json.loads(raw)
+    if not isinstance(blocks, list):
+        raise ValueError("blocks.json 不是 block 陣列")
+
+    searchable_pages: list[int] = []
+    precise_block_count = 0
+    sections: list[str] = []
+    seen_sections: set[str] = set()
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        if block_has_searchable_text(block):
+            searchable_pages.append(int(block.get("page") or 0))
+            if block_has_precise_source(block):
+                precise_block_count += 1
+        if str(block.get("block_type") or "") == "SectionHeader":
+            title = str(block.get("text") or "").strip()
+            if title and title not in seen_sections:
+                seen_sections.add(title)
+                sections.append(title)
+
+    try:
+        manifest = json.loads(resolve_manifest_path(doc_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    if not isinstance(manifest, dict):
+        manifest = {}
+
+    return {
+        "schema_version": SIDECAR_SCHEMA_VERSION,
+        "doc_id": doc_dir.name,
+        "signature": signature,
+        "checksum": hashlib.sha256(raw.encode("utf-8")).hexdigest(),
+        "title": str(manifest.get("title") or manifest.get("filename") or doc_dir.name),
+        "filename": str(manifest.get("filename") or ""),
+        "block_count": len(blocks),
+        "searchable_block_count": len(searchable_pages),
+        "precise_block_count": precise_block_count,
+        "page_range": [min(searchable_pages), max(searchable_pages)] if searchable_pages else [],
+        "sections": sections,
+    }
+
+
+def write_readiness_sidecar(doc_dir: Path, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Atomically persist ``payload`` (rebuilt from ``blocks.json`` when omitted) next to the blocks."""
+    payload = payload if payload is not None else build_readiness_sidecar(doc_dir)
+    sidecar_path = doc_dir / SIDECAR_FILENAME
+    tmp_path = sidecar_path.with_name(f".{SIDECAR_FILENAME}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, sidecar_path)
+    return payload
+
+
+def load_readiness_sidecar(doc_dir: Path) -> dict[str, Any] | None:
+    """Return the persisted sidecar when it still matches the files on disk, else ``None``."""
+    sidecar_path = doc_dir / SIDECAR_FILENAME
+    try:
+        payload = json.loads(sidecar_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("schema_version") != SIDECAR_SCHEMA_VERSION:
+        return None
+    if payload.get("signature") != source_signature(doc_dir):
+        return None
+    return payload
+
+
+def _blocks_signature(doc_dir: Path) -> str | None:
+    try:
+        stat = (doc_dir / "blocks.json").stat()
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def build_block_store(doc_dir: Path) -> int:
+    """Rebuild ``blocks.sqlite`` from ``blocks.json`` atomically; returns the block count."""
+    signature = _blocks_signature(doc_dir)
+    if signature is None:
+        raise FileNotFoundError(f"找不到 blocks.json: {doc_dir / 'blocks.json'}")
+    blocks = json.loads((doc_dir / "blocks.json").read_text(encoding="utf-8"))
+    if not isinstance(blocks, list):
+        raise ValueError("blocks.json 不是 block 陣列")
+
+    store_path = doc_dir / BLOCK_STORE_FILENAME
+    tmp_path = store_path.with_name(f".{BLOCK_STORE_FILENAME}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE blocks (
+                position INTEGER PRIMARY KEY,
+                block_id TEXT,
+                page INTEGER,
+                block_type TEXT,
+                is_precise INTEGER NOT NULL,
+                norm_text TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE block_sections (position INTEGER NOT NULL, section TEXT NOT NULL);
+            """
+        )
+        if _TRIGRAM_AVAILABLE:
+            conn.execute("CREATE VIRTUAL TABLE blocks_fts USING fts5(norm_text, tokenize='trigram')")
+
+        count = 0
+        for position, block in enumerate(blocks):
+            if not isinstance(block, dict):
+                continue
+            normalized_text = normalize_source_text(str(block.get("text") or ""))
+            conn.execute(
+                "INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    position,
+                    str(block.get("block_id") or ""),
+                    int(block.get("page") or 0),
+                    str(block.get("block_type") or ""),
+                    1 if block_has_precise_source(block) else 0,
+                    normalized_text,
+                    json.dumps(block, ensure_ascii=False),
+                ),
+            )
+            if _TRIGRAM_AVAILABLE:
+                conn.execute("INSERT INTO blocks_fts(rowid, norm_text) VALUES (?, ?)", (position, normalized_text))
+            sections = {
+                normalize_source_text(str(value))
+                for value in (block.get("section_hierarchy") or {}).values()
+                if str(value or "").strip()
+            }
+            conn.executemany(
+                "INSERT INTO block_sections VALUES (?, ?)",
+                [(position, section) for section in sections if section],
+            )
+            count += 1
+
+        conn.executescript(
+            """
+            CREATE INDEX idx_blocks_block_id ON blocks (block_id);
+            CREATE INDEX idx_blocks_page ON blocks (page);
+            CREATE INDEX idx_block_sections_section ON block_sections (section);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("schema_version", str(BLOCK_STORE_SCHEMA_VERSION)),
+                ("blocks_signature", signature),
+                ("block_count", str(count)),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, store_path)
+    return count
+
+
+class BlockStore:
+    """Read-only view over ``blocks.sqlite``; results come back as the original block dicts."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        self._has_fts = (
+            conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'blocks_fts'").fetchone()
+            is not None
+        )
+
+    @classmethod
+    def open(cls, doc_dir: Path) -> BlockStore | None:
+        """Open the store when it exists and still matches ``blocks.json``; otherwise ``None``."""
+        store_path = doc_dir / BLOCK_STORE_FILENAME
+        if not store_path.exists():
+            return None
+        conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.DatabaseError:
+            conn.close()
+            return None
+        if meta.get("schema_version") != str(BLOCK_STORE_SCHEMA_VERSION) or meta.get(
+            "blocks_signature"
+        ) != _blocks_signature(doc_dir):
+            conn.close()
+            return None
+        return cls(conn)
+
+    def __enter__(self) -> BlockStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def count(self, *, precise_only: bool = False) -> int:
+        query = "SELECT COUNT(*) FROM blocks" + (" WHERE is_precise = 1" if precise_only else "")
+        return int(self._conn.execute(query).fetchone()[0])
+
+    def get_block(self, block_id: str) -> dict[str, Any] | None:
+        row = self._conn.execute(
+            "SELECT payload FROM blocks WHERE block_id = ? ORDER BY position LIMIT 1",
+            (block_id,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def blocks_for_pages(self, page_start: int, page_end: int | None = None) -> list[dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT payload FROM blocks WHERE page BETWEEN ? AND ? ORDER BY position",
+            (page_start, page_end if page_end is not None else page_start),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def section_titles(self) -> list[str]:
+        """Distinct normalized section titles referenced by any block's hierarchy."""
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT section FROM block_sections ORDER BY section")]
+
+    def candidate_blocks(
+        self,
+        tokens: Iterable[str],
+        *,
+        sections: Iterable[str] = (),
+        precise_only: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Blocks whose normalized text contains any token, plus blocks under ``sections``.
+
+        Tokens shorter than three characters cannot use the trigram postings and
+        are matched with ``instr``. Results keep document order.
+        """
+        token_list = sorted({token for token in tokens if token})
+        section_list = sorted({section for section in sections if section})
+        if not token_list and not section_list:
+            return []
+
+        positions: set[int] = set()
+        indexed_tokens = [token for token in token_list if self._has_fts and len(token) >= 3]
+        if indexed_tokens:
+            match = " OR ".join('"' + token.replace('"', '""') + '"' for token in indexed_tokens)
+            positions.update(
+                row[0] for row in self._conn.execute("SELECT rowid FROM blocks_fts WHERE blocks_fts MATCH ?", (match,))
+            )
+        for token in token_list:
+            if token in indexed_tokens:
+                continue
+            positions.update(
+                row[0]
+                for row in self._conn.execute("SELECT position FROM blocks WHERE instr(norm_text, ?) > 0", (token,))
+            )
+        if section_list:
+            placeholders = ", ".join("?" for _ in section_list)
+            positions.update(
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT position FROM block_sections WHERE section IN ({placeholders})",
+                    section_list,
+                )
+            )
+        if not positions:
+            return []
+
+        ordered = sorted(positions)
+        query = "SELECT payload FROM blocks WHERE position IN (SELECT value FROM json_each(?))"
+        if precise_only:
+            query += " AND is_precise = 1"
+        rows = self._conn.execute(query + " ORDER BY position", (json.dumps(ordered),)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_stat_signature(path: Path) -> dict[str, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def load_ingest_ledger(doc_dir: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads((doc_dir / INGEST_LEDGER_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"schema_version": INGEST_LEDGER_SCHEMA_VERSION, "hashes": {}, "stages": {}}
+    if not isinstance(payload, dict) or payload.get("schema_version") != INGEST_LEDGER_SCHEMA_VERSION:
+        return {"schema_version": INGEST_LEDGER_SCHEMA_VERSION, "hashes": {}, "stages": {}}
+    payload.setdefault("hashes", {})
+    payload.setdefault("stages", {})
+    return payload
+
+
+def _write_ingest_ledger(doc_dir: Path, ledger: dict[str, Any]) -> None:
+    doc_dir.mkdir(parents=True, exist_ok=True)
+    ledger_path = doc_dir / INGEST_LEDGER_FILENAME
+    tmp_path = ledger_path.with_name(f".{INGEST_LEDGER_FILENAME}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(ledger, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, ledger_path)
+
+
+def ledger_content_hash(doc_dir: Path, source_path: Path) -> str:
+    """
+    SHA-256 of ``source_path``, reusing the hash recorded in the ledger while the
+    file's ``(mtime_ns, size)`` is unchanged so unchanged PDFs are not re-read.
+    """
+    stat_signature = _file_stat_signature(source_path)
+    if stat_signature is None:
+        raise FileNotFoundError(f"找不到來源檔案: {source_path}")
+    recorded = load_ingest_ledger(doc_dir)["hashes"].get(str(source_path.resolve()))
+    if isinstance(recorded, dict) and recorded.get("stat") == stat_signature and recorded.get("sha256"):
+        return str(recorded["sha256"])
+    return file_sha256(source_path)
+
+
+def ingest_stage_record(doc_dir: Path, stage: str, key: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Return the ledger record for ``stage`` when it was produced from ``key`` and
+    every recorded artifact is still on disk unchanged; otherwise ``None``.
+    """
+    record = load_ingest_ledger(doc_dir)["stages"].get(stage)
+    if not isinstance(record, dict) or record.get("key") != key:
+        return None
+    artifacts = record.get("artifacts")
+    if not isinstance(artifacts, dict) or not artifacts:
+        return None
+    for name, signature in artifacts.items():
+        if _file_stat_signature(doc_dir / name) != signature:
+            return None
+    return record
+
+
+def has_ingest_stage(doc_dir: Path, stage: str) -> bool:
+    return isinstance(load_ingest_ledger(doc_dir)["stages"].get(stage), dict)
+
+
+def record_ingest_stage(
+    doc_dir: Path,
+    stage: str,
+    key: dict[str, Any],
+    artifacts: Iterable[str],
+    *,
+    source_path: Path | None = None,
+    source_sha256: str = "",
+    details: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Record that ``artifacts`` (names relative to ``doc_dir``) were produced from ``key``."""
+    artifact_signatures = {name: _file_stat_signature(doc_dir / name) for name in artifacts}
+    missing = [name for name, signature in artifact_signatures.items() if signature is None]
+    if missing:
+        raise FileNotFoundError(f"ledger artifact 不存在: {', '.join(missing)}")
+
+    ledger = load_ingest_ledger(doc_dir)
+    if source_path is not None and source_sha256:
+        ledger["hashes"][str(source_path.resolve())] = {
+            "sha256": source_sha256,
+            "stat": _file_stat_signature(source_path),
+        }
+    record = {"key": key, "artifacts": artifact_signatures, "details": details or {}}
+    ledger["stages"][stage] = record
+    _write_ingest_ledger(doc_dir, ledger)
+    return record
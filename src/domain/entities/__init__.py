@@ -1,9 +1,10 @@
 """Domain Entities"""
 
 from .conversation import Conversation
-from .exam import Exam, ExamConfig, ExamStatus
+from .exam import BlueprintQuota, Exam, ExamCatalogEntry, ExamConfig, ExamStatus
 from .message import Message, MessageRole
 from .past_exam import Concept, PastExam, PastExamQuestion, QuestionPattern
+from .practice import PracticeAttempt, PracticeMastery, PracticeQuestionStat
 from .question import Difficulty, Question, QuestionType, Source
 
 __all__ = [
@@ -15,10 +16,15 @@ __all__ = [
     "Difficulty",
     "Source",
     "Exam",
+    "BlueprintQuota",
+    "ExamCatalogEntry",
     "ExamConfig",
     "ExamStatus",
     "PastExam",
     "PastExamQuestion",
     "Concept",
     "QuestionPattern",
+    "PracticeAttempt",
+    "PracticeMastery",
+    "PracticeQuestionStat",
 ]
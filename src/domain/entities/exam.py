@@ -42,6 +42,39 @@ class ExamConfig:
     topic_scope: list[str] = field(default_factory=list)  # 範圍限定
 
 
+@dataclass(frozen=True)
+class BlueprintQuota:
+    """組卷藍圖中的一格：某知識點 × 難度要抽幾題（None 表示不限）"""
+
+    count: int
+    topic: str | None = None
+    difficulty: Difficulty | None = None
+
+
+@dataclass
+class ExamCatalogEntry:
+    """已產生考卷檔的目錄資訊（不含題目內容）"""
+
+    id: str
+    name: str
+    question_count: int
+    file_path: str
+    created_at: datetime = field(default_factory=datetime.now)
+    requested_question_count: int | None = None
+    question_ids: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "question_count": self.question_count,
+            "requested_question_count": self.requested_question_count,
+            "file_path": self.file_path,
+            "created_at": self.created_at.isoformat(),
+            "question_ids": list(self.question_ids),
+        }
+
+
 @dataclass
 class Exam:
     """
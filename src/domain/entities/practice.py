@@ -0,0 +1,96 @@
+"""
+Practice Entities - 作答紀錄與熟練度
+
+練習結束時每題寫入一筆 PracticeAttempt；熟練度與複習排程由資料庫端彙總。
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class PracticeAttempt:
+    """單題作答紀錄"""
+
+    user_id: str
+    session_id: str
+    question_id: str
+    selected_letters: str = ""  # 例如 "A" 或 "A,C"；未作答為空字串
+    is_correct: bool = False
+    elapsed_ms: Optional[int] = None
+    question_source: Optional[str] = None  # past_exam / question_bank
+    topics: list[str] = field(default_factory=list)
+    pattern: Optional[str] = None
+    answered_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "question_id": self.question_id,
+            "selected_letters": self.selected_letters,
+            "is_correct": self.is_correct,
+            "elapsed_ms": self.elapsed_ms,
+            "question_source": self.question_source,
+            "topics": self.topics,
+            "pattern": self.pattern,
+            "answered_at": self.answered_at.isoformat(),
+        }
+
+
+@dataclass
+class PracticeMastery:
+    """某主題 / 題型的累積表現"""
+
+    dimension: str  # topic / pattern
+    label: str
+    attempts: int = 0
+    correct: int = 0
+    last_attempt_at: Optional[datetime] = None
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.attempts if self.attempts else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "dimension": self.dimension,
+            "label": self.label,
+            "attempts": self.attempts,
+            "correct": self.correct,
+            "accuracy": self.accuracy,
+            "last_attempt_at": self.last_attempt_at.isoformat() if self.last_attempt_at else None,
+        }
+
+
+@dataclass
+class PracticeQuestionStat:
+    """單題累積表現與下次複習時間"""
+
+    question_id: str
+    attempts: int = 0
+    correct: int = 0
+    streak: int = 0  # 目前連續答對次數
+    last_attempt_at: Optional[datetime] = None
+    next_review_at: Optional[datetime] = None
+    global_attempts: int = 0  # 所有使用者合計，用來估計題目本身難度
+    global_correct: int = 0
+
+    @property
+    def item_difficulty(self) -> float:
+        """1 - 平滑後的全體正確率；沒人作答過時為 0.5"""
+        return 1.0 - (self.global_correct + 1) / (self.global_attempts + 2)
+
+    def to_dict(self) -> dict:
+        return {
+            "question_id": self.question_id,
+            "attempts": self.attempts,
+            "correct": self.correct,
+            "streak": self.streak,
+            "last_attempt_at": self.last_attempt_at.isoformat() if self.last_attempt_at else None,
+            "next_review_at": self.next_review_at.isoformat() if self.next_review_at else None,
+            "global_attempts": self.global_attempts,
+            "global_correct": self.global_correct,
+            "item_difficulty": self.item_difficulty,
+        }
@@ -1,6 +1,8 @@
 # Repository interfaces
 
+from .exam_catalog_repository import IExamCatalogRepository
 from .past_exam_repository import IPastExamRepository
+from .practice_attempt_repository import IPracticeAttemptRepository
 from .question_repository import IQuestionRepository
 
-__all__ = ["IQuestionRepository", "IPastExamRepository"]
+__all__ = ["IQuestionRepository", "IPastExamRepository", "IExamCatalogRepository", "IPracticeAttemptRepository"]
@@ -0,0 +1,28 @@
+"""
+Exam Catalog Repository Interface - 考卷目錄儲存庫介面
+
+記錄已產生考卷檔的中繼資料，讓統計與列表不必掃描 data/exams。
+"""
+
+from abc import ABC, abstractmethod
+
+from src.domain.entities.exam import ExamCatalogEntry
+
+
+class IExamCatalogRepository(ABC):
+    """考卷目錄儲存庫介面"""
+
+    @abstractmethod
+    def save(self, entry: ExamCatalogEntry) -> str:
+        """新增或更新一筆考卷目錄，回傳 ID"""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """已產生考卷數"""
+        pass
+
+    @abstractmethod
+    def list_recent(self, limit: int = 50, offset: int = 0) -> list[ExamCatalogEntry]:
+        """依建立時間由新到舊列出考卷"""
+        pass
@@ -7,6 +7,7 @@ records, and derived concepts.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Optional
 
 from src.domain.entities.past_exam import Concept, PastExam, PastExamQuestion
@@ -35,6 +36,10 @@ class IPastExamRepository(ABC):
     def list_questions(self, past_exam_id: str) -> list[PastExamQuestion]:
         """List normalized/classified questions for one extracted exam."""
 
+    @abstractmethod
+    def list_questions_for_exams(self, past_exam_ids: list[str]) -> Iterator[PastExamQuestion]:
+        """Stream questions for several exams in one query, grouped in the given exam order."""
+
     @abstractmethod
     def list_all_questions(
         self,
@@ -44,6 +49,30 @@ class IPastExamRepository(ABC):
     ) -> list[PastExamQuestion]:
         """List past-exam questions across all imported exams."""
 
+    @abstractmethod
+    def list_template_exemplars(
+        self,
+        exam_limit: int = 20,
+        exemplars_per_pattern: int = 12,
+        top_values: int = 5,
+    ) -> list[dict]:
+        """Per-pattern exemplar questions with pattern counts, years and top topics/concepts."""
+
+    @abstractmethod
+    def search_questions(
+        self,
+        query: str,
+        *,
+        past_exam_ids: list[str] | None = None,
+        exam_year: int | None = None,
+        pattern: str | None = None,
+        difficulty: str | None = None,
+        explanation_required: bool = False,
+        match_any: bool = False,
+        limit: int = 20,
+    ) -> list[PastExamQuestion]:
+        """Full-text search past-exam questions, best BM25 match first."""
+
     @abstractmethod
     def update_question_explanation(self, question_id: str, explanation: str) -> bool:
         """Update the persisted explanation for one past-exam question."""
@@ -0,0 +1,60 @@
+"""
+Practice Attempt Repository Interface - 作答紀錄儲存庫介面
+
+作答紀錄只追加；熟練度與複習排程隨寫入增量維護，查詢時不需重播歷史。
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from src.domain.entities.practice import PracticeAttempt, PracticeMastery, PracticeQuestionStat
+
+
+class IPracticeAttemptRepository(ABC):
+    """作答紀錄儲存庫介面"""
+
+    @abstractmethod
+    def record_attempts(self, attempts: list[PracticeAttempt]) -> int:
+        """批次寫入一次練習的作答紀錄，回傳寫入筆數"""
+        pass
+
+    @abstractmethod
+    def weakest(self, user_id: str, dimension: str = "topic", limit: int = 5, min_attempts: int = 1) -> list[PracticeMastery]:
+        """正確率最低的主題 / 題型"""
+        pass
+
+    @abstractmethod
+    def due_for_review(
+        self,
+        user_id: str,
+        limit: int = 20,
+        now: Optional[datetime] = None,
+    ) -> list[PracticeQuestionStat]:
+        """已到複習時間的題目，最早到期者優先"""
+        pass
+
+    @abstractmethod
+    def get_question_stats(self, user_id: str, question_ids: list[str]) -> dict[str, PracticeQuestionStat]:
+        """指定題目的累積表現（沒作答過的題目不會出現在結果中）"""
+        pass
+
+    @abstractmethod
+    def list_mastery(self, user_id: str, dimension: str = "topic") -> list[PracticeMastery]:
+        """使用者在某維度下的全部熟練度"""
+        pass
+
+    @abstractmethod
+    def load_item_statistics(self, user_id: str) -> dict[str, PracticeQuestionStat]:
+        """使用者作答過的題目：個人紀錄 + 全體作答數（供選題快照使用）"""
+        pass
+
+    @abstractmethod
+    def load_item_difficulty(self, question_ids: list[str]) -> dict[str, PracticeQuestionStat]:
+        """指定題目的全體作答數（只填 global_* 欄位；沒人作答過的題目不會出現）"""
+        pass
+
+    @abstractmethod
+    def get_user_versions(self, user_ids: list[str]) -> dict[str, int]:
+        """使用者作答統計的版本號，每次計入統計的作答都會遞增"""
+        pass
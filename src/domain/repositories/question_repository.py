@@ -5,10 +5,12 @@ Question Repository Interface - 題目儲存庫介面
 Infrastructure 層必須實作此介面。
 """
 
+import random
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Optional
 
+from src.domain.entities.exam import BlueprintQuota
 from src.domain.entities.question import Difficulty, ExamTrack, Question, QuestionType
 from src.domain.value_objects.audit import ActorType, AuditEntry
 
@@ -128,6 +130,31 @@ class IQuestionRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def sample_by_blueprint(
+        self,
+        quotas: list[BlueprintQuota],
+        *,
+        exam_track: Optional[ExamTrack] = None,
+        validated_only: bool = False,
+        exclude_ids: Optional[set[str]] = None,
+        rng: Optional[random.Random] = None,
+    ) -> list[list[Question]]:
+        """
+        依組卷藍圖隨機抽題
+
+        Args:
+            quotas: 每格的知識點 × 難度 × 題數
+            exam_track: 考試類型篩選
+            validated_only: 只抽已審查通過的題目
+            exclude_ids: 不可抽到的題目 ID
+            rng: 亂數來源（測試可固定種子）
+
+        Returns:
+            與 quotas 對應的題目列表；同一題只會出現在一格，題量不足的格回傳較少題目
+        """
+        pass
+
     # ==================== Update ====================
 
     @abstractmethod
@@ -0,0 +1,61 @@
+"""Process-wide asyncio loop for provider ``astream`` consumers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SharedEventLoop:
+    """Lazily started event loop running forever on one daemon thread."""
+
+    def __init__(self, name: str = "agent-event-loop") -> None:
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                self._start_locked()
+            assert self._loop is not None
+            return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule ``coro`` on the shared loop; cancelling the future cancels the task."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _start_locked(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, daemon=True, name=self._name)
+        thread.start()
+        ready.wait(timeout=5)
+        self._loop = loop
+        self._thread = thread
+        logger.info("shared_event_loop_started", thread=self._name)
+
+
+_SHARED_EVENT_LOOP = SharedEventLoop()
+
+
+def get_shared_event_loop() -> SharedEventLoop:
+    """Return the process-wide loop used to drive provider ``astream`` calls."""
+    return _SHARED_EVENT_LOOP
@@ -0,0 +1,186 @@
+"""Incremental JSON object scanner for streamed agent output."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterator
+
+_TRAILING_COMMA_OBJECT = re.compile(r",\s*}")
+_TRAILING_COMMA_ARRAY = re.compile(r",\s*]")
+_WHITESPACE = frozenset(" \t\r\n")
+
+_OPEN = -1
+_REJECTED = -2
+
+
+def loads_lenient_json(raw_json: str) -> object | None:
+    """Decode a JSON candidate, tolerating trailing commas emitted by LLMs."""
+    try:
+        return json.loads(raw_json)
+    except json.JSONDecodeError:
+        pass
+    cleaned = _TRAILING_COMMA_OBJECT.sub("}", raw_json)
+    cleaned = _TRAILING_COMMA_ARRAY.sub("]", cleaned)
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        return None
+
+
+class IncrementalJsonObjectScanner:
+    """Resumable scanner that yields complete top-level JSON objects from text chunks.
+
+    Objects nested inside a top-level JSON array are emitted one by one, so a
+    streamed ``[{...}, {...}]`` payload surfaces each element as soon as it closes.
+    A ``{`` not followed by a key (e.g. ``{placeholder}`` in prose) is skipped, and
+    balanced groups that still fail to decode are rescanned from the character
+    after their opening brace, matching the behaviour of a ``raw_decode`` sweep.
+    """
+
+    def __init__(self, max_object_chars: int = 2_000_000):
+        self.max_object_chars = max_object_chars
+        self.reset()
+
+    @property
+    def in_object(self) -> bool:
+        return self._depth > 0
+
+    def reset(self) -> None:
+        self._parts: list[str] = []
+        self._size = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._resume_at = 0
+
+    def feed(self, chunk: str) -> list[object]:
+        """Consume a chunk and return the decoded objects it completed."""
+        return list(self._iter_feed(chunk))
+
+    def _iter_feed(self, chunk: str) -> Iterator[object]:
+        index = 0
+        length = len(chunk)
+
+        while index < length:
+            if self._depth == 0:
+                start = chunk.find("{", index)
+                if start < 0:
+                    return
+                self._begin_object()
+                object_start = start
+                index = start + 1
+            else:
+                object_start = index
+
+            end = self._scan(chunk, index)
+            if end == _OPEN:
+                self._append(chunk[object_start:])
+                if self._size > self.max_object_chars:
+                    yield from self._abandon_current()
+                return
+            if end == _REJECTED:
+                index = self._resume_at
+                continue
+
+            self._append(chunk[object_start : end + 1])
+            raw_json = "".join(self._parts)
+            self.reset()
+            index = end + 1
+            yield from self._emit(raw_json)
+
+    def _begin_object(self) -> None:
+        self.reset()
+        self._depth = 1
+        self._expect_key = True
+
+    def _append(self, text: str) -> None:
+        if text:
+            self._parts.append(text)
+            self._size += len(text)
+
+    def _scan(self, chunk: str, index: int) -> int:
+        """Advance state through ``chunk[index:]``; return the closing-brace index or a sentinel."""
+        length = len(chunk)
+        position = index
+        while position < length:
+            char = chunk[position]
+            if self._expect_key:
+                if char in _WHITESPACE:
+                    position += 1
+                    continue
+                self._expect_key = False
+                if char not in '"}':
+                    self.reset()
+                    self._resume_at = position
+                    return _REJECTED
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return position
+            position += 1
+        return _OPEN
+
+    def _emit(self, raw_json: str) -> Iterator[object]:
+        payload = loads_lenient_json(raw_json)
+        if payload is not None:
+            yield payload
+            return
+        yield from IncrementalJsonObjectScanner(self.max_object_chars)._iter_feed(raw_json[1:])
+
+    def _abandon_current(self) -> Iterator[object]:
+        buffered = "".join(self._parts)
+        self.reset()
+        yield from self._iter_feed(buffered[1:])
+
+
+def find_mcp_save_result(payload: object) -> dict | None:
+    """Find a saved-question result (a dict with ``question_id`` but no ``question_text``) anywhere in ``payload``.
+
+    MCP tool results are often wrapped (``{"result": {...}}``, ``{"content": [{"text": "{...}"}]}``),
+    so nested dicts, lists and JSON-encoded strings are searched too.
+    """
+    if isinstance(payload, dict):
+        if payload.get("question_text"):
+            # 題目物件本身，不是工具結果
+            return None
+        if payload.get("question_id"):
+            return payload
+        children = payload.values()
+    elif isinstance(payload, list):
+        children = payload
+    elif isinstance(payload, str) and payload.lstrip().startswith("{") and "question_id" in payload:
+        return find_mcp_save_result(loads_lenient_json(payload))
+    else:
+        return None
+    for child in children:
+        result = find_mcp_save_result(child)
+        if result is not None:
+            return result
+    return None
+
+
+def iter_json_objects(text: str) -> Iterator[object]:
+    """Yield every top-level JSON object found in ``text`` in a single pass."""
+    yield from IncrementalJsonObjectScanner()._iter_feed(text)
+
+
+def split_at_question_id(text: str, question_id: str) -> tuple[str, str]:
+    """Split streamed text right after ``question_id``; without a match everything belongs to this result."""
+    position = text.find(question_id)
+    if position < 0:
+        return text, ""
+    cut = position + len(question_id)
+    return text[:cut], text[cut:]
@@ -11,20 +11,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import shutil
 import subprocess
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, Optional, Protocol
+from typing import AsyncIterator, Iterator, Optional, Protocol
 from urllib import request
 from urllib.error import HTTPError, URLError
 
 from src.application.services.openclaw_session_keys import build_openclaw_session_key
+from src.infrastructure.agent.json_stream import iter_json_objects
 from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import instrument_agent_provider
 
 logger = get_logger(__name__)
 
@@ -105,6 +109,94 @@ def _iter_process_lines(process: subprocess.Popen[str], timeout_sec: int) -> Ite
             watchdog.cancel()
 
 
+async def _aterminate_process(process: asyncio.subprocess.Process, *, timeout: float = 2.0) -> None:
+    """Terminate an asyncio child process and force-kill on timeout."""
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+
+async def _aiter_process_lines(cmd: list[str], *, cwd: str, timeout_sec: int) -> AsyncIterator[str]:
+    """Yield stdout+stderr lines of ``cmd`` without a thread; the child is killed on cancel/close.
+
+    Raises ``TimeoutError`` when ``timeout_sec`` elapses and
+    ``subprocess.CalledProcessError`` on a non-zero exit code.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=cwd,
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_sec if timeout_sec > 0 else None
+    try:
+        assert process.stdout is not None
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"process timed out after {timeout_sec}s")
+            try:
+                raw_line = await asyncio.wait_for(process.stdout.readline(), timeout=remaining)
+            except asyncio.TimeoutError as exc:
+                raise TimeoutError(f"process timed out after {timeout_sec}s") from exc
+            if not raw_line:
+                break
+            yield raw_line.decode("utf-8", errors="replace")
+
+        returncode = await process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd[:1])
+    finally:
+        await _aterminate_process(process)
+
+
+_BLOCKING_STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="agent-stream")
+_STREAM_EXHAUSTED = object()
+
+
+def _close_stream_quietly(stream: Iterator[str]) -> None:
+    close = getattr(stream, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:  # noqa: BLE001
+        pass
+
+
+async def _astream_blocking(stream: Iterator[str]) -> AsyncIterator[str]:
+    """Adapt a blocking provider stream (urllib SSE, CLI ``run``) to ``astream``.
+
+    Only the in-flight ``next()`` call occupies a pooled thread. On cancellation
+    the iterator is closed as soon as that call returns, which releases the HTTP
+    response or child process held by the generator.
+    """
+    pending: Future | None = None
+    try:
+        while True:
+            pending = _BLOCKING_STREAM_EXECUTOR.submit(next, stream, _STREAM_EXHAUSTED)
+            chunk = await asyncio.wrap_future(pending)
+            if chunk is _STREAM_EXHAUSTED:
+                return
+            yield chunk
+    finally:
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda _future: _close_stream_quietly(stream))
+        else:
+            _close_stream_quietly(stream)
+
+
 def _dedupe_strings(values: list[str]) -> list[str]:
     deduped: list[str] = []
     seen: set[str] = set()
@@ -233,25 +325,11 @@ def extract_openclaw_text(payload: dict) -> str:
 
 
 def extract_last_json_object(raw_text: str) -> dict | None:
-    """Extract the last JSON object from mixed stdout/stderr text."""
-    decoder = json.JSONDecoder()
-    index = 0
+    """Extract the last JSON object from mixed stdout/stderr text in a single pass."""
     last_object: dict | None = None
-
-    while index < len(raw_text):
-        start = raw_text.find("{", index)
-        if start < 0:
-            break
-        try:
-            payload, end = decoder.raw_decode(raw_text[start:])
-        except json.JSONDecodeError:
-            index = start + 1
-            continue
-
+    for payload in iter_json_objects(raw_text):
         if isinstance(payload, dict):
             last_object = payload
-        index = start + max(end, 1)
-
     return last_object
 
 
@@ -342,6 +420,32 @@ def iter_sse_data_messages(response) -> Iterator[str]:
         yield "\n".join(data_lines)
 
 
+def iter_chat_completion_deltas(response) -> Iterator[str]:
+    """Yield assistant text deltas from a streamed Chat Completions SSE response."""
+    for message in iter_sse_data_messages(response):
+        if message == "[DONE]":
+            return
+        try:
+            event = json.loads(message)
+        except json.JSONDecodeError:
+            continue
+        error = event.get("error")
+        if error:
+            detail = error.get("message") if isinstance(error, dict) else error
+            raise RuntimeError(str(detail or "chat-completions stream error"))
+        choices = event.get("choices") or []
+        if not choices:
+            continue
+        delta = choices[0].get("delta") or {}
+        content = delta.get("content")
+        if isinstance(content, str) and content:
+            yield content
+            continue
+        structured = extract_openai_text_content(content)
+        if structured:
+            yield structured
+
+
 class IAgentProvider(Protocol):
     """Agent provider 介面"""
 
@@ -353,6 +457,8 @@ class IAgentProvider(Protocol):
 
     def stream(self, prompt: str, session_key: Optional[str] = None) -> Iterator[str]: ...
 
+    def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]: ...
+
 
 @dataclass
 class AgentProviderConfig:
@@ -374,6 +480,8 @@ class AgentProviderConfig:
     openclaw_config_path: Optional[Path] = None
     openclaw_mode: Optional[str] = None
     openclaw_agent_id: Optional[str] = None
+    openclaw_gateway_url: Optional[str] = None
+    openclaw_gateway_token: Optional[str] = None
     openai_base_url: Optional[str] = None
     openai_api_key: Optional[str] = None
     openai_organization: Optional[str] = None
@@ -451,6 +559,16 @@ class AgentProviderConfig:
         if openclaw_mode not in {"agent", "infer"}:
             openclaw_mode = "agent"
         openclaw_agent_id = (os.getenv("EXAM_OPENCLAW_AGENT_ID") or "main").strip() or "main"
+        openclaw_gateway_url = (
+            os.getenv("EXAM_OPENCLAW_GATEWAY_URL")
+            or os.getenv("OPENCLAW_GATEWAY_URL")
+            or ""
+        ).strip()
+        openclaw_gateway_token = (
+            os.getenv("EXAM_OPENCLAW_GATEWAY_TOKEN")
+            or os.getenv("OPENCLAW_GATEWAY_TOKEN")
+            or ""
+        ).strip()
 
         codex_model = (
             model_override
@@ -488,6 +606,8 @@ class AgentProviderConfig:
             openclaw_config_path=Path(openclaw_config_path) if openclaw_config_path else None,
             openclaw_mode=openclaw_mode,
             openclaw_agent_id=openclaw_agent_id,
+            openclaw_gateway_url=openclaw_gateway_url or None,
+            openclaw_gateway_token=openclaw_gateway_token or None,
             openai_base_url=openai_base_url or None,
             openai_api_key=openai_api_key or None,
             openai_organization=openai_organization or None,
@@ -495,6 +615,7 @@ class AgentProviderConfig:
         )
 
 
+@instrument_agent_provider
 class CrushAgentProvider:
     """Crush CLI provider"""
 
@@ -587,7 +708,37 @@ class CrushAgentProvider:
         finally:
             _terminate_process(process)
 
+    async def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]:
+        _ = session_key
+        log = logger.bind(provider="crush", model=self.config.model)
+        log.info("agent_astream_start", prompt_len=len(prompt))
+        t0 = time.monotonic()
+        total_chars = 0
 
+        try:
+            async for line in _aiter_process_lines(
+                self._build_command(prompt),
+                cwd=str(self.config.working_dir),
+                timeout_sec=self.config.timeout,
+            ):
+                total_chars += len(line)
+                yield line
+        except subprocess.CalledProcessError as exc:
+            elapsed_ms = int((time.monotonic() - t0) * 1000)
+            log.error("agent_stream_error", returncode=exc.returncode, duration_ms=elapsed_ms)
+            raise RuntimeError(f"Crush 結束碼：{exc.returncode}") from exc
+        except TimeoutError as exc:
+            elapsed_ms = int((time.monotonic() - t0) * 1000)
+            log.error("agent_stream_error", duration_ms=elapsed_ms, error="timeout")
+            raise RuntimeError(f"Crush 串流超時（{self.config.timeout} 秒）") from exc
+        except asyncio.CancelledError:
+            log.info("agent_astream_cancelled", total_chars=total_chars)
+            raise
+        elapsed_ms = int((time.monotonic() - t0) * 1000)
+        log.info("agent_stream_done", duration_ms=elapsed_ms, total_chars=total_chars)
+
+
+@instrument_agent_provider
 class OpenCodeAgentProvider:
     """OpenCode CLI provider（使用 opencode run 指令 + opencode.json 設定）"""
 
@@ -690,7 +841,41 @@ class OpenCodeAgentProvider:
         finally:
             _terminate_process(process)
 
+    async def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]:
+        _ = session_key
+        log = logger.bind(provider="opencode", model=self.config.opencode_model)
+        log.info("agent_astream_start", prompt_len=len(prompt))
+        t0 = time.monotonic()
+        total_chars = 0
+        mcp_calls_detected = 0
 
+        try:
+            async for line in _aiter_process_lines(
+                self._build_command(prompt),
+                cwd=str(self.config.working_dir),
+                timeout_sec=self.config.timeout,
+            ):
+                total_chars += len(line)
+                if "exam_save_question" in line or "exam_" in line:
+                    mcp_calls_detected += 1
+                    log.info("mcp_call_detected", line=line.strip()[:200])
+                yield line
+        except subprocess.CalledProcessError as exc:
+            elapsed_ms = int((time.monotonic() - t0) * 1000)
+            log.error("agent_stream_error", returncode=exc.returncode, duration_ms=elapsed_ms)
+            raise RuntimeError(f"OpenCode 結束碼：{exc.returncode}") from exc
+        except TimeoutError as exc:
+            elapsed_ms = int((time.monotonic() - t0) * 1000)
+            log.error("agent_stream_error", duration_ms=elapsed_ms, error="timeout")
+            raise RuntimeError(f"OpenCode 串流超時（{self.config.timeout} 秒）") from exc
+        except asyncio.CancelledError:
+            log.info("agent_astream_cancelled", total_chars=total_chars)
+            raise
+        elapsed_ms = int((time.monotonic() - t0) * 1000)
+        log.info("agent_stream_done", duration_ms=elapsed_ms, total_chars=total_chars, mcp_calls=mcp_calls_detected)
+
+
+@instrument_agent_provider
 class CopilotSdkAgentProvider:
     """Copilot SDK provider（HTTP endpoint）"""
 
@@ -749,7 +934,11 @@ class CopilotSdkAgentProvider:
         _ = session_key
         yield self._call_api(prompt)
 
+    def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]:
+        return _astream_blocking(self.stream(prompt, session_key=session_key))
 
+
+@instrument_agent_provider
 class CodexAgentProvider:
     """OpenAI API provider for Codex / GPT-5 family models."""
 
@@ -850,24 +1039,7 @@ class CodexAgentProvider:
             "stream": True,
         }
         with self._open(f"{self._get_base_url()}/chat/completions", payload) as response:
-            for message in iter_sse_data_messages(response):
-                if message == "[DONE]":
-                    return
-                try:
-                    event = json.loads(message)
-                except json.JSONDecodeError:
-                    continue
-                choices = event.get("choices") or []
-                if not choices:
-                    continue
-                delta = choices[0].get("delta") or {}
-                content = delta.get("content")
-                if isinstance(content, str) and content:
-                    yield content
-                    continue
-                structured = extract_openai_text_content(content)
-                if structured:
-                    yield structured
+            yield from iter_chat_completion_deltas(response)
 
     def is_available(self) -> tuple[bool, str]:
         if not self.config.openai_api_key:
@@ -943,7 +1115,11 @@ class CodexAgentProvider:
         log.error("agent_stream_error", duration_ms=elapsed_ms, error=str(last_error))
         raise RuntimeError(f"Codex 串流失敗：{last_error}")
 
+    def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]:
+        return _astream_blocking(self.stream(prompt, session_key=session_key))
+
 
+@instrument_agent_provider
 class OpenClawAgentProvider:
     """Repo-local OpenClaw CLI provider."""
 
@@ -1077,8 +1253,72 @@ class OpenClawAgentProvider:
         log.error("agent_run_error", duration_ms=elapsed_ms, error="OpenClaw 回傳空內容")
         raise RuntimeError("OpenClaw 回傳空內容")
 
+    def _get_gateway_url(self) -> str:
+        return (self.config.openclaw_gateway_url or "").strip().rstrip("/")
+
+    def _open_gateway_stream(self, prompt: str, session_key: str):
+        agent_id = self._get_agent_id()
+        payload = {
+            "model": f"openclaw:{agent_id}",
+            "stream": True,
+            "user": session_key,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "x-openclaw-agent-id": agent_id,
+            "x-openclaw-session-key": session_key,
+        }
+        if self.config.openclaw_gateway_token:
+            headers["Authorization"] = f"Bearer {self.config.openclaw_gateway_token}"
+        req = request.Request(
+            f"{self._get_gateway_url()}/v1/chat/completions",
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        return request.urlopen(req, timeout=self.config.timeout)
+
+    def _stream_via_gateway(self, prompt: str, session_key: str) -> Iterator[str]:
+        with self._open_gateway_stream(prompt, session_key) as response:
+            yield from iter_chat_completion_deltas(response)
+
     def stream(self, prompt: str, session_key: Optional[str] = None) -> Iterator[str]:
-        yield self.run(prompt, session_key=session_key)
+        """Stream text deltas from the Gateway SSE endpoint, or fall back to one CLI run.
+
+        Token-level streaming needs ``EXAM_OPENCLAW_GATEWAY_URL`` in agent mode; the
+        CLI ``--json`` output only arrives once the whole turn has finished.
+        """
+        if self._get_mode() != "agent" or not self._get_gateway_url():
+            yield self.run(prompt, session_key=session_key)
+            return
+
+        resolved_session_key = session_key or self._default_session_key()
+        log = logger.bind(provider="openclaw", model=self._get_model(), session_key=resolved_session_key)
+        log.info("agent_stream_start", prompt_len=len(prompt), transport="gateway-sse")
+        t0 = time.monotonic()
+        total_chars = 0
+        try:
+            for delta in self._stream_via_gateway(prompt, resolved_session_key):
+                if not delta:
+                    continue
+                total_chars += len(delta)
+                yield delta
+        except (HTTPError, URLError, RuntimeError, OSError) as exc:
+            elapsed_ms = int((time.monotonic() - t0) * 1000)
+            if total_chars:
+                log.error("agent_stream_error", duration_ms=elapsed_ms, error=str(exc))
+                raise RuntimeError(f"OpenClaw 串流失敗：{exc}") from exc
+            log.warning("openclaw_gateway_stream_unavailable", duration_ms=elapsed_ms, error=str(exc))
+            yield self.run(prompt, session_key=resolved_session_key)
+            return
+
+        elapsed_ms = int((time.monotonic() - t0) * 1000)
+        log.info("agent_stream_done", duration_ms=elapsed_ms, total_chars=total_chars)
+
+    def astream(self, prompt: str, session_key: Optional[str] = None) -> AsyncIterator[str]:
+        return _astream_blocking(self.stream(prompt, session_key=session_key))
 
 
 def create_agent_provider(config: AgentProviderConfig) -> IAgentProvider:
@@ -0,0 +1,44 @@
+"""Append-only text buffer for streamed agent output, with a bounded tail for live previews."""
+
+from __future__ import annotations
+
+import io
+from collections import deque
+
+DEFAULT_TAIL_CHARS = 3000
+
+
+class StreamTextBuffer:
+    """Full-text accumulator plus a ring buffer holding at least the last ``tail_chars`` characters."""
+
+    def __init__(self, tail_chars: int = DEFAULT_TAIL_CHARS) -> None:
+        self.tail_chars = max(int(tail_chars), 1)
+        self._full = io.StringIO()
+        self._tail: deque[str] = deque()
+        self._tail_size = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._full.write(chunk)
+        self._size += len(chunk)
+        self._tail.append(chunk)
+        self._tail_size += len(chunk)
+        # 丟掉整段超出視窗的舊 chunk；保留的總長度仍 >= tail_chars
+        while len(self._tail) > 1 and self._tail_size - len(self._tail[0]) >= self.tail_chars:
+            self._tail_size -= len(self._tail.popleft())
+
+    def tail(self, max_chars: int | None = None) -> str:
+        """Return the last ``max_chars`` (default ``tail_chars``) characters without copying the full text."""
+        limit = min(self.tail_chars if max_chars is None else max_chars, self.tail_chars)
+        if limit <= 0:
+            return ""
+        text = "".join(self._tail)
+        return text[-limit:] if len(text) > limit else text
+
+    def getvalue(self) -> str:
+        return self._full.getvalue()
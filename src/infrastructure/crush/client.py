@@ -3,8 +3,7 @@
 import os
 import shutil
 import subprocess
-from dataclasses import field
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -49,7 +48,6 @@ class CrushClient:
         if executable and shutil.which(executable):
             return
         raise FileNotFoundError(f"Crush executable not found: {self.config.executable_path}")
-            raise FileNotFoundError(f"Crush executable not found: {self.config.executable_path}")
 
     def run(self, prompt: str, quiet: bool = True) -> str:
         """
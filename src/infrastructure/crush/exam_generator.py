@@ -8,18 +8,24 @@ Exam Generator - Crush 整合的考題生成器
 - 題目/選項/詳解分段處理
 """
 
-import json
 import logging
-import re
-import subprocess
 import os
+import re
 import shutil
+import subprocess
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Callable, Generator, Optional
 
+from src.infrastructure.agent.json_stream import (
+    IncrementalJsonObjectScanner,
+    find_mcp_save_result,
+    split_at_question_id,
+)
+from src.infrastructure.agent.stream_buffer import StreamTextBuffer
+
 
 def _resolve_crush_executable(explicit: str | None = None) -> str:
     if explicit and explicit.strip():
@@ -50,6 +56,9 @@ def _terminate_process(process: subprocess.Popen[str], timeout: float = 2.0) ->
 # 設定 logger
 logger = logging.getLogger(__name__)
 
+# 足以容納跨行切斷的「題目 ID: <uuid>」標記
+MCP_MARKER_WINDOW_CHARS = 160
+
 
 class GenerationPhase(Enum):
     """生成階段"""
@@ -130,7 +139,7 @@ class ExamGenerator:
         self.current_phase = GenerationPhase.INITIALIZING
         self.questions: list[QuestionDraft] = []
         self.current_question: Optional[QuestionDraft] = None
-        self.raw_output = ""
+        self._raw_output = StreamTextBuffer()
 
         # 回呼函數
         self._on_event: Optional[Callable[[GenerationEvent], None]] = None
@@ -138,12 +147,21 @@ class ExamGenerator:
 
         self._validate()
 
+    @property
+    def raw_output(self) -> str:
+        """本次生成的完整原始輸出"""
+        return self._raw_output.getvalue()
+
+    @property
+    def raw_output_tail(self) -> str:
+        """最近約 3000 字元的輸出，供即時預覽使用"""
+        return self._raw_output.tail()
+
     def _validate(self):
         """驗證 Crush 執行檔"""
         if self.crush_path.exists() or shutil.which(str(self.crush_path)):
             return
         raise FileNotFoundError(f"Crush not found: {self.crush_path}")
-            raise FileNotFoundError(f"Crush not found: {self.crush_path}")
 
     def set_event_handler(self, handler: Callable[[GenerationEvent], None]):
         """設定事件處理器"""
@@ -172,31 +190,19 @@ class ExamGenerator:
         if self._on_chunk:
             self._on_chunk(chunk)
 
-    def _parse_mcp_result(self, text: str) -> Optional[dict]:
-        """解析 MCP 工具調用結果"""
-        # 尋找 JSON 格式的結果
-        patterns = [
-            r'\{[^{}]*"question_id"\s*:\s*"[^"]+?"[^{}]*\}',
-            r'\{[^{}]*"success"\s*:\s*true[^{}]*\}',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                try:
-                    result = json.loads(match)
-                    if result.get("question_id"):
-                        return result
-                except json.JSONDecodeError:
-                    continue
-
-        # 嘗試尋找題目 ID 格式
+    @staticmethod
+    def _parse_question_id_marker(text: str) -> Optional[dict]:
+        """解析代理在儲存後印出的「題目 ID: <uuid>」文字標記"""
         id_match = re.search(r'題目\s*ID[：:]\s*[`"]?([a-f0-9-]{36})[`"]?', text)
         if id_match:
             return {"question_id": id_match.group(1), "success": True}
-
         return None
 
+    @staticmethod
+    def _detect_mcp_results(payloads: list[object]) -> list[dict]:
+        """從串流中剛完成的 JSON 物件挑出所有 MCP 儲存結果（依出現順序）"""
+        return [result for result in map(find_mcp_save_result, payloads) if result is not None]
+
     def _parse_question_content(self, text: str) -> Optional[QuestionDraft]:
         """從文字中解析題目內容"""
         draft = QuestionDraft(index=len(self.questions) + 1)
@@ -276,7 +282,7 @@ class ExamGenerator:
             list[QuestionDraft]: 生成的題目列表
         """
         self.questions = []
-        self.raw_output = ""
+        self._raw_output = StreamTextBuffer()
 
         # 建構 prompt
         prompt = self._build_prompt(
@@ -306,7 +312,9 @@ class ExamGenerator:
         )
 
         try:
-            current_question_buffer = ""
+            question_buffer_parts: list[str] = []
+            marker_window = ""
+            json_scanner = IncrementalJsonObjectScanner()
 
             self._emit_event(GenerationPhase.THINKING, "AI 正在思考...")
 
@@ -316,14 +324,22 @@ class ExamGenerator:
 
                 # 發送原始文字塊
                 self._emit_chunk(line)
-                self.raw_output += line
-                current_question_buffer += line
-
-                # 偵測 MCP 調用
-                mcp_result = self._parse_mcp_result(current_question_buffer)
-                if mcp_result and mcp_result.get("question_id"):
-                    # 解析題目內容
-                    draft = self._parse_question_content(current_question_buffer)
+                self._raw_output.append(line)
+                question_buffer_parts.append(line)
+
+                # 偵測 MCP 調用（只掃描新進文字，避免每行重掃整個緩衝區）
+                mcp_results = self._detect_mcp_results(json_scanner.feed(line))
+                if not mcp_results:
+                    marker_window = (marker_window + line)[-MCP_MARKER_WINDOW_CHARS:]
+                    marker_result = self._parse_question_id_marker(marker_window)
+                    mcp_results = [marker_result] if marker_result else []
+                pending_text = "".join(question_buffer_parts)
+                for mcp_result in mcp_results:
+                    if not mcp_result.get("question_id"):
+                        continue
+                    # 解析題目內容（每個結果只取到自己的 question_id 為止）
+                    segment, pending_text = split_at_question_id(pending_text, mcp_result["question_id"])
+                    draft = self._parse_question_content(segment)
                     if draft:
                         draft.question_id = mcp_result["question_id"]
                         draft.is_saved = True
@@ -338,8 +354,10 @@ class ExamGenerator:
 
                         logger.info(f"Question {len(self.questions)} saved: {draft.question_id}")
 
+                if mcp_results:
                     # 重置緩衝區
-                    current_question_buffer = ""
+                    question_buffer_parts = [pending_text] if pending_text else []
+                    marker_window = ""
 
                 # 偵測生成階段
                 if "題目" in line or "Question" in line:
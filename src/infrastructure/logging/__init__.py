@@ -8,6 +8,7 @@ from src.infrastructure.logging.setup import (
 	log_context,
 	new_run_id,
 	resolve_logging_config,
+	shutdown_logging,
 	unbind_log_context,
 )
 
@@ -19,5 +20,6 @@ __all__ = [
 	"log_context",
 	"new_run_id",
 	"resolve_logging_config",
+	"shutdown_logging",
 	"unbind_log_context",
 ]
@@ -0,0 +1,191 @@
+"""Queue-based log delivery: callers enqueue records, a background thread writes them in batches."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any
+
+import structlog
+
+QUEUE_POLICY_DROP = "drop"
+QUEUE_POLICY_BLOCK = "block"
+QUEUE_POLICIES = (QUEUE_POLICY_DROP, QUEUE_POLICY_BLOCK)
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 256
+# 高頻率的讀取路徑事件；預設每 N 筆保留 1 筆
+DEFAULT_SAMPLE_RATES: dict[str, int] = {
+    "question_list_loaded": 20,
+    "question_lookup_hit": 20,
+    "question_lookup_miss": 20,
+    "question_search_completed": 10,
+    "table_versions_changed": 10,
+}
+_SAMPLED_METHODS = frozenset({"debug", "info"})
+
+
+def parse_sample_rates(value: str | None) -> dict[str, int]:
+    """Parse ``event=N,event2=M``; ``N <= 1`` disables sampling for that event."""
+    rates: dict[str, int] = {}
+    for item in (value or "").split(","):
+        event, separator, raw_rate = item.partition("=")
+        if not separator or not event.strip():
+            continue
+        try:
+            rates[event.strip()] = max(int(raw_rate), 1)
+        except ValueError:
+            continue
+    return rates
+
+
+class EventSampler:
+    """Structlog processor keeping every N-th debug/info event per sampled event name."""
+
+    def __init__(self, rates: Mapping[str, int]) -> None:
+        self.rates = {event: rate for event, rate in rates.items() if rate > 1}
+        self._counters = {event: itertools.count() for event in self.rates}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        rate = self.rates.get(event_dict.get("event"))  # type: ignore[arg-type]
+        if rate is None or method_name not in _SAMPLED_METHODS:
+            return event_dict
+        # itertools.count 的 next() 在 GIL 下是原子操作，不需要鎖
+        if next(self._counters[event_dict["event"]]) % rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Enqueue records unformatted; when the queue is full either drop (and count) or block."""
+
+    def __init__(self, log_queue: queue.Queue, policy: str = QUEUE_POLICY_DROP) -> None:
+        super().__init__(log_queue)
+        self.policy = policy if policy in QUEUE_POLICIES else QUEUE_POLICY_DROP
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog 的 event dict 放在 record.msg，交給背景執行緒的 ProcessorFormatter 渲染；
+        # 只先固定 stdlib 訊息的 %-args，避免之後被呼叫端修改
+        if record.args and not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == QUEUE_POLICY_BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+            return
+        self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        """Queue a ``log_records_dropped`` warning once there is room again."""
+        with self._drop_lock:
+            newly_dropped = self.dropped - self._reported_dropped
+            if not newly_dropped:
+                return
+            notice = logging.LogRecord(__name__, logging.WARNING, __file__, 0, "log_records_dropped", None, None)
+            notice.dropped = newly_dropped
+            notice.total_dropped = self.dropped
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                return
+            self._reported_dropped = self.dropped
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that renders a batch once and writes/flushes it in one call."""
+
+    def handle_batch(self, records: list[logging.LogRecord]) -> None:
+        lines: list[str] = []
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+
+        with self.lock:
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.seek(0, 2)
+                size = self.stream.tell()
+                pending: list[str] = []
+                for line in lines:
+                    if self.maxBytes > 0 and size and size + len(line) >= self.maxBytes:
+                        self.stream.write("".join(pending))
+                        pending.clear()
+                        self.doRollover()
+                        if self.stream is None:
+                            self.stream = self._open()
+                        size = 0
+                    pending.append(line)
+                    size += len(line)
+                self.stream.write("".join(pending))
+                self.stream.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+
+class BatchingQueueListener(QueueListener):
+    """Drain up to ``batch_size`` records per wakeup and hand each handler the whole batch."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = max(int(batch_size), 1)
+
+    def enqueue_sentinel(self) -> None:
+        # 丟棄模式下佇列可能已滿，停止訊號必須等到有空位
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        log_queue = self.queue
+        has_task_done = hasattr(log_queue, "task_done")
+        stopping = False
+        while not stopping:
+            batch: list[logging.LogRecord] = []
+            taken = 0
+            record = self.dequeue(True)
+            while True:
+                taken += 1
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.handle_batch(batch)
+            if has_task_done:
+                for _ in range(taken):
+                    log_queue.task_done()
+
+    def handle_batch(self, batch: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            if isinstance(handler, BatchedRotatingFileHandler):
+                handler.handle_batch(batch)
+                continue
+            for record in batch:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
@@ -2,18 +2,32 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import queue
 import sys
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any, Generator
 
 import structlog
 
+from src.infrastructure.logging.async_pipeline import (
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SAMPLE_RATES,
+    QUEUE_POLICIES,
+    QUEUE_POLICY_DROP,
+    BatchedRotatingFileHandler,
+    BatchingQueueListener,
+    BoundedQueueHandler,
+    EventSampler,
+    parse_sample_rates,
+)
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_LOG_DIR = PROJECT_ROOT / "logs"
 LOG_DIR_ENV_VAR = "ANESTHESIA_EXAM_LOG_DIR"
@@ -21,11 +35,18 @@ LOG_LEVEL_ENV_VAR = "ANESTHESIA_EXAM_LOG_LEVEL"
 LOG_JSON_CONSOLE_ENV_VAR = "ANESTHESIA_EXAM_LOG_JSON_CONSOLE"
 LOG_MAX_BYTES_ENV_VAR = "ANESTHESIA_EXAM_LOG_MAX_BYTES"
 LOG_BACKUP_COUNT_ENV_VAR = "ANESTHESIA_EXAM_LOG_BACKUP_COUNT"
+LOG_ASYNC_ENV_VAR = "ANESTHESIA_EXAM_LOG_ASYNC"
+LOG_QUEUE_SIZE_ENV_VAR = "ANESTHESIA_EXAM_LOG_QUEUE_SIZE"
+LOG_QUEUE_POLICY_ENV_VAR = "ANESTHESIA_EXAM_LOG_QUEUE_POLICY"
+# 例如 "question_list_loaded=50,question_lookup_hit=1"（1 表示不抽樣），覆蓋預設值
+LOG_SAMPLE_ENV_VAR = "ANESTHESIA_EXAM_LOG_SAMPLE"
 DEBUG_ENV_VAR = "ANESTHESIA_EXAM_DEBUG"
 DEFAULT_MAX_BYTES = 5 * 1024 * 1024
 DEFAULT_BACKUP_COUNT = 5
 
-_BOOTSTRAP_SIGNATURE: tuple[str | None, str, bool, int, int] | None = None
+_BOOTSTRAP_SIGNATURE: tuple[Any, ...] | None = None
+_QUEUE_LISTENERS: list[QueueListener] = []
+_ATEXIT_REGISTERED = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -37,6 +58,10 @@ class LoggingConfig:
     json_console: bool
     max_bytes: int
     backup_count: int
+    async_mode: bool = False
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    queue_policy: str = QUEUE_POLICY_DROP
+    sample_rates: tuple[tuple[str, int], ...] = ()
 
 
 def _env_flag(name: str, default: bool = False) -> bool:
@@ -62,6 +87,10 @@ def resolve_logging_config(
     json_console: bool | None = None,
     max_bytes: int | None = None,
     backup_count: int | None = None,
+    async_mode: bool | None = None,
+    queue_size: int | None = None,
+    queue_policy: str | None = None,
+    sample_rates: dict[str, int] | None = None,
 ) -> LoggingConfig:
     """Resolve log settings from explicit arguments first, then env vars."""
     resolved_log_dir = log_dir
@@ -79,12 +108,24 @@ def resolve_logging_config(
         backup_count if backup_count is not None else _env_int(LOG_BACKUP_COUNT_ENV_VAR, DEFAULT_BACKUP_COUNT)
     )
 
+    resolved_async_mode = async_mode if async_mode is not None else _env_flag(LOG_ASYNC_ENV_VAR, True)
+    resolved_queue_size = queue_size if queue_size is not None else _env_int(LOG_QUEUE_SIZE_ENV_VAR, DEFAULT_QUEUE_SIZE)
+    resolved_queue_policy = (queue_policy or os.getenv(LOG_QUEUE_POLICY_ENV_VAR) or QUEUE_POLICY_DROP).strip().lower()
+    if resolved_queue_policy not in QUEUE_POLICIES:
+        resolved_queue_policy = QUEUE_POLICY_DROP
+    if sample_rates is None:
+        sample_rates = {**DEFAULT_SAMPLE_RATES, **parse_sample_rates(os.getenv(LOG_SAMPLE_ENV_VAR))}
+
     return LoggingConfig(
         log_dir=Path(resolved_log_dir) if resolved_log_dir else None,
         level=resolved_level,
         json_console=resolved_json_console,
         max_bytes=resolved_max_bytes,
         backup_count=resolved_backup_count,
+        async_mode=resolved_async_mode,
+        queue_size=resolved_queue_size,
+        queue_policy=resolved_queue_policy,
+        sample_rates=tuple(sorted((event, rate) for event, rate in sample_rates.items() if rate > 1)),
     )
 
 
@@ -94,9 +135,20 @@ def configure_logging(
     json_console: bool = False,
     max_bytes: int = DEFAULT_MAX_BYTES,
     backup_count: int = DEFAULT_BACKUP_COUNT,
+    async_mode: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    queue_policy: str = QUEUE_POLICY_DROP,
+    sample_rates: dict[str, int] | None = None,
 ) -> None:
-    """初始化結構化 logging。"""
+    """初始化結構化 logging。
+
+    async_mode 下呼叫端只把 record 放進有界佇列，渲染與寫檔都在背景執行緒批次完成。
+    """
     log_level = getattr(logging, level.upper(), logging.INFO)
+    # 先拆掉舊的 queue handler 再停背景執行緒，避免重新設定期間有 record 寫進已停止的佇列
+    logging.getLogger().handlers.clear()
+    logging.getLogger("mcp_trace").handlers.clear()
+    shutdown_logging()
 
     shared_processors: list[structlog.types.Processor] = [
         structlog.contextvars.merge_contextvars,
@@ -111,6 +163,8 @@ def configure_logging(
 
     structlog.configure(
         processors=[
+            # 抽樣放最前面，被丟掉的事件不會跑後面的 processor
+            EventSampler(sample_rates or {}),
             *shared_processors,
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
@@ -156,7 +210,8 @@ def configure_logging(
         log_dir = Path(log_dir)
         log_dir.mkdir(parents=True, exist_ok=True)
 
-        file_handler = RotatingFileHandler(
+        file_handler_class = BatchedRotatingFileHandler if async_mode else RotatingFileHandler
+        file_handler = file_handler_class(
             log_dir / "app.log",
             maxBytes=max_bytes,
             backupCount=backup_count,
@@ -166,7 +221,7 @@ def configure_logging(
         file_handler.setFormatter(json_formatter)
         handlers.append(file_handler)
 
-        mcp_handler = RotatingFileHandler(
+        mcp_handler = file_handler_class(
             log_dir / "mcp.log",
             maxBytes=max_bytes,
             backupCount=backup_count,
@@ -174,15 +229,48 @@ def configure_logging(
         )
         mcp_handler.setLevel(logging.DEBUG)
         mcp_handler.setFormatter(json_formatter)
-        mcp_logger.addHandler(mcp_handler)
+        mcp_logger.addHandler(_queued(mcp_handler, queue_size, queue_policy) if async_mode else mcp_handler)
 
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
+    if async_mode:
+        handlers = [_queued(handlers, queue_size, queue_policy)]
     for handler in handlers:
         root_logger.addHandler(handler)
     root_logger.setLevel(log_level)
 
 
+def _queued(
+    handlers: logging.Handler | list[logging.Handler],
+    queue_size: int,
+    queue_policy: str,
+) -> BoundedQueueHandler:
+    """Put ``handlers`` behind a bounded queue drained by a background listener thread."""
+    global _ATEXIT_REGISTERED
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    targets = handlers if isinstance(handlers, list) else [handlers]
+    listener = BatchingQueueListener(log_queue, *targets)
+    listener.start()
+    _QUEUE_LISTENERS.append(listener)
+    if not _ATEXIT_REGISTERED:
+        atexit.register(shutdown_logging)
+        _ATEXIT_REGISTERED = True
+    return BoundedQueueHandler(log_queue, policy=queue_policy)
+
+
+def shutdown_logging() -> None:
+    """Drain and stop background log writers (registered with atexit in async mode)."""
+    while _QUEUE_LISTENERS:
+        listener = _QUEUE_LISTENERS.pop()
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        for handler in listener.handlers:
+            handler.close()
+
+
 def bootstrap_logging(
     app_name: str,
     *,
@@ -191,6 +279,7 @@ def bootstrap_logging(
     json_console: bool | None = None,
     max_bytes: int | None = None,
     backup_count: int | None = None,
+    async_mode: bool | None = None,
     extra_context: dict[str, Any] | None = None,
 ) -> structlog.stdlib.BoundLogger:
     """Idempotent bootstrap used by web, MCP, scripts and CLI entrypoints."""
@@ -202,6 +291,7 @@ def bootstrap_logging(
         json_console=json_console,
         max_bytes=max_bytes,
         backup_count=backup_count,
+        async_mode=async_mode,
     )
     signature = (
         str(config.log_dir) if config.log_dir else None,
@@ -209,6 +299,10 @@ def bootstrap_logging(
         config.json_console,
         config.max_bytes,
         config.backup_count,
+        config.async_mode,
+        config.queue_size,
+        config.queue_policy,
+        config.sample_rates,
     )
     if _BOOTSTRAP_SIGNATURE != signature:
         configure_logging(
@@ -217,6 +311,10 @@ def bootstrap_logging(
             json_console=config.json_console,
             max_bytes=config.max_bytes,
             backup_count=config.backup_count,
+            async_mode=config.async_mode,
+            queue_size=config.queue_size,
+            queue_policy=config.queue_policy,
+            sample_rates=dict(config.sample_rates),
         )
         _BOOTSTRAP_SIGNATURE = signature
 
@@ -233,6 +331,9 @@ def bootstrap_logging(
         json_console=config.json_console,
         max_bytes=config.max_bytes,
         backup_count=config.backup_count,
+        async_mode=config.async_mode,
+        queue_policy=config.queue_policy if config.async_mode else None,
+        sampled_events=len(config.sample_rates),
     )
     return logger
 
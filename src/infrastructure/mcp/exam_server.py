@@ -16,11 +16,14 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from src.application.services.adaptive_practice_service import get_adaptive_practice_selector
 from src.application.services.exam_tool_application_service import ExamToolApplicationService
 from src.application.services.past_exam_extraction_service import PastExamExtractionService
 from src.domain.entities.past_exam import Concept, PastExam
 from src.infrastructure.logging import bootstrap_logging, get_logger, new_run_id
 from src.infrastructure.mcp.exam_tool_handlers import build_tool_handler_registry, dispatch_tool
+from src.infrastructure.metrics import MCP_TOOL_CALL_SECONDS, maybe_start_metrics_server
+from src.infrastructure.persistence.sqlite_exam_catalog_repo import get_exam_catalog_repository
 from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
 from src.infrastructure.persistence.sqlite_question_repo import get_question_repository
 
@@ -487,6 +490,8 @@ def _build_question_tool_service() -> ExamToolApplicationService:
         project_root=PROJECT_ROOT,
         exams_dir=EXAMS_DIR,
         questions_dir=QUESTIONS_DIR,
+        exam_catalog=get_exam_catalog_repository(),
+        practice_selector=get_adaptive_practice_selector(),
     )
 
 
@@ -595,10 +600,30 @@ def create_exam_mcp_server() -> Server:
                     "type": "object",
                     "properties": {
                         "name": {"type": "string", "description": "考卷名稱"},
-                        "question_count": {"type": "integer", "description": "題數"},
+                        "question_count": {"type": "integer", "description": "題數（有藍圖時忽略）"},
                         "topics": {"type": "array", "items": {"type": "string"}, "description": "範圍限定"},
+                        "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"], "description": "難度"},
+                        "exam_track": {"type": "string", "description": "考試類型（ite/pgy/clerk/...）"},
+                        "validated_only": {"type": "boolean", "description": "只選已審查通過的題目"},
+                        "adaptive_user_id": {
+                            "type": "string",
+                            "description": "依此使用者的作答紀錄優先選弱點、到期與沒做過的題目",
+                        },
+                        "blueprint": {
+                            "type": "array",
+                            "description": "組卷藍圖：每格指定知識點 × 難度 × 題數",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "topic": {"type": "string"},
+                                    "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
+                                    "count": {"type": "integer"},
+                                },
+                                "required": ["count"],
+                            },
+                        },
                     },
-                    "required": ["name", "question_count"],
+                    "required": ["name"],
                 },
             ),
             Tool(
@@ -931,6 +956,7 @@ def create_exam_mcp_server() -> Server:
         """處理工具調用"""
 
         t0 = time.monotonic()
+        outcome = "invalid"
         log = mcp_logger.bind(tool=name)
         log.info("mcp_tool_call_start", arguments=_safe_args(arguments) if isinstance(arguments, dict) else arguments)
 
@@ -966,6 +992,7 @@ def create_exam_mcp_server() -> Server:
 
             elapsed_ms = int((time.monotonic() - t0) * 1000)
             success = result.get("success", not result.get("error"))
+            outcome = "ok" if success else "failed"
             log.info(
                 "mcp_tool_call_done",
                 duration_ms=elapsed_ms,
@@ -976,8 +1003,11 @@ def create_exam_mcp_server() -> Server:
             return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         except Exception as e:
             elapsed_ms = int((time.monotonic() - t0) * 1000)
+            outcome = "error"
             log.exception("mcp_tool_call_error", error=str(e), duration_ms=elapsed_ms)
             return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+        finally:
+            MCP_TOOL_CALL_SECONDS.observe(time.monotonic() - t0, tool=name, outcome=outcome)
 
     return server
 
@@ -1739,6 +1769,7 @@ async def main():
     """啟動 MCP Server"""
     run_id = new_run_id("mcp")
     bootstrap_logging(__name__, extra_context={"run_id": run_id, "provider": "mcp"})
+    maybe_start_metrics_server("mcp")
     logger.info("mcp_server_start", transport="stdio")
     server = create_exam_mcp_server()
 
@@ -0,0 +1,61 @@
+"""In-process latency metrics and Prometheus text exposition."""
+
+from src.infrastructure.metrics.exposition import (
+    format_metrics_summary,
+    maybe_start_metrics_server,
+    start_metrics_server,
+    summarize_histograms,
+)
+from src.infrastructure.metrics.instruments import (
+    AGENT_CALL_SECONDS,
+    DB_BUSY_ERRORS,
+    DB_CHECKOUT_SECONDS,
+    DB_HOLD_SECONDS,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+    DB_WAL_BYTES,
+    DB_WRITE_LOCK_WAIT_SECONDS,
+    LLM_CALL_SECONDS,
+    MCP_TOOL_CALL_SECONDS,
+    REPOSITORY_CALL_SECONDS,
+    instrument_agent_provider,
+    instrument_repository,
+)
+from src.infrastructure.metrics.registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    get_metrics_registry,
+    histogram_quantile,
+    instrument_methods,
+)
+
+__all__ = [
+    "AGENT_CALL_SECONDS",
+    "Counter",
+    "DB_BUSY_ERRORS",
+    "DB_CHECKOUT_SECONDS",
+    "DB_HOLD_SECONDS",
+    "DB_POOL_IN_USE",
+    "DB_POOL_OVERFLOW",
+    "DB_POOL_TIMEOUTS",
+    "DB_WAL_BYTES",
+    "DB_WRITE_LOCK_WAIT_SECONDS",
+    "Gauge",
+    "Histogram",
+    "LLM_CALL_SECONDS",
+    "MCP_TOOL_CALL_SECONDS",
+    "MetricsRegistry",
+    "REPOSITORY_CALL_SECONDS",
+    "format_metrics_summary",
+    "get_metrics_registry",
+    "histogram_quantile",
+    "instrument_agent_provider",
+    "instrument_methods",
+    "instrument_repository",
+    "maybe_start_metrics_server",
+    "start_metrics_server",
+    "summarize_histograms",
+]
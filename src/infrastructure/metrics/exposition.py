@@ -0,0 +1,134 @@
+"""Expose the metrics registry over HTTP and summarize Prometheus text for humans."""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.registry import MetricsRegistry, get_metrics_registry, histogram_quantile
+
+logger = get_logger(__name__)
+
+# 每種程序各讀自己的變數（..._WEB / _MCP / _BOT）；web 啟動的 MCP stdio 子程序會繼承
+# 整個環境，共用同一個 port 變數會讓子程序綁定失敗
+METRICS_PORT_ENV_VAR = "ANESTHESIA_EXAM_METRICS_PORT"
+METRICS_HOST_ENV_VAR = "ANESTHESIA_EXAM_METRICS_HOST"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_BUCKET_LINE = re.compile(r'^(?P<name>[a-zA-Z_:][\w:]*)_bucket\{(?P<labels>.*)\}\s+(?P<value>\S+)$')
+_LABEL_PAIR = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+_server: ThreadingHTTPServer | None = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry | None = None,
+) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` in the Prometheus text format from a daemon thread."""
+    registry = registry or get_metrics_registry()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("metrics_server_started", host=host, port=server.server_address[1])
+    return server
+
+
+def metrics_port_env_var(role: str) -> str:
+    """Port variable for one process type, e.g. ``ANESTHESIA_EXAM_METRICS_PORT_WEB``."""
+    return f"{METRICS_PORT_ENV_VAR}_{role.upper()}"
+
+
+def maybe_start_metrics_server(role: str, env: Mapping[str, str] | None = None) -> ThreadingHTTPServer | None:
+    """Start the endpoint once per process when ``ANESTHESIA_EXAM_METRICS_PORT_<ROLE>`` is set."""
+    global _server
+    env = os.environ if env is None else env
+    port_env_var = metrics_port_env_var(role)
+    raw_port = str(env.get(port_env_var) or "").strip()
+    if not raw_port:
+        if env.get(METRICS_PORT_ENV_VAR):
+            logger.warning("metrics_port_env_var_ignored", env_var=METRICS_PORT_ENV_VAR, use_instead=port_env_var)
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = start_metrics_server(int(raw_port), host=env.get(METRICS_HOST_ENV_VAR) or "127.0.0.1")
+        except (OSError, ValueError) as exc:
+            logger.warning("metrics_server_start_failed", role=role, port=raw_port, error=str(exc))
+            return None
+        return _server
+
+
+def summarize_histograms(text: str) -> list[dict]:
+    """Per-series count / p50 / p99 (seconds) from Prometheus text, busiest series first."""
+    cumulative: dict[tuple[str, tuple[tuple[str, str], ...]], list[tuple[float, float]]] = defaultdict(list)
+    for line in text.splitlines():
+        match = _BUCKET_LINE.match(line.strip())
+        if not match:
+            continue
+        labels = dict(_LABEL_PAIR.findall(match.group("labels")))
+        bound = labels.pop("le", "+Inf")
+        key = (match.group("name"), tuple(labels.items()))
+        cumulative[key].append((math.inf if bound == "+Inf" else float(bound), float(match.group("value"))))
+
+    rows: list[dict] = []
+    for (name, labels), points in cumulative.items():
+        points.sort()
+        counts = [points[0][1]] + [current[1] - previous[1] for previous, current in zip(points, points[1:])]
+        total = points[-1][1]
+        if not total:
+            continue
+        finite_bounds = [bound for bound, _ in points if not math.isinf(bound)]
+        rows.append(
+            {
+                "metric": name,
+                "labels": dict(labels),
+                "count": int(total),
+                "p50": histogram_quantile(0.5, finite_bounds, counts),
+                "p99": histogram_quantile(0.99, finite_bounds, counts),
+            }
+        )
+    rows.sort(key=lambda row: (-row["count"], row["metric"]))
+    return rows
+
+
+def format_metrics_summary(text: str, limit: int = 15) -> str:
+    """Compact latency table for chat: ``metric{labels} n=.. p50=..ms p99=..ms``."""
+    rows = summarize_histograms(text)
+    if not rows:
+        return "no latency samples yet"
+    lines = []
+    for row in rows[:limit]:
+        labels = ",".join(f"{key}={value}" for key, value in row["labels"].items() if value)
+        name = row["metric"].removeprefix("exam_").removesuffix("_seconds")
+        lines.append(
+            f"{name}{{{labels}}} n={row['count']} p50={row['p50'] * 1000:.1f}ms p99={row['p99'] * 1000:.1f}ms"
+        )
+    if len(rows) > limit:
+        lines.append(f"... {len(rows) - limit} more series")
+    return "\n".join(lines)
@@ -0,0 +1,72 @@
+"""Hot-path metrics shared by the persistence, MCP and agent layers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from src.infrastructure.metrics.registry import get_metrics_registry, instrument_methods
+
+_registry = get_metrics_registry()
+
+DB_CHECKOUT_SECONDS = _registry.histogram(
+    "db_connection_checkout_seconds",
+    "Time to check a SQLite connection out of the pool (including the liveness ping).",
+    ("db",),
+)
+DB_HOLD_SECONDS = _registry.histogram(
+    "db_connection_hold_seconds",
+    "Time a SQLite connection stays checked out.",
+    ("db",),
+)
+DB_WRITE_LOCK_WAIT_SECONDS = _registry.histogram(
+    "db_write_lock_wait_seconds",
+    "Time BEGIN IMMEDIATE spends in the SQLite busy handler waiting for the write lock.",
+    ("db",),
+)
+DB_POOL_IN_USE = _registry.gauge("db_pool_in_use", "SQLite connections currently checked out.", ("db",))
+DB_POOL_OVERFLOW = _registry.gauge("db_pool_overflow", "Checked-out connections beyond pool_size.", ("db",))
+DB_WAL_BYTES = _registry.gauge("db_wal_bytes", "Size of the SQLite -wal file.", ("db",))
+DB_POOL_TIMEOUTS = _registry.counter("db_pool_timeouts_total", "Checkouts that hit the pool timeout.", ("db",))
+DB_BUSY_ERRORS = _registry.counter(
+    "db_busy_errors_total",
+    "SQLITE_BUSY / SQLITE_LOCKED errors raised after busy_timeout ran out.",
+    ("db",),
+)
+REPOSITORY_CALL_SECONDS = _registry.histogram(
+    "repository_call_seconds",
+    "Latency of public repository methods.",
+    ("repository", "method", "outcome"),
+)
+MCP_TOOL_CALL_SECONDS = _registry.histogram(
+    "mcp_tool_call_seconds",
+    "Latency of MCP call_tool dispatches.",
+    ("tool", "outcome"),
+)
+AGENT_CALL_SECONDS = _registry.histogram(
+    "agent_call_seconds",
+    "Latency of agent provider run / stream calls (stream: until the last chunk).",
+    ("provider", "method", "outcome"),
+)
+LLM_CALL_SECONDS = _registry.histogram(
+    "llm_call_seconds",
+    "Latency of direct LLM completions made by application services.",
+    ("caller", "backend", "outcome"),
+)
+
+
+def instrument_repository(repository: str) -> Callable[[type], type]:
+    """Class decorator timing every public method of a repository into ``repository_call_seconds``."""
+    return instrument_methods(
+        REPOSITORY_CALL_SECONDS,
+        labels=lambda _self, method: {"repository": repository, "method": method},
+    )
+
+
+def instrument_agent_provider(cls: type) -> type:
+    """Class decorator timing ``run`` / ``stream`` of an agent provider into ``agent_call_seconds``."""
+    return instrument_methods(
+        AGENT_CALL_SECONDS,
+        ("run", "stream"),
+        labels=lambda self, method: {"provider": getattr(self, "name", type(self).__name__), "method": method},
+        streaming=("stream",),
+    )(cls)
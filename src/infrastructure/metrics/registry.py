@@ -0,0 +1,353 @@
+"""In-process counters, gauges and fixed-bucket latency histograms."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import inspect
+import math
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+METRIC_PREFIX = "exam_"
+# 秒；涵蓋 SQLite 單次查詢（< 1ms）到 LLM 呼叫（數分鐘）
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+LabelKey = tuple[str, ...]
+
+
+def _label_key(labelnames: Sequence[str], labels: Mapping[str, Any]) -> LabelKey:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(zip(labelnames, key))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelKey, float] = {}
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def collect(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """Point-in-time value (pool in-use, WAL size, ...) with optional labels."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelKey, float] = {}
+        self._lock = Lock()
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def collect(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "total")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * (bucket_count + 1)  # 最後一格是 +Inf
+        self.count = 0
+        self.total = 0.0
+
+
+class Histogram:
+    """Fixed-bucket histogram (non-cumulative storage, cumulative exposition)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self._series: dict[LabelKey, _HistogramSeries] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.bucket_counts[index] += 1
+            series.count += 1
+            series.total += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[dict[str, Any]]:
+        """Observe the block's duration; the yielded dict can override labels (e.g. ``outcome``)."""
+        mutable_labels = dict(labels)
+        started = time.perf_counter()
+        try:
+            yield mutable_labels
+        except GeneratorExit:
+            # 串流被呼叫端提早關閉不算錯誤
+            raise
+        except BaseException:
+            if "outcome" in mutable_labels:
+                mutable_labels["outcome"] = "error"
+            raise
+        finally:
+            self.observe(time.perf_counter() - started, **mutable_labels)
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(_label_key(self.labelnames, labels))
+        return series.count if series else 0
+
+    def quantile(self, q: float, **labels: Any) -> float | None:
+        series = self._series.get(_label_key(self.labelnames, labels))
+        if series is None or not series.count:
+            return None
+        return histogram_quantile(q, self.buckets, series.bucket_counts)
+
+    def series(self) -> list[tuple[dict[str, str], int, float, list[int]]]:
+        """(labels, count, sum, per-bucket counts) for every label combination."""
+        with self._lock:
+            return [
+                (dict(zip(self.labelnames, key)), series.count, series.total, list(series.bucket_counts))
+                for key, series in sorted(self._series.items())
+            ]
+
+    def collect(self) -> Iterator[str]:
+        for labels, count, total, bucket_counts in self.series():
+            key = _label_key(self.labelnames, labels)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), bucket_counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def histogram_quantile(q: float, buckets: Sequence[float], bucket_counts: Sequence[int]) -> float:
+    """Linear interpolation inside the bucket holding the q-th observation (PromQL semantics)."""
+    total = sum(bucket_counts)
+    rank = q * total
+    cumulative = 0
+    lower = 0.0
+    for bound, bucket_count in zip((*buckets, math.inf), bucket_counts):
+        if bucket_count and cumulative + bucket_count >= rank:
+            if math.isinf(bound):
+                return lower
+            return lower + (bound - lower) * ((rank - cumulative) / bucket_count)
+        cumulative += bucket_count
+        lower = bound
+    return lower
+
+
+class MetricsRegistry:
+    """Get-or-create registry; metric names get the ``exam_`` prefix."""
+
+    def __init__(self, prefix: str = METRIC_PREFIX) -> None:
+        self.prefix = prefix
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._lock = Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)  # type: ignore[return-value]
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], *args):
+        full_name = f"{self.prefix}{name}"
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = metric_class(full_name, documentation, labelnames, *args)
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {full_name} already registered with a different type or labels")
+            return metric
+
+    def metrics(self) -> list[Counter | Gauge | Histogram]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self.metrics():
+            metric.reset()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+def _timed_iterator(histogram: Histogram, iterator: Iterable[Any], labels: dict[str, Any]) -> Iterator[Any]:
+    """Time a stream from first ``next`` to exhaustion (or to the consumer closing it)."""
+    with histogram.time(**labels, outcome="ok"):
+        yield from iterator
+
+
+def instrument_methods(
+    histogram: Histogram,
+    method_names: Iterable[str] | None = None,
+    *,
+    labels: Callable[[Any, str], Mapping[str, Any]],
+    streaming: Iterable[str] = (),
+) -> Callable[[type], type]:
+    """Class decorator timing the given methods (default: every public method defined on the class).
+
+    Methods listed in ``streaming`` or defined as generators are timed until the
+    returned iterator is exhausted rather than until it is created.
+    """
+    streaming_names = set(streaming)
+
+    def decorate(cls: type) -> type:
+        names = (
+            list(method_names)
+            if method_names is not None
+            else [
+                name
+                for name, value in vars(cls).items()
+                if not name.startswith("_") and inspect.isfunction(value)
+            ]
+        )
+        for name in names:
+            original = vars(cls).get(name)
+            if not inspect.isfunction(original):
+                continue
+            is_stream = name in streaming_names or inspect.isgeneratorfunction(original)
+            setattr(cls, name, _wrap_method(histogram, original, name, labels, is_stream))
+        return cls
+
+    return decorate
+
+
+def _wrap_method(
+    histogram: Histogram,
+    method: F,
+    name: str,
+    labels: Callable[[Any, str], Mapping[str, Any]],
+    is_stream: bool,
+) -> F:
+    if is_stream:
+
+        @functools.wraps(method)
+        def stream_wrapper(self, *args, **kwargs):
+            return _timed_iterator(histogram, method(self, *args, **kwargs), dict(labels(self, name)))
+
+        return stream_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with histogram.time(**labels(self, name), outcome="ok"):
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
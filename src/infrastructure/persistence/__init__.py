@@ -1,6 +1,8 @@
 """Persistence helpers."""
 
+from .sqlite_exam_catalog_repo import SQLiteExamCatalogRepository, get_exam_catalog_repository
 from .sqlite_past_exam_repo import SQLitePastExamRepository, get_past_exam_repository
+from .sqlite_practice_attempt_repo import SQLitePracticeAttemptRepository, get_practice_attempt_repository
 from .sqlite_question_repo import SQLiteQuestionRepository, get_question_repository
 
 __all__ = [
@@ -8,4 +10,8 @@ __all__ = [
     "get_question_repository",
     "SQLitePastExamRepository",
     "get_past_exam_repository",
+    "SQLiteExamCatalogRepository",
+    "get_exam_catalog_repository",
+    "SQLitePracticeAttemptRepository",
+    "get_practice_attempt_repository",
 ]
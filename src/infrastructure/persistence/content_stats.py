@@ -0,0 +1,113 @@
+"""Question-bank content statistics answered in a single SQL statement."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.persistence.database import get_read_connection
+
+logger = get_logger(__name__)
+
+DEFAULT_TOP_TOPICS = 10
+DEFAULT_RECENT_DAYS = 7
+# 統計會讀到的表；任一張的 table_versions 變動就重算快取
+CONTENT_STATS_SOURCE_TABLES = ("questions", "past_exams", "past_exam_questions", "exams")
+CONTENT_STATS_MAX_AGE_SECONDS = 600
+
+CONTENT_STATS_SQL = """
+    WITH question_totals AS (
+        SELECT
+            COALESCE(SUM(is_deleted = 0), 0) AS total,
+            COALESCE(SUM(is_deleted = 0 AND is_validated = 1), 0) AS validated,
+            COALESCE(SUM(is_deleted = 1), 0) AS deleted,
+            COALESCE(SUM(is_deleted = 0 AND created_at >= :recent_since), 0) AS recent
+        FROM questions
+    ),
+    difficulty_counts AS (
+        SELECT COALESCE(difficulty, 'unknown') AS label, COUNT(*) AS n
+        FROM questions WHERE is_deleted = 0 GROUP BY 1
+    ),
+    type_counts AS (
+        SELECT COALESCE(question_type, 'unknown') AS label, COUNT(*) AS n
+        FROM questions WHERE is_deleted = 0 GROUP BY 1
+    ),
+    topic_counts AS (
+        SELECT topic AS label, COUNT(*) AS n
+        FROM question_topics GROUP BY topic
+        ORDER BY n DESC, topic LIMIT :top_topics
+    ),
+    past_question_totals AS (
+        SELECT
+            COUNT(*) AS question_count,
+            COALESCE(SUM(correct_answer IS NOT NULL AND TRIM(correct_answer) != ''), 0) AS answered
+        FROM past_exam_questions
+    )
+    SELECT
+        question_totals.total,
+        question_totals.validated,
+        question_totals.deleted,
+        question_totals.recent,
+        (SELECT json_group_object(label, n) FROM difficulty_counts) AS by_difficulty,
+        (SELECT json_group_object(label, n) FROM type_counts) AS by_type,
+        (SELECT json_group_object(label, n) FROM topic_counts) AS by_topic,
+        (SELECT COUNT(*) FROM past_exams) AS past_exam_count,
+        past_question_totals.question_count AS past_exam_question_count,
+        past_question_totals.answered AS past_exam_answered_count,
+        (SELECT COUNT(*) FROM exams) AS generated_exam_count
+    FROM question_totals, past_question_totals
+"""
+
+
+def load_content_stats(
+    db_path: Path | None = None,
+    *,
+    top_topics: int = DEFAULT_TOP_TOPICS,
+    recent_days: int = DEFAULT_RECENT_DAYS,
+) -> dict[str, Any]:
+    """
+    Load every content counter in one query.
+
+    Returns ``{"questions": ..., "past_exams": ..., "generated_exam_count": n}``;
+    ``questions`` has the same shape as ``SQLiteQuestionRepository.get_statistics()``
+    and ``past_exams`` the same shape as ``SQLitePastExamRepository.get_statistics()``.
+    """
+    recent_since = (datetime.now() - timedelta(days=recent_days)).isoformat()
+    with get_read_connection(db_path) as conn:
+        row = conn.execute(
+            CONTENT_STATS_SQL,
+            {"recent_since": recent_since, "top_topics": max(int(top_topics), 0)},
+        ).fetchone()
+
+    stats = {
+        "questions": {
+            "total": int(row["total"]),
+            "by_difficulty": _decode_counts(row["by_difficulty"]),
+            "by_type": _decode_counts(row["by_type"]),
+            "by_topic": _decode_counts(row["by_topic"]),
+            "validated": int(row["validated"]),
+            "deleted": int(row["deleted"]),
+            "recent_7_days": int(row["recent"]),
+        },
+        "past_exams": {
+            "exam_count": int(row["past_exam_count"]),
+            "question_count": int(row["past_exam_question_count"]),
+            "answered_question_count": int(row["past_exam_answered_count"]),
+        },
+        "generated_exam_count": int(row["generated_exam_count"]),
+    }
+    logger.debug(
+        "content_stats_loaded",
+        question_count=stats["questions"]["total"],
+        past_exam_count=stats["past_exams"]["exam_count"],
+        generated_exam_count=stats["generated_exam_count"],
+    )
+    return stats
+
+
+def _decode_counts(payload: str | None) -> dict[str, int]:
+    # json_group_object 在沒有任何列時回傳 '{}'；json.loads 會保留 SQL 排序
+    return json.loads(payload) if payload else {}
@@ -2,17 +2,35 @@
 Database Connection - SQLite 資料庫連線管理
 
 提供 SQLite 資料庫的連線和初始化功能。
+
+- ``get_read_connection``：唯讀連線池（``mode=ro`` + ``query_only``），WAL 下不會擋寫入
+- ``get_write_connection`` / ``submit_write`` / ``execute_write``：每個程序單一寫入連線，
+  小寫入由背景執行緒合併成一個交易（見 ``sqlite_writer``）
+- ``get_connection``：舊的讀寫連線池，保留給腳本與尚未拆分的呼叫端
 """
 
+import atexit
 import os
 import sqlite3
+import time
+from concurrent.futures import Future
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Lock
-from typing import Generator
+from typing import Any, Callable, Generator, TypeVar
 
 from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import DB_CHECKOUT_SECONDS, DB_HOLD_SECONDS
+from src.infrastructure.persistence.pool_monitor import (
+    PoolAlertThresholds,
+    POOL_MONITOR_INFO_KEY,
+    SQLitePoolMonitor,
+    is_busy_error,
+    monitor_for_connection,
+)
+from src.infrastructure.persistence.sqlite_writer import DEFAULT_WRITE_BATCH_SIZE, SQLiteWriter, WriterConnection
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.pool import QueuePool
 
 # 預設資料庫路徑
@@ -24,15 +42,38 @@ SQLITE_POOL_TIMEOUT_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_POOL_TIMEOUT"
 SQLITE_BUSY_TIMEOUT_MS_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_BUSY_TIMEOUT_MS"
 SQLITE_WAL_AUTOCHECKPOINT_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_WAL_AUTOCHECKPOINT"
 SQLITE_ENABLE_WAL_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_ENABLE_WAL"
+SQLITE_POOL_WARN_UTILIZATION_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_POOL_WARN_UTILIZATION"
+SQLITE_POOL_WARN_CHECKOUT_MS_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_POOL_WARN_CHECKOUT_MS"
+SQLITE_WAL_WARN_MB_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_WAL_WARN_MB"
+SQLITE_WRITE_BATCH_SIZE_ENV_VAR = "ANESTHESIA_EXAM_SQLITE_WRITE_BATCH_SIZE"
 DEFAULT_SQLITE_POOL_SIZE = 8
 DEFAULT_SQLITE_MAX_OVERFLOW = 16
 DEFAULT_SQLITE_POOL_TIMEOUT = 30.0
 DEFAULT_SQLITE_BUSY_TIMEOUT_MS = 15000
 DEFAULT_SQLITE_WAL_AUTOCHECKPOINT = 1000
+DEFAULT_SQLITE_POOL_WARN_UTILIZATION = 0.8
+DEFAULT_SQLITE_POOL_WARN_CHECKOUT_MS = 250.0
+DEFAULT_SQLITE_WAL_WARN_MB = 64.0
+# trigram 讓中文題幹可做子字串檢索；SQLite < 3.34 沒有 trigram 時退回 unicode61
+FTS_TOKENIZER = "trigram" if sqlite3.sqlite_version_info >= (3, 34, 0) else "unicode61"
 logger = get_logger(__name__)
 _POOL_REGISTRY: dict[str, QueuePool] = {}
 _POOL_SIGNATURES: dict[str, tuple[int, int, float, int, int, bool]] = {}
+_POOL_MONITORS: dict[str, SQLitePoolMonitor] = {}
+_WRITERS: dict[str, SQLiteWriter] = {}
+READ_ONLY_POOL_SUFFIX = "?mode=ro"
+T = TypeVar("T")
 _POOL_LOCK = Lock()
+# 讀模型快取依賴的資料表；任一列異動都會由觸發器遞增 table_versions.version
+TRACKED_READ_MODEL_TABLES = (
+    "questions",
+    "question_drafts",
+    "past_exams",
+    "past_exam_questions",
+    "scope_requests",
+    "exams",
+    "practice_attempts",
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -99,6 +140,18 @@ def resolve_sqlite_runtime_config() -> SQLiteRuntimeConfig:
     )
 
 
+def resolve_pool_alert_thresholds() -> PoolAlertThresholds:
+    """Resolve pool saturation / slow checkout / WAL size warning thresholds from the environment."""
+    return PoolAlertThresholds(
+        utilization=min(
+            _env_float(SQLITE_POOL_WARN_UTILIZATION_ENV_VAR, DEFAULT_SQLITE_POOL_WARN_UTILIZATION, minimum=0.01),
+            1.0,
+        ),
+        checkout_ms=_env_float(SQLITE_POOL_WARN_CHECKOUT_MS_ENV_VAR, DEFAULT_SQLITE_POOL_WARN_CHECKOUT_MS),
+        wal_bytes=int(_env_float(SQLITE_WAL_WARN_MB_ENV_VAR, DEFAULT_SQLITE_WAL_WARN_MB) * 1024 * 1024),
+    )
+
+
 def _pool_key(db_path: Path) -> str:
     return str(db_path.resolve())
 
@@ -134,11 +187,12 @@ def _apply_sqlite_pragmas(conn, db_path: Path, config: SQLiteRuntimeConfig) -> s
     return journal_mode
 
 
-def _open_sqlite_connection(db_path: Path, config: SQLiteRuntimeConfig):
+def _open_sqlite_connection(db_path: Path, config: SQLiteRuntimeConfig, factory=sqlite3.Connection):
     conn = sqlite3.connect(
         db_path,
         timeout=config.busy_timeout_ms / 1000,
         check_same_thread=False,
+        factory=factory,
     )
     conn.row_factory = sqlite3.Row
     journal_mode = _apply_sqlite_pragmas(conn, db_path, config)
@@ -151,37 +205,120 @@ def _open_sqlite_connection(db_path: Path, config: SQLiteRuntimeConfig):
     return conn
 
 
+def _open_read_only_connection(db_path: Path, config: SQLiteRuntimeConfig):
+    try:
+        conn = sqlite3.connect(
+            f"{db_path.as_uri()}?mode=ro",
+            uri=True,
+            timeout=config.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+    except sqlite3.OperationalError as exc:
+        # 例如 WAL 的 -shm 無法建立；退回一般連線，仍以 query_only 擋寫入
+        logger.warning("sqlite_read_only_open_failed", db_path=str(db_path), error=str(exc))
+        conn = sqlite3.connect(db_path, timeout=config.busy_timeout_ms / 1000, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {config.busy_timeout_ms}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA query_only = ON")
+    logger.debug("sqlite_read_connection_configured", db_path=str(db_path))
+    return conn
+
+
+def _discard_pool_entries(key: str) -> list[QueuePool | SQLiteWriter]:
+    """Drop the read-write pool, read-only pool and writer for ``key``; caller holds ``_POOL_LOCK``."""
+    discarded: list[QueuePool | SQLiteWriter] = []
+    for pool_key in (key, key + READ_ONLY_POOL_SUFFIX):
+        pool = _POOL_REGISTRY.pop(pool_key, None)
+        _POOL_SIGNATURES.pop(pool_key, None)
+        _POOL_MONITORS.pop(pool_key, None)
+        if pool is not None:
+            discarded.append(pool)
+    writer = _WRITERS.pop(key, None)
+    if writer is not None:
+        discarded.append(writer)
+    return discarded
+
+
+def _close_discarded(discarded: list[QueuePool | SQLiteWriter]) -> None:
+    for item in discarded:
+        if isinstance(item, SQLiteWriter):
+            item.close()
+        else:
+            item.dispose()
+
+
 def dispose_connection_pool(db_path: Path | None = None) -> None:
     """Dispose a pooled connection set so future checkouts get fresh connections."""
     db_path = db_path or get_db_path()
     key = _pool_key(db_path)
     with _POOL_LOCK:
-        pool = _POOL_REGISTRY.pop(key, None)
-        _POOL_SIGNATURES.pop(key, None)
-    if pool is not None:
-        pool.dispose()
+        discarded = _discard_pool_entries(key)
+    if discarded:
+        _close_discarded(discarded)
         logger.info("sqlite_pool_disposed", db_path=str(db_path))
 
 
+def _close_all_writers() -> None:
+    """Flush queued batched writes before the interpreter exits."""
+    with _POOL_LOCK:
+        writers = list(_WRITERS.values())
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(_close_all_writers)
+
+
 def get_connection_pool(db_path: Path | None = None) -> QueuePool:
     """Return a per-process SQLAlchemy QueuePool for SQLite connections."""
+    return _get_pool_entry(db_path)[0]
+
+
+def get_pool_monitor(db_path: Path | None = None) -> SQLitePoolMonitor:
+    """Return the monitor attached to the pool for ``db_path`` (creating the pool if needed)."""
+    return _get_pool_entry(db_path)[1]
+
+
+def get_pool_stats(db_path: Path | None = None) -> dict[str, Any]:
+    """
+    取得連線池使用統計（in-use / overflow 峰值、checkout 等待、SQLITE_BUSY、WAL 大小）
+
+    用來依實際資料調整 ANESTHESIA_EXAM_SQLITE_POOL_SIZE / MAX_OVERFLOW。
+    唯讀池與寫入連線已建立時，分別放在 ``read_pool`` / ``writer``。
+    """
+    stats = get_pool_monitor(db_path).stats()
+    key = _pool_key((db_path or get_db_path()).resolve())
+    with _POOL_LOCK:
+        read_monitor = _POOL_MONITORS.get(key + READ_ONLY_POOL_SUFFIX)
+        writer = _WRITERS.get(key)
+    if read_monitor is not None:
+        stats["read_pool"] = read_monitor.stats()
+    if writer is not None:
+        stats["writer"] = writer.stats()
+    return stats
+
+
+def _get_pool_entry(db_path: Path | None = None, read_only: bool = False) -> tuple[QueuePool, SQLitePoolMonitor]:
     db_path = (db_path or get_db_path()).resolve()
     config = resolve_sqlite_runtime_config()
-    key = _pool_key(db_path)
+    base_key = _pool_key(db_path)
+    key = base_key + READ_ONLY_POOL_SUFFIX if read_only else base_key
     signature = config.signature()
+    discarded: list[QueuePool | SQLiteWriter] = []
 
     with _POOL_LOCK:
         existing = _POOL_REGISTRY.get(key)
         if existing is not None and _POOL_SIGNATURES.get(key) != signature:
-            existing.dispose()
-            _POOL_REGISTRY.pop(key, None)
-            _POOL_SIGNATURES.pop(key, None)
+            discarded = _discard_pool_entries(base_key)
             logger.info("sqlite_pool_recreated_for_new_config", db_path=str(db_path))
 
         pool = _POOL_REGISTRY.get(key)
         if pool is None:
+            opener = _open_read_only_connection if read_only else _open_sqlite_connection
             pool = QueuePool(
-                creator=lambda path=db_path, runtime_config=config: _open_sqlite_connection(path, runtime_config),
+                creator=lambda path=db_path, runtime_config=config: opener(path, runtime_config),
                 pool_size=config.pool_size,
                 max_overflow=config.max_overflow,
                 timeout=config.pool_timeout,
@@ -190,9 +327,19 @@ def get_connection_pool(db_path: Path | None = None) -> QueuePool:
             )
             _POOL_REGISTRY[key] = pool
             _POOL_SIGNATURES[key] = signature
+            _POOL_MONITORS[key] = SQLitePoolMonitor(
+                pool,
+                db_path,
+                pool_size=config.pool_size,
+                max_overflow=config.max_overflow,
+                pool_timeout=config.pool_timeout,
+                thresholds=resolve_pool_alert_thresholds(),
+                label=f"{db_path.name}:ro" if read_only else None,
+            ).attach()
             logger.info(
                 "sqlite_pool_created",
                 db_path=str(db_path),
+                read_only=read_only,
                 pool_size=config.pool_size,
                 max_overflow=config.max_overflow,
                 pool_timeout=config.pool_timeout,
@@ -200,7 +347,34 @@ def get_connection_pool(db_path: Path | None = None) -> QueuePool:
                 enable_wal=config.enable_wal,
             )
 
-    return pool
+        monitor = _POOL_MONITORS[key]
+
+    _close_discarded(discarded)
+    return pool, monitor
+
+
+def get_sqlite_writer(db_path: Path | None = None) -> SQLiteWriter:
+    """Return this process's single writer for ``db_path``."""
+    db_path = (db_path or get_db_path()).resolve()
+    # 寫入連線與讀寫池共用 monitor（busy / 寫鎖等待統計）；也順便套用設定變更
+    _, monitor = _get_pool_entry(db_path)
+    key = _pool_key(db_path)
+    with _POOL_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None:
+            config = resolve_sqlite_runtime_config()
+
+            def connect(path: Path = db_path, runtime_config: SQLiteRuntimeConfig = config) -> sqlite3.Connection:
+                conn = _open_sqlite_connection(path, runtime_config, factory=WriterConnection)
+                conn.info[POOL_MONITOR_INFO_KEY] = monitor
+                return conn
+
+            writer = _WRITERS[key] = SQLiteWriter(
+                db_path,
+                connect,
+                max_batch=_env_int(SQLITE_WRITE_BATCH_SIZE_ENV_VAR, DEFAULT_WRITE_BATCH_SIZE),
+            )
+        return writer
 
 
 def _checkout_pooled_connection(pool: QueuePool, db_path: Path):
@@ -220,8 +394,16 @@ def _checkout_pooled_connection(pool: QueuePool, db_path: Path):
 
 def begin_immediate_transaction(conn) -> None:
     """Upgrade write transactions to BEGIN IMMEDIATE when not already in one."""
-    if not getattr(conn, "in_transaction", False):
+    if getattr(conn, "in_transaction", False):
+        return
+    # BEGIN IMMEDIATE 在拿不到寫鎖時會停在 busy handler 重試，這段時間就是寫鎖等待
+    started = time.perf_counter()
+    try:
         conn.execute("BEGIN IMMEDIATE")
+    finally:
+        monitor = monitor_for_connection(conn)
+        if monitor is not None:
+            monitor.record_write_lock_wait(time.perf_counter() - started)
 
 
 def get_db_path() -> Path:
@@ -309,7 +491,8 @@ def init_database(db_path: Path | None = None) -> None:
             """)
 
             # 全文搜尋表 (FTS5)
-            cursor.execute("""
+            questions_fts_recreated = _drop_fts_with_stale_tokenizer(cursor, "questions_fts")
+            cursor.execute(f"""
                 CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
                     id,
                     question_text,
@@ -317,7 +500,8 @@ def init_database(db_path: Path | None = None) -> None:
                     explanation,
                     topics,
                     content='questions',
-                    content_rowid='rowid'
+                    content_rowid='rowid',
+                    tokenize='{FTS_TOKENIZER}'
                 )
             """)
 
@@ -342,6 +526,12 @@ def init_database(db_path: Path | None = None) -> None:
                     VALUES (new.rowid, new.id, new.question_text, new.options, new.explanation, new.topics);
                 END
             """)
+            if questions_fts_recreated:
+                cursor.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+            # 兩字中文詞（麻醉、插管）靠詞彙表找出以它開頭的 trigram，仍走索引
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts_vocab USING fts5vocab(questions_fts, 'row')"
+            )
 
             conn.commit()
 
@@ -356,6 +546,18 @@ def init_database(db_path: Path | None = None) -> None:
 
         # ─── Draft Question Schema ───
         _init_question_draft_tables(db_path, config)
+
+        # ─── Exam Assembly Sampling Index ───
+        _init_exam_assembly_index(db_path, config)
+
+        # ─── Generated Exam Catalog ───
+        _init_exam_catalog_tables(db_path, config)
+
+        # ─── Practice Attempt History & Mastery ───
+        _init_practice_history_tables(db_path, config)
+
+        # ─── Read-model Change Counters ───
+        _init_table_version_tracking(db_path, config)
     except Exception as exc:
         log.exception("database_init_failed", error=str(exc))
         raise
@@ -363,6 +565,24 @@ def init_database(db_path: Path | None = None) -> None:
     log.debug("database_init_complete")
 
 
+def _drop_fts_with_stale_tokenizer(cursor, table_name: str) -> bool:
+    """
+    FTS 表 tokenizer 與 FTS_TOKENIZER 不符時先刪表（觸發器不受影響）
+
+    Returns:
+        True 表示表格將重新建立，呼叫端建表後需執行 'rebuild'
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    row = cursor.fetchone()
+    if row is None:
+        return True
+    if f"tokenize='{FTS_TOKENIZER}'" in (row[0] or ""):
+        return False
+    cursor.execute(f"DROP TABLE {table_name}")
+    logger.info("fts_tokenizer_migrated", table=table_name, tokenizer=FTS_TOKENIZER)
+    return True
+
+
 def _init_past_exam_tables(db_path: Path, config: SQLiteRuntimeConfig) -> None:
     """初始化考古題相關表"""
     with _open_sqlite_connection(db_path, config) as conn:
@@ -446,7 +666,8 @@ def _init_past_exam_tables(db_path: Path, config: SQLiteRuntimeConfig) -> None:
         """)
 
         # 考古題 FTS
-        cursor.execute("""
+        past_exam_fts_recreated = _drop_fts_with_stale_tokenizer(cursor, "past_exam_questions_fts")
+        cursor.execute(f"""
             CREATE VIRTUAL TABLE IF NOT EXISTS past_exam_questions_fts USING fts5(
                 id,
                 question_text,
@@ -455,10 +676,56 @@ def _init_past_exam_tables(db_path: Path, config: SQLiteRuntimeConfig) -> None:
                 concept_names,
                 topics,
                 content='past_exam_questions',
-                content_rowid='rowid'
+                content_rowid='rowid',
+                tokenize='{FTS_TOKENIZER}'
             )
         """)
 
+        # 觸發器：同步考古題 FTS；舊庫沒有觸發器時索引是空的，建好後需 rebuild
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'past_exam_questions_ai'")
+        needs_fts_rebuild = past_exam_fts_recreated or cursor.fetchone() is None
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS past_exam_questions_ai AFTER INSERT ON past_exam_questions BEGIN
+                INSERT INTO past_exam_questions_fts(rowid, id, question_text, options, explanation, concept_names, topics)
+                VALUES (
+                    new.rowid, new.id, new.question_text, new.options, new.explanation, new.concept_names, new.topics
+                );
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS past_exam_questions_ad AFTER DELETE ON past_exam_questions BEGIN
+                INSERT INTO past_exam_questions_fts(
+                    past_exam_questions_fts, rowid, id, question_text, options, explanation, concept_names, topics
+                )
+                VALUES (
+                    'delete', old.rowid, old.id, old.question_text, old.options, old.explanation,
+                    old.concept_names, old.topics
+                );
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS past_exam_questions_au AFTER UPDATE ON past_exam_questions BEGIN
+                INSERT INTO past_exam_questions_fts(
+                    past_exam_questions_fts, rowid, id, question_text, options, explanation, concept_names, topics
+                )
+                VALUES (
+                    'delete', old.rowid, old.id, old.question_text, old.options, old.explanation,
+                    old.concept_names, old.topics
+                );
+                INSERT INTO past_exam_questions_fts(rowid, id, question_text, options, explanation, concept_names, topics)
+                VALUES (
+                    new.rowid, new.id, new.question_text, new.options, new.explanation, new.concept_names, new.topics
+                );
+            END
+        """)
+        if needs_fts_rebuild:
+            cursor.execute("INSERT INTO past_exam_questions_fts(past_exam_questions_fts) VALUES ('rebuild')")
+            logger.info("past_exam_questions_fts_rebuilt", db_path=str(db_path))
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS past_exam_questions_fts_vocab "
+            "USING fts5vocab(past_exam_questions_fts, 'row')"
+        )
+
         conn.commit()
 
 
@@ -621,30 +888,439 @@ def _init_question_draft_tables(db_path: Path, config: SQLiteRuntimeConfig) -> N
         conn.commit()
 
 
+def _init_exam_assembly_index(db_path: Path, config: SQLiteRuntimeConfig) -> None:
+    """
+    建立組卷用的隨機抽樣索引
+
+    每題有固定的隨機 ``sample_key``；抽樣時從隨機起點沿 ``(篩選欄位, sample_key)``
+    索引往後取 N 題，成本只與題數有關、與題庫大小無關。``question_topics``
+    由觸發器維護（僅收錄未刪除題目），讓知識點篩選也能走索引。
+    """
+    with _open_sqlite_connection(db_path, config) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(questions)")
+        if "sample_key" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE questions ADD COLUMN sample_key INTEGER")
+            logger.info("database_migrations_applied", db_path=str(db_path), migrations=["add_questions_sample_key"])
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_sample_key ON questions (sample_key)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_difficulty_sample ON questions (difficulty, sample_key)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_exam_track_sample ON questions (exam_track, sample_key)"
+        )
+        cursor.execute("UPDATE questions SET sample_key = abs(random()) WHERE sample_key IS NULL")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS questions_sample_key_ai
+            AFTER INSERT ON questions WHEN new.sample_key IS NULL BEGIN
+                UPDATE questions SET sample_key = abs(random()) WHERE rowid = new.rowid;
+            END
+        """)
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'question_topics'")
+        needs_backfill = cursor.fetchone() is None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS question_topics (
+                topic TEXT NOT NULL,
+                sample_key INTEGER NOT NULL,
+                question_id TEXT NOT NULL,
+                PRIMARY KEY (topic, sample_key, question_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_question_topics_question_id ON question_topics (question_id)"
+        )
+
+        # topics 欄位可能不是合法 JSON；不合法時視為空陣列
+        topic_rows = """
+            SELECT topic.value, {row}.sample_key, {row}.id
+            FROM json_each(CASE WHEN json_valid({row}.topics) THEN {row}.topics ELSE '[]' END) AS topic
+            WHERE topic.type = 'text' AND topic.value != '' AND {row}.is_deleted = 0 AND {row}.sample_key IS NOT NULL
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS questions_topics_ai AFTER INSERT ON questions BEGIN
+                INSERT OR IGNORE INTO question_topics (topic, sample_key, question_id)
+                {topic_rows.format(row="new")};
+            END
+        """)
+        # 舊版觸發器對任何欄位更新都重建知識點列；只在相關欄位變動時才觸發
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'questions_topics_au'")
+        trigger_row = cursor.fetchone()
+        if trigger_row is not None and "UPDATE OF" not in trigger_row[0]:
+            cursor.execute("DROP TRIGGER questions_topics_au")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS questions_topics_au
+            AFTER UPDATE OF topics, is_deleted, sample_key ON questions BEGIN
+                DELETE FROM question_topics WHERE question_id = old.id;
+                INSERT OR IGNORE INTO question_topics (topic, sample_key, question_id)
+                {topic_rows.format(row="new")};
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS questions_topics_ad AFTER DELETE ON questions BEGIN
+                DELETE FROM question_topics WHERE question_id = old.id;
+            END
+        """)
+        if needs_backfill:
+            cursor.execute("""
+                INSERT OR IGNORE INTO question_topics (topic, sample_key, question_id)
+                SELECT topic.value, q.sample_key, q.id
+                FROM questions AS q, json_each(CASE WHEN json_valid(q.topics) THEN q.topics ELSE '[]' END) AS topic
+                WHERE topic.type = 'text' AND topic.value != '' AND q.is_deleted = 0 AND q.sample_key IS NOT NULL
+            """)
+            logger.info("question_topics_backfilled", db_path=str(db_path))
+
+        conn.commit()
+
+
+def _init_exam_catalog_tables(db_path: Path, config: SQLiteRuntimeConfig) -> None:
+    """初始化已產生考卷目錄（取代掃描 data/exams/*.json）"""
+    with _open_sqlite_connection(db_path, config) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exams (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                question_count INTEGER NOT NULL DEFAULT 0,
+                requested_question_count INTEGER,
+                created_at TEXT NOT NULL,
+                file_path TEXT NOT NULL UNIQUE,
+                question_ids TEXT           -- JSON array
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_exams_created_at ON exams (created_at)")
+
+        # 每個考卷目錄只做一次舊檔回填
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exam_catalog_scans (
+                exams_dir TEXT PRIMARY KEY,
+                scanned_at TEXT NOT NULL,
+                file_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        conn.commit()
+
+
+def _init_practice_history_tables(db_path: Path, config: SQLiteRuntimeConfig) -> None:
+    """
+    初始化作答紀錄與熟練度彙總
+
+    ``practice_attempts`` 只追加；每筆寫入由觸發器遞增 ``practice_mastery``
+    （依主題 / 題型）、``practice_question_stats``（每題連對次數與下次複習時間）、
+    ``practice_item_difficulty``（每題全體作答數）與 ``practice_user_versions``
+    （每位使用者的寫入次數，讓快取只丟掉有變動的使用者），
+    查詢弱點與待複習題目時不必重播整段歷史。未作答（``selected_letters`` 為空）
+    只留在歷史裡，不算進熟練度與複習排程。時間欄位一律存
+    ``YYYY-MM-DDTHH:MM:SS`` 以便字串比較。
+    """
+    with _open_sqlite_connection(db_path, config) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS practice_attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                question_id TEXT NOT NULL,
+                question_source TEXT,
+                selected_letters TEXT NOT NULL DEFAULT '',
+                is_correct INTEGER NOT NULL DEFAULT 0,
+                elapsed_ms INTEGER,
+                topics TEXT,            -- JSON array（作答當下的快照）
+                pattern TEXT,
+                answered_at TEXT NOT NULL
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_practice_attempts_user_question "
+            "ON practice_attempts (user_id, question_id, answered_at)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_practice_attempts_session ON practice_attempts (session_id)")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS practice_mastery (
+                user_id TEXT NOT NULL,
+                dimension TEXT NOT NULL,    -- 'topic' | 'pattern'
+                label TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                last_attempt_at TEXT,
+                PRIMARY KEY (user_id, dimension, label)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS practice_question_stats (
+                user_id TEXT NOT NULL,
+                question_id TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                streak INTEGER NOT NULL DEFAULT 0,
+                last_attempt_at TEXT,
+                next_review_at TEXT,
+                PRIMARY KEY (user_id, question_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_practice_question_stats_due "
+            "ON practice_question_stats (user_id, next_review_at)"
+        )
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'practice_item_difficulty'")
+        needs_difficulty_backfill = cursor.fetchone() is None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS practice_item_difficulty (
+                question_id TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS practice_user_versions (
+                user_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        if needs_difficulty_backfill:
+            cursor.execute("""
+                INSERT INTO practice_item_difficulty (question_id, attempts, correct)
+                SELECT question_id, SUM(attempts), SUM(correct) FROM practice_question_stats GROUP BY question_id
+            """)
+            cursor.execute("""
+                INSERT INTO practice_user_versions (user_id, version)
+                SELECT user_id, SUM(attempts) FROM practice_question_stats GROUP BY user_id
+            """)
+
+        mastery_upsert = """
+            ON CONFLICT (user_id, dimension, label) DO UPDATE SET
+                attempts = attempts + 1,
+                correct = correct + excluded.correct,
+                last_attempt_at = MAX(COALESCE(last_attempt_at, ''), excluded.last_attempt_at)
+        """
+        # 舊版觸發器把未作答當答錯、1 << streak 會溢位，也還沒維護全體難度與使用者版本
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'practice_attempts_mastery_ai'")
+        trigger_row = cursor.fetchone()
+        if trigger_row is not None and "practice_user_versions" not in trigger_row[0]:
+            cursor.execute("DROP TRIGGER practice_attempts_mastery_ai")
+        # 答錯立即到期；答對依連對次數 1, 2, 4 … 天後再複習（上限 64 天）
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS practice_attempts_mastery_ai AFTER INSERT ON practice_attempts
+            WHEN new.selected_letters != '' BEGIN
+                INSERT INTO practice_mastery (user_id, dimension, label, attempts, correct, last_attempt_at)
+                SELECT new.user_id, 'topic', topic.value, 1, new.is_correct, new.answered_at
+                FROM json_each(CASE WHEN json_valid(new.topics) THEN new.topics ELSE '[]' END) AS topic
+                WHERE topic.type = 'text' AND topic.value != ''
+                {mastery_upsert};
+                INSERT INTO practice_mastery (user_id, dimension, label, attempts, correct, last_attempt_at)
+                SELECT new.user_id, 'pattern', new.pattern, 1, new.is_correct, new.answered_at
+                WHERE COALESCE(new.pattern, '') != ''
+                {mastery_upsert};
+                INSERT INTO practice_question_stats (
+                    user_id, question_id, attempts, correct, streak, last_attempt_at, next_review_at
+                ) VALUES (
+                    new.user_id, new.question_id, 1, new.is_correct, new.is_correct, new.answered_at,
+                    CASE WHEN new.is_correct
+                        THEN strftime('%Y-%m-%dT%H:%M:%S', new.answered_at, '+1 days')
+                        ELSE new.answered_at
+                    END
+                )
+                ON CONFLICT (user_id, question_id) DO UPDATE SET
+                    attempts = attempts + 1,
+                    correct = correct + excluded.correct,
+                    streak = CASE WHEN excluded.correct THEN streak + 1 ELSE 0 END,
+                    last_attempt_at = excluded.last_attempt_at,
+                    next_review_at = CASE WHEN excluded.correct
+                        THEN strftime(
+                            '%Y-%m-%dT%H:%M:%S', excluded.last_attempt_at, '+' || (1 << MIN(streak, 6)) || ' days'
+                        )
+                        ELSE excluded.last_attempt_at
+                    END;
+                INSERT INTO practice_item_difficulty (question_id, attempts, correct)
+                VALUES (new.question_id, 1, new.is_correct)
+                ON CONFLICT (question_id) DO UPDATE SET
+                    attempts = attempts + 1,
+                    correct = correct + excluded.correct;
+                INSERT INTO practice_user_versions (user_id, version) VALUES (new.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END
+        """)
+
+        conn.commit()
+
+
+def _init_table_version_tracking(db_path: Path, config: SQLiteRuntimeConfig) -> None:
+    """建立 table_versions 計數表與觸發器，讓跨程序寫入都能被讀取端察覺。"""
+    with _open_sqlite_connection(db_path, config) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        for table_name in TRACKED_READ_MODEL_TABLES:
+            cursor.execute(
+                "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)",
+                (table_name,),
+            )
+            for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {table_name}_version_{suffix}
+                    AFTER {event} ON {table_name} BEGIN
+                        UPDATE table_versions SET version = version + 1
+                        WHERE table_name = '{table_name}';
+                    END
+                    """
+                )
+
+        conn.commit()
+
+
+def get_table_versions(
+    tables: tuple[str, ...] | list[str] | None = None,
+    db_path: Path | None = None,
+) -> dict[str, int]:
+    """
+    讀取資料表變更計數
+
+    Args:
+        tables: 要查詢的資料表，None 則回傳全部追蹤中的表
+        db_path: 資料庫路徑
+
+    Returns:
+        {table_name: version}；計數只增不減，任何程序的寫入都會反映
+    """
+    with get_read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        if tables:
+            placeholders = ", ".join("?" for _ in tables)
+            cursor.execute(
+                f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+                list(tables),
+            )
+        else:
+            cursor.execute("SELECT table_name, version FROM table_versions")
+        return {row[0]: int(row[1]) for row in cursor.fetchall()}
+
+
 @contextmanager
 def get_connection(db_path: Path | None = None) -> Generator[sqlite3.Connection, None, None]:
     """
     取得資料庫連線（Context Manager）
 
+    讀寫共用的連線池；repository 的查詢請用 ``get_read_connection``，
+    寫入請用 ``get_write_connection`` / ``execute_write``。
+
     Args:
         db_path: 資料庫路徑
 
     Yields:
         SQLite 連線
     """
+    with _pooled_connection(db_path, read_only=False) as conn:
+        yield conn
+
+
+@contextmanager
+def get_read_connection(db_path: Path | None = None) -> Generator[sqlite3.Connection, None, None]:
+    """
+    取得唯讀連線（Context Manager）
+
+    以 ``mode=ro`` 開啟並設 ``PRAGMA query_only``；WAL 模式下讀取不會等寫鎖，
+    也不會佔用寫入連線。
+
+    Args:
+        db_path: 資料庫路徑
+
+    Yields:
+        唯讀 SQLite 連線
+    """
+    with _pooled_connection(db_path, read_only=True) as conn:
+        yield conn
+
+
+@contextmanager
+def get_write_connection(db_path: Path | None = None) -> Generator[sqlite3.Connection, None, None]:
+    """
+    獨佔本程序唯一的寫入連線（Context Manager）
+
+    呼叫端自行 ``begin_immediate_transaction`` / ``commit``；離開時未提交的交易會回滾。
+    同一程序的其他寫入在 Python 端排隊，不會各自在 busy_timeout 裡空轉。
+
+    Args:
+        db_path: 資料庫路徑
+
+    Yields:
+        SQLite 寫入連線
+    """
     db_path = db_path or get_db_path()
     log = logger.bind(db_path=str(db_path))
+    _ensure_database_file(db_path, log)
+    writer = get_sqlite_writer(db_path)
+    with writer.connection() as conn:
+        try:
+            yield conn
+        except Exception as exc:
+            if is_busy_error(exc):
+                get_pool_monitor(db_path).record_busy_error(exc)
+            log.exception("db_connection_error", error=str(exc), writer=True)
+            raise
+
+
+def submit_write(work: Callable[[sqlite3.Connection], T], db_path: Path | None = None) -> Future[T]:
+    """
+    把小寫入排進寫入佇列，和同時排隊的其他寫入合併成一個交易
 
+    ``work(conn)`` 在寫入執行緒內執行，不可自行 commit / rollback；
+    回傳的 Future 在 COMMIT 之後才完成。
+    """
+    db_path = db_path or get_db_path()
+    _ensure_database_file(db_path, logger.bind(db_path=str(db_path)))
+    return get_sqlite_writer(db_path).submit(work)
+
+
+def execute_write(
+    work: Callable[[sqlite3.Connection], T],
+    db_path: Path | None = None,
+    timeout: float | None = None,
+) -> T:
+    """``submit_write`` 並等待結果（交易已提交）"""
+    return submit_write(work, db_path).result(timeout)
+
+
+def _ensure_database_file(db_path: Path, log) -> None:
     # 確保資料庫已初始化
     if not db_path.exists():
         log.info("database_file_missing_initializing")
         init_database(db_path)
 
-    pool = get_connection_pool(db_path)
-    conn = _checkout_pooled_connection(pool, db_path)
+
+@contextmanager
+def _pooled_connection(db_path: Path | None, read_only: bool) -> Generator[sqlite3.Connection, None, None]:
+    db_path = db_path or get_db_path()
+    log = logger.bind(db_path=str(db_path))
+    _ensure_database_file(db_path, log)
+
+    pool, monitor = _get_pool_entry(db_path, read_only=read_only)
+    checkout_started = time.perf_counter()
+    try:
+        conn = _checkout_pooled_connection(pool, db_path)
+    except PoolTimeoutError:
+        monitor.record_timeout()
+        raise
+    checked_out = time.perf_counter()
+    DB_CHECKOUT_SECONDS.observe(checked_out - checkout_started, db=monitor.label)
+    monitor.record_checkout_wait(checked_out - checkout_started)
     log.debug(
         "db_connection_checkout",
         pool_status=pool.status(),
+        read_only=read_only,
     )
 
     try:
@@ -654,11 +1330,16 @@ def get_connection(db_path: Path | None = None) -> Generator[sqlite3.Connection,
             conn.rollback()
         except Exception:
             pass
+        if is_busy_error(exc):
+            monitor.record_busy_error(exc)
         log.exception("db_connection_error", error=str(exc))
         raise
     finally:
         conn.close()
+        DB_HOLD_SECONDS.observe(time.perf_counter() - checked_out, db=monitor.label)
+        monitor.record_release()
         log.debug(
             "db_connection_checkin",
             pool_status=pool.status(),
+            read_only=read_only,
         )
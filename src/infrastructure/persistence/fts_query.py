@@ -0,0 +1,118 @@
+"""Helpers for turning free-form user input into safe FTS5 trigram / LIKE search clauses."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+FTS_TRIGRAM_MIN_CHARS = 3
+FTS_BIGRAM_CHARS = 2
+# 兩字詞展開成以它開頭的 trigram；超過這個數量（極常見的字）就退回 LIKE
+FTS_BIGRAM_MAX_EXPANSIONS = 256
+_MAX_CODE_POINT = chr(0x10FFFF)
+
+_CJK_CHARS = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# 中英混打時在文字系統交界切詞，例如「propofol低血壓」→ propofol / 低血壓
+_SCRIPT_RUN = re.compile(rf"[{_CJK_CHARS}]+|[^\s{_CJK_CHARS}]+")
+_TERM_EDGE_PUNCTUATION = "\"'“”‘’「」『』()（）[]【】,，.。:：;；!！?？*^+-"
+
+
+@dataclass(frozen=True, slots=True)
+class FtsSearchPlan:
+    """Rewritten search: an FTS5 MATCH expression plus LIKE fallbacks for short terms."""
+
+    match: str
+    like_terms: tuple[str, ...]
+    bigram_terms: tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.match and not self.like_terms
+
+
+def quote_fts_term(term: str) -> str:
+    """Quote one term as an FTS5 string so operators like ``AND``/``*``/``:`` are literal."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def split_search_terms(text: str) -> list[str]:
+    """Split user input on whitespace and zh/en script boundaries, dropping duplicates."""
+    terms: list[str] = []
+    for run in _SCRIPT_RUN.findall(str(text or "")):
+        term = run.strip(_TERM_EDGE_PUNCTUATION)
+        if term and term.casefold() not in {existing.casefold() for existing in terms}:
+            terms.append(term)
+    return terms
+
+
+def plan_fts_search(text: str, *, match_any: bool = False) -> FtsSearchPlan:
+    """
+    Rewrite user input into a trigram-friendly search plan.
+
+    Terms are ANDed by default. ``match_any`` ORs the MATCH terms for
+    recall-first lookups that rely on BM25 ordering; short terms are then only
+    used when no term is long enough to hit the index. Two-character terms are
+    also kept in ``bigram_terms`` for ``expand_bigram_terms``.
+    """
+    terms = split_search_terms(text)
+    long_terms = [term for term in terms if len(term) >= FTS_TRIGRAM_MIN_CHARS]
+    short_terms = [term for term in terms if len(term) < FTS_TRIGRAM_MIN_CHARS]
+    bigram_terms = tuple(term for term in short_terms if len(term) == FTS_BIGRAM_CHARS)
+    joiner = " OR " if match_any else " "
+    match = joiner.join(quote_fts_term(term) for term in long_terms)
+    if match_any and match:
+        short_terms = []
+    return FtsSearchPlan(match=match, like_terms=tuple(short_terms), bigram_terms=bigram_terms)
+
+
+def expand_bigram_terms(cursor, vocab_table: str, plan: FtsSearchPlan, *, match_any: bool = False) -> FtsSearchPlan:
+    """
+    Move two-character terms from LIKE onto the trigram index.
+
+    Each term becomes an OR of the indexed trigrams that start with it, read from
+    an ``fts5vocab`` table with a range scan. Terms with no such trigram, or too
+    many of them, stay as LIKE filters. A term that only occurs at the very end
+    of a column has no trigram starting with it and is not found this way.
+    """
+    groups: list[str] = []
+    unresolved: list[str] = []
+    for term in plan.bigram_terms:
+        prefix = term.lower()
+        cursor.execute(
+            f"SELECT term FROM {vocab_table} WHERE term > ? AND term < ? LIMIT ?",
+            (prefix, prefix + _MAX_CODE_POINT, FTS_BIGRAM_MAX_EXPANSIONS + 1),
+        )
+        trigrams = [row[0] for row in cursor.fetchall()]
+        if not trigrams or len(trigrams) > FTS_BIGRAM_MAX_EXPANSIONS:
+            unresolved.append(term)
+            continue
+        groups.append("(" + " OR ".join(quote_fts_term(trigram) for trigram in trigrams) + ")")
+    if not groups:
+        return plan
+
+    # 括號群組之間 FTS5 不接受隱含 AND，需明寫
+    joiner = " OR " if match_any else " AND "
+    match = joiner.join([plan.match, *groups] if plan.match else groups)
+    like_terms = tuple(term for term in plan.like_terms if term not in plan.bigram_terms or term in unresolved)
+    if match_any:
+        like_terms = ()
+    return FtsSearchPlan(match=match, like_terms=like_terms)
+
+
+def build_like_filters(
+    like_terms: tuple[str, ...],
+    columns: tuple[str, ...],
+    *,
+    match_any: bool = False,
+) -> tuple[str, list[str]]:
+    """Build ``(col LIKE ? OR ...)`` groups for short terms; returns ``("", [])`` when unused."""
+    if not like_terms:
+        return "", []
+    groups: list[str] = []
+    params: list[str] = []
+    for term in like_terms:
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        groups.append("(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns) + ")")
+        params.extend(f"%{escaped}%" for _ in columns)
+    joiner = " OR " if match_any else " AND "
+    return "(" + joiner.join(groups) + ")", params
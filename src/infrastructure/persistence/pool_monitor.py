@@ -0,0 +1,260 @@
+"""
+SQLite Pool Monitor - 連線池使用量與鎖等待的觀測
+
+數值寫進 metrics registry（``/metrics``），超過門檻時記節流過的 warning log。
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import (
+    DB_BUSY_ERRORS,
+    DB_CHECKOUT_SECONDS,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+    DB_WAL_BYTES,
+    DB_WRITE_LOCK_WAIT_SECONDS,
+)
+
+logger = get_logger(__name__)
+
+POOL_MONITOR_INFO_KEY = "pool_monitor"
+# 同一種警告在這段時間內只記一次，避免鎖風暴時把 log 灌爆
+WARNING_INTERVAL_SECONDS = 60.0
+# WAL 檔大小最多每幾秒 stat 一次
+WAL_SAMPLE_INTERVAL_SECONDS = 5.0
+_BUSY_ERROR_CODES = {sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED}
+
+
+@dataclass(frozen=True, slots=True)
+class PoolAlertThresholds:
+    """Thresholds for the throttled pool warnings."""
+
+    utilization: float
+    checkout_ms: float
+    wal_bytes: int
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    """True for ``database is locked`` / ``SQLITE_BUSY`` errors that outlasted busy_timeout."""
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    error_code = getattr(exc, "sqlite_errorcode", None)
+    if error_code is not None:
+        # extended result code 的低 8 位是 primary code
+        return error_code & 0xFF in _BUSY_ERROR_CODES
+    message = str(exc).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def monitor_for_connection(conn) -> SQLitePoolMonitor | None:
+    """Return the monitor of the pool a checked-out connection belongs to (None for raw sqlite3)."""
+    info = getattr(conn, "info", None)
+    return info.get(POOL_MONITOR_INFO_KEY) if isinstance(info, dict) else None
+
+
+class SQLitePoolMonitor:
+    """Per-pool counters, peaks and throttled saturation warnings."""
+
+    def __init__(
+        self,
+        pool: QueuePool,
+        db_path: Path,
+        *,
+        pool_size: int,
+        max_overflow: int,
+        pool_timeout: float,
+        thresholds: PoolAlertThresholds,
+        label: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.pool = pool
+        self.db_path = db_path
+        self.label = label or db_path.name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.thresholds = thresholds
+        self._clock = clock
+        self._lock = Lock()
+
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.busy_errors = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.write_lock_waits = 0
+        self.write_lock_wait_total = 0.0
+        self.write_lock_wait_max = 0.0
+        self.warnings: dict[str, int] = {}
+        self._wal_bytes = 0
+        self._wal_sampled_at = -math.inf
+        self._last_warned: dict[str, float] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    @property
+    def wal_path(self) -> Path:
+        return self.db_path.with_name(f"{self.db_path.name}-wal")
+
+    def attach(self) -> SQLitePoolMonitor:
+        event.listen(self.pool, "connect", self._on_connect)
+        event.listen(self.pool, "checkout", self._on_checkout)
+        event.listen(self.pool, "checkin", self._on_checkin)
+        event.listen(self.pool, "invalidate", self._on_invalidate)
+        return self
+
+    # ---- pool events -------------------------------------------------
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        # 讓 begin_immediate_transaction 能從 conn.info 找回 monitor
+        connection_record.info[POOL_MONITOR_INFO_KEY] = self
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        in_use, overflow = self._pool_usage()
+        with self._lock:
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+        DB_POOL_IN_USE.set(in_use, db=self.label)
+        DB_POOL_OVERFLOW.set(overflow, db=self.label)
+        if self.capacity and in_use / self.capacity >= self.thresholds.utilization:
+            self._warn("sqlite_pool_saturated", in_use=in_use, overflow=overflow, capacity=self.capacity)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    # ---- explicit reports from database.py ---------------------------
+
+    def record_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+        if seconds * 1000 >= self.thresholds.checkout_ms:
+            self._warn("sqlite_pool_checkout_slow", wait_ms=round(seconds * 1000, 1))
+
+    def record_release(self) -> None:
+        in_use, overflow = self._pool_usage()
+        DB_POOL_IN_USE.set(in_use, db=self.label)
+        DB_POOL_OVERFLOW.set(overflow, db=self.label)
+        self._sample_wal()
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        DB_POOL_TIMEOUTS.inc(db=self.label)
+        self._warn("sqlite_pool_timeout", pool_timeout=self.pool_timeout, capacity=self.capacity)
+
+    def record_busy_error(self, exc: BaseException) -> None:
+        with self._lock:
+            self.busy_errors += 1
+        DB_BUSY_ERRORS.inc(db=self.label)
+        self._warn("sqlite_busy_error", error=str(exc))
+
+    def record_write_lock_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.write_lock_waits += 1
+            self.write_lock_wait_total += seconds
+            self.write_lock_wait_max = max(self.write_lock_wait_max, seconds)
+        DB_WRITE_LOCK_WAIT_SECONDS.observe(seconds, db=self.label)
+
+    # ---- snapshot ----------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        in_use, overflow = self._pool_usage()
+        wal_bytes = self._sample_wal(force=True)
+        checkout_p50 = DB_CHECKOUT_SECONDS.quantile(0.5, db=self.label)
+        checkout_p99 = DB_CHECKOUT_SECONDS.quantile(0.99, db=self.label)
+        with self._lock:
+            return {
+                "db_path": str(self.db_path),
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "pool_timeout": self.pool_timeout,
+                "in_use": in_use,
+                "idle": self.pool.checkedin(),
+                "overflow": overflow,
+                "utilization": round(in_use / self.capacity, 3) if self.capacity else 0.0,
+                "peak_in_use": self.peak_in_use,
+                "peak_overflow": self.peak_overflow,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "busy_errors": self.busy_errors,
+                "checkout_wait_ms": {
+                    "avg": _ms(self.checkout_wait_total / self.checkouts) if self.checkouts else 0.0,
+                    "max": _ms(self.checkout_wait_max),
+                    "p50": _ms(checkout_p50) if checkout_p50 is not None else None,
+                    "p99": _ms(checkout_p99) if checkout_p99 is not None else None,
+                },
+                "write_lock_wait_ms": {
+                    "count": self.write_lock_waits,
+                    "avg": _ms(self.write_lock_wait_total / self.write_lock_waits) if self.write_lock_waits else 0.0,
+                    "max": _ms(self.write_lock_wait_max),
+                },
+                "wal_bytes": wal_bytes,
+                "warnings": dict(self.warnings),
+            }
+
+    def _pool_usage(self) -> tuple[int, int]:
+        # QueuePool 的 _overflow 從 -pool_size 起算，只有超過 pool_size 的部分才是 overflow
+        return max(self.pool.checkedout(), 0), max(self.pool.overflow(), 0)
+
+    def _sample_wal(self, force: bool = False) -> int:
+        now = self._clock()
+        if not force and now - self._wal_sampled_at < WAL_SAMPLE_INTERVAL_SECONDS:
+            return self._wal_bytes
+        try:
+            wal_bytes = os.stat(self.wal_path).st_size
+        except OSError:
+            wal_bytes = 0
+        self._wal_bytes = wal_bytes
+        self._wal_sampled_at = now
+        DB_WAL_BYTES.set(wal_bytes, db=self.label)
+        if wal_bytes >= self.thresholds.wal_bytes:
+            self._warn("sqlite_wal_large", wal_bytes=wal_bytes, threshold_bytes=self.thresholds.wal_bytes)
+        return wal_bytes
+
+    def _warn(self, event_name: str, **fields: Any) -> None:
+        now = self._clock()
+        with self._lock:
+            last = self._last_warned.get(event_name)
+            if last is not None and now - last < WARNING_INTERVAL_SECONDS:
+                return
+            self._last_warned[event_name] = now
+            self.warnings[event_name] = self.warnings.get(event_name, 0) + 1
+        logger.warning(event_name, db_path=str(self.db_path), pool_status=self.pool.status(), **fields)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
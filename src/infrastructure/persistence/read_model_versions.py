@@ -0,0 +1,130 @@
+"""Cross-process change detection for cached read models via ``table_versions``."""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from threading import Lock
+from typing import Any, TypeVar
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.persistence.database import TRACKED_READ_MODEL_TABLES, get_table_versions
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_READ_MODEL_CACHE_ENTRIES = 256
+
+
+class TableVersionTracker:
+    """Remember the last seen ``table_versions`` and report which tables moved."""
+
+    def __init__(
+        self,
+        tables: tuple[str, ...] = TRACKED_READ_MODEL_TABLES,
+        db_path: Path | None = None,
+    ) -> None:
+        self.tables = tables
+        self.db_path = db_path
+        self._seen: dict[str, int] | None = None
+        self._lock = Lock()
+
+    def poll(self) -> set[str]:
+        """Return tables changed since the previous poll; the first poll only records a baseline."""
+        try:
+            current = get_table_versions(self.tables, db_path=self.db_path)
+        except Exception as exc:
+            logger.warning("table_version_poll_failed", error=str(exc))
+            return set()
+
+        with self._lock:
+            previous = self._seen
+            self._seen = current
+        if previous is None:
+            return set()
+
+        changed = {table for table, version in current.items() if previous.get(table) != version}
+        if changed:
+            logger.debug("table_versions_changed", tables=sorted(changed))
+        return changed
+
+
+_tracker_singleton: TableVersionTracker | None = None
+
+
+def get_table_version_tracker() -> TableVersionTracker:
+    """Return the process-wide tracker shared by cached read paths."""
+    global _tracker_singleton
+    if _tracker_singleton is None:
+        _tracker_singleton = TableVersionTracker()
+    return _tracker_singleton
+
+
+class VersionedReadModelCache:
+    """
+    程序內讀模型快取，以來源表的 ``table_versions`` 為鍵
+
+    每次讀取只查一次 ``table_versions``；任何程序（Streamlit、MCP、worker、Telegram）
+    寫入來源表都會推進版本，下次讀取即重算，不必靠各自的 TTL 或手動清除。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_READ_MODEL_CACHE_ENTRIES) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self._entries: OrderedDict[tuple, tuple[dict[str, int], float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        tables: tuple[str, ...],
+        loader: Callable[[], T],
+        *,
+        db_path: Path | None = None,
+        max_age_seconds: float | None = None,
+    ) -> T:
+        """Return the cached value while ``tables`` keep their versions, otherwise rebuild it with ``loader``."""
+        try:
+            versions = get_table_versions(tables, db_path=db_path)
+        except Exception as exc:
+            logger.warning("read_model_cache_version_check_failed", key=str(key), error=str(exc))
+            return loader()
+
+        cache_key = (str(db_path) if db_path else None, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                cached_versions, loaded_at, value = entry
+                fresh = max_age_seconds is None or now - loaded_at < max_age_seconds
+                if cached_versions == versions and fresh:
+                    self._entries.move_to_end(cache_key)
+                    return copy.deepcopy(value)
+
+        # 版本在載入前取得：載入途中若有寫入，下次讀取會看到新版本並重算
+        value = loader()
+        with self._lock:
+            self._entries[cache_key] = (versions, now, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug("read_model_cache_loaded", key=str(key), versions=versions)
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_read_model_cache_singleton: VersionedReadModelCache | None = None
+
+
+def get_read_model_cache() -> VersionedReadModelCache:
+    """Return the process-wide read-model cache shared by repositories and query services."""
+    global _read_model_cache_singleton
+    if _read_model_cache_singleton is None:
+        _read_model_cache_singleton = VersionedReadModelCache()
+    return _read_model_cache_singleton
@@ -0,0 +1,189 @@
+"""
+SQLite Exam Catalog Repository - 已產生考卷目錄
+
+create_exam 寫檔時同步寫入 ``exams`` 表；舊的 data/exams/*.json 由
+``ensure_backfilled`` 在每個目錄第一次使用時掃描回填一次。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.domain.entities.exam import ExamCatalogEntry
+from src.domain.repositories.exam_catalog_repository import IExamCatalogRepository
+from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.database import (
+    begin_immediate_transaction,
+    execute_write,
+    get_read_connection,
+    get_write_connection,
+    init_database,
+)
+
+logger = get_logger(__name__)
+
+
+@instrument_repository("exam_catalog")
+class SQLiteExamCatalogRepository(IExamCatalogRepository):
+    """SQLite 考卷目錄儲存庫"""
+
+    def __init__(self, db_path: Path | None = None):
+        self.db_path = db_path
+        self._scanned_dirs: set[str] = set()
+        init_database(db_path)
+
+    def save(self, entry: ExamCatalogEntry) -> str:
+        execute_write(lambda conn: self._upsert(conn.cursor(), entry), self.db_path)
+        logger.debug("exam_catalog_saved", exam_id=entry.id, question_count=entry.question_count)
+        return entry.id
+
+    def count(self) -> int:
+        with get_read_connection(self.db_path) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM exams").fetchone()[0])
+
+    def list_recent(self, limit: int = 50, offset: int = 0) -> list[ExamCatalogEntry]:
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT * FROM exams ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def get_by_id(self, exam_id: str) -> Optional[ExamCatalogEntry]:
+        with get_read_connection(self.db_path) as conn:
+            row = conn.execute("SELECT * FROM exams WHERE id = ?", (exam_id,)).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def ensure_backfilled(self, exams_dir: Path) -> int:
+        """目錄尚未掃描過才回填；回傳本次新增筆數（已掃描過為 0）
+
+        同一程序內確認過的目錄記在記憶體，之後不再查 exam_catalog_scans。
+        """
+        scan_key = str(exams_dir.resolve())
+        if scan_key in self._scanned_dirs:
+            return 0
+        with get_read_connection(self.db_path) as conn:
+            scanned = conn.execute("SELECT 1 FROM exam_catalog_scans WHERE exams_dir = ?", (scan_key,)).fetchone()
+        inserted = 0 if scanned else self.backfill_from_directory(exams_dir)
+        self._scanned_dirs.add(scan_key)
+        return inserted
+
+    def backfill_from_directory(self, exams_dir: Path) -> int:
+        """掃描 exams_dir 下的考卷 JSON 寫入目錄；已登錄的檔案會略過"""
+        scan_key = str(exams_dir.resolve())
+        entries: list[ExamCatalogEntry] = []
+        file_count = 0
+        for path in sorted(exams_dir.glob("*.json")) if exams_dir.exists() else []:
+            file_count += 1
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("exam_catalog_backfill_unreadable", file_path=str(path))
+                continue
+            if not isinstance(payload, dict):
+                continue
+            entries.append(self._entry_from_exam_file(path, payload))
+
+        inserted = 0
+        with get_write_connection(self.db_path) as conn:
+            begin_immediate_transaction(conn)
+            cursor = conn.cursor()
+            for entry in entries:
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO exams (
+                        id, name, question_count, requested_question_count,
+                        created_at, file_path, question_ids
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    self._entry_params(entry),
+                )
+                inserted += cursor.rowcount
+            cursor.execute(
+                """
+                INSERT INTO exam_catalog_scans (exams_dir, scanned_at, file_count) VALUES (?, ?, ?)
+                ON CONFLICT(exams_dir) DO UPDATE SET
+                    scanned_at = excluded.scanned_at,
+                    file_count = excluded.file_count
+                """,
+                (scan_key, datetime.now().isoformat(), file_count),
+            )
+            conn.commit()
+
+        logger.info("exam_catalog_backfilled", exams_dir=scan_key, file_count=file_count, inserted=inserted)
+        return inserted
+
+    @staticmethod
+    def _entry_from_exam_file(path: Path, payload: dict) -> ExamCatalogEntry:
+        questions = payload.get("questions") if isinstance(payload.get("questions"), list) else []
+        try:
+            created_at = datetime.fromisoformat(str(payload.get("created_at")))
+        except ValueError:
+            created_at = datetime.fromtimestamp(path.stat().st_mtime)
+        requested = payload.get("requested_question_count")
+        return ExamCatalogEntry(
+            id=str(payload.get("id") or path.stem),
+            name=str(payload.get("name") or path.stem),
+            question_count=int(payload.get("question_count") or len(questions)),
+            file_path=str(path.resolve()),
+            created_at=created_at,
+            requested_question_count=int(requested) if isinstance(requested, int) else None,
+            question_ids=[
+                str(question["id"]) for question in questions if isinstance(question, dict) and question.get("id")
+            ],
+        )
+
+    @staticmethod
+    def _entry_params(entry: ExamCatalogEntry) -> tuple:
+        return (
+            entry.id,
+            entry.name,
+            entry.question_count,
+            entry.requested_question_count,
+            entry.created_at.isoformat(),
+            entry.file_path,
+            json.dumps(entry.question_ids, ensure_ascii=False),
+        )
+
+    def _upsert(self, cursor, entry: ExamCatalogEntry) -> None:
+        cursor.execute(
+            """
+            INSERT INTO exams (
+                id, name, question_count, requested_question_count,
+                created_at, file_path, question_ids
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name = excluded.name,
+                question_count = excluded.question_count,
+                requested_question_count = excluded.requested_question_count,
+                created_at = excluded.created_at,
+                file_path = excluded.file_path,
+                question_ids = excluded.question_ids
+            """,
+            self._entry_params(entry),
+        )
+
+    @staticmethod
+    def _row_to_entry(row) -> ExamCatalogEntry:
+        return ExamCatalogEntry(
+            id=row["id"],
+            name=row["name"],
+            question_count=int(row["question_count"] or 0),
+            file_path=row["file_path"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            requested_question_count=row["requested_question_count"],
+            question_ids=json.loads(row["question_ids"]) if row["question_ids"] else [],
+        )
+
+
+_repository: SQLiteExamCatalogRepository | None = None
+
+
+def get_exam_catalog_repository() -> SQLiteExamCatalogRepository:
+    """取得考卷目錄儲存庫實例（單例）"""
+    global _repository
+    if _repository is None:
+        _repository = SQLiteExamCatalogRepository()
+    return _repository
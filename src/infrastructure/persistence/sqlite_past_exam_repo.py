@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,11 +11,31 @@ from typing import Optional
 from src.domain.entities.past_exam import Concept, PastExam, PastExamQuestion, QuestionPattern
 from src.domain.repositories.past_exam_repository import IPastExamRepository
 from src.infrastructure.logging import get_logger
-from src.infrastructure.persistence.database import begin_immediate_transaction, get_connection, init_database
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.database import (
+    begin_immediate_transaction,
+    execute_write,
+    get_read_connection,
+    get_write_connection,
+    init_database,
+)
+from src.infrastructure.persistence.fts_query import build_like_filters, expand_bigram_terms, plan_fts_search
+from src.infrastructure.persistence.read_model_versions import get_read_model_cache
 
 logger = get_logger(__name__)
 
+# bm25() 欄位權重，順序同 past_exam_questions_fts：id, question_text, options, explanation, concept_names, topics
+PAST_EXAM_FTS_BM25_WEIGHTS = (0.0, 10.0, 3.0, 1.0, 5.0, 5.0)
+PAST_EXAM_FTS_LIKE_COLUMNS = (
+    "peq.question_text",
+    "peq.options",
+    "peq.explanation",
+    "peq.concept_names",
+    "peq.topics",
+)
 
+
+@instrument_repository("past_exam")
 class SQLitePastExamRepository(IPastExamRepository):
     """Persist normalized/classified past exam artifacts into SQLite."""
 
@@ -29,7 +50,7 @@ class SQLitePastExamRepository(IPastExamRepository):
             doc_id=past_exam.source_doc_id,
             exam_year=past_exam.exam_year,
         )
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             begin_immediate_transaction(conn)
             cursor = conn.cursor()
             cursor.execute(
@@ -74,8 +95,7 @@ class SQLitePastExamRepository(IPastExamRepository):
         return past_exam.id
 
     def get_exam(self, exam_id: str) -> Optional[PastExam]:
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM past_exams WHERE id = ?", (exam_id,))
             row = cursor.fetchone()
@@ -88,8 +108,7 @@ class SQLitePastExamRepository(IPastExamRepository):
         return exam
 
     def get_exam_by_doc_id(self, source_doc_id: str) -> Optional[PastExam]:
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM past_exams WHERE source_doc_id = ? ORDER BY imported_at DESC LIMIT 1",
@@ -113,7 +132,7 @@ class SQLitePastExamRepository(IPastExamRepository):
             doc_id=questions[0].source_doc_id if questions else None,
         )
 
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             cursor = conn.cursor()
             keep_ids = [question.id for question in questions]
             placeholders = ", ".join("?" for _ in keep_ids)
@@ -183,7 +202,7 @@ class SQLitePastExamRepository(IPastExamRepository):
         return len(questions)
 
     def list_questions(self, past_exam_id: str) -> list[PastExamQuestion]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -197,13 +216,34 @@ class SQLitePastExamRepository(IPastExamRepository):
             rows = cursor.fetchall()
         return [self._row_to_question(row) for row in rows]
 
+    def list_questions_for_exams(self, past_exam_ids: list[str]) -> Iterator[PastExamQuestion]:
+        """一次查詢多份考卷的題目，依傳入的考卷順序逐列產出（連線在迭代結束後才歸還）"""
+        exam_ids = list(dict.fromkeys(str(exam_id) for exam_id in past_exam_ids if exam_id))
+        if not exam_ids:
+            return
+        with get_read_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                SELECT peq.*
+                FROM json_each(?) AS picked
+                JOIN past_exam_questions AS peq ON peq.past_exam_id = picked.value
+                ORDER BY picked.key ASC, COALESCE(peq.source_page, 0) ASC, peq.created_at ASC, peq.question_number ASC
+                """,
+                (json.dumps(exam_ids, ensure_ascii=False),),
+            )
+            result_count = 0
+            for row in cursor:
+                result_count += 1
+                yield self._row_to_question(row)
+        logger.debug("past_exam_questions_for_exams_loaded", exam_count=len(exam_ids), result_count=result_count)
+
     def list_all_questions(
         self,
         limit: int | None = None,
         *,
         explanation_required: bool = False,
     ) -> list[PastExamQuestion]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             query = """
                 SELECT *
@@ -230,15 +270,87 @@ class SQLitePastExamRepository(IPastExamRepository):
         )
         return [self._row_to_question(row) for row in rows]
 
+    def search_questions(
+        self,
+        query: str,
+        *,
+        past_exam_ids: list[str] | None = None,
+        exam_year: int | None = None,
+        pattern: str | None = None,
+        difficulty: str | None = None,
+        explanation_required: bool = False,
+        match_any: bool = False,
+        limit: int = 20,
+    ) -> list[PastExamQuestion]:
+        plan = plan_fts_search(query, match_any=match_any)
+        if plan.is_empty:
+            return []
+        if plan.bigram_terms:
+            # 兩字詞先查詞彙表展開成 trigram，讓「麻醉」這類查詢也走 FTS 索引
+            with get_read_connection(self.db_path) as conn:
+                plan = expand_bigram_terms(conn.cursor(), "past_exam_questions_fts_vocab", plan, match_any=match_any)
+
+        if plan.match:
+            sql = """
+                SELECT peq.*
+                FROM past_exam_questions_fts
+                JOIN past_exam_questions peq ON peq.rowid = past_exam_questions_fts.rowid
+                WHERE past_exam_questions_fts MATCH ?
+            """
+            params: list[object] = [plan.match]
+        else:
+            sql = "SELECT peq.* FROM past_exam_questions peq WHERE 1 = 1"
+            params = []
+
+        like_clause, like_params = build_like_filters(plan.like_terms, PAST_EXAM_FTS_LIKE_COLUMNS, match_any=match_any)
+        if like_clause:
+            sql += f" AND {like_clause}"
+            params.extend(like_params)
+        if past_exam_ids:
+            placeholders = ", ".join("?" for _ in past_exam_ids)
+            sql += f" AND peq.past_exam_id IN ({placeholders})"
+            params.extend(past_exam_ids)
+        if exam_year is not None:
+            sql += " AND peq.exam_year = ?"
+            params.append(exam_year)
+        if pattern:
+            sql += " AND peq.pattern = ?"
+            params.append(pattern)
+        if difficulty:
+            sql += " AND peq.difficulty = ?"
+            params.append(difficulty)
+        if explanation_required:
+            sql += " AND peq.explanation IS NOT NULL AND TRIM(peq.explanation) != ''"
+
+        if plan.match:
+            weights = ", ".join(str(weight) for weight in PAST_EXAM_FTS_BM25_WEIGHTS)
+            sql += f" ORDER BY bm25(past_exam_questions_fts, {weights}) ASC LIMIT ?"
+        else:
+            sql += " ORDER BY peq.exam_year DESC, peq.question_number ASC LIMIT ?"
+        params.append(limit)
+
+        with get_read_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        logger.debug(
+            "past_exam_question_search_completed",
+            query=query,
+            match_any=match_any,
+            exam_year=exam_year,
+            pattern=pattern,
+            limit=limit,
+            result_count=len(rows),
+        )
+        return [self._row_to_question(row) for row in rows]
+
     def update_question_explanation(self, question_id: str, explanation: str) -> bool:
         cleaned_explanation = explanation.strip()
         if not cleaned_explanation:
             return False
 
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
-            cursor = conn.cursor()
-            cursor.execute(
+        def update_explanation(conn) -> bool:
+            cursor = conn.execute(
                 """
                 UPDATE past_exam_questions
                 SET explanation = ?
@@ -246,8 +358,9 @@ class SQLitePastExamRepository(IPastExamRepository):
                 """,
                 (cleaned_explanation, question_id),
             )
-            updated = cursor.rowcount > 0
-            conn.commit()
+            return cursor.rowcount > 0
+
+        updated = execute_write(update_explanation, self.db_path)
 
         logger.info(
             "past_exam_question_explanation_updated",
@@ -257,7 +370,7 @@ class SQLitePastExamRepository(IPastExamRepository):
         return updated
 
     def list_exam_catalog(self, limit: int = 20) -> list[dict]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -285,17 +398,119 @@ class SQLitePastExamRepository(IPastExamRepository):
         logger.debug("past_exam_catalog_listed", limit=limit, result_count=len(rows))
         return [dict(row) for row in rows]
 
-    def get_statistics(self) -> dict[str, int]:
-        with get_connection(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM past_exams")
-            exam_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM past_exam_questions")
-            question_count = cursor.fetchone()[0]
-            cursor.execute(
-                "SELECT COUNT(*) FROM past_exam_questions WHERE correct_answer IS NOT NULL AND TRIM(correct_answer) != ''"
+    def list_template_exemplars(
+        self,
+        exam_limit: int = 20,
+        exemplars_per_pattern: int = 12,
+        top_values: int = 5,
+    ) -> list[dict]:
+        """
+        題型模板用的彙總查詢（單一 SQL）
+
+        以最近 exam_limit 份考卷為範圍，每個 pattern 回傳前 exemplars_per_pattern 題範例，
+        並附上該 pattern 的題數、出現年份與 json_each 統計的前幾名 topics / concept_names。
+        排名同分時依 pattern 內第一次出現的順序，與 Counter.most_common 一致。
+        """
+        value_counts = """
+            SELECT pool.pattern, item.value AS label, COUNT(*) AS n, MIN(pool.pattern_rank) AS first_rank
+            FROM pool, json_each(CASE WHEN json_valid(pool.{column}) THEN pool.{column} ELSE '[]' END) AS item
+            WHERE item.type = 'text' AND item.value != ''
+            GROUP BY pool.pattern, item.value
+        """
+        top_labels = """
+            SELECT pattern, json_group_array(json_array(label_rank, label)) AS labels
+            FROM (
+                SELECT pattern, label,
+                       ROW_NUMBER() OVER (PARTITION BY pattern ORDER BY n DESC, first_rank ASC) AS label_rank
+                FROM {source}
             )
-            answered_question_count = cursor.fetchone()[0]
+            WHERE label_rank <= :top_values
+            GROUP BY pattern
+        """
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                WITH recent_exams AS (
+                    SELECT id FROM past_exams ORDER BY exam_year DESC, imported_at DESC LIMIT :exam_limit
+                ),
+                pool AS (
+                    SELECT
+                        peq.*,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY peq.pattern
+                            ORDER BY COALESCE(peq.exam_year, 0) DESC, COALESCE(peq.question_number, 0) ASC, peq.id ASC
+                        ) AS pattern_rank,
+                        COUNT(*) OVER (PARTITION BY peq.pattern) AS pattern_count
+                    FROM past_exam_questions AS peq
+                    JOIN recent_exams ON recent_exams.id = peq.past_exam_id
+                ),
+                topic_counts AS ({value_counts.format(column="topics")}),
+                concept_counts AS ({value_counts.format(column="concept_names")}),
+                top_topics AS ({top_labels.format(source="topic_counts")}),
+                top_concepts AS ({top_labels.format(source="concept_counts")}),
+                pattern_years AS (
+                    SELECT pattern, json_group_array(exam_year) AS years
+                    FROM (
+                        SELECT DISTINCT pattern, exam_year FROM pool
+                        WHERE exam_year IS NOT NULL AND exam_year != 0
+                    )
+                    GROUP BY pattern
+                )
+                SELECT
+                    pool.*,
+                    top_topics.labels AS top_topics,
+                    top_concepts.labels AS top_concepts,
+                    pattern_years.years AS pattern_exam_years
+                FROM pool
+                LEFT JOIN top_topics ON top_topics.pattern = pool.pattern
+                LEFT JOIN top_concepts ON top_concepts.pattern = pool.pattern
+                LEFT JOIN pattern_years ON pattern_years.pattern = pool.pattern
+                WHERE pool.pattern_rank <= :exemplars_per_pattern
+                ORDER BY pool.pattern_count DESC, pool.pattern ASC, pool.pattern_rank ASC
+                """,
+                {
+                    "exam_limit": exam_limit,
+                    "exemplars_per_pattern": exemplars_per_pattern,
+                    "top_values": top_values,
+                },
+            ).fetchall()
+
+        exemplars = [
+            {
+                "question": self._row_to_question(row),
+                "pattern_rank": int(row["pattern_rank"]),
+                "pattern_count": int(row["pattern_count"]),
+                "top_topics": self._ranked_labels(row["top_topics"]),
+                "top_concepts": self._ranked_labels(row["top_concepts"]),
+                "exam_years": sorted(json.loads(row["pattern_exam_years"] or "[]"), reverse=True),
+            }
+            for row in rows
+        ]
+        logger.debug("past_exam_template_exemplars_loaded", exam_limit=exam_limit, result_count=len(exemplars))
+        return exemplars
+
+    @staticmethod
+    def _ranked_labels(payload: str | None) -> list[str]:
+        # json_group_array 不保證輸入順序，排名一併帶出後在這裡排序
+        return [label for _rank, label in sorted(json.loads(payload or "[]"))]
+
+    def get_statistics(self) -> dict[str, int]:
+        return get_read_model_cache().get_or_load(
+            "past_exam_statistics", ("past_exams", "past_exam_questions"), self._load_statistics, db_path=self.db_path
+        )
+
+    def _load_statistics(self) -> dict[str, int]:
+        with get_read_connection(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM past_exams) AS exam_count,
+                    COUNT(*) AS question_count,
+                    COALESCE(SUM(correct_answer IS NOT NULL AND TRIM(correct_answer) != ''), 0) AS answered
+                FROM past_exam_questions
+                """
+            ).fetchone()
+        exam_count, question_count, answered_question_count = int(row[0]), int(row[1]), int(row[2])
 
         stats = {
             "exam_count": exam_count,
@@ -309,7 +524,7 @@ class SQLitePastExamRepository(IPastExamRepository):
         if not concepts:
             return 0
 
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             cursor = conn.cursor()
             for concept in concepts:
                 cursor.execute(
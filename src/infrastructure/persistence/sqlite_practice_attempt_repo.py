@@ -0,0 +1,230 @@
+"""
+SQLite Practice Attempt Repository - 作答紀錄與熟練度
+
+寫入只碰 practice_attempts；practice_mastery / practice_question_stats 由
+AFTER INSERT 觸發器在同一交易內增量更新。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.domain.entities.practice import PracticeAttempt, PracticeMastery, PracticeQuestionStat
+from src.domain.repositories.practice_attempt_repository import IPracticeAttemptRepository
+from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.database import (
+    execute_write,
+    get_read_connection,
+    init_database,
+)
+
+logger = get_logger(__name__)
+
+PRACTICE_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# 少量作答的主題以 Laplace 平滑排序，避免 0/1 永遠排在最前面
+WEAKEST_ORDER_BY = "(correct + 1.0) / (attempts + 2.0) ASC, attempts DESC, label ASC"
+
+
+def _format_timestamp(value: datetime) -> str:
+    return value.strftime(PRACTICE_TIMESTAMP_FORMAT)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+@instrument_repository("practice_attempt")
+class SQLitePracticeAttemptRepository(IPracticeAttemptRepository):
+    """SQLite 作答紀錄儲存庫"""
+
+    def __init__(self, db_path: Path | None = None):
+        self.db_path = db_path
+        init_database(db_path)
+
+    def record_attempts(self, attempts: list[PracticeAttempt]) -> int:
+        if not attempts:
+            return 0
+        rows = [
+            (
+                attempt.user_id,
+                attempt.session_id,
+                attempt.question_id,
+                attempt.question_source,
+                attempt.selected_letters,
+                int(attempt.is_correct),
+                attempt.elapsed_ms,
+                json.dumps(attempt.topics, ensure_ascii=False),
+                attempt.pattern,
+                _format_timestamp(attempt.answered_at),
+            )
+            for attempt in attempts
+        ]
+        # 每題作答都是一筆小寫入；交給寫入佇列和同時間的其他寫入合併成一個交易
+        execute_write(
+            lambda conn: conn.executemany(
+                """
+                INSERT INTO practice_attempts (
+                    user_id, session_id, question_id, question_source, selected_letters,
+                    is_correct, elapsed_ms, topics, pattern, answered_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            ),
+            self.db_path,
+        )
+        logger.info(
+            "practice_attempts_recorded",
+            session_id=attempts[0].session_id,
+            attempt_count=len(attempts),
+            correct_count=sum(1 for attempt in attempts if attempt.is_correct),
+        )
+        return len(attempts)
+
+    def weakest(self, user_id: str, dimension: str = "topic", limit: int = 5, min_attempts: int = 1) -> list[PracticeMastery]:
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT dimension, label, attempts, correct, last_attempt_at
+                FROM practice_mastery
+                WHERE user_id = ? AND dimension = ? AND attempts >= ?
+                ORDER BY {WEAKEST_ORDER_BY}
+                LIMIT ?
+                """,
+                (user_id, dimension, min_attempts, limit),
+            ).fetchall()
+        return [self._row_to_mastery(row) for row in rows]
+
+    def list_mastery(self, user_id: str, dimension: str = "topic") -> list[PracticeMastery]:
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT dimension, label, attempts, correct, last_attempt_at
+                FROM practice_mastery
+                WHERE user_id = ? AND dimension = ?
+                """,
+                (user_id, dimension),
+            ).fetchall()
+        return [self._row_to_mastery(row) for row in rows]
+
+    def load_item_statistics(self, user_id: str) -> dict[str, PracticeQuestionStat]:
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT
+                    stats.*,
+                    difficulty.attempts AS global_attempts,
+                    difficulty.correct AS global_correct
+                FROM practice_question_stats AS stats
+                LEFT JOIN practice_item_difficulty AS difficulty ON difficulty.question_id = stats.question_id
+                WHERE stats.user_id = ?
+                """,
+                (user_id,),
+            ).fetchall()
+        stats = {row["question_id"]: self._row_to_question_stat(row) for row in rows}
+        logger.debug("practice_item_statistics_loaded", user_id=user_id, question_count=len(stats))
+        return stats
+
+    def load_item_difficulty(self, question_ids: list[str]) -> dict[str, PracticeQuestionStat]:
+        if not question_ids:
+            return {}
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT difficulty.question_id, difficulty.attempts, difficulty.correct
+                FROM json_each(?) AS picked
+                JOIN practice_item_difficulty AS difficulty ON difficulty.question_id = picked.value
+                """,
+                (json.dumps(list(question_ids), ensure_ascii=False),),
+            ).fetchall()
+        return {
+            row["question_id"]: PracticeQuestionStat(
+                question_id=row["question_id"],
+                global_attempts=int(row["attempts"]),
+                global_correct=int(row["correct"]),
+            )
+            for row in rows
+        }
+
+    def get_user_versions(self, user_ids: list[str]) -> dict[str, int]:
+        if not user_ids:
+            return {}
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT versions.user_id, versions.version
+                FROM json_each(?) AS picked
+                JOIN practice_user_versions AS versions ON versions.user_id = picked.value
+                """,
+                (json.dumps(list(user_ids), ensure_ascii=False),),
+            ).fetchall()
+        return {row["user_id"]: int(row["version"]) for row in rows}
+
+    def due_for_review(
+        self,
+        user_id: str,
+        limit: int = 20,
+        now: Optional[datetime] = None,
+    ) -> list[PracticeQuestionStat]:
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT * FROM practice_question_stats
+                WHERE user_id = ? AND next_review_at <= ?
+                ORDER BY next_review_at ASC
+                LIMIT ?
+                """,
+                (user_id, _format_timestamp(now or datetime.now()), limit),
+            ).fetchall()
+        return [self._row_to_question_stat(row) for row in rows]
+
+    def get_question_stats(self, user_id: str, question_ids: list[str]) -> dict[str, PracticeQuestionStat]:
+        if not question_ids:
+            return {}
+        with get_read_connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT stats.*
+                FROM json_each(?) AS picked
+                JOIN practice_question_stats AS stats
+                    ON stats.user_id = ? AND stats.question_id = picked.value
+                """,
+                (json.dumps(list(question_ids), ensure_ascii=False), user_id),
+            ).fetchall()
+        return {row["question_id"]: self._row_to_question_stat(row) for row in rows}
+
+    @staticmethod
+    def _row_to_mastery(row) -> PracticeMastery:
+        return PracticeMastery(
+            dimension=row["dimension"],
+            label=row["label"],
+            attempts=int(row["attempts"]),
+            correct=int(row["correct"]),
+            last_attempt_at=_parse_timestamp(row["last_attempt_at"]),
+        )
+
+    @staticmethod
+    def _row_to_question_stat(row) -> PracticeQuestionStat:
+        columns = row.keys()
+        return PracticeQuestionStat(
+            question_id=row["question_id"],
+            attempts=int(row["attempts"]),
+            correct=int(row["correct"]),
+            streak=int(row["streak"]),
+            last_attempt_at=_parse_timestamp(row["last_attempt_at"]),
+            next_review_at=_parse_timestamp(row["next_review_at"]),
+            global_attempts=int(row["global_attempts"] or 0) if "global_attempts" in columns else 0,
+            global_correct=int(row["global_correct"] or 0) if "global_correct" in columns else 0,
+        )
+
+
+_repository: SQLitePracticeAttemptRepository | None = None
+
+
+def get_practice_attempt_repository() -> SQLitePracticeAttemptRepository:
+    """取得作答紀錄儲存庫實例（單例）"""
+    global _repository
+    if _repository is None:
+        _repository = SQLitePracticeAttemptRepository()
+    return _repository
@@ -19,9 +19,17 @@ from src.domain.entities.question_draft import (
     classify_source_confidence,
 )
 from src.domain.repositories.question_draft_repository import IQuestionDraftRepository
-from src.infrastructure.persistence.database import begin_immediate_transaction, get_connection, init_database
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.database import (
+    begin_immediate_transaction,
+    get_read_connection,
+    get_write_connection,
+    init_database,
+)
+from src.infrastructure.persistence.read_model_versions import get_read_model_cache
 
 
+@instrument_repository("question_draft")
 class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
     """SQLite-backed draft question storage."""
 
@@ -36,7 +44,7 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
         reason: str | None = None,
         action: str | None = None,
     ) -> str:
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             begin_immediate_transaction(conn)
             return self.save_with_connection(
                 conn,
@@ -116,7 +124,7 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
         return draft.id
 
     def get_by_id(self, draft_id: str) -> Optional[QuestionDraft]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             return self._get_by_id_with_connection(conn, draft_id)
 
     def list_all(
@@ -126,7 +134,7 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
         limit: int = 200,
         offset: int = 0,
     ) -> list[QuestionDraft]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM question_drafts WHERE 1=1"
             params: list = []
@@ -223,7 +231,7 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
         actor_name: str = "streamlit-admin",
         reason: str | None = None,
     ) -> bool:
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             begin_immediate_transaction(conn)
             result = self.mark_promoted_with_connection(
                 conn,
@@ -260,7 +268,7 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
         return True
 
     def get_history(self, draft_id: str, limit: int = 20) -> list[QuestionDraftVersion]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -275,7 +283,12 @@ class SQLiteQuestionDraftRepository(IQuestionDraftRepository):
             return [self._row_to_version(row) for row in rows]
 
     def get_statistics(self) -> dict:
-        with get_connection(self.db_path) as conn:
+        return get_read_model_cache().get_or_load(
+            "question_draft_statistics", ("question_drafts",), self._load_statistics, db_path=self.db_path
+        )
+
+    def _load_statistics(self) -> dict:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
             cursor.execute("SELECT COUNT(*) FROM question_drafts")
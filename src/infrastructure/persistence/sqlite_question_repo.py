@@ -5,20 +5,44 @@ SQLite Question Repository - SQLite 題目儲存庫實作
 """
 
 import json
+import random
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from src.domain.entities.exam import BlueprintQuota
 from src.domain.entities.question import Difficulty, ExamTrack, Question, QuestionType, Source
 from src.domain.repositories.question_repository import IQuestionRepository
 from src.domain.value_objects.audit import ActorType, AuditAction, AuditEntry
 from src.infrastructure.logging import get_logger
-from src.infrastructure.persistence.database import begin_immediate_transaction, get_connection, init_database
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.content_stats import (
+    CONTENT_STATS_MAX_AGE_SECONDS,
+    CONTENT_STATS_SOURCE_TABLES,
+    load_content_stats,
+)
+from src.infrastructure.persistence.database import (
+    begin_immediate_transaction,
+    execute_write,
+    get_read_connection,
+    init_database,
+)
+from src.infrastructure.persistence.fts_query import build_like_filters, expand_bigram_terms, plan_fts_search
+from src.infrastructure.persistence.read_model_versions import get_read_model_cache
 
 logger = get_logger(__name__)
 
+# 少於 trigram 長度的關鍵字（如「插管」）改以 LIKE 比對這些欄位
+QUESTION_FTS_LIKE_COLUMNS = ("q.question_text", "q.options", "q.explanation", "q.topics")
 
+# 每個隨機起點沿索引取幾題再從中隨機挑一題，降低題目間 key 間距不同造成的抽中率差異
+BLUEPRINT_PIVOT_WINDOW = 4
+# 每段兩個 UNION ALL 分支；SQLite 預設 compound SELECT 上限為 500
+BLUEPRINT_SLICES_PER_QUERY = 200
+
+
+@instrument_repository("question")
 class SQLiteQuestionRepository(IQuestionRepository):
     """
     SQLite 題目儲存庫
@@ -46,16 +70,17 @@ class SQLiteQuestionRepository(IQuestionRepository):
         actor_name: str = "crush",
         generation_context: Optional[dict] = None,
     ) -> str:
-        """儲存題目（新增或更新）"""
-        with get_connection(self.db_path) as conn:
-            return self.save_with_connection(
+        """儲存題目（新增或更新）；交給寫入佇列，和同時間的其他小寫入合併成一個交易"""
+        return execute_write(
+            lambda conn: self.save_with_connection(
                 conn,
                 question,
                 actor_type=actor_type,
                 actor_name=actor_name,
                 generation_context=generation_context,
-                commit=True,
-            )
+            ),
+            self.db_path,
+        )
 
     def save_with_connection(
         self,
@@ -88,8 +113,8 @@ class SQLiteQuestionRepository(IQuestionRepository):
                 id, question_text, options, correct_answer, explanation,
                 source, question_type, difficulty, topics, points,
                 image_path, created_at, created_by, updated_at,
-                is_deleted, is_validated, exam_track
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?)
+                is_deleted, is_validated, exam_track, sample_key
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?, ?)
         """,
             (
                 question.id,
@@ -114,6 +139,7 @@ class SQLiteQuestionRepository(IQuestionRepository):
                 question.created_by,
                 now,
                 question.exam_track.value if question.exam_track else None,
+                random.getrandbits(63),
             ),
         )
 
@@ -157,7 +183,7 @@ class SQLiteQuestionRepository(IQuestionRepository):
 
     def get_by_id(self, question_id: str) -> Optional[Question]:
         """根據 ID 取得題目"""
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -187,7 +213,7 @@ class SQLiteQuestionRepository(IQuestionRepository):
         exam_track: Optional[ExamTrack] = None,
     ) -> list[Question]:
         """列出題目（支援篩選）"""
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
             query = "SELECT * FROM questions WHERE is_deleted = 0"
@@ -243,7 +269,7 @@ class SQLiteQuestionRepository(IQuestionRepository):
         question_type: Optional[QuestionType] = None,
     ) -> int:
         """統計題目數量"""
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
             query = "SELECT COUNT(*) FROM questions WHERE is_deleted = 0"
@@ -261,25 +287,206 @@ class SQLiteQuestionRepository(IQuestionRepository):
             return cursor.fetchone()[0]
 
     def search(self, keyword: str, limit: int = 20) -> list[Question]:
-        """搜尋題目"""
-        with get_connection(self.db_path) as conn:
-            cursor = conn.cursor()
+        """搜尋題目（中英混合關鍵字，自動跳脫 FTS 運算子）"""
+        plan = plan_fts_search(keyword)
+        if plan.is_empty:
+            return []
 
-            # 使用 FTS5 搜尋
-            cursor.execute(
+        with get_read_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            plan = expand_bigram_terms(cursor, "questions_fts_vocab", plan)
+
+            # 使用 FTS5 (trigram) 搜尋；兩字詞展開成 trigram，仍過短的關鍵字退回 LIKE
+            if plan.match:
+                query = """
+                    SELECT q.* FROM questions_fts
+                    JOIN questions q ON q.rowid = questions_fts.rowid
+                    WHERE questions_fts MATCH ? AND q.is_deleted = 0
                 """
-                SELECT q.* FROM questions q
-                JOIN questions_fts fts ON q.id = fts.id
-                WHERE questions_fts MATCH ? AND q.is_deleted = 0
-                LIMIT ?
-            """,
-                (keyword, limit),
-            )
+                params: list = [plan.match]
+            else:
+                query = "SELECT q.* FROM questions q WHERE q.is_deleted = 0"
+                params = []
+
+            like_clause, like_params = build_like_filters(plan.like_terms, QUESTION_FTS_LIKE_COLUMNS)
+            if like_clause:
+                query += f" AND {like_clause}"
+                params.extend(like_params)
+
+            query += " ORDER BY bm25(questions_fts) ASC" if plan.match else " ORDER BY q.created_at DESC"
+            query += " LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(query, params)
 
             rows = cursor.fetchall()
             logger.debug("question_search_completed", keyword=keyword, limit=limit, result_count=len(rows))
             return [self._row_to_question(row) for row in rows]
 
+    def sample_by_blueprint(
+        self,
+        quotas: list[BlueprintQuota],
+        *,
+        exam_track: Optional[ExamTrack] = None,
+        validated_only: bool = False,
+        exclude_ids: Optional[set[str]] = None,
+        rng: Optional[random.Random] = None,
+    ) -> list[list[Question]]:
+        """
+        依組卷藍圖隨機抽題（每輪一次查詢解完所有格）
+
+        每一題各用一個隨機 sample_key 起點，沿索引取其後 BLUEPRINT_PIVOT_WINDOW 題
+        （不足時從頭補齊），再從中隨機挑一題，因此各題獨立抽出、相鄰 key 不會
+        成群出現，成本與要抽的題數成正比、與題庫大小無關。起點撞在一起或被
+        其他格拿走而不足的格，第二輪多取已選題數作為去重緩衝，題庫夠時一定補滿。
+        """
+        results: list[list[Question]] = [[] for _ in quotas]
+        if not any(quota.count > 0 for quota in quotas):
+            return results
+
+        rng = rng or random.Random()
+        excluded = set(exclude_ids or ())
+        used_ids = set(excluded)
+        candidate_rows = 0
+        with get_read_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            for top_up in (False, True):
+                # (格, 這段要挑幾題, 這段沿索引取幾題)
+                slices: list[tuple[int, int, int]] = []
+                for index, quota in enumerate(quotas):
+                    missing = quota.count - len(results[index])
+                    if missing <= 0:
+                        continue
+                    if top_up:
+                        slices.append((index, missing, missing + len(used_ids) - len(excluded)))
+                    else:
+                        slices.extend((index, 1, BLUEPRINT_PIVOT_WINDOW) for _ in range(missing))
+                if not slices:
+                    break
+
+                rows = self._fetch_blueprint_slices(
+                    cursor,
+                    quotas,
+                    slices,
+                    rng=rng,
+                    exam_track=exam_track,
+                    validated_only=validated_only,
+                    exclude_ids=excluded,
+                )
+                candidate_rows += len(rows)
+                rows.sort(key=lambda item: (item["blueprint_slice"], item["blueprint_branch"], item["sample_key"]))
+                windows: list[list] = [[] for _ in slices]
+                for row in rows:
+                    window = windows[row["blueprint_slice"]]
+                    if len(window) < slices[row["blueprint_slice"]][2]:
+                        window.append(row)
+
+                for (cell_index, size, _), window in zip(slices, windows, strict=True):
+                    cell = results[cell_index]
+                    fresh = [row for row in window if row["id"] not in used_ids]
+                    room = min(size, quotas[cell_index].count - len(cell))
+                    if not fresh or room <= 0:
+                        continue
+                    picked = fresh[:room] if top_up else [rng.choice(fresh)]
+                    for row in picked:
+                        used_ids.add(row["id"])
+                        cell.append(self._row_to_question(row))
+        for cell in results:
+            rng.shuffle(cell)
+
+        logger.debug(
+            "question_blueprint_sampled",
+            cell_count=sum(1 for quota in quotas if quota.count > 0),
+            requested=sum(max(quota.count, 0) for quota in quotas),
+            selected=sum(len(cell) for cell in results),
+            candidate_rows=candidate_rows,
+        )
+        return results
+
+    def _fetch_blueprint_slices(
+        self,
+        cursor,
+        quotas: list[BlueprintQuota],
+        slices: list[tuple[int, int, int]],
+        *,
+        rng: random.Random,
+        exam_track: Optional[ExamTrack],
+        validated_only: bool,
+        exclude_ids: set[str],
+    ) -> list:
+        """每段各用一個隨機起點，以 UNION ALL 分批查詢；排除清單只以 json_each 綁定一次"""
+        rows = []
+        for start in range(0, len(slices), BLUEPRINT_SLICES_PER_QUERY):
+            branches: list[str] = []
+            params: list = []
+            for slice_index in range(start, min(start + BLUEPRINT_SLICES_PER_QUERY, len(slices))):
+                cell_index, _, limit = slices[slice_index]
+                pivot = rng.getrandbits(63)
+                for branch in (0, 1):
+                    branch_sql, branch_params = self._blueprint_branch_query(
+                        slice_index,
+                        branch,
+                        quotas[cell_index],
+                        pivot=pivot,
+                        limit=limit,
+                        exam_track=exam_track,
+                        validated_only=validated_only,
+                        has_exclusions=bool(exclude_ids),
+                    )
+                    branches.append(f"SELECT * FROM ({branch_sql})")
+                    params.extend(branch_params)
+            query = " UNION ALL ".join(branches)
+            if exclude_ids:
+                query = f"WITH blueprint_excluded(id) AS (SELECT value FROM json_each(?)) {query}"
+                params.insert(0, json.dumps(sorted(exclude_ids), ensure_ascii=False))
+            cursor.execute(query, params)
+            rows.extend(cursor.fetchall())
+        return rows
+
+    @staticmethod
+    def _blueprint_branch_query(
+        slice_index: int,
+        branch: int,
+        quota: BlueprintQuota,
+        *,
+        pivot: int,
+        limit: int,
+        exam_track: Optional[ExamTrack],
+        validated_only: bool,
+        has_exclusions: bool,
+    ) -> tuple[str, list]:
+        """單段單分支：branch 0 取 sample_key >= pivot，branch 1 從頭補到 pivot 之前"""
+        if quota.topic:
+            source = "question_topics qt JOIN questions q ON q.id = qt.question_id"
+            key_column = "qt.sample_key"
+            conditions = ["qt.topic = ?"]
+            params: list = [quota.topic]
+        else:
+            source = "questions q"
+            key_column = "q.sample_key"
+            conditions = []
+            params = []
+
+        conditions.append("q.is_deleted = 0")
+        if quota.difficulty:
+            conditions.append("q.difficulty = ?")
+            params.append(quota.difficulty.value)
+        if exam_track:
+            conditions.append("q.exam_track = ?")
+            params.append(exam_track.value)
+        if validated_only:
+            conditions.append("q.is_validated = 1")
+        if has_exclusions:
+            conditions.append("q.id NOT IN (SELECT id FROM blueprint_excluded)")
+        conditions.append(f"{key_column} {'>=' if branch == 0 else '<'} ?")
+        params.append(pivot)
+
+        query = (
+            f"SELECT ? AS blueprint_slice, ? AS blueprint_branch, q.* FROM {source} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY {key_column} LIMIT ?"
+        )
+        return query, [slice_index, branch, *params, limit]
+
     # ==================== Update ====================
 
     def update(
@@ -290,9 +497,11 @@ class SQLiteQuestionRepository(IQuestionRepository):
         reason: Optional[str] = None,
     ) -> bool:
         """更新題目"""
-        with get_connection(self.db_path) as conn:
-            result = self._update_internal(conn, question, actor_type, actor_name, reason)
-            return result is not None
+        result = execute_write(
+            lambda conn: self._update_internal(conn, question, actor_type, actor_name, reason, commit=False),
+            self.db_path,
+        )
+        return result is not None
 
     def _update_internal(
         self,
@@ -418,9 +627,8 @@ class SQLiteQuestionRepository(IQuestionRepository):
         soft_delete: bool = True,
     ) -> bool:
         """刪除題目"""
-        log = logger.bind(question_id=question_id)
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+
+        def delete_question(conn) -> bool:
             cursor = conn.cursor()
 
             if soft_delete:
@@ -446,11 +654,13 @@ class SQLiteQuestionRepository(IQuestionRepository):
                 actor_name=actor_name,
                 reason=reason,
             )
-
-            conn.commit()
-            log.info("question_deleted", provider=actor_name, soft_delete=soft_delete)
             return True
 
+        deleted = execute_write(delete_question, self.db_path)
+        if deleted:
+            logger.info("question_deleted", question_id=question_id, provider=actor_name, soft_delete=soft_delete)
+        return deleted
+
     def restore(
         self,
         question_id: str,
@@ -458,9 +668,8 @@ class SQLiteQuestionRepository(IQuestionRepository):
         actor_name: str = "unknown",
     ) -> bool:
         """還原已刪除的題目"""
-        log = logger.bind(question_id=question_id)
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+
+        def restore_question(conn) -> bool:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -482,17 +691,18 @@ class SQLiteQuestionRepository(IQuestionRepository):
                 actor_type=actor_type,
                 actor_name=actor_name,
             )
-
-            conn.commit()
-            log.info("question_restored", provider=actor_name)
             return True
 
+        restored = execute_write(restore_question, self.db_path)
+        if restored:
+            logger.info("question_restored", question_id=question_id, provider=actor_name)
+        return restored
+
     # ==================== Audit ====================
 
     def get_audit_log(self, question_id: str, limit: int = 50) -> list[AuditEntry]:
         """取得題目的審計日誌"""
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -510,7 +720,7 @@ class SQLiteQuestionRepository(IQuestionRepository):
 
     def get_generation_context(self, question_id: str) -> Optional[dict]:
         """取得題目的生成上下文"""
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -571,8 +781,8 @@ class SQLiteQuestionRepository(IQuestionRepository):
         notes: Optional[str] = None,
     ) -> bool:
         """標記題目驗證結果"""
-        log = logger.bind(question_id=question_id)
-        with get_connection(self.db_path) as conn:
+
+        def mark_question(conn) -> bool:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -598,91 +808,37 @@ class SQLiteQuestionRepository(IQuestionRepository):
                 actor_name=actor_name,
                 reason=notes,
             )
-
-            conn.commit()
-            log.info("question_validation_marked", passed=passed, provider=actor_name)
             return True
 
+        marked = execute_write(mark_question, self.db_path)
+        if marked:
+            logger.info("question_validation_marked", question_id=question_id, passed=passed, provider=actor_name)
+        return marked
+
     # ==================== Statistics ====================
 
     def get_statistics(self) -> dict:
-        """取得題庫統計"""
-        with get_connection(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # 總題數
-            cursor.execute("SELECT COUNT(*) FROM questions WHERE is_deleted = 0")
-            total = cursor.fetchone()[0]
-
-            # 按難度統計
-            cursor.execute("""
-                SELECT difficulty, COUNT(*)
-                FROM questions WHERE is_deleted = 0
-                GROUP BY difficulty
-            """)
-            by_difficulty = dict(cursor.fetchall())
-
-            # 按題型統計
-            cursor.execute("""
-                SELECT question_type, COUNT(*)
-                FROM questions WHERE is_deleted = 0
-                GROUP BY question_type
-            """)
-            by_type = dict(cursor.fetchall())
-
-            # 已驗證數
-            cursor.execute("""
-                SELECT COUNT(*) FROM questions
-                WHERE is_deleted = 0 AND is_validated = 1
-            """)
-            validated = cursor.fetchone()[0]
-
-            # 已刪除數
-            cursor.execute("SELECT COUNT(*) FROM questions WHERE is_deleted = 1")
-            deleted = cursor.fetchone()[0]
-
-            # 近7天新增
-            seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM questions
-                WHERE is_deleted = 0 AND created_at >= ?
-            """,
-                (seven_days_ago,),
-            )
-            recent = cursor.fetchone()[0]
-
-            # 按主題統計 (Top 10)
-            cursor.execute("""
-                SELECT topics FROM questions WHERE is_deleted = 0
-            """)
-            topic_counts: dict[str, int] = {}
-            for row in cursor.fetchall():
-                if row[0]:
-                    topics = json.loads(row[0])
-                    for topic in topics:
-                        topic_counts[topic] = topic_counts.get(topic, 0) + 1
-
-            # 取 Top 10
-            by_topic = dict(sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-
-            stats = {
-                "total": total,
-                "by_difficulty": by_difficulty,
-                "by_type": by_type,
-                "by_topic": by_topic,
-                "validated": validated,
-                "deleted": deleted,
-                "recent_7_days": recent,
-            }
-            logger.debug(
-                "question_statistics_loaded",
-                total=total,
-                validated=validated,
-                deleted=deleted,
-                recent_7_days=recent,
-            )
-            return stats
+        """取得題庫統計（與考古題、考卷目錄共用同一條彙總查詢）"""
+        stats = self.get_content_statistics()["questions"]
+        logger.debug(
+            "question_statistics_loaded",
+            total=stats["total"],
+            validated=stats["validated"],
+            deleted=stats["deleted"],
+            recent_7_days=stats["recent_7_days"],
+        )
+        return stats
+
+    def get_content_statistics(self) -> dict:
+        """一次查詢取得題庫、考古題與已產生考卷的統計，供儀表板 / MCP / Telegram 共用"""
+        # 近 7 天新增數會隨時間移動，除了版本之外再加上存活時間
+        return get_read_model_cache().get_or_load(
+            "content_statistics",
+            CONTENT_STATS_SOURCE_TABLES,
+            lambda: load_content_stats(self.db_path),
+            db_path=self.db_path,
+            max_age_seconds=CONTENT_STATS_MAX_AGE_SECONDS,
+        )
 
     # ==================== Helpers ====================
 
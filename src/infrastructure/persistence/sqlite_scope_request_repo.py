@@ -8,9 +8,18 @@ from typing import Optional
 
 from src.domain.entities.scope_request import ScopeRequest, ScopeRequestStatus
 from src.domain.repositories.scope_request_repository import IScopeRequestRepository
-from src.infrastructure.persistence.database import begin_immediate_transaction, get_connection, init_database
-
-
+from src.infrastructure.metrics.instruments import instrument_repository
+from src.infrastructure.persistence.database import (
+    begin_immediate_transaction,
+    execute_write,
+    get_read_connection,
+    get_write_connection,
+    init_database,
+)
+from src.infrastructure.persistence.read_model_versions import get_read_model_cache
+
+
+@instrument_repository("scope_request")
 class SQLiteScopeRequestRepository(IScopeRequestRepository):
     """SQLite 出題需求儲存庫"""
 
@@ -19,7 +28,7 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
         init_database(db_path)
 
     def save(self, request: ScopeRequest) -> str:
-        with get_connection(self.db_path) as conn:
+        with get_write_connection(self.db_path) as conn:
             begin_immediate_transaction(conn)
             cursor = conn.cursor()
             now = datetime.now().isoformat()
@@ -66,7 +75,7 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
         return request.id
 
     def get_by_id(self, request_id: str) -> Optional[ScopeRequest]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM scope_requests WHERE id = ?", (request_id,))
             row = cursor.fetchone()
@@ -81,7 +90,7 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
         limit: int = 100,
         offset: int = 0,
     ) -> list[ScopeRequest]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM scope_requests WHERE 1=1"
             params: list = []
@@ -106,8 +115,7 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
         new_status: ScopeRequestStatus,
         admin_notes: Optional[str] = None,
     ) -> bool:
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+        def update_request(conn) -> bool:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
@@ -131,15 +139,13 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
                     """,
                     (new_status.value, now, fulfilled_at, request_id),
                 )
+            return cursor.rowcount > 0
 
-            if cursor.rowcount == 0:
-                return False
-            conn.commit()
-            return True
+        return execute_write(update_request, self.db_path)
 
     def increment_fulfilled(self, request_id: str, count: int = 1) -> bool:
-        with get_connection(self.db_path) as conn:
-            begin_immediate_transaction(conn)
+        # 每題出完都會加一次計數；交給寫入佇列和同時間的其他小寫入合併成一個交易
+        def increment(conn) -> bool:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
@@ -165,12 +171,12 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
                 """,
                 (now, request_id),
             )
-
-            conn.commit()
             return True
 
+        return execute_write(increment, self.db_path)
+
     def get_pending_requests(self) -> list[ScopeRequest]:
-        with get_connection(self.db_path) as conn:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -182,7 +188,12 @@ class SQLiteScopeRequestRepository(IScopeRequestRepository):
             return [self._row_to_scope_request(row) for row in cursor.fetchall()]
 
     def get_statistics(self) -> dict:
-        with get_connection(self.db_path) as conn:
+        return get_read_model_cache().get_or_load(
+            "scope_request_statistics", ("scope_requests",), self._load_statistics, db_path=self.db_path
+        )
+
+    def _load_statistics(self) -> dict:
+        with get_read_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
             cursor.execute("SELECT COUNT(*) FROM scope_requests")
@@ -0,0 +1,269 @@
+"""
+SQLite Writer - 每個程序單一寫入連線
+
+``connection()`` 獨佔寫入連線；``submit()`` 交給背景執行緒把小寫入合併成一個交易。
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from src.infrastructure.logging import get_logger
+from src.infrastructure.metrics.instruments import DB_CHECKOUT_SECONDS, DB_WRITE_LOCK_WAIT_SECONDS
+from src.infrastructure.persistence.pool_monitor import monitor_for_connection
+
+T = TypeVar("T")
+WriteWork = Callable[[sqlite3.Connection], Any]
+
+logger = get_logger(__name__)
+
+DEFAULT_WRITE_BATCH_SIZE = 64
+_STOP = object()
+
+
+class WriterConnection(sqlite3.Connection):
+    """sqlite3 connection with a pool-style ``info`` dict, so pool monitors can find it."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.info: dict[str, Any] = {}
+
+
+class SQLiteWriter:
+    """Single read-write connection per database, shared by exclusive use and a batching thread."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        connect: Callable[[], sqlite3.Connection],
+        *,
+        max_batch: int = DEFAULT_WRITE_BATCH_SIZE,
+    ) -> None:
+        self.db_path = db_path
+        self.label = f"{db_path.name}:writer"
+        self.max_batch = max(int(max_batch), 1)
+        self._connect = connect
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = threading.Lock()
+        # 目前持有寫入連線的執行緒；同一執行緒再次要求時不能等鎖（會等到自己）
+        self._owner: int | None = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._state_lock = threading.Lock()
+        self._closed = False
+
+        self.exclusive_uses = 0
+        self.batches = 0
+        self.jobs = 0
+        self.failed_jobs = 0
+        self.max_batch_seen = 0
+
+    # ---- exclusive use ----------------------------------------------
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer connection exclusively; an unfinished transaction is rolled back on exit.
+
+        Nesting on the thread that already holds it raises ``RuntimeError``: the inner block would
+        share the outer transaction and roll it back on exit. Pass the connection down instead.
+        """
+        if self.held_by_current_thread():
+            raise RuntimeError(f"SQLite writer for {self.db_path} is already held by this thread")
+        started = time.perf_counter()
+        with self._conn_lock:
+            self._owner = threading.get_ident()
+            try:
+                DB_CHECKOUT_SECONDS.observe(time.perf_counter() - started, db=self.label)
+                conn = self._ensure_connection()
+                self.exclusive_uses += 1
+                try:
+                    yield conn
+                finally:
+                    if conn.in_transaction:
+                        conn.rollback()
+            finally:
+                self._owner = None
+
+    def held_by_current_thread(self) -> bool:
+        return self._owner == threading.get_ident()
+
+    # ---- batched writes ---------------------------------------------
+
+    def submit(self, work: Callable[[sqlite3.Connection], T]) -> Future[T]:
+        """Queue ``work(conn)`` for the next grouped transaction; the Future resolves after COMMIT.
+
+        From the thread that holds the connection (inside ``connection()`` or a batched work) the work
+        runs inline instead: in a savepoint of the open transaction, which the holder commits, or in
+        its own transaction when none is open.
+        """
+        if self.held_by_current_thread():
+            return self._run_inline(work)
+        future: Future[T] = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError(f"SQLite writer for {self.db_path} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"sqlite-writer-{self.db_path.name}",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._queue.put((work, future))
+        return future
+
+    def execute(self, work: Callable[[sqlite3.Connection], T], timeout: float | None = None) -> T:
+        """``submit`` and wait for the result."""
+        return self.submit(work).result(timeout)
+
+    def _run_inline(self, work: Callable[[sqlite3.Connection], T]) -> Future[T]:
+        # 排進佇列會等寫入執行緒拿鎖，而鎖在自己手上：直接用這條連線執行
+        future: Future[T] = Future()
+        future.set_running_or_notify_cancel()
+        conn = self._ensure_connection()
+        try:
+            if conn.in_transaction:
+                conn.execute("SAVEPOINT inline_write")
+                try:
+                    result = work(conn)
+                except Exception:
+                    conn.execute("ROLLBACK TO inline_write")
+                    conn.execute("RELEASE inline_write")
+                    raise
+                conn.execute("RELEASE inline_write")
+            else:
+                begin_started = time.perf_counter()
+                conn.execute("BEGIN IMMEDIATE")
+                self._record_write_lock_wait(conn, time.perf_counter() - begin_started)
+                try:
+                    result = work(conn)
+                    conn.commit()
+                except Exception:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+        except Exception as exc:
+            self.failed_jobs += 1
+            future.set_exception(exc)
+            return future
+        self.jobs += 1
+        future.set_result(result)
+        return future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[tuple[WriteWork, Future]]) -> None:
+        batch = [(work, future) for work, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        succeeded: list[tuple[Future, Any]] = []
+        with self._conn_lock:
+            self._owner = threading.get_ident()
+            conn = self._ensure_connection()
+            remaining = list(batch)
+            try:
+                begin_started = time.perf_counter()
+                conn.execute("BEGIN IMMEDIATE")
+                self._record_write_lock_wait(conn, time.perf_counter() - begin_started)
+                while remaining:
+                    work, future = remaining[0]
+                    conn.execute("SAVEPOINT batched_write")
+                    try:
+                        result = work(conn)
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO batched_write")
+                        conn.execute("RELEASE batched_write")
+                        remaining.pop(0)
+                        self.failed_jobs += 1
+                        future.set_exception(exc)
+                        continue
+                    conn.execute("RELEASE batched_write")
+                    remaining.pop(0)
+                    succeeded.append((future, result))
+                conn.commit()
+            except Exception as exc:
+                if conn.in_transaction:
+                    conn.rollback()
+                failed = [future for future, _ in succeeded] + [future for _, future in remaining]
+                self.failed_jobs += len(failed)
+                logger.warning(
+                    "sqlite_write_batch_failed",
+                    db_path=str(self.db_path),
+                    batch_size=len(batch),
+                    error=str(exc),
+                )
+                for future in failed:
+                    future.set_exception(exc)
+                return
+            finally:
+                self._owner = None
+            self.batches += 1
+            self.jobs += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        for future, result in succeeded:
+            future.set_result(result)
+
+    def _record_write_lock_wait(self, conn: sqlite3.Connection, seconds: float) -> None:
+        monitor = monitor_for_connection(conn)
+        if monitor is not None:
+            monitor.record_write_lock_wait(seconds)
+        else:
+            DB_WRITE_LOCK_WAIT_SECONDS.observe(seconds, db=self.label)
+
+    # ---- lifecycle --------------------------------------------------
+
+    def _ensure_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "exclusive_uses": self.exclusive_uses,
+            "batches": self.batches,
+            "batched_jobs": self.jobs,
+            "failed_jobs": self.failed_jobs,
+            "avg_batch_size": round(self.jobs / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self) -> None:
+        """Finish queued writes, stop the thread and close the connection."""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -14,7 +14,6 @@ import html
 import os
 import re
 import sys
-from collections import Counter
 from pathlib import Path
 
 # 確保專案根目錄在 Python path 中
@@ -34,12 +33,20 @@ from typing import Any, Optional, cast
 import streamlit as st
 import streamlit.components.v1 as components
 
+from src.application.services.adaptive_practice_service import get_adaptive_practice_selector
 from src.application.services.past_exam_explanation_service import get_past_exam_explanation_service
 from src.application.services.openclaw_session_keys import build_openclaw_session_key, normalize_openclaw_session_part
 from src.application.services.past_exam_figure_service import get_past_exam_figure_service
+from src.application.services.practice_analytics import (
+    PracticeScorecard,
+    get_practice_scorecard_cache,
+    practice_session_fingerprint,
+)
 from src.application.services.textbook_generation_service import get_textbook_generation_service
 from src.infrastructure import agent as agent_module
 from src.infrastructure.logging import bootstrap_logging, new_run_id
+from src.infrastructure.metrics import maybe_start_metrics_server
+from src.domain.entities.practice import PracticeAttempt
 from src.domain.value_objects.answer import (
     question_allows_multiple as _question_type_allows_multiple,
     format_answer_letters as _format_answer_letters,
@@ -60,7 +67,6 @@ from src.presentation.streamlit.generation.fragments import (
 from src.presentation.streamlit.generation.orchestration import (
     build_generation_prompt,
     create_generation_execution_ui,
-    extract_questions_from_response,
     stream_agent_generate,
 )
 from src.presentation.streamlit.past_exam_fragments import render_past_exam_question_assets
@@ -80,6 +86,8 @@ logger = bootstrap_logging(
     log_dir=LOG_DIR,
     extra_context={"run_id": APP_RUN_ID, "provider": "streamlit"},
 )
+# Streamlit 每次互動都會重跑腳本；maybe_start_metrics_server 在同一程序內只啟動一次
+maybe_start_metrics_server("web")
 
 # 設定頁面
 st.set_page_config(
@@ -137,9 +145,12 @@ CHAT_QUICK_PROMPTS = [
 PRACTICE_SOURCE_GENERAL = "general_bank"
 PRACTICE_SOURCE_GENERATED = "generated_preview"
 PRACTICE_SOURCE_PAST_EXAM = "past_exam"
+PRACTICE_USER_ID_ENV_VAR = "EXAM_PRACTICE_USER_ID"
 SUPPORTED_AGENT_PROVIDERS = ("crush", "opencode", "copilot-sdk", "codex", "openclaw")
 MCP_CAPABLE_AGENT_PROVIDERS = ("crush", "opencode")
 REQUIRED_REPO_MCP_SERVERS = ("exam-generator", "asset-aware")
+# DB 讀模型靠 table_versions 計數失效，TTL 只是保底
+READ_MODEL_CACHE_TTL_SECONDS = 600
 PRACTICE_PATTERN_LABELS = {
     "direct_recall": "直接記憶",
     "clinical_scenario": "臨床情境",
@@ -577,6 +588,7 @@ def start_practice_session(questions: list[dict], context: Optional[dict] = None
     st.session_state.practice_submitted = False
     st.session_state.show_explanations = {}
     st.session_state.practice_context = dict(context or {})
+    _reset_practice_attempt_tracking()
 
 
 def queue_practice_session(questions: list[dict], context: Optional[dict] = None) -> None:
@@ -598,73 +610,164 @@ def clear_practice_session(clear_questions: bool = True) -> None:
     st.session_state.practice_submitted = False
     st.session_state.show_explanations = {}
     st.session_state.practice_context = {}
+    _reset_practice_attempt_tracking()
 
 
-def summarize_practice_results(questions: list[dict], practice_answers: dict[str, str]) -> dict:
-    """Build a normalized result summary for practice results and review UIs."""
-    result_rows: list[dict] = []
-    correct_count = 0
-    answered_count = 0
+def _reset_practice_attempt_tracking() -> None:
+    st.session_state.practice_session_id = uuid.uuid4().hex
+    st.session_state.practice_answer_elapsed_ms = {}
+    st.session_state.practice_last_answer_at = time.monotonic()
 
-    for index, question in enumerate(questions):
-        question_key = get_practice_question_key(question, index)
+
+def _set_practice_answer(question_key: str, answer: str) -> None:
+    """Store a practice answer; time spent since the previous answer change is credited to this question."""
+    previous_answer = st.session_state.practice_answers.get(question_key, "")
+    st.session_state.practice_answers[question_key] = answer
+    if not answer or answer == previous_answer:
+        return
+    now = time.monotonic()
+    elapsed_by_question = st.session_state.setdefault("practice_answer_elapsed_ms", {})
+    last_answer_at = st.session_state.get("practice_last_answer_at") or now
+    elapsed_by_question[question_key] = elapsed_by_question.get(question_key, 0) + int((now - last_answer_at) * 1000)
+    st.session_state.practice_last_answer_at = now
+
+
+def get_practice_user_id() -> str:
+    """Practice history owner; the site is single-tenant, so one shared id unless overridden."""
+    return str(st.session_state.get("practice_user_id") or os.getenv(PRACTICE_USER_ID_ENV_VAR) or "local")
+
+
+def record_practice_attempts(questions: list[dict], practice_answers: dict[str, str], practice_context: dict) -> int:
+    """Persist a submitted practice round as one batch of attempts (mastery aggregates update in the same write)."""
+    if practice_context.get("source_type") == PRACTICE_SOURCE_GENERATED:
+        return 0
+
+    from src.infrastructure.persistence.sqlite_practice_attempt_repo import get_practice_attempt_repository
+
+    scorecard = summarize_practice_results(questions, practice_answers)["scorecard"]
+    session_id = str(st.session_state.get("practice_session_id") or uuid.uuid4().hex)
+    elapsed_by_question = st.session_state.get("practice_answer_elapsed_ms", {})
+    user_id = get_practice_user_id()
+    answered_at = datetime.now()
+    correct_flags = scorecard.correct.tolist()
+    attempts = [
+        PracticeAttempt(
+            user_id=user_id,
+            session_id=session_id,
+            question_id=str(question["id"]),
+            selected_letters="" if scorecard.user_answers[index] == "-" else scorecard.user_answers[index],
+            is_correct=correct_flags[index],
+            elapsed_ms=elapsed_by_question.get(str(question["id"])),
+            question_source=str(practice_context.get("source_type") or "") or None,
+            topics=[str(topic).strip() for topic in question.get("topics", []) if str(topic).strip()],
+            pattern=str(question.get("pattern") or "") or None,
+            answered_at=answered_at,
+        )
+        for index, question in enumerate(questions)
+        if str(question.get("id") or "").strip()
+    ]
+    return get_practice_attempt_repository().record_attempts(attempts)
+
+
+def _score_practice_session(
+    questions: list[dict],
+    question_keys: list[str],
+    practice_answers: dict[str, str],
+) -> PracticeScorecard:
+    """Grade every question once and encode the grouping fields into a scorecard."""
+    answered: list[bool] = []
+    correct: list[bool] = []
+    user_answers: list[str] = []
+    correct_answers: list[str] = []
+    exam_years: list[object] = []
+    exam_labels: list[str] = []
+    pattern_labels: list[str] = []
+
+    for question, question_key in zip(questions, question_keys):
         option_count = len(question.get("options") or [])
-        user_answer = str(practice_answers.get(question_key, "") or "")
-        user_letters = _normalize_answer_letters(user_answer, option_count=option_count)
+        user_letters = _normalize_answer_letters(practice_answers.get(question_key, "") or "", option_count=option_count)
         correct_letters = _normalize_answer_letters(question.get("correct_answer", ""), option_count=option_count)
-        is_answered = bool(user_letters)
-        is_correct = is_answered and user_letters == correct_letters
-
-        if is_answered:
-            answered_count += 1
-        if is_correct:
-            correct_count += 1
+        answered.append(bool(user_letters))
+        correct.append(bool(user_letters) and user_letters == correct_letters)
+        user_answers.append(_format_answer_letters(user_letters) or "-")
+        correct_answers.append(_format_answer_letters(correct_letters) or "-")
 
         exam_year = question.get("exam_year")
         exam_name = str(question.get("exam_name", "") or "")
-        exam_label = f"{exam_year} 年 {exam_name}" if exam_year or exam_name else "未標記考卷"
-        pattern_value = str(question.get("pattern", "") or "")
+        exam_years.append(exam_year if exam_year not in (None, "") else "未標記")
+        exam_labels.append(f"{exam_year} 年 {exam_name}" if exam_year or exam_name else "未標記考卷")
+        pattern_labels.append(PRACTICE_PATTERN_LABELS.get(str(question.get("pattern", "") or ""), "未分類"))
+
+    return PracticeScorecard.build(
+        answered=answered,
+        correct=correct,
+        user_answers=user_answers,
+        correct_answers=correct_answers,
+        topics=[question.get("topics", []) for question in questions],
+        groups={"exam_year": exam_years, "exam_label": exam_labels, "pattern_label": pattern_labels},
+    )
 
-        result_rows.append(
-            {
-                "question_text": question.get("question_text", ""),
-                "exam_year": exam_year if exam_year not in (None, "") else "未標記",
-                "exam_label": exam_label,
-                "question_number": question.get("question_number") or index + 1,
-                "pattern_label": PRACTICE_PATTERN_LABELS.get(pattern_value, "未分類"),
-                "topics": question.get("topics", []),
-                "difficulty": question.get("difficulty", "medium"),
-                "user_answer": _format_answer_letters(user_letters) or "-",
-                "correct_answer": _format_answer_letters(correct_letters) or "-",
-                "is_answered": is_answered,
-                "is_correct": is_correct,
-                "explanation": question.get("explanation", ""),
-                "source_page": question.get("source_page"),
-                "figure_assets": question.get("figure_assets", []),
-                "option_figure_assets": question.get("option_figure_assets", []),
-                "source_page_image_path": question.get("source_page_image_path"),
-                "image_asset_status": question.get("image_asset_status"),
-                "image_asset_note": question.get("image_asset_note"),
-            }
-        )
 
-    total_questions = len(questions)
-    incorrect_count = answered_count - correct_count
-    unanswered_count = total_questions - answered_count
-    score = (correct_count / total_questions * 100) if total_questions else 0.0
-    answered_accuracy = (correct_count / answered_count * 100) if answered_count else 0.0
-    review_rows = [row for row in result_rows if not row["is_correct"]]
+def summarize_practice_results(questions: list[dict], practice_answers: dict[str, str]) -> dict:
+    """Build a normalized result summary for practice results and review UIs.
+
+    Grading and breakdown counts live in a cached ``PracticeScorecard`` keyed by the
+    answers and grading fields, so reruns of a submitted session skip re-scoring.
+    """
+    question_keys = [get_practice_question_key(question, index) for index, question in enumerate(questions)]
+    fingerprint = practice_session_fingerprint(
+        (
+            question_key,
+            practice_answers.get(question_key, ""),
+            question.get("correct_answer", ""),
+            len(question.get("options") or []),
+            question.get("exam_year"),
+            question.get("exam_name"),
+            question.get("pattern"),
+            question.get("topics"),
+        )
+        for question_key, question in zip(question_keys, questions)
+    )
+    scorecard_cache = get_practice_scorecard_cache()
+    scorecard = scorecard_cache.get(fingerprint)
+    if scorecard is None:
+        scorecard = _score_practice_session(questions, question_keys, practice_answers)
+        scorecard_cache.put(fingerprint, scorecard)
+
+    exam_years = scorecard.group_values["exam_year"]
+    exam_labels = scorecard.group_values["exam_label"]
+    pattern_labels = scorecard.group_values["pattern_label"]
+    answered_flags = scorecard.answered.tolist()
+    correct_flags = scorecard.correct.tolist()
+    result_rows = [
+        {
+            "question_text": question.get("question_text", ""),
+            "exam_year": exam_years[index],
+            "exam_label": exam_labels[index],
+            "question_number": question.get("question_number") or index + 1,
+            "pattern_label": pattern_labels[index],
+            "topics": question.get("topics", []),
+            "difficulty": question.get("difficulty", "medium"),
+            "user_answer": scorecard.user_answers[index],
+            "correct_answer": scorecard.correct_answers[index],
+            "is_answered": answered_flags[index],
+            "is_correct": correct_flags[index],
+            "explanation": question.get("explanation", ""),
+            "source_page": question.get("source_page"),
+            "figure_assets": question.get("figure_assets", []),
+            "option_figure_assets": question.get("option_figure_assets", []),
+            "source_page_image_path": question.get("source_page_image_path"),
+            "image_asset_status": question.get("image_asset_status"),
+            "image_asset_note": question.get("image_asset_note"),
+        }
+        for index, question in enumerate(questions)
+    ]
 
     return {
         "result_rows": result_rows,
-        "review_rows": review_rows,
-        "correct_count": correct_count,
-        "answered_count": answered_count,
-        "incorrect_count": incorrect_count,
-        "unanswered_count": unanswered_count,
-        "total_questions": total_questions,
-        "score": score,
-        "answered_accuracy": answered_accuracy,
+        "review_rows": [row for row in result_rows if not row["is_correct"]],
+        "scorecard": scorecard,
+        **scorecard.summary(),
     }
 
 
@@ -770,78 +873,17 @@ def build_practice_breakdown_rows(
     group_key: str,
     label: str,
     numeric_sort_desc: bool = False,
+    scorecard: Optional[PracticeScorecard] = None,
 ) -> list[dict]:
     """Aggregate practice results into a dataframe-friendly breakdown table."""
-    grouped: dict[str, dict] = {}
-
-    for row in result_rows:
-        raw_value = row.get(group_key)
-        group_label = raw_value if raw_value not in (None, "", []) else "未標記"
-        group_key_str = str(group_label)
-
-        if group_key_str not in grouped:
-            grouped[group_key_str] = {
-                "_sort_value": raw_value,
-                "題數": 0,
-                "答對": 0,
-                "答錯": 0,
-                "未作答": 0,
-            }
-
-        grouped[group_key_str]["題數"] += 1
-        if row.get("is_correct"):
-            grouped[group_key_str]["答對"] += 1
-        elif row.get("is_answered"):
-            grouped[group_key_str]["答錯"] += 1
-        else:
-            grouped[group_key_str]["未作答"] += 1
-
-    table_rows: list[dict] = []
-    for group_label, counts in grouped.items():
-        total = counts["題數"]
-        accuracy = (counts["答對"] / total * 100) if total else 0.0
-        table_rows.append(
-            {
-                label: group_label,
-                "題數": total,
-                "答對": counts["答對"],
-                "答錯": counts["答錯"],
-                "未作答": counts["未作答"],
-                "正確率": f"{accuracy:.1f}%",
-                "_sort_value": counts["_sort_value"],
-            }
-        )
-
-    if numeric_sort_desc:
-        table_rows.sort(
-            key=lambda item: item["_sort_value"] if isinstance(item["_sort_value"], (int, float)) else -1,
-            reverse=True,
-        )
-    else:
-        table_rows.sort(key=lambda item: str(item[label]))
+    scorecard = scorecard or PracticeScorecard.from_result_rows(result_rows)
+    return scorecard.breakdown_rows(group_key, label, numeric_sort_desc=numeric_sort_desc)
 
-    for row in table_rows:
-        row.pop("_sort_value", None)
 
-    return table_rows
-
-
-def build_practice_weak_topic_rows(result_rows: list[dict]) -> list[dict]:
+def build_practice_weak_topic_rows(result_rows: list[dict], scorecard: Optional[PracticeScorecard] = None) -> list[dict]:
     """Summarize wrong or unanswered questions by topic for quick review."""
-    weak_topics: Counter[str] = Counter()
-
-    for row in result_rows:
-        if row.get("is_correct"):
-            continue
-
-        topics = [str(topic).strip() for topic in row.get("topics", []) if str(topic).strip()]
-        if not topics:
-            topics = ["未標記主題"]
-
-        for topic in topics:
-            weak_topics[topic] += 1
-
-    return [{"主題": topic, "錯題/未作答": count} for topic, count in weak_topics.most_common(8)]
+    scorecard = scorecard or PracticeScorecard.from_result_rows(result_rows)
+    return scorecard.weak_topic_rows()
 
 
 def inject_app_styles() -> None:
@@ -1790,7 +1832,7 @@ def run_agent_sync(prompt: str, provider, session_key: str | None = None) -> str
     return provider.run(prompt, session_key=session_key)
 
 
-@st.cache_data(ttl=15, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_past_exam_catalog(limit: int = 20) -> list[dict]:
     """讀取歷屆考卷清單與摘要資訊。"""
     from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
@@ -1799,56 +1841,58 @@ def load_past_exam_catalog(limit: int = 20) -> list[dict]:
     return repo.list_exam_catalog(limit=limit)
 
 
-@st.cache_data(ttl=15, show_spinner=False)
+def _past_exam_question_payload(question) -> dict:
+    return {
+        "id": question.id,
+        "past_exam_id": question.past_exam_id,
+        "question_number": question.question_number,
+        "question_text": question.question_text,
+        "options": question.options,
+        "correct_answer": question.correct_answer,
+        "explanation": question.explanation,
+        "pattern": question.pattern.value,
+        "difficulty": question.difficulty,
+        "topics": question.topics,
+        "concept_names": question.concept_names,
+        "source_doc_id": question.source_doc_id,
+        "source_page": question.source_page,
+        "exam_name": question.exam_name,
+        "exam_year": question.exam_year,
+    }
+
+
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_past_exam_questions(past_exam_id: str) -> list[dict]:
     """讀取單份歷屆考卷的題目明細。"""
     from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
 
     repo = get_past_exam_repository()
-    figure_service = get_past_exam_figure_service()
-    questions = repo.list_questions(past_exam_id)
-    return [
-        figure_service.enrich_question(
-            {
-                "id": question.id,
-                "past_exam_id": question.past_exam_id,
-                "question_number": question.question_number,
-                "question_text": question.question_text,
-                "options": question.options,
-                "correct_answer": question.correct_answer,
-                "explanation": question.explanation,
-                "pattern": question.pattern.value,
-                "difficulty": question.difficulty,
-                "topics": question.topics,
-                "concept_names": question.concept_names,
-                "source_doc_id": question.source_doc_id,
-                "source_page": question.source_page,
-                "exam_name": question.exam_name,
-                "exam_year": question.exam_year,
-            }
-        )
-        for question in questions
-    ]
+    return get_past_exam_figure_service().enrich_questions(
+        _past_exam_question_payload(question) for question in repo.list_questions(past_exam_id)
+    )
 
 
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_past_exam_question_pool(past_exam_ids: list[str]) -> list[dict]:
-    """Merge one or more past exams into a single practice pool."""
-    question_pool: list[dict] = []
+    """Merge one or more past exams into a single practice pool (one query, batched figure lookup)."""
+    from src.infrastructure.persistence.sqlite_past_exam_repo import get_past_exam_repository
+
+    repo = get_past_exam_repository()
     seen_ids: set[str] = set()
 
-    for past_exam_id in past_exam_ids:
-        for question in load_past_exam_questions(past_exam_id):
-            question_id = str(question.get("id", "") or "")
+    def unique_payloads():
+        for question in repo.list_questions_for_exams(past_exam_ids):
+            question_id = str(question.id or "")
             if question_id and question_id in seen_ids:
                 continue
             if question_id:
                 seen_ids.add(question_id)
-            question_pool.append(question)
+            yield _past_exam_question_payload(question)
 
-    return question_pool
+    return get_past_exam_figure_service().enrich_questions(unique_payloads())
 
 
-@st.cache_data(ttl=5, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_question_drafts(status: str | None = None, starred_only: bool = False) -> list[dict]:
     """載入題目草稿箱。"""
     from src.application.services.question_draft_service import get_question_draft_service
@@ -1856,7 +1900,7 @@ def load_question_drafts(status: str | None = None, starred_only: bool = False)
     return get_question_draft_service().list_drafts(status=status, starred_only=starred_only, limit=300)
 
 
-@st.cache_data(ttl=5, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def get_draft_stats() -> dict:
     """取得草稿箱統計。"""
     from src.application.services.question_draft_service import get_question_draft_service
@@ -2622,7 +2666,7 @@ def render_question_review_expander(question: dict, display_number: int, key_pre
             render_source_info(source, expanded=False)
 
 
-@st.cache_data(ttl=10, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def get_questions_stats() -> dict:
     """取得題庫統計。"""
     from src.application.services.question_bank_query_service import get_question_bank_query_service
@@ -2630,7 +2674,7 @@ def get_questions_stats() -> dict:
     return get_question_bank_query_service().get_content_stats()
 
 
-@st.cache_data(ttl=10, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_questions(validated_only: bool = False, exam_track: str | None = None) -> list[dict]:
     """載入一般題庫題目。"""
     from src.application.services.question_bank_query_service import get_question_bank_query_service
@@ -2642,7 +2686,7 @@ def load_questions(validated_only: bool = False, exam_track: str | None = None)
     )
 
 
-@st.cache_data(ttl=5, show_spinner=False)
+@st.cache_data(ttl=READ_MODEL_CACHE_TTL_SECONDS, show_spinner=False)
 def load_scope_requests(status: str | None = None) -> list[dict]:
     """載入出題需求 backlog"""
     from src.domain.entities.scope_request import ScopeRequestStatus
@@ -2684,12 +2728,37 @@ def invalidate_question_bank_caches() -> None:
 def invalidate_past_exam_caches() -> None:
     _clear_cached_read_function(load_past_exam_catalog)
     _clear_cached_read_function(load_past_exam_questions)
+    _clear_cached_read_function(load_past_exam_question_pool)
 
 
 def invalidate_scope_request_caches() -> None:
     _clear_cached_read_function(load_scope_requests)
 
 
+READ_MODEL_TABLE_INVALIDATORS = {
+    "questions": invalidate_question_bank_caches,
+    "question_drafts": invalidate_draft_caches,
+    "past_exams": invalidate_past_exam_caches,
+    "past_exam_questions": invalidate_past_exam_caches,
+    "scope_requests": invalidate_scope_request_caches,
+    "exams": invalidate_question_bank_caches,
+}
+
+
+def sync_read_model_caches() -> None:
+    """依 table_versions 清掉被其他程序（MCP、worker、Telegram）改過的讀模型快取。"""
+    from src.infrastructure.persistence.read_model_versions import get_table_version_tracker
+
+    changed_tables = get_table_version_tracker().poll()
+    invalidators = {
+        READ_MODEL_TABLE_INVALIDATORS[table] for table in changed_tables if table in READ_MODEL_TABLE_INVALIDATORS
+    }
+    for invalidate in invalidators:
+        invalidate()
+    if invalidators:
+        logger.info("streamlit_read_model_caches_synced", tables=sorted(changed_tables))
+
+
 def get_heartbeat_summary() -> dict:
     """取得 heartbeat / backlog 摘要"""
     from src.application.services.heartbeat_service import HeartbeatService
@@ -2698,6 +2767,8 @@ def get_heartbeat_summary() -> dict:
 
 
 # ===== 初始化 session state =====
+sync_read_model_caches()
+
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
@@ -2781,6 +2852,8 @@ if "chat_question_context_label" not in st.session_state:
     st.session_state.chat_question_context_label = "未指定題目"
 if "chat_active_job_id" not in st.session_state:
     st.session_state.chat_active_job_id = None
+if "chat_active_cursor" not in st.session_state:
+    st.session_state.chat_active_cursor = 0
 if "chat_active_assistant_index" not in st.session_state:
     st.session_state.chat_active_assistant_index = None
 if "draft_flash" not in st.session_state:
@@ -2907,14 +2980,22 @@ def sync_active_chat_stream() -> None:
             message_count=len(messages),
         )
         st.session_state.chat_active_job_id = None
+        st.session_state.chat_active_cursor = 0
         st.session_state.chat_active_assistant_index = None
         return
 
-    snapshot = job_store.snapshot(job_id)
+    cursor = st.session_state.get("chat_active_cursor")
+    cursor = cursor if isinstance(cursor, int) else 0
+    update = job_store.read_since(job_id, cursor)
     message = messages[assistant_index]
-    streamed_content = str(snapshot.get("content") or "")
-    status = str(snapshot.get("status") or "error")
-    error_message = str(snapshot.get("error") or "")
+    status = str(update.get("status") or "error")
+    error_message = str(update.get("error") or "")
+    delta = str(update.get("delta") or "")
+    if update.get("reset") or cursor == 0:
+        streamed_content = delta
+    else:
+        streamed_content = str(message.get("content") or "") + delta
+    st.session_state.chat_active_cursor = int(update.get("cursor") or 0)
 
     if streamed_content:
         message["content"] = streamed_content
@@ -2948,6 +3029,7 @@ def sync_active_chat_stream() -> None:
         error=error_message,
     )
     st.session_state.chat_active_job_id = None
+    st.session_state.chat_active_cursor = 0
     st.session_state.chat_active_assistant_index = None
 
 
@@ -2974,6 +3056,7 @@ def stop_active_chat_stream(reason: str = "回應已停止") -> None:
             message["content"] = f"[中止] {reason}"
 
     st.session_state.chat_active_job_id = None
+    st.session_state.chat_active_cursor = 0
     st.session_state.chat_active_assistant_index = None
 
 
@@ -3484,7 +3567,7 @@ with main_col:
 
                     generation_ui = create_generation_execution_ui()
 
-                    full_response, saved_questions = stream_agent_generate(
+                    full_response, saved_questions, extracted = stream_agent_generate(
                         prompt=prompt,
                         provider=provider,
                         execution_ui=generation_ui,
@@ -3501,8 +3584,7 @@ with main_col:
                     all_questions = list(saved_questions)  # MCP 已儲存的
                     mcp_saved_ids = {q.get("id") for q in saved_questions}
 
-                    # 從 AI 完整回應中提取 JSON 格式題目
-                    extracted = extract_questions_from_response(full_response)
+                    # 串流中已逐題提取的 JSON 格式題目
                     for eq in extracted:
                         # 避免與 MCP 已儲存的重複
                         if eq.get("id") not in mcp_saved_ids:
@@ -3825,6 +3907,11 @@ with main_col:
                     disabled=not source_uses_general_bank_filters,
                 )
                 practice_random = st.checkbox("隨機順序", value=True)
+                practice_adaptive = st.checkbox(
+                    "弱點優先",
+                    value=False,
+                    help="依過去作答紀錄，優先挑答錯、到期複習與還沒做過的題目（取代隨機順序）",
+                )
                 st.caption("建議先用主題篩選做小批次訓練，再用隨機順序做混合回顧。")
 
             if st.button("🎯 開始練習", width="stretch", type="primary"):
@@ -3881,7 +3968,20 @@ with main_col:
                     ]
 
                 # 隨機/選取
-                if practice_random:
+                if practice_adaptive and all_questions:
+                    try:
+                        all_questions = get_adaptive_practice_selector().select(
+                            get_practice_user_id(),
+                            all_questions,
+                            practice_count,
+                            key=lambda q: str(q.get("id")),
+                            topics=lambda q: q.get("topics", []),
+                        )
+                        practice_context["selection"] = "adaptive"
+                    except Exception as exc:
+                        logger.warning("adaptive_practice_select_failed", error=str(exc))
+                        random.shuffle(all_questions)
+                elif practice_random:
                     random.shuffle(all_questions)
 
                 if not all_questions:
@@ -3942,9 +4042,9 @@ with main_col:
                         )
                         selected_letters = _letters_from_option_labels(selected)
                         if selected_letters:
-                            st.session_state.practice_answers[q_id] = _format_answer_letters(selected_letters)
+                            _set_practice_answer(q_id, _format_answer_letters(selected_letters))
                         elif not st.session_state.practice_submitted:
-                            st.session_state.practice_answers[q_id] = ""
+                            _set_practice_answer(q_id, "")
                     else:
                         current_index = None
                         if current_letters:
@@ -3960,9 +4060,9 @@ with main_col:
 
                         if selected is not None:
                             selected_letters = _letters_from_option_labels([selected])
-                            st.session_state.practice_answers[q_id] = _format_answer_letters(selected_letters)
+                            _set_practice_answer(q_id, _format_answer_letters(selected_letters))
                         elif not st.session_state.practice_submitted:
-                            st.session_state.practice_answers[q_id] = ""
+                            _set_practice_answer(q_id, "")
 
                     # 已提交時顯示結果
                     if st.session_state.practice_submitted:
@@ -4004,6 +4104,10 @@ with main_col:
                 with col2:
                     if st.button("📤 提交答案", width="stretch", type="primary"):
                         st.session_state.practice_submitted = True
+                        try:
+                            record_practice_attempts(questions, st.session_state.practice_answers, practice_context)
+                        except Exception as exc:
+                            logger.warning("practice_attempts_record_failed", error=str(exc))
                         st.rerun()
                 with col3:
                     st.download_button(
@@ -4055,15 +4159,21 @@ with main_col:
                     with stats_col4:
                         st.metric("已作答命中率", f"{practice_result['answered_accuracy']:.1f}%")
 
+                    scorecard = practice_result["scorecard"]
                     year_rows = build_practice_breakdown_rows(
                         result_rows,
                         group_key="exam_year",
                         label="年度",
                         numeric_sort_desc=True,
+                        scorecard=scorecard,
+                    )
+                    exam_rows = build_practice_breakdown_rows(
+                        result_rows, group_key="exam_label", label="考卷", scorecard=scorecard
+                    )
+                    pattern_rows = build_practice_breakdown_rows(
+                        result_rows, group_key="pattern_label", label="題型", scorecard=scorecard
                     )
-                    exam_rows = build_practice_breakdown_rows(result_rows, group_key="exam_label", label="考卷")
-                    pattern_rows = build_practice_breakdown_rows(result_rows, group_key="pattern_label", label="題型")
-                    weak_topic_rows = build_practice_weak_topic_rows(result_rows)
+                    weak_topic_rows = build_practice_weak_topic_rows(result_rows, scorecard=scorecard)
 
                     stats_sections = ["year", "exam", "pattern", "review"]
                     stats_labels = {
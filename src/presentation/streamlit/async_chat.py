@@ -2,44 +2,85 @@
 
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
 import uuid
-from collections.abc import Callable, Iterator
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from typing import Literal
 
+from src.infrastructure.agent.async_runtime import SharedEventLoop, get_shared_event_loop
+
 JobStatus = Literal["running", "done", "error", "cancelled"]
 TERMINAL_STATUSES = {"done", "error", "cancelled"}
 
 
 @dataclass
 class ChatStreamJob:
-    """Mutable state for one assistant streaming response."""
+    """Mutable state for one assistant streaming response.
+
+    ``chunks`` is append-only; ``content`` joins only the chunks added since the
+    previous call, so repeated reads do not rebuild the whole response.
+    """
 
     job_id: str
     status: JobStatus = "running"
     chunks: list[str] = field(default_factory=list)
     error: str = ""
     updated_at: float = field(default_factory=time.monotonic)
+    _joined: str = field(default="", repr=False)
+    _joined_count: int = field(default=0, repr=False)
 
     @property
     def content(self) -> str:
-        return "".join(self.chunks)
+        if self._joined_count < len(self.chunks):
+            self._joined += "".join(self.chunks[self._joined_count :])
+            self._joined_count = len(self.chunks)
+        return self._joined
 
 
 class ChatStreamJobStore:
     """Thread-safe in-memory store for chat streaming jobs."""
 
-    def __init__(self, max_jobs: int = 128) -> None:
+    def __init__(self, max_jobs: int = 128, event_loop: SharedEventLoop | None = None) -> None:
         if max_jobs < 1:
             raise ValueError("max_jobs must be >= 1")
         self._jobs: dict[str, ChatStreamJob] = {}
+        self._tasks: dict[str, Future] = {}
         self._lock = threading.Lock()
         self._max_jobs = int(max_jobs)
+        self._event_loop = event_loop
 
     def start(self, stream_factory: Callable[[], Iterator[str]]) -> str:
         """Start consuming a stream on a daemon thread and return immediately."""
+        job_id = self._register_job()
+        thread = threading.Thread(
+            target=self._consume_stream,
+            args=(job_id, stream_factory),
+            daemon=True,
+            name=f"chat-stream-{job_id[:8]}",
+        )
+        thread.start()
+        return job_id
+
+    def start_async(self, astream_factory: Callable[[], AsyncIterator[str]]) -> str:
+        """Consume a provider ``astream`` as a task on the shared event loop.
+
+        Unlike :meth:`start`, no thread is spawned per job, and :meth:`cancel`
+        cancels the task so the provider can kill its child process immediately.
+        """
+        job_id = self._register_job()
+        event_loop = self._event_loop or get_shared_event_loop()
+        future = event_loop.submit(self._consume_astream(job_id, astream_factory))
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status not in TERMINAL_STATUSES:
+                self._tasks[job_id] = future
+        return job_id
+
+    def _register_job(self) -> str:
         job_id = uuid.uuid4().hex
         with self._lock:
             self._prune_terminal_jobs_locked()
@@ -59,15 +100,8 @@ class ChatStreamJobStore:
                 oldest_job.status = "cancelled"
                 oldest_job.error = "capacity_exceeded"
                 oldest_job.updated_at = time.monotonic()
+                self._cancel_task_locked(oldest_running_job_id)
             self._jobs[job_id] = ChatStreamJob(job_id=job_id)
-
-        thread = threading.Thread(
-            target=self._consume_stream,
-            args=(job_id, stream_factory),
-            daemon=True,
-            name=f"chat-stream-{job_id[:8]}",
-        )
-        thread.start()
         return job_id
 
     def cancel(self, job_id: str, reason: str = "cancelled") -> bool:
@@ -83,8 +117,14 @@ class ChatStreamJobStore:
             job.status = "cancelled"
             job.error = str(reason or "cancelled")
             job.updated_at = time.monotonic()
+            self._cancel_task_locked(job_id)
             return True
 
+    def _cancel_task_locked(self, job_id: str) -> None:
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+
     def snapshot(self, job_id: str) -> dict[str, str]:
         """Return a copy of the current job state for UI rendering."""
         with self._lock:
@@ -98,6 +138,39 @@ class ChatStreamJobStore:
                 "error": job.error,
             }
 
+    def read_since(self, job_id: str, cursor: int = 0) -> dict[str, object]:
+        """Return only the chunks appended after ``cursor`` plus the next cursor.
+
+        Polling cost is proportional to new output. A cursor beyond the job's
+        chunk count (e.g. from a pruned and recreated job) yields ``reset=True``
+        with the full content so the caller can replace its local copy.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {
+                    "job_id": job_id,
+                    "status": "error",
+                    "delta": "",
+                    "cursor": 0,
+                    "reset": False,
+                    "error": "chat job not found",
+                }
+            chunk_count = len(job.chunks)
+            start = max(0, int(cursor))
+            reset = start > chunk_count
+            new_chunks = list(job.chunks) if reset else job.chunks[start:]
+            status = job.status
+            error = job.error
+        return {
+            "job_id": job_id,
+            "status": status,
+            "delta": "".join(new_chunks),
+            "cursor": chunk_count,
+            "reset": reset,
+            "error": error,
+        }
+
     def _consume_stream(self, job_id: str, stream_factory: Callable[[], Iterator[str]]) -> None:
         try:
             for chunk in stream_factory():
@@ -127,6 +200,43 @@ class ChatStreamJobStore:
             with self._lock:
                 self._prune_terminal_jobs_locked()
 
+    async def _consume_astream(self, job_id: str, astream_factory: Callable[[], AsyncIterator[str]]) -> None:
+        stream: AsyncIterator[str] | None = None
+        try:
+            stream = astream_factory()
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                with self._lock:
+                    job = self._jobs.get(job_id)
+                    if job is None or job.status == "cancelled":
+                        return
+                    job.chunks.append(str(chunk))
+                    job.updated_at = time.monotonic()
+            self._finish_job(job_id, "done")
+        except asyncio.CancelledError:
+            self._finish_job(job_id, "cancelled", "cancelled")
+            raise
+        except Exception as exc:  # noqa: BLE001
+            self._finish_job(job_id, "error", str(exc))
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            with self._lock:
+                self._tasks.pop(job_id, None)
+                self._prune_terminal_jobs_locked()
+
+    def _finish_job(self, job_id: str, status: JobStatus, error: str = "") -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status == "cancelled":
+                return
+            job.status = status
+            if error:
+                job.error = error
+            job.updated_at = time.monotonic()
+
     def _prune_terminal_jobs_locked(self) -> None:
         if len(self._jobs) < self._max_jobs:
             return
@@ -148,10 +148,10 @@ def _render_source_location(label: str, location: dict) -> None:
         st.markdown(f"> _{text}_")
 
 
-def render_question_card_inline(question: dict, index: int) -> None:
+def render_question_card_inline(question: dict, index: int, *, saved: bool = True) -> None:
     """Render a generated question card inline during streaming."""
     st.markdown("---")
-    st.markdown(f"### ✅ 第 {index} 題 (已儲存)")
+    st.markdown(f"### ✅ 第 {index} 題 (已儲存)" if saved else f"### 📝 第 {index} 題 (預覽)")
     st.markdown(f"**{question.get('question_text', '')}**")
 
     options = list(question.get("options", []) or [])
@@ -7,16 +7,27 @@ import re
 import time
 import uuid
 from dataclasses import dataclass
-from json import JSONDecodeError
 from typing import Any
 
 import streamlit as st
 
+from src.infrastructure.agent.json_stream import (
+    IncrementalJsonObjectScanner,
+    find_mcp_save_result,
+    split_at_question_id,
+)
+from src.infrastructure.agent.stream_buffer import StreamTextBuffer
 from src.infrastructure.logging import get_logger
 from src.presentation.streamlit.generation.fragments import render_question_card_inline
 
 logger = get_logger(__name__)
 
+_QUESTION_ID_MARKER = re.compile(r'題目\s*ID[：:]\s*[`"]?([a-f0-9-]{36})[`"]?')
+# Long enough to hold a split "題目 ID: <uuid>" marker across chunk boundaries.
+MCP_MARKER_WINDOW_CHARS = 160
+OUTPUT_PREVIEW_CHARS = 3000
+OUTPUT_REFRESH_SECONDS = 0.1
+
 
 @dataclass
 class GenerationExecutionUi:
@@ -303,70 +314,48 @@ def _build_template_rewrite_section(template_context: dict[str, Any]) -> str:
 """
 
 
-def extract_questions_from_response(text: str) -> list[dict]:
-    """Extract all JSON question objects from a mixed AI response."""
-    questions: list[dict] = []
-    seen_texts: set[str] = set()
-
-    raw_candidates: list[str] = []
-    raw_candidates.extend(re.findall(r"```(?:json)?\s*(\{.+?\})\s*```", text, re.DOTALL))
-    raw_candidates.extend(_extract_json_candidates(text))
-
-    for raw_json in raw_candidates:
-        try:
-            obj = json.loads(raw_json)
-        except json.JSONDecodeError:
-            cleaned = re.sub(r",\s*}", "}", raw_json)
-            cleaned = re.sub(r",\s*]", "]", cleaned)
-            try:
-                obj = json.loads(cleaned)
-            except json.JSONDecodeError:
-                continue
+class StreamingQuestionExtractor:
+    """Incrementally extract question objects and MCP save results from streamed output.
 
-        if isinstance(obj, list):
-            payloads = obj
-        elif isinstance(obj, dict):
-            payloads = [obj]
-        else:
-            continue
+    Each chunk is consumed once by an :class:`IncrementalJsonObjectScanner`, so a
+    question becomes available as soon as its closing brace arrives instead of after
+    re-scanning the whole accumulated response.
+    """
 
-        for payload in payloads:
+    def __init__(self) -> None:
+        self._scanner = IncrementalJsonObjectScanner()
+        self._seen_texts: set[str] = set()
+        self.questions: list[dict] = []
+        self.tool_results: list[dict] = []
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume a chunk and return newly completed, normalized questions."""
+        new_questions: list[dict] = []
+        for payload in self._scanner.feed(chunk):
             if not isinstance(payload, dict):
                 continue
+            tool_result = find_mcp_save_result(payload)
+            if tool_result is not None:
+                self.tool_results.append(tool_result)
+                continue
             if not payload.get("question_text") or not payload.get("options"):
                 continue
 
             fingerprint = str(payload.get("question_text") or "")[:80]
-            if fingerprint in seen_texts:
+            if fingerprint in self._seen_texts:
                 continue
-            seen_texts.add(fingerprint)
-            questions.append(normalize_ai_question(payload))
-
-    return questions
-
-
-def _extract_json_candidates(text: str) -> list[str]:
-    decoder = json.JSONDecoder()
-    candidates: list[str] = []
-    index = 0
-    text_len = len(text)
+            self._seen_texts.add(fingerprint)
+            question = normalize_ai_question(payload)
+            self.questions.append(question)
+            new_questions.append(question)
+        return new_questions
 
-    while index < len(text):
-        if text[index] not in "{[":
-            index += 1
-            continue
-        try:
-            _, end = decoder.raw_decode(text[index:])
-        except JSONDecodeError:
-            index += 1
-            continue
-        start = index
-        end = start + end
-        if end <= text_len:
-            candidates.append(text[start:end])
-        index = end
 
-    return candidates
+def extract_questions_from_response(text: str) -> list[dict]:
+    """Extract all JSON question objects from a mixed AI response."""
+    extractor = StreamingQuestionExtractor()
+    extractor.feed(text)
+    return extractor.questions
 
 
 def normalize_question_type(value: object) -> str:
@@ -477,23 +466,9 @@ def normalize_ai_question(raw: dict) -> dict:
     return question
 
 
-def parse_mcp_result(text: str) -> dict | None:
-    """Parse a question-save result from streamed MCP output."""
-    patterns = [
-        r'\{[^{}]*"question_id"\s*:\s*"[^"]+?"[^{}]*\}',
-        r'\{[^{}]*"success"\s*:\s*true[^{}]*\}',
-    ]
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            try:
-                result = json.loads(match)
-            except json.JSONDecodeError:
-                continue
-            if result.get("question_id"):
-                return result
-
-    question_id_match = re.search(r'題目\s*ID[：:]\s*[`"]?([a-f0-9-]{36})[`"]?', text)
+def parse_question_id_marker(text: str) -> dict | None:
+    """Parse the plain-text ``題目 ID: <uuid>`` marker some agents print after saving."""
+    question_id_match = _QUESTION_ID_MARKER.search(text)
     if question_id_match:
         return {"question_id": question_id_match.group(1), "success": True}
     return None
@@ -556,51 +531,82 @@ def stream_agent_generate(
     provider,
     execution_ui: GenerationExecutionUi,
     session_key: str | None = None,
-) -> tuple[str, list[dict]]:
-    """Stream generation output into the grouped UI placeholders."""
+) -> tuple[str, list[dict], list[dict]]:
+    """Stream generation output into the grouped UI placeholders.
+
+    Returns the full response, questions confirmed by an MCP save result, and JSON
+    questions extracted incrementally while the stream was running.
+    """
     logger.info("generation_start", provider=getattr(provider, "name", "unknown"), prompt_len=len(prompt))
     started_at = time.monotonic()
-    full_response = ""
-    current_question_buffer = ""
+    response = StreamTextBuffer(tail_chars=OUTPUT_PREVIEW_CHARS)
+    question_buffer_parts: list[str] = []
+    marker_window = ""
     saved_questions = []
-    last_update_time = time.time()
+    extractor = StreamingQuestionExtractor()
+    handled_tool_results = 0
+    last_update_time = time.monotonic()
 
     try:
         for line in provider.stream(prompt, session_key=session_key):
             if not line:
                 continue
 
-            full_response += line
-            current_question_buffer += line
-            current_time = time.time()
-            if current_time - last_update_time > 0.1:
-                display_text = full_response[-3000:] if len(full_response) > 3000 else full_response
-                execution_ui.output_placeholder.markdown(f"```\n{display_text}\n```")
+            response.append(line)
+            question_buffer_parts.append(line)
+            current_time = time.monotonic()
+            if current_time - last_update_time > OUTPUT_REFRESH_SECONDS:
+                execution_ui.output_placeholder.markdown(f"```\n{response.tail()}\n```")
                 execution_ui.progress_placeholder.markdown(
-                    f"⏳ 已接收 {len(full_response)} 字元，已儲存 {len(saved_questions)} 題"
+                    f"⏳ 已接收 {len(response)} 字元，已儲存 {len(saved_questions)} 題"
                 )
                 last_update_time = current_time
 
-            mcp_result = parse_mcp_result(current_question_buffer)
-            if mcp_result and mcp_result.get("question_id"):
+            for question in extractor.feed(line):
+                logger.info(
+                    "question_streamed",
+                    index=len(extractor.questions),
+                    question_text=question.get("question_text", "")[:80],
+                )
+                with execution_ui.questions_container:
+                    render_question_card_inline(question, len(extractor.questions), saved=False)
+
+            # 同一段輸出可能帶好幾個儲存結果，逐一處理上一段之後新增的每一個
+            mcp_results = extractor.tool_results[handled_tool_results:]
+            handled_tool_results = len(extractor.tool_results)
+            if not mcp_results:
+                marker_window = (marker_window + line)[-MCP_MARKER_WINDOW_CHARS:]
+                marker_result = parse_question_id_marker(marker_window)
+                mcp_results = [marker_result] if marker_result else []
+
+            pending_text = "".join(question_buffer_parts)
+            for mcp_result in mcp_results:
                 question_id = mcp_result.get("question_id")
+                if not question_id:
+                    continue
                 logger.info("mcp_result_detected", question_id=question_id)
 
-                parsed_question = parse_question_from_output(current_question_buffer)
-                if parsed_question:
-                    parsed_question["id"] = question_id
-                    saved_questions.append(parsed_question)
-                    logger.info(
-                        "question_saved",
-                        index=len(saved_questions),
-                        question_id=question_id,
-                        question_text=parsed_question.get("question_text", "")[:80],
-                    )
-                    with execution_ui.questions_container:
-                        render_question_card_inline(parsed_question, len(saved_questions))
-                current_question_buffer = ""
-
-        execution_ui.output_placeholder.markdown(f"```\n{full_response[-3000:]}\n```")
+                # 每個結果只拿到自己的 question_id 為止的文字，後面的留給下一個結果
+                segment, pending_text = split_at_question_id(pending_text, question_id)
+                parsed_question = parse_question_from_output(segment)
+                if not parsed_question:
+                    logger.info("mcp_result_without_question_text", question_id=question_id)
+                    continue
+                parsed_question["id"] = question_id
+                saved_questions.append(parsed_question)
+                logger.info(
+                    "question_saved",
+                    index=len(saved_questions),
+                    question_id=question_id,
+                    question_text=parsed_question.get("question_text", "")[:80],
+                )
+                with execution_ui.questions_container:
+                    render_question_card_inline(parsed_question, len(saved_questions))
+            if mcp_results:
+                question_buffer_parts = [pending_text] if pending_text else []
+                marker_window = ""
+
+        execution_ui.output_placeholder.markdown(f"```\n{response.tail()}\n```")
     except Exception as exc:  # noqa: BLE001
         logger.exception("generation_error", error=str(exc))
         execution_ui.output_placeholder.error(f"生成錯誤: {exc}")
@@ -610,6 +616,7 @@ def stream_agent_generate(
         "generation_done",
         duration_ms=elapsed_ms,
         total_questions=len(saved_questions),
-        total_chars=len(full_response),
+        streamed_questions=len(extractor.questions),
+        total_chars=len(response),
     )
-    return full_response, saved_questions
+    return response.getvalue(), saved_questions, extractor.questions
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import sys
+from datetime import datetime
 from pathlib import Path
 
+import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -12,3 +14,23 @@ if str(PROJECT_ROOT) not in sys.path:
 for module_name in list(sys.modules):
     if module_name == "src" or module_name.startswith("src."):
         del sys.modules[module_name]
+
+
+@pytest.fixture
+def make_attempt():
+    """Build ``PracticeAttempt`` rows: correct answers pick "A", wrong ones "B", ``unanswered=True`` picks nothing."""
+    from src.domain.entities.practice import PracticeAttempt
+
+    def build(question_id: str, correct: bool, answered_at: datetime, *, unanswered: bool = False, **kwargs):
+        return PracticeAttempt(
+            user_id=kwargs.pop("user_id", "resident"),
+            session_id=kwargs.pop("session_id", "s1"),
+            question_id=question_id,
+            selected_letters="" if unanswered else "A" if correct else "B",
+            is_correct=correct and not unanswered,
+            elapsed_ms=kwargs.pop("elapsed_ms", 1200),
+            answered_at=answered_at,
+            **kwargs,
+        )
+
+    return build
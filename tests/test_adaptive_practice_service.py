@@ -0,0 +1,104 @@
+import json
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.application.services.adaptive_practice_service import AdaptivePracticeSelector  # noqa: E402
+from src.application.services.exam_tool_application_service import ExamToolApplicationService  # noqa: E402
+from src.domain.entities.question import Question  # noqa: E402
+from src.infrastructure.persistence.database import dispose_connection_pool  # noqa: E402
+from src.infrastructure.persistence.sqlite_practice_attempt_repo import SQLitePracticeAttemptRepository  # noqa: E402
+from src.infrastructure.persistence.sqlite_question_repo import SQLiteQuestionRepository  # noqa: E402
+
+
+def test_selector_favours_weak_items_and_rebuilds_after_new_attempts(tmp_path: Path, make_attempt) -> None:
+    db_path = tmp_path / "practice.db"
+    repo = SQLitePracticeAttemptRepository(db_path=db_path)
+    now = datetime(2026, 3, 1, 9, 0, 0)
+    repo.record_attempts(
+        [make_attempt("a-wrong", False, now - timedelta(days=3), topics=["airway"]) for _ in range(3)]
+        + [make_attempt("r-mastered", True, now - timedelta(hours=1), topics=["renal"]) for _ in range(3)]
+        + [make_attempt("a-wrong", False, now, user_id="someone-else", topics=["airway"])]
+    )
+
+    selector = AdaptivePracticeSelector(repo, rng=random.Random(7))
+    snapshot = selector.snapshot("resident")
+    assert snapshot.items["a-wrong"].global_attempts == 4
+    assert snapshot.items["r-mastered"].next_review_at > now
+    assert snapshot.topic_weakness["airway"] > snapshot.topic_weakness["renal"]
+    assert snapshot.item_weight("a-wrong", ["airway"], now) > snapshot.item_weight("unseen", ["renal"], now)
+    assert snapshot.item_weight("unseen", ["renal"], now) > snapshot.item_weight("r-mastered", ["renal"], now)
+
+    candidates = [{"id": "a-wrong", "topics": ["airway"]}, {"id": "r-mastered", "topics": ["renal"]}]
+    candidates += [{"id": f"new-{index}", "topics": []} for index in range(6)]
+    first_picks = Counter()
+    for _ in range(300):
+        picked = selector.select(
+            "resident",
+            candidates,
+            3,
+            key=lambda q: q["id"],
+            topics=lambda q: q["topics"],
+            now=now,
+        )
+        assert len({q["id"] for q in picked}) == 3
+        first_picks[picked[0]["id"]] += 1
+    assert first_picks.most_common(1)[0][0] == "a-wrong"
+    assert first_picks["r-mastered"] < first_picks["a-wrong"] / 5
+    assert selector.select("resident", candidates, 0, key=lambda q: q["id"]) == []
+    assert len(selector.select("resident", candidates[:2], 5, key=lambda q: q["id"])) == 2
+
+    assert selector.snapshot("resident") is snapshot
+    other = selector.snapshot("someone-else")
+    repo.record_attempts([make_attempt("new-0", False, now)])
+    rebuilt = selector.snapshot("resident")
+    assert rebuilt is not snapshot
+    assert rebuilt.items["new-0"].attempts == 1
+    assert selector.snapshot("someone-else") is other
+    assert set(other.items) == {"a-wrong"}
+    assert repo.load_item_difficulty(["a-wrong", "new-0", "unseen"]).keys() == {"a-wrong", "new-0"}
+
+    dispose_connection_pool(db_path)
+
+
+def test_create_exam_with_adaptive_user_reranks_sampled_candidates(tmp_path: Path, make_attempt) -> None:
+    db_path = tmp_path / "adaptive-exam.db"
+    question_repo = SQLiteQuestionRepository(db_path=db_path)
+    questions = [
+        Question(question_text=f"Airway question {index}", options=["A", "B"], correct_answer="A", topics=["airway"])
+        for index in range(3)
+    ]
+    for question in questions:
+        question_repo.save(question)
+    attempt_repo = SQLitePracticeAttemptRepository(db_path=db_path)
+    now = datetime.now()
+    attempt_repo.record_attempts(
+        [make_attempt(questions[0].id, False, now) for _ in range(3)]
+        + [make_attempt(question.id, True, now) for question in questions[1:] for _ in range(3)]
+    )
+
+    def build_service(selector: AdaptivePracticeSelector | None) -> ExamToolApplicationService:
+        return ExamToolApplicationService(
+            repo=question_repo,
+            project_root=tmp_path,
+            exams_dir=tmp_path / "exams",
+            questions_dir=tmp_path / "questions-legacy",
+            practice_selector=selector,
+        )
+
+    service = build_service(AdaptivePracticeSelector(attempt_repo, rng=random.Random(3)))
+    picks = Counter()
+    for _ in range(20):
+        result = service.create_exam({"name": "Weak spots", "question_count": 1, "adaptive_user_id": "resident"})
+        assert result["success"] is True and result["adaptive_user_id"] == "resident"
+        exam = json.loads((tmp_path / result["saved_to"]).read_text(encoding="utf-8"))
+        picks[exam["questions"][0]["id"]] += 1
+    assert picks.most_common(1)[0][0] == questions[0].id
+
+    assert build_service(None).create_exam({"name": "No selector", "adaptive_user_id": "resident"})["success"] is False
+    dispose_connection_pool(db_path)
@@ -1,7 +1,14 @@
-import sys
+import asyncio
+import json
+import os
 import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -12,6 +19,7 @@ from src.application.services.openclaw_session_keys import (  # noqa: E402
 )
 from src.infrastructure.agent.provider import (  # noqa: E402
     AgentProviderConfig,
+    CrushAgentProvider,
     OpenClawAgentProvider,
     collect_openclaw_available_models,
     collect_opencode_available_models,
@@ -20,6 +28,7 @@ from src.infrastructure.agent.provider import (  # noqa: E402
     resolve_openclaw_default_model,
     resolve_opencode_default_model,
 )
+from src.presentation.streamlit.async_chat import ChatStreamJobStore  # noqa: E402
 
 
 def test_collect_opencode_available_models_supports_dict_and_list_model_shapes() -> None:
@@ -248,3 +257,172 @@ def test_openclaw_session_key_helper_normalizes_parts_and_avoids_main_session()
     assert normalize_openclaw_session_part(" question/abc 123 ") == "question-abc-123"
     assert build_openclaw_session_key("job", "heartbeat 1") == "agent:main:job:heartbeat-1"
     assert build_openclaw_session_key("web", "user") != "agent:main:main"
+
+
+def _write_fake_cli(tmp_path: Path, body: str) -> Path:
+    script = tmp_path / "fake-cli"
+    script.write_text("#!/bin/sh\n" + body, encoding="utf-8")
+    script.chmod(0o755)
+    return script
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def test_crush_astream_kills_child_process_when_cancelled(tmp_path: Path) -> None:
+    pid_file = tmp_path / "child.pid"
+    script = _write_fake_cli(tmp_path, f'echo $$ > "{pid_file}"\necho "first line"\nexec sleep 30\n')
+    provider = CrushAgentProvider(
+        AgentProviderConfig(provider="crush", working_dir=tmp_path, crush_executable=str(script), timeout=60)
+    )
+    received: list[str] = []
+
+    async def consume() -> None:
+        async for chunk in provider.astream("prompt"):
+            received.append(chunk)
+
+    task = asyncio.create_task(consume())
+    for _ in range(200):
+        if received:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert received == ["first line\n"]
+    child_pid = int(pid_file.read_text(encoding="utf-8").strip())
+    assert not _process_exists(child_pid)
+
+
+async def test_crush_astream_reports_nonzero_exit(tmp_path: Path) -> None:
+    script = _write_fake_cli(tmp_path, 'echo "partial"\nexit 3\n')
+    provider = CrushAgentProvider(
+        AgentProviderConfig(provider="crush", working_dir=tmp_path, crush_executable=str(script), timeout=10)
+    )
+
+    chunks: list[str] = []
+    with pytest.raises(RuntimeError, match="結束碼：3"):
+        async for chunk in provider.astream("prompt"):
+            chunks.append(chunk)
+
+    assert chunks == ["partial\n"]
+
+
+def test_chat_stream_job_store_start_async_cancel_kills_provider_child(tmp_path: Path) -> None:
+    pid_file = tmp_path / "child.pid"
+    script = _write_fake_cli(tmp_path, f'echo $$ > "{pid_file}"\necho "hello"\nexec sleep 30\n')
+    provider = CrushAgentProvider(
+        AgentProviderConfig(provider="crush", working_dir=tmp_path, crush_executable=str(script), timeout=60)
+    )
+    store = ChatStreamJobStore()
+
+    job_id = store.start_async(lambda: provider.astream("prompt"))
+
+    deadline = time.monotonic() + 5
+    while store.snapshot(job_id)["content"] != "hello\n" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.snapshot(job_id)["content"] == "hello\n"
+
+    assert store.cancel(job_id, reason="manual stop") is True
+    child_pid = int(pid_file.read_text(encoding="utf-8").strip())
+    deadline = time.monotonic() + 5
+    while _process_exists(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not _process_exists(child_pid)
+    assert store.snapshot(job_id)["status"] == "cancelled"
+    assert store.snapshot(job_id)["error"] == "manual stop"
+
+
+class _GatewaySseStub(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+    release = threading.Event()
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        type(self).requests.append(
+            {
+                "path": self.path,
+                "session_key": self.headers.get("x-openclaw-session-key"),
+                "authorization": self.headers.get("Authorization"),
+                "body": json.loads(self.rfile.read(length).decode("utf-8")),
+            }
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for index, delta in enumerate(["Sugam", "madex ", "包覆 rocuronium"]):
+            if index == 2:
+                type(self).release.wait(timeout=2)
+            event = {"choices": [{"delta": {"content": delta}}]}
+            self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+def test_openclaw_stream_yields_gateway_sse_deltas_before_turn_finishes(tmp_path: Path) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GatewaySseStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _GatewaySseStub.requests = []
+    _GatewaySseStub.release.clear()
+    try:
+        provider = OpenClawAgentProvider(
+            AgentProviderConfig(
+                provider="openclaw",
+                working_dir=tmp_path,
+                timeout=10,
+                openclaw_executable="/nonexistent/openclaw",
+                openclaw_mode="agent",
+                openclaw_agent_id="main",
+                openclaw_gateway_url=f"http://127.0.0.1:{server.server_address[1]}/",
+                openclaw_gateway_token="gw-token",
+            )
+        )
+
+        stream = provider.stream("hello", session_key="agent:main:web:user-1")
+        first_two = [next(stream), next(stream)]
+        _GatewaySseStub.release.set()
+        rest = list(stream)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first_two == ["Sugam", "madex "]
+    assert rest == ["包覆 rocuronium"]
+    request_record = _GatewaySseStub.requests[0]
+    assert request_record["path"] == "/v1/chat/completions"
+    assert request_record["session_key"] == "agent:main:web:user-1"
+    assert request_record["authorization"] == "Bearer gw-token"
+    assert request_record["body"]["stream"] is True
+    assert request_record["body"]["model"] == "openclaw:main"
+
+
+def test_openclaw_stream_falls_back_to_cli_when_gateway_is_unreachable(tmp_path: Path) -> None:
+    provider = OpenClawAgentProvider(
+        AgentProviderConfig(
+            provider="openclaw",
+            working_dir=tmp_path,
+            timeout=5,
+            openclaw_executable="/nonexistent/openclaw",
+            openclaw_mode="agent",
+            openclaw_gateway_url="http://127.0.0.1:9",
+        )
+    )
+    provider._run_cli = lambda args, *, timeout: subprocess.CompletedProcess(  # type: ignore[method-assign]
+        args=args,
+        returncode=0,
+        stdout='{"ok": true, "payloads": [{"text": "CLI answer"}]}',
+        stderr="",
+    )
+
+    assert list(provider.stream("hello")) == ["CLI answer"]
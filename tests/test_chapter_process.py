@@ -0,0 +1,29 @@
+import asyncio
+import math
+import operator
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from chapter_process import ChapterProcessError, run_in_chapter_process  # noqa: E402
+
+
+def test_chapter_process_returns_result() -> None:
+    assert asyncio.run(run_in_chapter_process(operator.add, (2, 3), timeout=30)) == 5
+
+
+def test_chapter_process_reports_child_errors() -> None:
+    with pytest.raises(ChapterProcessError, match="ValueError"):
+        asyncio.run(run_in_chapter_process(math.sqrt, (-1,), timeout=30))
+
+
+def test_chapter_process_is_killed_on_timeout() -> None:
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(run_in_chapter_process(time.sleep, (60,), timeout=0.5))
+    assert time.monotonic() - started < 20
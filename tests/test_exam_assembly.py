@@ -0,0 +1,245 @@
+import json
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.application.services.exam_tool_application_service import ExamToolApplicationService  # noqa: E402
+from src.domain.entities.exam import BlueprintQuota  # noqa: E402
+from src.domain.entities.question import Difficulty, ExamTrack, Question  # noqa: E402
+from src.domain.value_objects.audit import ActorType  # noqa: E402
+from src.infrastructure.persistence.database import dispose_connection_pool, init_database  # noqa: E402
+from src.infrastructure.persistence.sqlite_exam_catalog_repo import SQLiteExamCatalogRepository  # noqa: E402
+from src.infrastructure.persistence.sqlite_question_repo import SQLiteQuestionRepository  # noqa: E402
+
+
+def _seed(repo: SQLiteQuestionRepository) -> None:
+    for index in range(24):
+        repo.save(
+            Question(
+                question_text=f"Question {index} about anesthesia management",
+                options=["A", "B", "C", "D"],
+                correct_answer="A",
+                difficulty=[Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD][index % 3],
+                topics=["airway", "pharmacology"] if index % 4 == 0 else [["airway"], ["pharmacology"]][index % 2],
+                exam_track=ExamTrack.ITE if index < 12 else ExamTrack.BOARD,
+            )
+        )
+
+
+def test_sample_by_blueprint_fills_quotas_from_indexes_without_duplicates(tmp_path: Path) -> None:
+    db_path = tmp_path / "assembly.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+
+    quotas = [
+        BlueprintQuota(count=3, topic="airway", difficulty=Difficulty.HARD),
+        BlueprintQuota(count=4, topic="pharmacology"),
+        BlueprintQuota(count=50, difficulty=Difficulty.EASY),
+    ]
+    cells = repo.sample_by_blueprint(quotas, rng=random.Random(7))
+
+    assert [len(cell) for cell in cells] == [3, 4, 8 - sum(q.difficulty == Difficulty.EASY for q in cells[1])]
+    assert all("airway" in q.topics and q.difficulty == Difficulty.HARD for q in cells[0])
+    assert all("pharmacology" in q.topics for q in cells[1])
+    selected_ids = [q.id for cell in cells for q in cell]
+    assert len(selected_ids) == len(set(selected_ids))
+
+    ite_only = repo.sample_by_blueprint([BlueprintQuota(count=30)], exam_track=ExamTrack.ITE)
+    assert len(ite_only[0]) == 12
+
+    victim = cells[0][0]
+    repo.delete(victim.id, actor_type=ActorType.USER, actor_name="tester", soft_delete=True)
+    remaining = repo.sample_by_blueprint([BlueprintQuota(count=30, topic="airway")])[0]
+    assert victim.id not in {q.id for q in remaining}
+
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(
+            str(row[-1])
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT q.* FROM question_topics qt JOIN questions q ON q.id = qt.question_id "
+                "WHERE qt.topic = ? AND qt.sample_key >= ? ORDER BY qt.sample_key LIMIT 5",
+                ("airway", 0),
+            )
+        )
+    assert "USE TEMP B-TREE" not in plan
+    dispose_connection_pool(db_path)
+
+
+def test_sample_by_blueprint_spreads_picks_and_tops_up_short_cells(tmp_path: Path) -> None:
+    db_path = tmp_path / "spread.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    step = 2**63 // 25
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE questions SET sample_key = rowid * ?", (step,))
+        ranks = {row[0]: row[1] for row in conn.execute("SELECT id, rowid FROM questions")}
+        assert conn.execute("SELECT COUNT(*) FROM question_topics WHERE sample_key % ? != 0", (step,)).fetchone()[0] == 0
+
+    [cell] = repo.sample_by_blueprint([BlueprintQuota(count=8)], rng=random.Random(3))
+    picked = sorted(ranks[q.id] for q in cell)
+    assert len(picked) == 8
+    assert sum(1 for a, b in zip(picked, picked[1:]) if (b - a) % 24 != 1) >= 1
+
+    for seed in range(5):
+        [whole_bank] = repo.sample_by_blueprint([BlueprintQuota(count=24)], rng=random.Random(seed))
+        assert len({q.id for q in whole_bank}) == 24
+    dispose_connection_pool(db_path)
+
+
+def test_sample_by_blueprint_binds_large_exclusion_sets_once(tmp_path: Path) -> None:
+    db_path = tmp_path / "exclusions.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    with sqlite3.connect(db_path) as conn:
+        real_ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY rowid")]
+    excluded = {f"missing-{index}" for index in range(1000)} | set(real_ids[:4])
+
+    cells = repo.sample_by_blueprint(
+        [BlueprintQuota(count=1) for _ in range(300)],
+        exclude_ids=excluded,
+        rng=random.Random(7),
+    )
+
+    picked = [q.id for cell in cells for q in cell]
+    assert len(picked) == len(set(picked)) == len(real_ids) - 4
+    assert not set(picked) & excluded
+    dispose_connection_pool(db_path)
+
+
+def test_question_topics_index_is_backfilled_for_existing_banks(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy-bank.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    dispose_connection_pool(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        for suffix in ("ai", "au", "ad"):
+            conn.execute(f"DROP TRIGGER questions_topics_{suffix}")
+        conn.execute("DROP TABLE question_topics")
+        conn.execute("UPDATE questions SET sample_key = NULL")
+        conn.execute("CREATE TRIGGER questions_topics_au AFTER UPDATE ON questions BEGIN SELECT 1; END")
+
+    init_database(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        trigger_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'questions_topics_au'").fetchone()[0]
+        assert "UPDATE OF topics, is_deleted, sample_key" in trigger_sql
+        assert conn.execute("SELECT COUNT(*) FROM questions WHERE sample_key IS NULL").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM question_topics WHERE topic = 'airway'").fetchone()[0] == 12
+    dispose_connection_pool(db_path)
+
+
+def test_create_exam_streams_blueprint_exam_file_and_reports_shortfalls(tmp_path: Path) -> None:
+    db_path = tmp_path / "create-exam.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    service = ExamToolApplicationService(
+        repo=repo,
+        project_root=tmp_path,
+        exams_dir=tmp_path / "exams",
+        questions_dir=tmp_path / "questions-legacy",
+    )
+
+    result = service.create_exam(
+        {
+            "name": "Blueprint exam",
+            "blueprint": [
+                {"topic": "airway", "difficulty": "medium", "count": 2},
+                {"topic": "pharmacology", "difficulty": "hard", "count": 40},
+            ],
+        }
+    )
+
+    assert result["success"] is True
+    assert result["requested_question_count"] == 42
+    assert [cell["topic"] for cell in result["shortfalls"]] == ["pharmacology"]
+    exam = json.loads((tmp_path / result["saved_to"]).read_text(encoding="utf-8"))
+    assert exam["question_count"] == len(exam["questions"]) == result["question_count"]
+    assert exam["blueprint"][0] == {"topic": "airway", "difficulty": "medium", "requested": 2, "selected": 2}
+
+    by_topics = service.create_exam({"name": "Topic exam", "question_count": 5, "topics": ["airway", "missing"]})
+    assert by_topics["question_count"] == 5
+    assert service.create_exam({"name": "Bad", "blueprint": [{"count": 0}]})["success"] is False
+    assert service.create_exam({"name": "Bad", "exam_track": "unknown"})["success"] is False
+    assert service.create_exam({"name": "Bad", "difficulty": "impossible"})["success"] is False
+    dispose_connection_pool(db_path)
+
+
+def test_exam_catalog_backfills_legacy_files_once_and_tracks_new_exams(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    exams_dir = tmp_path / "exams"
+    exams_dir.mkdir()
+    (exams_dir / "exam_legacy.json").write_text(
+        json.dumps(
+            {
+                "id": "legacy01",
+                "name": "Legacy exam",
+                "created_at": "2024-01-02T03:04:05",
+                "question_count": 1,
+                "questions": [{"id": "q-old"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    (exams_dir / "broken.json").write_text("{not json", encoding="utf-8")
+    catalog = SQLiteExamCatalogRepository(db_path=db_path)
+    service = ExamToolApplicationService(
+        repo=repo,
+        project_root=tmp_path,
+        exams_dir=exams_dir,
+        questions_dir=tmp_path / "questions-legacy",
+        exam_catalog=catalog,
+    )
+
+    assert service.get_stats()["exam_count"] == 1
+    assert catalog.ensure_backfilled(exams_dir) == 0
+
+    result = service.create_exam({"name": "Catalogued", "question_count": 3})
+    assert service.get_stats()["exam_count"] == 2
+
+    newest = catalog.list_recent(limit=1)[0]
+    assert newest.id == result["exam_id"]
+    assert newest.question_count == 3
+    assert len(newest.question_ids) == 3
+    assert catalog.get_by_id("legacy01").question_ids == ["q-old"]
+    dispose_connection_pool(db_path)
+
+
+def test_content_statistics_match_per_table_counts_in_one_statement(tmp_path: Path) -> None:
+    db_path = tmp_path / "content-stats.db"
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    _seed(repo)
+    victim = repo.list_all(limit=1)[0]
+    repo.delete(victim.id, actor_type=ActorType.USER, actor_name="tester", soft_delete=True)
+    catalog = SQLiteExamCatalogRepository(db_path=db_path)
+    service = ExamToolApplicationService(
+        repo=repo,
+        project_root=tmp_path,
+        exams_dir=tmp_path / "exams",
+        questions_dir=tmp_path / "questions-legacy",
+        exam_catalog=catalog,
+    )
+    service.create_exam({"name": "Stats exam", "question_count": 2})
+
+    stats = repo.get_content_statistics()
+    live = [question for question in repo.list_all(limit=100) if question.id != victim.id]
+    expected_topics: dict[str, int] = {}
+    for question in live:
+        for topic in question.topics:
+            expected_topics[topic] = expected_topics.get(topic, 0) + 1
+    assert stats["questions"]["total"] == len(live) == 23
+    assert stats["questions"]["deleted"] == 1
+    assert sum(stats["questions"]["by_difficulty"].values()) == 23
+    assert stats["questions"]["by_topic"] == expected_topics
+    assert list(stats["questions"]["by_topic"].values()) == sorted(expected_topics.values(), reverse=True)
+    assert stats["past_exams"] == {"exam_count": 0, "question_count": 0, "answered_question_count": 0}
+    assert stats["generated_exam_count"] == 1
+    assert repo.get_statistics() == stats["questions"]
+    assert service.get_stats()["exam_count"] == 1
+    dispose_connection_pool(db_path)
@@ -0,0 +1,69 @@
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.infrastructure.logging import setup as logging_setup  # noqa: E402
+from src.infrastructure.logging.async_pipeline import BoundedQueueHandler, parse_sample_rates  # noqa: E402
+
+
+@pytest.fixture
+def restore_logging(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(logging_setup, "_BOOTSTRAP_SIGNATURE", None)
+    yield
+    logging_setup.configure_logging(level="INFO")
+
+
+def test_async_mode_writes_sampled_events_from_background_thread(tmp_path: Path, restore_logging) -> None:
+    logging_setup.configure_logging(
+        log_dir=tmp_path,
+        level="DEBUG",
+        async_mode=True,
+        sample_rates={"question_list_loaded": 10},
+    )
+    assert any(isinstance(handler, BoundedQueueHandler) for handler in logging.getLogger().handlers)
+
+    logger = logging_setup.get_logger("tests.logging_pipeline.async")
+    for index in range(50):
+        logger.debug("question_list_loaded", result_count=index)
+    logger.warning("question_list_loaded", result_count=-1)
+    logger.info("question_saved", question_id="q1")
+    logging.getLogger("tests.logging_pipeline.stdlib").info("legacy %s message", "stdlib")
+    logging_setup.shutdown_logging()
+
+    events = [json.loads(line) for line in (tmp_path / "app.log").read_text(encoding="utf-8").splitlines()]
+    sampled = [event for event in events if event["event"] == "question_list_loaded" and event["level"] == "debug"]
+    assert [event["result_count"] for event in sampled] == [0, 10, 20, 30, 40]
+    assert all(event["sample_rate"] == 10 for event in sampled)
+    assert any(event["event"] == "question_list_loaded" and event["level"] == "warning" for event in events)
+    assert any(event["event"] == "question_saved" and event["question_id"] == "q1" for event in events)
+    assert any(event["event"] == "legacy stdlib message" for event in events)
+
+
+def test_bounded_queue_handler_drops_when_full_and_reports_once_there_is_room() -> None:
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+
+    def record(message: str) -> logging.LogRecord:
+        return logging.LogRecord("tests", logging.INFO, __file__, 0, message, None, None)
+
+    for message in ("a", "b", "c", "d"):
+        handler.emit(record(message))
+    assert handler.dropped == 2
+    assert [log_queue.get_nowait().msg for _ in range(2)] == ["a", "b"]
+
+    handler.emit(record("e"))
+    notice = log_queue.queue[-1]
+    assert [item.msg for item in log_queue.queue] == ["e", "log_records_dropped"]
+    assert notice.dropped == 2 and notice.levelno == logging.WARNING
+
+    assert parse_sample_rates("question_list_loaded=50, bad, x=oops,question_lookup_hit=0") == {
+        "question_list_loaded": 50,
+        "question_lookup_hit": 1,
+    }
@@ -0,0 +1,106 @@
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.infrastructure.metrics import (  # noqa: E402
+    MetricsRegistry,
+    format_metrics_summary,
+    instrument_methods,
+    maybe_start_metrics_server,
+    start_metrics_server,
+    summarize_histograms,
+)
+
+
+def test_histogram_quantiles_and_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("query_seconds", "Query latency.", ("table",), buckets=(0.01, 0.1, 1.0))
+    counter = registry.counter("queries_total", "Queries.", ("table",))
+
+    for value in [0.005] * 50 + [0.05] * 49 + [0.5]:
+        histogram.observe(value, table="questions")
+        counter.inc(table="questions")
+
+    assert histogram.count(table="questions") == 100
+    assert histogram.quantile(0.5, table="questions") == pytest.approx(0.01)
+    assert 0.01 < histogram.quantile(0.99, table="questions") <= 0.1
+    assert histogram.quantile(0.5, table="missing") is None
+    assert registry.histogram("query_seconds", "Query latency.", ("table",)) is histogram
+    with pytest.raises(ValueError):
+        registry.counter("query_seconds", "Wrong type.")
+
+    text = registry.render_prometheus()
+    assert "# TYPE exam_query_seconds histogram" in text
+    assert 'exam_query_seconds_bucket{table="questions",le="0.1"} 99' in text
+    assert 'exam_query_seconds_bucket{table="questions",le="+Inf"} 100' in text
+    assert 'exam_query_seconds_count{table="questions"} 100' in text
+    assert 'exam_queries_total{table="questions"} 100' in text
+
+    [row] = summarize_histograms(text)
+    assert row["labels"] == {"table": "questions"} and row["count"] == 100
+    assert row["p50"] == pytest.approx(histogram.quantile(0.5, table="questions"))
+    assert format_metrics_summary(text).startswith("query{table=questions} n=100 p50=10.0ms")
+    assert format_metrics_summary("") == "no latency samples yet"
+
+
+def test_instrument_methods_times_calls_errors_and_streams() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("call_seconds", "Calls.", ("method", "outcome"))
+
+    @instrument_methods(histogram, labels=lambda _self, method: {"method": method}, streaming=("stream",))
+    class Service:
+        def load(self, value: int) -> int:
+            return value * 2
+
+        def fail(self) -> None:
+            raise RuntimeError("boom")
+
+        def stream(self):
+            return iter(["a", "b", "c"])
+
+        def _private(self) -> str:
+            return "untouched"
+
+    service = Service()
+    assert service.load(2) == 4
+    with pytest.raises(RuntimeError):
+        service.fail()
+    chunks = service.stream()
+    assert histogram.count(method="stream", outcome="ok") == 0
+    assert next(chunks) == "a"
+    chunks.close()
+
+    assert histogram.count(method="load", outcome="ok") == 1
+    assert histogram.count(method="fail", outcome="error") == 1
+    assert histogram.count(method="stream", outcome="ok") == 1
+    assert service._private() == "untouched"
+    assert histogram.count(method="_private", outcome="ok") == 0
+
+
+def test_metrics_server_serves_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    registry.histogram("ping_seconds", "Ping.").observe(0.002)
+    server = start_metrics_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain")
+    assert "exam_ping_seconds_count 1" in body
+
+
+def test_metrics_port_is_read_per_process_role() -> None:
+    # web 程序的環境會被 MCP stdio 子程序繼承；子程序只認自己的變數
+    inherited = {"ANESTHESIA_EXAM_METRICS_PORT_WEB": "9464", "ANESTHESIA_EXAM_METRICS_PORT": "9464"}
+    assert maybe_start_metrics_server("mcp", env=inherited) is None
+    assert maybe_start_metrics_server("bot", env={}) is None
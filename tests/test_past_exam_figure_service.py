@@ -136,4 +136,39 @@ def test_resolve_question_assets_marks_hist_questions_without_doc_assets_for_rei
     )
 
     assert enriched["image_asset_status"] == "needs_reingest"
-    assert "需要重新建立帶圖資的來源映射" in enriched["image_asset_note"]
\ No newline at end of file
+    assert "需要重新建立帶圖資的來源映射" in enriched["image_asset_note"]
+
+
+def test_enrich_questions_indexes_manifest_once_and_skips_text_rows(tmp_path: Path, monkeypatch) -> None:
+    data_dir = tmp_path / "data"
+    doc_id = "doc_fixture_pool"
+    images_dir = data_dir / doc_id / "images"
+    figures = []
+    for page in (3, 4):
+        _write_png(images_dir / f"fig_{page}_1.png")
+        figures.append({"id": f"fig_{page}_1", "page": page, "path": str(images_dir / f"fig_{page}_1.png")})
+    _write_manifest(data_dir / doc_id, doc_id, figures)
+
+    service = PastExamFigureService(data_dir=data_dir)
+    monkeypatch.setattr(service, "_render_pdf_page_preview", lambda doc, page: None)
+    manifest_loads: list[str] = []
+    original_load_manifest = service._load_manifest
+    monkeypatch.setattr(
+        service,
+        "_load_manifest",
+        lambda doc: manifest_loads.append(doc) or original_load_manifest(doc),
+    )
+
+    text_row = {"id": "text", "pattern": "recall", "options": ["A", "B"], "source_doc_id": doc_id, "source_page": 3}
+    pool = service.enrich_questions(
+        [
+            text_row,
+            {"id": "img-3", "pattern": "image_based", "source_doc_id": doc_id, "source_page": 3, "options": []},
+            {"id": "img-4", "pattern": "image_based", "source_doc_id": doc_id, "source_page": 4, "options": []},
+        ]
+    )
+
+    assert pool[0] is text_row
+    assert [asset["id"] for asset in pool[1]["figure_assets"]] == ["fig_3_1"]
+    assert [asset["id"] for asset in pool[2]["figure_assets"]] == ["fig_4_1"]
+    assert manifest_loads == [doc_id]
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.application.services.practice_analytics import (  # noqa: E402
+    PracticeScorecard,
+    PracticeScorecardCache,
+    practice_session_fingerprint,
+)
+
+
+def _rows() -> list[dict]:
+    return [
+        {"exam_year": 2024, "exam_label": "2024 年 ITE", "is_answered": True, "is_correct": True, "topics": ["airway"]},
+        {"exam_year": 2024, "exam_label": "2024 年 ITE", "is_answered": True, "is_correct": False, "topics": ["airway"]},
+        {"exam_year": 2023, "exam_label": "2023 年 ITE", "is_answered": False, "is_correct": False, "topics": []},
+        {
+            "exam_year": "未標記",
+            "exam_label": "未標記考卷",
+            "is_answered": True,
+            "is_correct": False,
+            "topics": ["pharmacology", " airway "],
+        },
+        {"exam_year": 2023, "exam_label": "2023 年 ITE", "is_answered": True, "is_correct": True, "topics": ["renal"]},
+    ]
+
+
+def test_scorecard_breakdowns_match_row_semantics() -> None:
+    scorecard = PracticeScorecard.from_result_rows(_rows())
+
+    assert scorecard.summary() == {
+        "correct_count": 2,
+        "answered_count": 4,
+        "incorrect_count": 2,
+        "unanswered_count": 1,
+        "total_questions": 5,
+        "score": 40.0,
+        "answered_accuracy": 50.0,
+    }
+    assert scorecard.breakdown_rows("exam_year", "年度", numeric_sort_desc=True) == [
+        {"年度": 2024, "題數": 2, "答對": 1, "答錯": 1, "未作答": 0, "正確率": "50.0%"},
+        {"年度": 2023, "題數": 2, "答對": 1, "答錯": 0, "未作答": 1, "正確率": "50.0%"},
+        {"年度": "未標記", "題數": 1, "答對": 0, "答錯": 1, "未作答": 0, "正確率": "0.0%"},
+    ]
+    assert [row["考卷"] for row in scorecard.breakdown_rows("exam_label", "考卷")] == [
+        "2023 年 ITE",
+        "2024 年 ITE",
+        "未標記考卷",
+    ]
+    assert scorecard.weak_topic_rows() == [
+        {"主題": "airway", "錯題/未作答": 2},
+        {"主題": "未標記主題", "錯題/未作答": 1},
+        {"主題": "pharmacology", "錯題/未作答": 1},
+    ]
+    assert PracticeScorecard.from_result_rows([]).weak_topic_rows() == []
+
+
+def test_scorecard_cache_is_keyed_by_session_fingerprint() -> None:
+    cache = PracticeScorecardCache(max_entries=1)
+    first = practice_session_fingerprint([("q1", "A", "A"), ("q2", "", "B")])
+    changed = practice_session_fingerprint([("q1", "A", "A"), ("q2", "B", "B")])
+    assert first != changed
+    assert first == practice_session_fingerprint([("q1", "A", "A"), ("q2", "", "B")])
+
+    scorecard = PracticeScorecard.from_result_rows(_rows())
+    cache.put(first, scorecard)
+    assert cache.get(first) is scorecard
+    cache.put(changed, scorecard)
+    assert cache.get(first) is None
+    assert len(cache) == 1
@@ -0,0 +1,113 @@
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.infrastructure.persistence.database import dispose_connection_pool, init_database  # noqa: E402
+from src.infrastructure.persistence.sqlite_practice_attempt_repo import SQLitePracticeAttemptRepository  # noqa: E402
+
+
+def test_attempts_maintain_mastery_and_review_schedule(tmp_path: Path, make_attempt) -> None:
+    db_path = tmp_path / "practice.db"
+    repo = SQLitePracticeAttemptRepository(db_path=db_path)
+    day1 = datetime(2026, 1, 1, 9, 0, 0)
+
+    assert repo.record_attempts([]) == 0
+    assert (
+        repo.record_attempts(
+            [
+                make_attempt("q1", True, day1, topics=["airway", "ventilation"], pattern="clinical_scenario"),
+                make_attempt("q2", False, day1, topics=["airway"], pattern="negation"),
+                make_attempt("q3", True, day1, topics=["renal"], pattern="negation"),
+                make_attempt("q1", False, day1, topics=["airway"], user_id="someone-else"),
+            ]
+        )
+        == 4
+    )
+    day2 = day1 + timedelta(days=1, hours=1)
+    repo.record_attempts([make_attempt("q1", True, day2, session_id="s2", topics=["airway", "ventilation"])])
+
+    weakest_topics = repo.weakest("resident", limit=2)
+    assert [(item.label, item.attempts, item.correct) for item in weakest_topics] == [
+        ("airway", 3, 2),
+        ("renal", 1, 1),
+    ]
+    assert [item.label for item in repo.weakest("resident", dimension="pattern")] == [
+        "negation",
+        "clinical_scenario",
+    ]
+
+    stats = repo.get_question_stats("resident", ["q1", "q2", "missing"])
+    assert set(stats) == {"q1", "q2"}
+    assert (stats["q1"].attempts, stats["q1"].streak) == (2, 2)
+    assert stats["q1"].next_review_at == day2 + timedelta(days=2)
+    assert stats["q2"].next_review_at == day1
+
+    due_now = repo.due_for_review("resident", now=day2)
+    assert [item.question_id for item in due_now] == ["q2", "q3"]
+    assert [item.question_id for item in repo.due_for_review("resident", now=day2 + timedelta(days=3))] == [
+        "q2",
+        "q3",
+        "q1",
+    ]
+
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(
+            str(row[-1])
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM practice_question_stats "
+                "WHERE user_id = ? AND next_review_at <= ? ORDER BY next_review_at LIMIT 5",
+                ("resident", "2026-01-02T00:00:00"),
+            )
+        )
+    assert "idx_practice_question_stats_due" in plan
+    assert "TEMP B-TREE" not in plan
+    dispose_connection_pool(db_path)
+
+
+def test_unanswered_attempts_skip_aggregates_and_review_interval_caps(tmp_path: Path, make_attempt) -> None:
+    db_path = tmp_path / "practice-unanswered.db"
+    repo = SQLitePracticeAttemptRepository(db_path=db_path)
+    day1 = datetime(2026, 1, 1, 9, 0, 0)
+
+    repo.record_attempts([make_attempt("q1", False, day1, unanswered=True, topics=["airway"])])
+    assert repo.get_question_stats("resident", ["q1"]) == {}
+    assert repo.list_mastery("resident") == []
+
+    streak_days = [day1 + timedelta(days=index) for index in range(70)]
+    repo.record_attempts([make_attempt("q2", True, answered_at) for answered_at in streak_days])
+    stat = repo.get_question_stats("resident", ["q2"])["q2"]
+    assert stat.streak == 70
+    assert stat.next_review_at == streak_days[-1] + timedelta(days=64)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM practice_attempts WHERE question_id = 'q1'").fetchone()[0] == 1
+    dispose_connection_pool(db_path)
+
+
+def test_item_difficulty_and_user_versions_are_backfilled(tmp_path: Path, make_attempt) -> None:
+    db_path = tmp_path / "practice-backfill.db"
+    repo = SQLitePracticeAttemptRepository(db_path=db_path)
+    day1 = datetime(2026, 1, 1, 9, 0, 0)
+    repo.record_attempts(
+        [
+            make_attempt("q1", True, day1),
+            make_attempt("q1", False, day1, user_id="someone-else"),
+            make_attempt("q2", True, day1),
+        ]
+    )
+    dispose_connection_pool(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE practice_item_difficulty")
+        conn.execute("DROP TABLE practice_user_versions")
+    init_database(db_path)
+
+    difficulty = repo.load_item_difficulty(["q1", "q2"])
+    assert (difficulty["q1"].global_attempts, difficulty["q1"].global_correct) == (2, 1)
+    assert repo.get_user_versions(["resident", "someone-else", "nobody"]) == {"resident": 2, "someone-else": 1}
+    assert repo.load_item_statistics("resident")["q1"].global_attempts == 2
+    dispose_connection_pool(db_path)
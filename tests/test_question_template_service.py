@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.application.services import question_template_service  # noqa: E402
+from src.domain.entities.past_exam import PastExam, PastExamQuestion, QuestionPattern  # noqa: E402
+from src.infrastructure.persistence.database import dispose_connection_pool  # noqa: E402
+from src.infrastructure.persistence.sqlite_past_exam_repo import SQLitePastExamRepository  # noqa: E402
+
+
+def _question(exam_id: str, year: int, number: int, pattern: QuestionPattern, topics: list[str]) -> PastExamQuestion:
+    return PastExamQuestion(
+        id=f"{exam_id}-{number}",
+        past_exam_id=exam_id,
+        exam_year=year,
+        exam_name="ITE",
+        question_number=number,
+        question_text=f"{year} question {number}",
+        options=["A", "B", "C", "D"],
+        correct_answer="A",
+        pattern=pattern,
+        topics=topics,
+        concept_names=[f"concept-{number % 2}"],
+    )
+
+
+def test_template_catalog_comes_from_grouped_query_and_refreshes_after_imports(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "templates.db"
+    repo = SQLitePastExamRepository(db_path=db_path)
+    monkeypatch.setattr(question_template_service, "get_past_exam_repository", lambda: repo)
+    for year in (2023, 2024):
+        exam_id = f"exam-{year}"
+        repo.save_exam(PastExam(id=exam_id, exam_year=year, exam_name="ITE", source_pdf=f"{year}.pdf"))
+        repo.save_questions(
+            exam_id,
+            [
+                _question(exam_id, year, 1, QuestionPattern.CLINICAL_SCENARIO, ["airway", "ventilation"]),
+                _question(exam_id, year, 2, QuestionPattern.CLINICAL_SCENARIO, ["airway"]),
+                _question(exam_id, year, 3, QuestionPattern.NEGATION, ["pharmacology"]),
+            ],
+        )
+
+    service = question_template_service.QuestionTemplateService()
+    templates = service.list_templates(limit=12)
+
+    assert [template["pattern"] for template in templates] == ["clinical_scenario", "negation"] * 2 + [
+        "clinical_scenario"
+    ] * 2
+    first = templates[0]
+    assert first["source_question_id"] == "exam-2024-1"
+    assert first["topics"] == ["airway", "ventilation"]
+    assert first["blueprint"]["reference_concepts"] == ["concept-1", "concept-0"]
+    assert first["blueprint"]["source_exam_years"] == [2024, 2023]
+    assert first["blueprint"]["historical_pattern_distribution"] == {"clinical_scenario": 4, "negation": 2}
+    assert first["blueprint"]["sample_source_refs"][0] == "2024 ITE 第 1 題"
+
+    repo.save_exam(PastExam(id="exam-2025", exam_year=2025, exam_name="ITE", source_pdf="2025.pdf"))
+    repo.save_questions("exam-2025", [_question("exam-2025", 2025, 9, QuestionPattern.NEGATION, ["sedation"])])
+
+    refreshed = service.list_templates(limit=12)
+    assert refreshed[0]["blueprint"]["historical_pattern_distribution"] == {"clinical_scenario": 4, "negation": 3}
+    assert any(template["source_question_id"] == "exam-2025-9" for template in refreshed)
+    dispose_connection_pool(db_path)
@@ -1,17 +1,30 @@
+import sqlite3
 import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.domain.entities.question import Question  # noqa: E402
 from src.infrastructure.persistence.database import (  # noqa: E402
+    begin_immediate_transaction,
     dispose_connection_pool,
+    execute_write,
     get_connection,
     get_connection_pool,
+    get_pool_stats,
+    get_read_connection,
+    get_sqlite_writer,
+    get_table_versions,
+    get_write_connection,
     init_database,
+    submit_write,
 )
+from src.infrastructure.persistence.read_model_versions import TableVersionTracker, VersionedReadModelCache  # noqa: E402
 from src.infrastructure.persistence.sqlite_question_repo import SQLiteQuestionRepository  # noqa: E402
 
 
@@ -64,5 +77,288 @@ def test_sqlite_connection_pool_handles_concurrent_question_writes(tmp_path: Pat
 
     assert len(results) == 18
     assert repo.get_statistics()["total"] == 18
+    # 題目儲存走寫入佇列：同時間的儲存會被合併成較少的交易
+    writer_stats = get_sqlite_writer(db_path).stats()
+    assert writer_stats["batched_jobs"] == 18
+    assert writer_stats["batches"] <= 18
+    assert writer_stats["exclusive_uses"] == 0
+
+    dispose_connection_pool(db_path)
+
+
+def test_table_version_tracker_sees_writes_from_other_connections(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "read-model-versions.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+
+    dispose_connection_pool(db_path)
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    tracker = TableVersionTracker(db_path=db_path)
+
+    assert tracker.poll() == set()
+
+    question_id = repo.save(
+        question=Question(
+            question_text="Version tracked question",
+            options=["A", "B"],
+            correct_answer="A",
+            created_by="pytest-versions",
+        ),
+        actor_name="pytest-versions",
+    )
+    assert tracker.poll() == {"questions"}
+    assert tracker.poll() == set()
+
+    # 模擬 MCP server / worker 等其他程序直接寫入同一個 DB
+    with sqlite3.connect(db_path) as other_process:
+        other_process.execute(
+            "UPDATE questions SET is_validated = 1 WHERE id = ?",
+            (question_id,),
+        )
+        other_process.execute(
+            "INSERT INTO scope_requests (id, topic, created_at) VALUES ('req-1', 'Propofol', '2026-01-01')"
+        )
+
+    assert tracker.poll() == {"questions", "scope_requests"}
+    assert get_table_versions(("questions",), db_path=db_path) == {"questions": 2}
+
+    dispose_connection_pool(db_path)
+
+
+def test_pool_stats_track_usage_busy_errors_and_saturation(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "pool-stats.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_POOL_SIZE", "2")
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_BUSY_TIMEOUT_MS", "50")
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_POOL_WARN_UTILIZATION", "0.6")
+
+    dispose_connection_pool(db_path)
+    init_database(db_path)
+
+    with get_connection(db_path), get_connection(db_path), get_connection(db_path):
+        busy_stats = get_pool_stats(db_path)
+    assert busy_stats["in_use"] == 3
+    assert busy_stats["overflow"] == 1
+    assert busy_stats["utilization"] == 1.0
+
+    # 另一個程序握著寫鎖，busy_timeout 用完後 BEGIN IMMEDIATE 失敗
+    holder = sqlite3.connect(db_path)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            with get_connection(db_path) as conn:
+                begin_immediate_transaction(conn)
+    finally:
+        holder.rollback()
+        holder.close()
+
+    with get_connection(db_path) as conn:
+        begin_immediate_transaction(conn)
+        conn.execute("INSERT INTO scope_requests (id, topic, created_at) VALUES ('req-1', 'Airway', '2026-01-01')")
+        conn.commit()
+
+    stats = get_pool_stats(db_path)
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 3
+    assert stats["peak_overflow"] == 1
+    assert stats["checkouts"] == 5
+    assert stats["busy_errors"] == 1
+    assert stats["write_lock_wait_ms"]["count"] == 2
+    assert stats["write_lock_wait_ms"]["max"] >= 40
+    assert stats["checkout_wait_ms"]["p99"] is not None
+    assert stats["wal_bytes"] > 0
+    assert stats["warnings"] == {"sqlite_pool_saturated": 1, "sqlite_busy_error": 1}
+
+    dispose_connection_pool(db_path)
+
+
+def test_pool_timeout_is_counted(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "pool-timeout.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_POOL_SIZE", "1")
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("ANESTHESIA_EXAM_SQLITE_POOL_TIMEOUT", "0.1")
+
+    dispose_connection_pool(db_path)
+    init_database(db_path)
+
+    errors: list[Exception] = []
+
+    def checkout_while_exhausted() -> None:
+        try:
+            with get_connection(db_path):
+                pass
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    with get_connection(db_path):
+        worker = threading.Thread(target=checkout_while_exhausted)
+        worker.start()
+        worker.join()
+
+    assert len(errors) == 1
+    assert get_pool_stats(db_path)["timeouts"] == 1
+
+    dispose_connection_pool(db_path)
+
+
+def test_read_connections_are_read_only_and_see_committed_writes(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "read-only.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+
+    dispose_connection_pool(db_path)
+    init_database(db_path)
+
+    with get_read_connection(db_path) as reader:
+        assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("INSERT INTO scope_requests (id, topic, created_at) VALUES ('r0', 'x', '2026-01-01')")
+
+    with get_write_connection(db_path) as writer:
+        begin_immediate_transaction(writer)
+        writer.execute("INSERT INTO scope_requests (id, topic, created_at) VALUES ('r1', 'Airway', '2026-01-01')")
+        # 寫入交易未提交時，唯讀連線仍可讀（WAL），只是看不到未提交的列
+        with get_read_connection(db_path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM scope_requests").fetchone()[0] == 0
+        writer.commit()
+
+    with get_read_connection(db_path) as reader:
+        assert reader.execute("SELECT COUNT(*) FROM scope_requests").fetchone()[0] == 1
+
+    dispose_connection_pool(db_path)
+
+
+def test_submitted_writes_are_grouped_and_isolated_per_job(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "batched-writes.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+
+    dispose_connection_pool(db_path)
+    init_database(db_path)
+
+    def insert(index: int):
+        def work(conn: sqlite3.Connection) -> int:
+            conn.execute(
+                "INSERT INTO scope_requests (id, topic, created_at) VALUES (?, ?, '2026-01-01')",
+                (f"req-{index}", f"topic-{index}"),
+            )
+            return index
 
-    dispose_connection_pool(db_path)
\ No newline at end of file
+        return work
+
+    def insert_then_fail(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO scope_requests (id, topic, created_at) VALUES ('bad', 'bad', '2026-01-01')")
+        raise ValueError("rejected")
+
+    # 另一個執行緒先佔住寫入連線，讓送出的寫入在佇列中累積
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_writer() -> None:
+        with get_sqlite_writer(db_path).connection():
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_writer)
+    holder.start()
+    assert held.wait(5)
+    futures = [submit_write(insert(index), db_path) for index in range(5)]
+    failing = submit_write(insert_then_fail, db_path)
+    futures += [submit_write(insert(index), db_path) for index in range(5, 10)]
+    release.set()
+    holder.join(5)
+
+    assert [future.result(timeout=5) for future in futures] == list(range(10))
+    with pytest.raises(ValueError):
+        failing.result(timeout=5)
+
+    with get_read_connection(db_path) as reader:
+        ids = {row[0] for row in reader.execute("SELECT id FROM scope_requests")}
+    assert ids == {f"req-{index}" for index in range(10)}
+
+    writer_stats = get_pool_stats(db_path)["writer"]
+    assert writer_stats["batched_jobs"] == 11
+    assert writer_stats["failed_jobs"] == 1
+    assert writer_stats["batches"] <= 2
+
+    dispose_connection_pool(db_path)
+
+
+def test_writes_from_the_thread_holding_the_writer_run_inline(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "reentrant-writes.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+
+    dispose_connection_pool(db_path)
+    init_database(db_path)
+
+    def insert(request_id: str):
+        def work(conn: sqlite3.Connection) -> str:
+            conn.execute(
+                "INSERT INTO scope_requests (id, topic, created_at) VALUES (?, 'Airway', '2026-01-01')",
+                (request_id,),
+            )
+            return request_id
+
+        return work
+
+    with get_write_connection(db_path) as conn:
+        # 沒有開啟中的交易：自己開一個交易並提交
+        assert execute_write(insert("own-tx"), db_path, timeout=5) == "own-tx"
+        begin_immediate_transaction(conn)
+        # 已在交易中：併入該交易的 savepoint，由持有者決定提交或回滾
+        assert execute_write(insert("joined"), db_path, timeout=5) == "joined"
+        with pytest.raises(RuntimeError):
+            with get_write_connection(db_path):
+                pass
+        assert conn.in_transaction
+        conn.commit()
+
+    with get_write_connection(db_path) as conn:
+        begin_immediate_transaction(conn)
+        execute_write(insert("rolled-back"), db_path, timeout=5)
+        # 離開時未提交的交易回滾，併入的寫入也一起撤銷
+
+    def nested(conn: sqlite3.Connection) -> str:
+        return submit_write(insert("nested"), db_path).result(timeout=5)
+
+    assert execute_write(nested, db_path, timeout=5) == "nested"
+
+    with get_read_connection(db_path) as reader:
+        ids = {row[0] for row in reader.execute("SELECT id FROM scope_requests")}
+    assert ids == {"own-tx", "joined", "nested"}
+
+    dispose_connection_pool(db_path)
+
+
+def test_versioned_read_model_cache_reloads_only_after_other_process_writes(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "read-model-cache.db"
+    monkeypatch.setenv("ANESTHESIA_EXAM_DB_PATH", str(db_path))
+
+    dispose_connection_pool(db_path)
+    repo = SQLiteQuestionRepository(db_path=db_path)
+    repo.save(
+        question=Question(question_text="Cached stats question", options=["A", "B"], correct_answer="A"),
+        actor_name="pytest-cache",
+    )
+    cache = VersionedReadModelCache()
+    loads: list[dict] = []
+
+    def load_validated() -> dict:
+        with get_read_connection(db_path) as conn:
+            loads.append({"validated": conn.execute("SELECT SUM(is_validated) FROM questions").fetchone()[0]})
+        return loads[-1]
+
+    first = cache.get_or_load("validated", ("questions",), load_validated, db_path=db_path)
+    first["validated"] = -1
+    assert cache.get_or_load("validated", ("questions",), load_validated, db_path=db_path) == {"validated": 0}
+    assert len(loads) == 1
+    assert repo.get_statistics()["validated"] == 0
+
+    # 其他程序寫入會推進 table_versions，下次讀取就重算
+    with sqlite3.connect(db_path) as other_process:
+        other_process.execute("UPDATE questions SET is_validated = 1")
+
+    assert cache.get_or_load("validated", ("questions",), load_validated, db_path=db_path) == {"validated": 1}
+    assert len(loads) == 2
+    assert repo.get_statistics()["validated"] == 1
+
+    dispose_connection_pool(db_path)
@@ -0,0 +1,199 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.domain.entities.past_exam import PastExam, PastExamQuestion  # noqa: E402
+from src.domain.entities.question import Question  # noqa: E402
+from src.infrastructure.persistence.database import (  # noqa: E402
+    FTS_TOKENIZER,
+    dispose_connection_pool,
+    get_read_connection,
+    init_database,
+)
+from src.infrastructure.persistence.fts_query import expand_bigram_terms, plan_fts_search  # noqa: E402
+from src.infrastructure.persistence.sqlite_past_exam_repo import SQLitePastExamRepository  # noqa: E402
+from src.infrastructure.persistence.sqlite_question_repo import SQLiteQuestionRepository  # noqa: E402
+
+
+def _question(question_id: str, number: int, text: str, **kwargs) -> PastExamQuestion:
+    return PastExamQuestion(
+        id=question_id,
+        past_exam_id="exam-2024",
+        exam_year=2024,
+        exam_name="ITE",
+        question_number=number,
+        question_text=text,
+        options=kwargs.pop("options", ["A", "B", "C", "D"]),
+        correct_answer="A",
+        **kwargs,
+    )
+
+
+def _seed(repo: SQLitePastExamRepository) -> None:
+    repo.save_exam(PastExam(id="exam-2024", exam_year=2024, exam_name="ITE", source_pdf="ite.pdf"))
+    repo.save_questions(
+        "exam-2024",
+        [
+            _question("peq-1", 1, "Which adverse effect is most common after propofol induction?", topics=["propofol"]),
+            _question(
+                "peq-2", 2, "Sugammadex reverses which neuromuscular blocker?", explanation="Encapsulates rocuronium"
+            ),
+            _question(
+                "peq-3", 3, "Malignant hyperthermia is triggered by which agent?", options=["propofol", "sevoflurane"]
+            ),
+        ],
+    )
+
+
+def test_search_questions_ranks_stem_hits_and_tracks_writes(tmp_path: Path) -> None:
+    db_path = tmp_path / "past-exam-search.db"
+    repo = SQLitePastExamRepository(db_path=db_path)
+    _seed(repo)
+
+    assert [question.id for question in repo.search_questions("propofol")] == ["peq-1", "peq-3"]
+    assert [question.id for question in repo.search_questions("propofol", explanation_required=True)] == []
+    assert [question.id for question in repo.search_questions('propofol* ("')] == ["peq-1", "peq-3"]
+    assert repo.search_questions("   ") == []
+
+    assert repo.update_question_explanation("peq-3", "Volatile anesthetics trigger MH, dantrolene treats it")
+    assert [question.id for question in repo.search_questions("dantrolene")] == ["peq-3"]
+
+    repo.save_questions("exam-2024", [_question("peq-2", 2, "Sugammadex reverses which neuromuscular blocker?")])
+    assert repo.search_questions("propofol") == []
+    assert [question.id for question in repo.search_questions("sugammadex OR missing", match_any=True)] == ["peq-2"]
+
+    dispose_connection_pool(db_path)
+
+
+def test_init_database_rebuilds_past_exam_fts_for_databases_without_triggers(tmp_path: Path) -> None:
+    db_path = tmp_path / "past-exam-legacy.db"
+    repo = SQLitePastExamRepository(db_path=db_path)
+    _seed(repo)
+    dispose_connection_pool(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER past_exam_questions_{suffix}")
+        conn.execute("INSERT INTO past_exam_questions_fts(past_exam_questions_fts) VALUES ('delete-all')")
+    assert repo.search_questions("sugammadex") == []
+    dispose_connection_pool(db_path)
+
+    init_database(db_path)
+
+    assert [question.id for question in repo.search_questions("sugammadex")] == ["peq-2"]
+    dispose_connection_pool(db_path)
+
+
+def test_chinese_keywords_hit_trigram_index_and_short_term_fallback(tmp_path: Path) -> None:
+    db_path = tmp_path / "cjk-search.db"
+    past_exam_repo = SQLitePastExamRepository(db_path=db_path)
+    past_exam_repo.save_exam(PastExam(id="exam-2024", exam_year=2024, exam_name="ITE", source_pdf="ite.pdf"))
+    past_exam_repo.save_questions(
+        "exam-2024",
+        [
+            _question("peq-1", 1, "病人接受propofol誘導後出現低血壓，最可能的機轉為何？"),
+            _question("peq-2", 2, "困難插管時下列何者為首選處置？", topics=["氣道管理"]),
+        ],
+    )
+    question_repo = SQLiteQuestionRepository(db_path=db_path)
+    question_repo.save(
+        Question(
+            question_text="Sugammadex 可逆轉下列哪一種肌肉鬆弛劑？",
+            options=["Rocuronium", "Succinylcholine"],
+            correct_answer="A",
+            topics=["肌肉鬆弛劑"],
+        )
+    )
+
+    assert [question.id for question in past_exam_repo.search_questions("propofol低血壓")] == ["peq-1"]
+    assert [question.id for question in past_exam_repo.search_questions("插管")] == ["peq-2"]
+    assert [question.id for question in past_exam_repo.search_questions("氣道管理 插管")] == ["peq-2"]
+    assert [question.question_text[:10] for question in question_repo.search("肌肉鬆弛")] == ["Sugammadex"]
+    assert len(question_repo.search('"sugammadex:*')) == 1
+    assert question_repo.search("鬆弛 OR") == []
+
+    dispose_connection_pool(db_path)
+
+
+def test_two_character_chinese_terms_use_the_fts_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "cjk-bigram.db"
+    question_repo = SQLiteQuestionRepository(db_path=db_path)
+    for text in ("全身麻醉誘導後血壓下降的處置？", "困難插管時的首選工具？", "區域麻醉的禁忌症？"):
+        question_repo.save(Question(question_text=text, options=["A", "B"], correct_answer="A"))
+
+    with get_read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        plan = expand_bigram_terms(cursor, "questions_fts_vocab", plan_fts_search("麻醉"))
+        assert plan.match and plan.like_terms == ()
+        query_plan = cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT q.* FROM questions_fts "
+            "JOIN questions q ON q.rowid = questions_fts.rowid "
+            "WHERE questions_fts MATCH ? AND q.is_deleted = 0",
+            (plan.match,),
+        ).fetchall()
+    details = [row[3] for row in query_plan]
+    assert any("VIRTUAL TABLE INDEX" in detail for detail in details)
+    assert all("VIRTUAL TABLE" in detail for detail in details if detail.startswith("SCAN"))
+
+    assert sorted(question.question_text[:4] for question in question_repo.search("麻醉")) == ["全身麻醉", "區域麻醉"]
+    assert [question.question_text[:4] for question in question_repo.search("插管 首選")] == ["困難插管"]
+    assert question_repo.search("插管 麻醉") == []
+
+    dispose_connection_pool(db_path)
+
+
+def test_init_database_migrates_unicode61_fts_tables_to_trigram(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy-tokenizer.db"
+    repo = SQLitePastExamRepository(db_path=db_path)
+    _seed(repo)
+    dispose_connection_pool(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE past_exam_questions_fts")
+        conn.execute(
+            "CREATE VIRTUAL TABLE past_exam_questions_fts USING fts5("
+            "id, question_text, options, explanation, concept_names, topics, "
+            "content='past_exam_questions', content_rowid='rowid')"
+        )
+
+    init_database(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        fts_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name IN ('questions_fts', 'past_exam_questions_fts')"
+        ).fetchall()
+    assert all(f"tokenize='{FTS_TOKENIZER}'" in row[0] for row in fts_sql)
+    assert [question.id for question in repo.search_questions("hyperthermia")] == ["peq-3"]
+    dispose_connection_pool(db_path)
+
+
+def test_list_questions_for_exams_streams_selected_exams_in_request_order(tmp_path: Path) -> None:
+    db_path = tmp_path / "past-exam-pool.db"
+    repo = SQLitePastExamRepository(db_path=db_path)
+    _seed(repo)
+    repo.save_exam(PastExam(id="exam-2023", exam_year=2023, exam_name="ITE", source_pdf="ite-2023.pdf"))
+    repo.save_questions(
+        "exam-2023",
+        [
+            PastExamQuestion(
+                id=f"peq-2023-{number}",
+                past_exam_id="exam-2023",
+                exam_year=2023,
+                exam_name="ITE",
+                question_number=number,
+                question_text=f"2023 question {number}",
+                options=["A", "B"],
+                correct_answer="A",
+            )
+            for number in (1, 2)
+        ],
+    )
+
+    pool = repo.list_questions_for_exams(["exam-2023", "missing", "exam-2024", "exam-2023"])
+    assert not isinstance(pool, list)
+    assert [question.id for question in pool] == ["peq-2023-1", "peq-2023-2", "peq-1", "peq-2", "peq-3"]
+    assert list(repo.list_questions_for_exams([])) == []
+    dispose_connection_pool(db_path)
@@ -106,6 +106,43 @@ def test_chat_stream_job_can_be_cancelled_while_source_is_waiting() -> None:
     assert snapshot["content"] == ""
 
 
+def test_chat_stream_job_read_since_returns_only_new_chunks() -> None:
+    store = ChatStreamJobStore()
+    release = threading.Event()
+
+    def gated_stream():
+        yield "first "
+        yield "second "
+        release.wait(timeout=1)
+        yield "third"
+
+    job_id = store.start(gated_stream)
+
+    deadline = time.monotonic() + 1
+    update = store.read_since(job_id, 0)
+    while update["cursor"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        update = store.read_since(job_id, 0)
+
+    assert update["delta"] == "first second "
+    assert update["cursor"] == 2
+    assert update["reset"] is False
+
+    release.set()
+    deadline = time.monotonic() + 1
+    follow_up = store.read_since(job_id, update["cursor"])
+    while follow_up["status"] != "done" and time.monotonic() < deadline:
+        time.sleep(0.01)
+        follow_up = store.read_since(job_id, update["cursor"])
+
+    assert follow_up["delta"] == "third"
+    assert follow_up["cursor"] == 3
+    assert store.read_since(job_id, 99)["reset"] is True
+    assert store.read_since(job_id, 99)["delta"] == "first second third"
+    assert store.snapshot(job_id)["content"] == "first second third"
+    assert store.read_since("missing-job")["error"] == "chat job not found"
+
+
 def test_chat_stream_job_cancel_unknown_job_returns_false() -> None:
     store = ChatStreamJobStore()
 
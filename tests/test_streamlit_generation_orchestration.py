@@ -1,12 +1,19 @@
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.infrastructure.agent.json_stream import IncrementalJsonObjectScanner  # noqa: E402
+from src.infrastructure.agent.stream_buffer import StreamTextBuffer  # noqa: E402
+from src.infrastructure.crush.exam_generator import ExamGenerator  # noqa: E402
 from src.presentation.streamlit.generation.orchestration import (  # noqa: E402
+    GenerationExecutionUi,
+    StreamingQuestionExtractor,
     build_generation_prompt,
     extract_questions_from_response,
+    stream_agent_generate,
 )
 
 
@@ -149,3 +156,136 @@ def test_extract_questions_from_response_deduplicates_and_normalizes_options() -
     assert questions[0]["semantic_structure"]["question_group"]["pattern"] == "direct_recall"
     assert questions[0]["source"]["document"] == "Miller"
     assert questions[0]["source"]["chapter"] == "Chapter 25"
+
+
+def test_streaming_question_extractor_emits_each_question_when_its_brace_closes() -> None:
+    response = (
+        "好的，以下是題目 {佔位符} 說明：\n"
+        '[{"question_text": "Sugammadex 的作用機轉為何？", "options": ["A. 包覆 rocuronium", "B. 抑制乙醯膽鹼酯酶"],'
+        ' "correct_answer": "A", "explanation": "含 } 與 \\" 的字串"},\n'
+        ' {"question_text": "MAC 的定義？", "options": ["50% 不動", "95% 不動"], "correct_answer": "1",},\n'
+        '{"question_id": "q-001", "success": true}]'
+    )
+    extractor = StreamingQuestionExtractor()
+
+    emitted_at: list[int] = []
+    for offset in range(0, len(response), 7):
+        for _question in extractor.feed(response[offset : offset + 7]):
+            emitted_at.append(offset)
+
+    assert [question["question_text"] for question in extractor.questions] == [
+        "Sugammadex 的作用機轉為何？",
+        "MAC 的定義？",
+    ]
+    assert extractor.questions[0]["explanation"] == '含 } 與 " 的字串'
+    assert extractor.questions[1]["correct_answer"] == "A"
+    assert emitted_at[0] < response.index("MAC")
+    assert extractor.tool_results == [{"question_id": "q-001", "success": True}]
+    assert [question["question_text"] for question in extract_questions_from_response(response)] == [
+        question["question_text"] for question in extractor.questions
+    ]
+
+
+def test_wrapped_mcp_save_results_are_detected() -> None:
+    response = (
+        '工具回傳：{"tool": "exam_save_question", "result": {"success": true, "question_id": "abc-1"}}\n'
+        '{"content": [{"type": "text", "text": "{\\"success\\": true, \\"question_id\\": \\"abc-2\\"}"}]}'
+    )
+    extractor = StreamingQuestionExtractor()
+
+    for offset in range(0, len(response), 5):
+        extractor.feed(response[offset : offset + 5])
+
+    assert extractor.tool_results == [
+        {"success": True, "question_id": "abc-1"},
+        {"success": True, "question_id": "abc-2"},
+    ]
+    assert ExamGenerator._detect_mcp_results(IncrementalJsonObjectScanner().feed(response)) == [
+        {"success": True, "question_id": "abc-1"},
+        {"success": True, "question_id": "abc-2"},
+    ]
+
+
+def test_incremental_json_scanner_recovers_nested_object_from_invalid_group() -> None:
+    scanner = IncrementalJsonObjectScanner()
+
+    payloads = scanner.feed('{"note": oops {"question_id": "abc"} } tail')
+
+    assert payloads == [{"question_id": "abc"}]
+    assert not scanner.in_object
+
+
+class _RecordingPlaceholder:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def markdown(self, text: str) -> None:
+        self.calls.append(text)
+
+    error = markdown
+
+
+def test_stream_text_buffer_keeps_bounded_tail_and_full_text() -> None:
+    buffer = StreamTextBuffer(tail_chars=10)
+    chunks = [f"line-{index:03d}\n" for index in range(200)]
+    for chunk in chunks:
+        buffer.append(chunk)
+    buffer.append("")
+
+    full_text = "".join(chunks)
+    assert buffer.getvalue() == full_text
+    assert len(buffer) == len(full_text)
+    assert buffer.tail() == full_text[-10:]
+    assert buffer.tail(4) == full_text[-4:]
+    assert len(buffer._tail) <= 2
+
+
+def test_stream_agent_generate_returns_full_text_and_renders_only_the_tail() -> None:
+    class _Provider:
+        name = "fake"
+
+        def stream(self, prompt: str, session_key: str | None = None):
+            yield from (f"第 {index} 行思考內容\n" for index in range(2000))
+
+    output = _RecordingPlaceholder()
+    ui = GenerationExecutionUi(
+        status_container=None,
+        progress_placeholder=_RecordingPlaceholder(),
+        output_placeholder=output,
+        questions_container=None,
+    )
+
+    full_response, saved, streamed = stream_agent_generate("prompt", _Provider(), ui)
+
+    assert full_response == "".join(f"第 {index} 行思考內容\n" for index in range(2000))
+    assert saved == [] and streamed == []
+    assert output.calls[-1] == f"```\n{full_response[-3000:]}\n```"
+
+
+def test_stream_agent_generate_keeps_every_save_result_in_one_chunk() -> None:
+    chunk = (
+        "題目：Sugammadex 拮抗哪一類藥物？\nA. Rocuronium 類\nB. Succinylcholine 類\n答案：A\n"
+        '{"success": true, "question_id": "q-first"}\n'
+        "題目：MAC 的定義？\nA. 半數不動的濃度\nB. 全部不動的濃度\n答案：A\n"
+        '{"success": true, "question_id": "q-second"}\n'
+    )
+
+    class _Provider:
+        name = "fake"
+
+        def stream(self, prompt: str, session_key: str | None = None):
+            yield chunk
+
+    ui = GenerationExecutionUi(
+        status_container=None,
+        progress_placeholder=_RecordingPlaceholder(),
+        output_placeholder=_RecordingPlaceholder(),
+        questions_container=nullcontext(),
+    )
+
+    _full_response, saved, _streamed = stream_agent_generate("prompt", _Provider(), ui)
+
+    assert [(question["id"], question["question_text"]) for question in saved] == [
+        ("q-first", "Sugammadex 拮抗哪一類藥物？"),
+        ("q-second", "MAC 的定義？"),
+    ]
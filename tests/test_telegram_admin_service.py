@@ -37,6 +37,9 @@ class FakeStatusService:
     def build_web_text(self) -> str:
         return "web ok"
 
+    def build_metrics_text(self) -> str:
+        return "metrics ok"
+
     def build_help_text(self) -> str:
         return "help ok"
 
@@ -148,8 +151,35 @@ def test_admin_bot_routes_read_only_commands_for_admin() -> None:
     assert bot.handle_update({"update_id": 1, "message": {"chat": {"id": 111}, "text": "/status"}}) is True
     assert bot.handle_update({"update_id": 2, "message": {"chat": {"id": 111}, "text": "/jobs"}}) is True
     assert bot.handle_update({"update_id": 3, "message": {"chat": {"id": 111}, "text": "/openclaw"}}) is True
+    assert bot.handle_update({"update_id": 4, "message": {"chat": {"id": 111}, "text": "/metrics"}}) is True
+
+    assert client.sent == [("111", "status ok"), ("111", "jobs ok"), ("111", "openclaw ok"), ("111", "metrics ok")]
+
+
+def test_status_service_metrics_text_summarizes_remote_endpoints(tmp_path: Path) -> None:
+    remote = "\n".join(
+        [
+            'exam_mcp_tool_call_seconds_bucket{tool="create_exam",outcome="ok",le="0.1"} 3',
+            'exam_mcp_tool_call_seconds_bucket{tool="create_exam",outcome="ok",le="+Inf"} 4',
+        ]
+    )
+
+    def fake_fetch(url: str) -> str:
+        if url.endswith(":9101/metrics"):
+            return remote
+        raise OSError("connection refused")
+
+    service = TelegramAdminStatusService(
+        project_dir=tmp_path,
+        metrics_urls=["http://127.0.0.1:9101/metrics", "http://127.0.0.1:9102/metrics"],
+        metrics_fetcher=fake_fetch,
+    )
+
+    text = service.build_metrics_text()
 
-    assert client.sent == [("111", "status ok"), ("111", "jobs ok"), ("111", "openclaw ok")]
+    assert "[http://127.0.0.1:9101/metrics]" in text
+    assert "mcp_tool_call{tool=create_exam,outcome=ok} n=4" in text
+    assert "error: connection refused" in text
 
 
 def test_worker_notification_summarizes_errors_and_generated_questions() -> None:
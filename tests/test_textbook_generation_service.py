@@ -5,7 +5,17 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.application.services.asset_document_cache import AssetDocumentCache, parse_markdown_sections  # noqa: E402
+from src.application.services.past_exam_extraction_service import PastExamExtractionService  # noqa: E402
 from src.application.services.textbook_generation_service import TextbookGenerationService  # noqa: E402
+from src.application.services.textbook_source_sidecar import (  # noqa: E402
+    BlockStore,
+    build_block_store,
+    has_ingest_stage,
+    ingest_stage_record,
+    ledger_content_hash,
+    record_ingest_stage,
+)
 
 
 def _write_doc(tmp_path: Path, *, doc_id: str, title: str, markdown: str, blocks: list[dict]) -> Path:
@@ -87,6 +97,122 @@ def test_assess_document_source_readiness_reuses_cached_block_stats(
     assert read_count == 1
 
 
+def test_assess_document_source_readiness_persists_sidecar_across_instances(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    block = {
+        "block_id": "blk_0001",
+        "block_type": "SectionHeader",
+        "page": 7,
+        "text": "Shock",
+        "metadata": {"line_start": 1, "line_end": 2},
+    }
+    doc_dir = _write_doc(tmp_path, doc_id="doc_sidecar", title="Miller Ch 79", markdown="# Shock", blocks=[block])
+
+    first = TextbookGenerationService(tmp_path).assess_document_source_readiness("doc_sidecar")
+    sidecar = json.loads((doc_dir / "source_readiness.json").read_text(encoding="utf-8"))
+    assert sidecar["page_range"] == [7, 7]
+    assert sidecar["sections"] == ["Shock"]
+    assert first["title"] == "Miller Ch 79"
+
+    original_read_text = Path.read_text
+
+    def guarded_read_text(path: Path, *args, **kwargs):
+        assert path.name != "blocks.json", "sidecar should answer readiness without decoding blocks"
+        return original_read_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", guarded_read_text)
+    assert TextbookGenerationService(tmp_path).assess_document_source_readiness("doc_sidecar") == first
+    monkeypatch.setattr(Path, "read_text", original_read_text)
+
+    (doc_dir / "blocks.json").write_text(json.dumps([block, {**block, "page": 9, "block_id": "blk_0002"}]))
+    refreshed = TextbookGenerationService(tmp_path).assess_document_source_readiness("doc_sidecar")
+    assert refreshed["precise_block_count"] == 2
+    assert refreshed["page_range"] == [7, 9]
+
+
+def test_block_store_serves_pages_ids_and_candidates_without_decoding_blocks_json(tmp_path: Path) -> None:
+    def block(block_id: str, page: int, text: str, section: str, **kwargs) -> dict:
+        return {
+            "block_id": block_id,
+            "block_type": kwargs.pop("block_type", "Text"),
+            "page": page,
+            "text": text,
+            "section_hierarchy": {"1": "Chapter 79", "2": section},
+            "metadata": kwargs.pop("metadata", {"line_start": page, "line_end": page}),
+        }
+
+    blocks = [
+        block("blk_0001", 3, "Shock", "Shock", block_type="SectionHeader"),
+        block("blk_0002", 3, "Propofol causes hypotension after induction.", "Induction"),
+        block("blk_0003", 4, "困難插管時應先給氧。", "Airway"),
+        block("blk_0004", 5, "Dantrolene treats malignant hyperthermia.", "Shock", metadata={}),
+        block("blk_0005", 6, "Sepsis management relies on early antibiotics.", "Sepsis"),
+    ]
+    doc_dir = _write_doc(tmp_path, doc_id="doc_store", title="Miller Ch 79", markdown="# Shock", blocks=blocks)
+
+    assert BlockStore.open(doc_dir) is None
+    assert build_block_store(doc_dir) == 5
+    with BlockStore.open(doc_dir) as store:
+        assert store.count() == 5
+        assert store.count(precise_only=True) == 4
+        assert store.get_block("blk_0003") == blocks[2]
+        assert [item["block_id"] for item in store.blocks_for_pages(3, 4)] == ["blk_0001", "blk_0002", "blk_0003"]
+        assert [item["block_id"] for item in store.candidate_blocks(["propofol", "插管"])] == ["blk_0002", "blk_0003"]
+        assert [item["block_id"] for item in store.candidate_blocks([], sections=["shock"])] == ["blk_0001"]
+        assert store.candidate_blocks(["dantrolene"]) == []
+        assert [item["block_id"] for item in store.candidate_blocks(["dantrolene"], precise_only=False)] == ["blk_0004"]
+
+    service = TextbookGenerationService(tmp_path)
+    queries = ["Which drug causes hypotension after induction?", "early antibiotics for sepsis"]
+    precise_blocks = [item for item in blocks if service._block_has_precise_source(item)]
+    candidates = service._load_candidate_blocks("doc_store", queries, ["Shock"])
+    for query in queries:
+        assert service._find_best_match(candidates, [query], ["Shock"]) == service._find_best_match(
+            precise_blocks, [query], ["Shock"]
+        )
+
+    (doc_dir / "blocks.json").write_text(json.dumps(blocks[:2]), encoding="utf-8")
+    assert BlockStore.open(doc_dir) is None
+    assert [item["block_id"] for item in service._load_candidate_blocks("doc_store", ["propofol"], [])] == ["blk_0002"]
+
+
+def test_ingest_ledger_tracks_source_hash_options_and_artifacts(tmp_path: Path, monkeypatch) -> None:
+    doc_dir = _write_doc(tmp_path, doc_id="doc_ledger", title="Miller Ch 1", markdown="# Intro", blocks=[])
+    pdf_path = tmp_path / "1 - Intro.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7 chapter one")
+    pdf_sha256 = ledger_content_hash(doc_dir, pdf_path)
+    key = {"pdf_sha256": pdf_sha256, "backend": "marker", "chunk_size": 12}
+
+    assert not has_ingest_stage(doc_dir, "ingest")
+    record_ingest_stage(
+        doc_dir,
+        "ingest",
+        key,
+        ["doc_ledger_full.md", "blocks.json"],
+        source_path=pdf_path,
+        source_sha256=pdf_sha256,
+        details={"blocks_count": 0},
+    )
+    assert ingest_stage_record(doc_dir, "ingest", key)["details"] == {"blocks_count": 0}
+    assert ingest_stage_record(doc_dir, "ingest", {**key, "chunk_size": 64}) is None
+
+    monkeypatch.setattr(
+        "src.application.services.textbook_source_sidecar.file_sha256",
+        lambda path: (_ for _ in ()).throw(AssertionError("unchanged PDFs reuse the recorded hash")),
+    )
+    assert ledger_content_hash(doc_dir, pdf_path) == pdf_sha256
+    monkeypatch.undo()
+
+    pdf_path.write_bytes(b"%PDF-1.7 chapter one, revised")
+    assert ledger_content_hash(doc_dir, pdf_path) != pdf_sha256
+
+    (doc_dir / "blocks.json").write_text("[{}]", encoding="utf-8")
+    assert has_ingest_stage(doc_dir, "ingest")
+    assert ingest_stage_record(doc_dir, "ingest", key) is None
+
+
 def test_build_prompt_context_prefers_selected_section_excerpt(tmp_path: Path) -> None:
     markdown = """# Pediatric and Neonatal Critical Care
 
@@ -119,6 +245,54 @@ Families should be included in ICU decision making.
     assert "Family Centered Care" not in context["prompt_context"]
 
 
+def test_parse_markdown_sections_closes_nested_sections_in_one_pass() -> None:
+    sections = parse_markdown_sections(
+        "# Chapter\nintro\n## **A**\na body\n### A.1\nnested\n## B\n<!-- Page 3 -->\nb body\n# Appendix\nend"
+    )
+
+    assert [(section["title"], section["level"]) for section in sections] == [
+        ("Chapter", 1),
+        ("A", 2),
+        ("A.1", 3),
+        ("B", 2),
+        ("Appendix", 1),
+    ]
+    assert sections[1]["body"] == "a body\n### A.1\nnested"
+    assert sections[3]["body"] == "b body"
+    assert "Appendix" not in sections[0]["body"]
+
+
+def test_asset_document_cache_reuses_documents_until_files_change(tmp_path: Path, monkeypatch) -> None:
+    doc_dir = _write_doc(tmp_path, doc_id="doc_cache", title="Cached", markdown="# One\nfirst", blocks=[])
+    _write_doc(tmp_path, doc_id="doc_other", title="Other", markdown="# Two\n" + "x" * 64, blocks=[])
+    cache = AssetDocumentCache(max_bytes=200)
+    loader = PastExamExtractionService(tmp_path, document_cache=cache)
+
+    original_read_text = Path.read_text
+    markdown_reads = 0
+
+    def counted_read_text(path: Path, *args, **kwargs):
+        nonlocal markdown_reads
+        if path.name.endswith("_full.md"):
+            markdown_reads += 1
+        return original_read_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", counted_read_text)
+
+    first = loader.load_asset_document("doc_cache")
+    assert loader.load_asset_document("doc_cache") is first
+    assert cache.section_index(first, str.lower) is cache.section_index(first, str.lower)
+    assert markdown_reads == 1
+
+    (doc_dir / "doc_cache_full.md").write_text("# One\nsecond edition", encoding="utf-8")
+    assert loader.load_asset_document("doc_cache").markdown.endswith("second edition")
+    assert markdown_reads == 2
+
+    loader.load_asset_document("doc_other")
+    assert cache.total_bytes <= 200
+    assert len(cache) == 1
+
+
 def test_enrich_generated_questions_marks_preview_only(tmp_path: Path) -> None:
     _write_doc(
         tmp_path,